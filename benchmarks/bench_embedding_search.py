@@ -0,0 +1,143 @@
+"""Passage embedding search benchmark: blocked cosine top-k over a float16 memmap.
+
+Builds random L2-normalized float16 matrices (all-MiniLM-L6-v2 width,
+384 dims) on disk, memory-maps them the way EmbeddingIndex does, and
+reports top-k latency plus the peak heap allocated per query. The peak
+stays at roughly one float32 block plus the score vector, whatever the
+passage count.
+
+Model encoding time is excluded (one query embedding is ~5-15 ms on CPU).
+
+Usage:
+    uv run python benchmarks/bench_embedding_search.py                 # 2k, 20k, 200k passages
+    uv run python benchmarks/bench_embedding_search.py --sizes 200000 --block-rows 32768
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+# Add project src to path for objlib import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from objlib.search.embeddings import SEARCH_BLOCK_ROWS, top_k_cosine
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_SIZES = [2_000, 20_000, 200_000]
+DIM = 384
+TOP_K = 20
+DEFAULT_REPEAT = 20
+TARGET_MS = 50.0
+SEED = 42
+
+console = Console()
+
+
+def build_matrix(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(SEED)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float16, shape=(rows, DIM))
+    for lo in range(0, rows, 50_000):
+        hi = min(rows, lo + 50_000)
+        block = rng.standard_normal((hi - lo, DIM)).astype(np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        out[lo:hi] = block
+    out.flush()
+    del out
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_size(rows: int, repeat: int, block_rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "passages.f16.npy"
+        build_matrix(path, rows)
+        matrix = np.load(path, mmap_mode="r")
+        rng = np.random.default_rng(SEED + 1)
+
+        queries = rng.standard_normal((repeat + 1, DIM)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        top_k_cosine(matrix, queries[0], TOP_K, block_rows=block_rows)  # warm page cache
+
+        samples = []
+        for q in queries[1:]:
+            t0 = perf_counter()
+            top_k_cosine(matrix, q, TOP_K, block_rows=block_rows)
+            samples.append((perf_counter() - t0) * 1000)
+
+        tracemalloc.start()
+        top_k_cosine(matrix, queries[1], TOP_K, block_rows=block_rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "rows": rows,
+            "file_mb": path.stat().st_size / (1024 * 1024),
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "peak_mb": peak / (1024 * 1024),
+        }
+
+
+def print_results(results: list[dict]) -> None:
+    table = Table(title=f"Cosine top-{TOP_K} over float16 memmap ({DIM} dims)")
+    table.add_column("Passages", justify="right")
+    table.add_column("Matrix MB", justify="right")
+    table.add_column("P50 ms", justify="right")
+    table.add_column("P95 ms", justify="right")
+    table.add_column("Peak heap MB", justify="right")
+    table.add_column(f"< {TARGET_MS:.0f} ms", justify="center")
+    for r in results:
+        ok = "[green]yes[/green]" if r["p95"] < TARGET_MS else "[red]no[/red]"
+        table.add_row(
+            f"{r['rows']:,}",
+            f"{r['file_mb']:.1f}",
+            f"{r['p50']:.2f}",
+            f"{r['p95']:.2f}",
+            f"{r['peak_mb']:.1f}",
+            ok,
+        )
+    console.print(table)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Embedding top-k search benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Passage counts to benchmark",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help="Timed queries per size",
+    )
+    parser.add_argument(
+        "--block-rows", type=int, default=SEARCH_BLOCK_ROWS,
+        help="Rows converted to float32 per step",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = [run_size(rows, args.repeat, args.block_rows) for rows in args.sizes]
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,15 @@ mock API latency profiles.
 Reports P50/P95/P99 per timing segment, identifies bottleneck, evaluates
 Threshold 1 (zero/c=10 <= 5min) and Threshold 2 (realistic/c=10 <= 6h).
 
+``--group-commit`` instead runs the lifecycle through
+``AsyncUploadStateManager.transition_to_*`` (one shared connection, as in
+production) at c=10 and c=50, once committing every transition and once
+with group commit, and compares them.
+
 Usage:
     uv run python benchmarks/bench_fsm.py           # Full run (realistic delay=2.0s, ~60min)
     uv run python benchmarks/bench_fsm.py --quick    # Quick verification (delay=0.05s, ~2min)
+    uv run python benchmarks/bench_fsm.py --group-commit --quick  # Per-row vs group commit
 """
 
 from __future__ import annotations
@@ -34,6 +40,7 @@ from rich.console import Console
 from rich.table import Table
 
 from objlib.upload.fsm import create_fsm
+from objlib.upload.state import AsyncUploadStateManager
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -261,6 +268,43 @@ async def process_file(
     return timings
 
 
+async def process_file_state(
+    file_path: str,
+    version: int,
+    state: AsyncUploadStateManager,
+    mock_adapter: MockApiAdapter,
+) -> dict[str, float]:
+    """Same lifecycle as :func:`process_file`, through the state manager."""
+    timings: dict[str, float] = {}
+    total_start = perf_counter()
+    db_ms = 0.0
+
+    t = perf_counter()
+    version = await state.transition_to_uploading(file_path, version)
+    db_ms += (perf_counter() - t) * 1000
+
+    t = perf_counter()
+    file_obj = await mock_adapter.upload_file(file_path, "display")
+    api_ms = (perf_counter() - t) * 1000
+
+    t = perf_counter()
+    version = await state.transition_to_processing(file_path, version, file_obj.name, file_obj.uri)
+    db_ms += (perf_counter() - t) * 1000
+
+    t = perf_counter()
+    operation = await mock_adapter.import_to_store(file_obj.name, [])
+    api_ms += (perf_counter() - t) * 1000
+
+    t = perf_counter()
+    await state.transition_to_indexed(file_path, version, operation.response.name)
+    db_ms += (perf_counter() - t) * 1000
+
+    timings["mock_api_ms"] = api_ms
+    timings["db_total_ms"] = db_ms
+    timings["total_wall_ms"] = (perf_counter() - total_start) * 1000
+    return timings
+
+
 # ---------------------------------------------------------------------------
 # Concurrency runner
 # ---------------------------------------------------------------------------
@@ -302,6 +346,28 @@ async def run_benchmark(
     return list(results)
 
 
+async def run_state_benchmark(
+    concurrency: int,
+    profile: str,
+    db_path: str,
+    group_commit: bool,
+    realistic_delay: float = 2.0,
+) -> list[dict[str, float]]:
+    """Run all files through the state manager's transition_to_* methods."""
+    sem = asyncio.Semaphore(concurrency)
+    mock = MockApiAdapter(profile, realistic_delay=realistic_delay)
+
+    async with AsyncUploadStateManager(db_path, group_commit=group_commit) as state:
+
+        async def worker(file_path: str) -> dict[str, float]:
+            async with sem:
+                return await process_file_state(file_path, 0, state, mock)
+
+        return list(await asyncio.gather(
+            *(worker(f"/bench/file_{i:04d}.txt") for i in range(FILE_COUNT))
+        ))
+
+
 # ---------------------------------------------------------------------------
 # Statistics
 # ---------------------------------------------------------------------------
@@ -513,6 +579,11 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Override realistic profile delay in seconds (default: 2.0, --quick sets 0.05)",
     )
+    parser.add_argument(
+        "--group-commit",
+        action="store_true",
+        help="Only compare per-transition commits vs group commit in AsyncUploadStateManager",
+    )
     parser.add_argument(
         "--shared-connection",
         action="store_true",
@@ -521,6 +592,56 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+async def run_group_commit_comparison(realistic_delay: float) -> None:
+    """Per-row commit vs group commit through AsyncUploadStateManager."""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_fsm_gc_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    await create_bench_db(db_path)
+
+    table = Table(title=f"State manager transitions ({FILE_COUNT} files, {TOTAL_TRANSITIONS - FILE_COUNT} writes)")
+    table.add_column("C", justify="right", style="cyan")
+    table.add_column("Profile", style="magenta")
+    table.add_column("Commit", style="bold")
+    table.add_column("Elapsed", justify="right")
+    table.add_column("Trans/s", justify="right", style="green")
+    table.add_column("db P50", justify="right")
+    table.add_column("db P95", justify="right", style="yellow")
+    table.add_column("Speedup", justify="right")
+
+    for profile in PROFILES:
+        for concurrency in (10, 50):
+            baseline = 0.0
+            for group_commit in (False, True):
+                await reset_files(db_path)
+                start = perf_counter()
+                timings = await run_state_benchmark(
+                    concurrency, profile, db_path, group_commit, realistic_delay
+                )
+                elapsed = perf_counter() - start
+                indexed = await verify_all_indexed(db_path)
+                if indexed != FILE_COUNT:
+                    console.print(f"  [bold red]ERROR: only {indexed}/{FILE_COUNT} indexed[/bold red]")
+                    sys.exit(1)
+                baseline = baseline or elapsed
+                db = compute_segment_stats(timings, "db_total_ms")
+                table.add_row(
+                    str(concurrency),
+                    profile,
+                    "group" if group_commit else "per-row",
+                    f"{elapsed:.2f}s",
+                    f"{TOTAL_TRANSITIONS / elapsed:.1f}",
+                    f"{db['p50']:.2f}",
+                    f"{db['p95']:.2f}",
+                    f"{baseline / elapsed:.2f}x",
+                )
+
+    console.print(table)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
+    os.rmdir(tmp_dir)
+
+
 async def main() -> None:
     """Run all 6 benchmark configurations and report results."""
     args = parse_args()
@@ -530,6 +651,11 @@ async def main() -> None:
     if args.realistic_delay is not None:
         realistic_delay = args.realistic_delay
 
+    if args.group_commit:
+        console.rule("[bold blue]FSM Group Commit Benchmark")
+        await run_group_commit_comparison(realistic_delay)
+        return
+
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     console.rule("[bold blue]FSM Transition Throughput Benchmark")
     console.print(f"  Files: {FILE_COUNT}")
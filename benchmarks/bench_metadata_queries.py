@@ -0,0 +1,290 @@
+"""Browse/filter query benchmark for the V14 generated metadata columns.
+
+Compares the pre-V14 queries (json_extract() on metadata_json for every
+row) against the current Database methods, which read the virtual
+generated columns and their idx_meta_* indexes. For each corpus size it
+prints the EXPLAIN QUERY PLAN of both variants and P50/P95 latency.
+
+Synthetic rows mimic the real library mix: ~60% course transcripts
+spread over 40 courses with year/quarter/week/lesson fields, the rest
+split across motm, book, qa and unknown categories.
+
+Usage:
+    uv run python benchmarks/bench_metadata_queries.py                  # 2k, 20k, 200k rows
+    uv run python benchmarks/bench_metadata_queries.py --sizes 2000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+# Add project src to path for Database import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rich.console import Console
+from rich.table import Table
+
+from objlib.database import Database
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_SIZES = [2_000, 20_000, 200_000]
+DEFAULT_REPEAT = 20
+SEED = 42
+COURSE_COUNT = 40
+TARGET_COURSE = "Course 07"
+TARGET_YEAR = 2021
+
+console = Console()
+
+# Pre-V14 query text, kept verbatim for comparison.
+LEGACY_QUERIES: dict[str, tuple[str, tuple]] = {
+    "categories": (
+        """SELECT COALESCE(json_extract(metadata_json, '$.category'), 'uncategorized') as category,
+                  COUNT(*) as count
+           FROM files
+           WHERE metadata_json IS NOT NULL AND NOT is_deleted
+           GROUP BY category
+           ORDER BY count DESC""",
+        (),
+    ),
+    "courses": (
+        """SELECT json_extract(metadata_json, '$.course') as course,
+                  COUNT(*) as count
+           FROM files
+           WHERE json_extract(metadata_json, '$.category') = 'course'
+             AND NOT is_deleted
+           GROUP BY course
+           ORDER BY course""",
+        (),
+    ),
+    "files_by_course": (
+        """SELECT filename, file_path, metadata_json FROM files
+           WHERE json_extract(metadata_json, '$.course') = ?
+             AND NOT is_deleted
+           ORDER BY json_extract(metadata_json, '$.lesson_number'),
+                    json_extract(metadata_json, '$.year'),
+                    json_extract(metadata_json, '$.quarter'),
+                    json_extract(metadata_json, '$.week'),
+                    filename""",
+        (TARGET_COURSE,),
+    ),
+    "filter_year_gte": (
+        """SELECT filename, file_path, metadata_json FROM files
+           WHERE NOT is_deleted AND metadata_json IS NOT NULL
+             AND CAST(json_extract(metadata_json, ?) AS INTEGER) >= ?
+           ORDER BY filename LIMIT ?""",
+        ("$.year", TARGET_YEAR, 50),
+    ),
+}
+
+# Current SQL for EXPLAIN (mirrors Database methods) and the callables timed.
+CURRENT_QUERIES: dict[str, tuple[str, tuple]] = {
+    "categories": (
+        """SELECT COALESCE(meta_category, 'uncategorized') as category, COUNT(*) as count
+           FROM files WHERE metadata_json IS NOT NULL AND NOT is_deleted
+           GROUP BY category ORDER BY count DESC""",
+        (),
+    ),
+    "courses": (
+        """SELECT meta_course as course, COUNT(*) as count FROM files
+           WHERE meta_category = 'course' AND NOT is_deleted
+           GROUP BY meta_course ORDER BY meta_course""",
+        (),
+    ),
+    "files_by_course": (
+        """SELECT filename, file_path, metadata_json FROM files
+           WHERE meta_course = ? AND NOT is_deleted
+           ORDER BY meta_lesson_number, meta_year, meta_quarter, meta_week, filename""",
+        (TARGET_COURSE,),
+    ),
+    "filter_year_gte": (
+        """SELECT filename, file_path, metadata_json FROM files
+           WHERE NOT is_deleted AND metadata_json IS NOT NULL
+             AND CAST(meta_year AS INTEGER) >= ?
+           ORDER BY filename LIMIT ?""",
+        (TARGET_YEAR, 50),
+    ),
+}
+
+
+def current_calls(db: Database) -> dict[str, callable]:
+    """Database method calls equivalent to CURRENT_QUERIES."""
+    return {
+        "categories": db.get_categories_with_counts,
+        "courses": db.get_courses_with_counts,
+        "files_by_course": lambda: db.get_files_by_course(TARGET_COURSE),
+        "filter_year_gte": lambda: db.filter_files_by_metadata({"year": f">={TARGET_YEAR}"}),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Corpus generation
+# ---------------------------------------------------------------------------
+
+
+def synth_metadata(rng: random.Random, i: int) -> dict:
+    roll = rng.random()
+    if roll < 0.6:
+        return {
+            "category": "course",
+            "course": f"Course {rng.randrange(COURSE_COUNT):02d}",
+            "year": rng.randint(2010, 2025),
+            "quarter": rng.randint(1, 4),
+            "week": rng.randint(1, 13),
+            "lesson_number": rng.randint(1, 30),
+            "difficulty": rng.choice(["introductory", "intermediate", "advanced"]),
+            "topic": f"Topic {i}",
+            "instructor": "Leonard Peikoff",
+        }
+    if roll < 0.75:
+        return {"category": "motm", "year": rng.randint(2015, 2025), "date": "2020-01-01"}
+    if roll < 0.85:
+        return {"category": "book", "difficulty": "advanced"}
+    if roll < 0.95:
+        return {"category": "qa", "year": rng.randint(2000, 2025)}
+    return {"category": "unknown", "_unparsed_filename": True}
+
+
+def build_db(db_path: Path, rows: int) -> Database:
+    rng = random.Random(SEED)
+    db = Database(db_path)
+    with db.conn:
+        db.conn.executemany(
+            "INSERT INTO files (file_path, content_hash, filename, file_size, "
+            "metadata_json, is_deleted) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f"/library/f{i:07d}.txt",
+                    f"{i:064x}",
+                    f"f{i:07d}.txt",
+                    4000,
+                    json.dumps(synth_metadata(rng, i)),
+                    1 if rng.random() < 0.02 else 0,
+                )
+                for i in range(rows)
+            ),
+        )
+    db.conn.execute("ANALYZE")
+    return db
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def time_call(fn, repeat: int) -> list[float]:
+    fn()  # warm page cache
+    samples = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        fn()
+        samples.append((perf_counter() - t0) * 1000)
+    return samples
+
+
+def query_plan(db: Database, sql: str, params: tuple) -> str:
+    rows = db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "; ".join(row["detail"] for row in rows)
+
+
+def run_size(rows: int, repeat: int) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        console.print(f"[dim]Building {rows:,}-row corpus...[/dim]")
+        db = build_db(Path(tmp) / "bench.db", rows)
+        calls = current_calls(db)
+        for name, (legacy_sql, legacy_params) in LEGACY_QUERIES.items():
+            current_sql, current_params = CURRENT_QUERIES[name]
+            legacy = time_call(
+                lambda: db.conn.execute(legacy_sql, legacy_params).fetchall(), repeat
+            )
+            current = time_call(calls[name], repeat)
+            results.append({
+                "rows": rows,
+                "query": name,
+                "legacy_p50": percentile(legacy, 50),
+                "legacy_p95": percentile(legacy, 95),
+                "current_p50": percentile(current, 50),
+                "current_p95": percentile(current, 95),
+                "legacy_plan": query_plan(db, legacy_sql, legacy_params),
+                "current_plan": query_plan(db, current_sql, current_params),
+            })
+        db.close()
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    table = Table(title="Browse/filter latency (ms): json_extract vs generated columns")
+    table.add_column("Rows", justify="right")
+    table.add_column("Query")
+    table.add_column("Legacy P50", justify="right")
+    table.add_column("Legacy P95", justify="right")
+    table.add_column("V14 P50", justify="right")
+    table.add_column("V14 P95", justify="right")
+    table.add_column("Speedup", justify="right", style="bold")
+    for r in results:
+        speedup = r["legacy_p50"] / r["current_p50"] if r["current_p50"] else float("inf")
+        table.add_row(
+            f"{r['rows']:,}",
+            r["query"],
+            f"{r['legacy_p50']:.2f}",
+            f"{r['legacy_p95']:.2f}",
+            f"{r['current_p50']:.2f}",
+            f"{r['current_p95']:.2f}",
+            f"{speedup:.1f}x",
+        )
+    console.print(table)
+
+    plans = Table(title="Query plans")
+    plans.add_column("Query")
+    plans.add_column("Legacy plan")
+    plans.add_column("V14 plan")
+    seen = set()
+    for r in results:
+        if r["query"] in seen:
+            continue
+        seen.add(r["query"])
+        plans.add_row(r["query"], r["legacy_plan"], r["current_plan"])
+    console.print(plans)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Metadata browse/filter query benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Corpus sizes (rows) to benchmark",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help="Timed iterations per query",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results: list[dict] = []
+    for rows in args.sizes:
+        results.extend(run_size(rows, args.repeat))
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
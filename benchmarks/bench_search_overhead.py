@@ -0,0 +1,256 @@
+"""Per-search overhead benchmark: native client.aio path vs executor hops.
+
+Both variants answer from a fake genai client that returns a canned
+grounding response (and rerank scores) instantly, so network time is
+excluded and only local overhead is measured: request building, citation
+extraction, SQLite enrichment, rerank parsing and task scheduling.
+
+- ``executor``: the pre-async pipeline -- sync ``generate_content`` in
+  ``run_in_executor`` behind ``make_retrying_observable``, then
+  enrichment and rerank each as a further executor hop through
+  ``rx.from_future`` / ``subscribe_awaitable``.
+- ``aio``: ``SearchService.search(hybrid=False)`` on ``client.aio``.
+
+Also reports how long a superseded search keeps running after it is
+cancelled (the fake request takes --cancel-ms to "complete").
+
+Usage:
+    uv run python benchmarks/bench_search_overhead.py
+    uv run python benchmarks/bench_search_overhead.py --chunks 20 --repeat 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+
+# Add project src to path for objlib import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import rx
+from google.genai import types
+from rich.console import Console
+from rich.table import Table
+
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.search.citations import enrich_citations, extract_citations
+from objlib.search.client import GeminiSearchClient
+from objlib.search.models import RankedPassage, RankedResults
+from objlib.search.reranker import rerank_passages
+from objlib.services import SearchService
+from objlib.services.pool import close_all_pools, get_pool
+from objlib.upload._operators import make_retrying_observable, subscribe_awaitable
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_CHUNKS = 20
+DEFAULT_REPEAT = 200
+DEFAULT_CANCEL_MS = 300
+STORE = "fileSearchStores/bench"
+
+console = Console()
+
+
+def build_responses(chunks: int) -> tuple[types.GenerateContentResponse, types.GenerateContentResponse]:
+    search = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text="Answer text.")]),
+                grounding_metadata=types.GroundingMetadata(
+                    grounding_chunks=[
+                        types.GroundingChunk(
+                            retrieved_context=types.GroundingChunkRetrievedContext(
+                                title=f"Lesson {i:03d}.txt",
+                                text=f"Passage {i} about concepts and measurement omission.",
+                            )
+                        )
+                        for i in range(chunks)
+                    ],
+                    grounding_supports=[
+                        types.GroundingSupport(grounding_chunk_indices=[i], confidence_scores=[0.8])
+                        for i in range(chunks)
+                    ],
+                ),
+            )
+        ]
+    )
+    ranked = RankedResults(
+        rankings=[RankedPassage(passage_index=i, score=10 - i % 10, reason="-") for i in range(chunks)]
+    )
+    rerank = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text=ranked.model_dump_json())])
+            )
+        ]
+    )
+    return search, rerank
+
+
+class FakeClient:
+    """Answers instantly (or after ``delay``) from canned responses, sync and aio."""
+
+    def __init__(self, search, rerank, delay: float = 0.0) -> None:
+        self._search, self._rerank, self._delay = search, rerank, delay
+        self.models = SimpleNamespace(generate_content=self._sync)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._async))
+        self.threads_busy = 0
+        self._lock = threading.Lock()
+
+    def _pick(self, config):
+        return self._rerank if config.response_schema is not None else self._search
+
+    def _sync(self, model, contents, config):
+        with self._lock:
+            self.threads_busy += 1
+        try:
+            time.sleep(self._delay)
+            return self._pick(config)
+        finally:
+            with self._lock:
+                self.threads_busy -= 1
+
+    async def _async(self, model, contents, config):
+        await asyncio.sleep(self._delay)
+        return self._pick(config)
+
+
+async def executor_search(client, search_client, db_path: str, query: str) -> list:
+    """The pre-async SearchService pipeline, kept verbatim for comparison."""
+    loop = asyncio.get_event_loop()
+
+    async def _attempt():
+        return await loop.run_in_executor(None, lambda: search_client.query(query, top_k=20))
+
+    response = await subscribe_awaitable(make_retrying_observable(_attempt, max_retries=2, base_delay=0.5))
+    citations = extract_citations(response.candidates[0].grounding_metadata)
+
+    def _enrich():
+        with get_pool(db_path).read() as db:
+            return enrich_citations(citations, db, client)
+
+    citations = await subscribe_awaitable(
+        rx.from_future(asyncio.ensure_future(loop.run_in_executor(None, _enrich)))
+    )
+    return await subscribe_awaitable(
+        rx.from_future(
+            asyncio.ensure_future(loop.run_in_executor(None, rerank_passages, client, query, citations))
+        )
+    )
+
+
+async def aio_search(svc: SearchService, query: str) -> list:
+    result = await svc.search(query, expand=False, hybrid=False, mode="research")
+    return result.citations
+
+
+async def time_variant(fn, repeat: int) -> list[float]:
+    await fn()  # warm up pools / executor threads
+    samples = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        await fn()
+        samples.append((perf_counter() - t0) * 1000)
+    return samples
+
+
+async def cancel_lag(fn, client: FakeClient) -> float:
+    """Seconds a worker thread stays busy after the search is cancelled."""
+    task = asyncio.ensure_future(fn())
+    await asyncio.sleep(0.02)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    t0 = perf_counter()
+    while client.threads_busy:
+        await asyncio.sleep(0.005)
+    return (perf_counter() - t0) * 1000
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def run(chunks: int, repeat: int, cancel_ms: int) -> tuple[dict, dict]:
+    search_resp, rerank_resp = build_responses(chunks)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        with Database(db_path) as db:
+            for i in range(chunks):
+                name = f"Lesson {i:03d}.txt"
+                db.upsert_file(FileRecord(file_path=f"/lib/{name}", content_hash=str(i),
+                                          filename=name, file_size=1))
+
+        client = FakeClient(search_resp, rerank_resp)
+        search_client = GeminiSearchClient(client, STORE)
+        svc = SearchService(api_key="unused", store_resource_name=STORE, db_path=db_path)
+        svc._client, svc._search_client = client, search_client
+
+        timings = {
+            "executor": await time_variant(
+                lambda: executor_search(client, search_client, db_path, "concepts"), repeat),
+            "aio": await time_variant(lambda: aio_search(svc, "concepts"), repeat),
+        }
+
+        slow = FakeClient(search_resp, rerank_resp, delay=cancel_ms / 1000)
+        slow_search = GeminiSearchClient(slow, STORE)
+        svc._client, svc._search_client = slow, slow_search
+        lags = {
+            "executor": await cancel_lag(
+                lambda: executor_search(slow, slow_search, db_path, "concepts"), slow),
+            "aio": await cancel_lag(lambda: aio_search(svc, "concepts"), slow),
+        }
+        close_all_pools()
+    return timings, lags
+
+
+def print_results(timings: dict, lags: dict, chunks: int) -> None:
+    table = Table(title=f"Per-search overhead, {chunks} grounding chunks (network excluded)")
+    table.add_column("Pipeline", style="bold")
+    table.add_column("P50 ms", justify="right")
+    table.add_column("P95 ms", justify="right")
+    table.add_column("Thread busy after cancel ms", justify="right")
+    for name, samples in timings.items():
+        table.add_row(
+            name,
+            f"{percentile(samples, 50):.3f}",
+            f"{percentile(samples, 95):.3f}",
+            f"{lags[name]:.0f}",
+        )
+    console.print(table)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Search pipeline overhead benchmark")
+    parser.add_argument("--chunks", type=int, default=DEFAULT_CHUNKS, help="Grounding chunks per response")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed searches per pipeline")
+    parser.add_argument(
+        "--cancel-ms", type=int, default=DEFAULT_CANCEL_MS,
+        help="Simulated request latency for the cancellation check",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    timings, lags = asyncio.run(run(args.chunks, args.repeat, args.cancel_ms))
+    print_results(timings, lags, args.chunks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Wall-clock benchmark: batch-barrier upload loop vs the pipelined scheduler.
+
+Simulates an enriched upload of N files against fake upload and poll
+calls with heavy-tailed latencies (a few files are 10x slower) and a
+fraction of first-attempt import failures. All delays are scaled by
+--scale so the run takes seconds; reported times are converted back to
+real-world seconds.
+
+- ``batched``: the pre-pipeline ``_process_enriched_batch`` structure --
+  upload the whole batch (bounded, 1 s stagger per task), wait for all,
+  poll all, then a 30 s cooldown and a sequential retry pass per batch.
+- ``pipelined``: ``UploadPipeline`` with the same concurrency limits,
+  1 s launch spacing and a per-file (non-blocking) 30 s retry cooldown.
+
+Usage:
+    uv run python benchmarks/bench_upload_pipeline.py
+    uv run python benchmarks/bench_upload_pipeline.py --files 1749 --scale 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+# Add project src to path for objlib import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rich.console import Console
+from rich.table import Table
+
+from objlib.upload.pipeline import UploadPipeline
+
+# ---------------------------------------------------------------------------
+# Constants (real-world seconds; multiplied by --scale when simulated)
+# ---------------------------------------------------------------------------
+
+DEFAULT_FILES = 1749
+DEFAULT_SCALE = 0.002
+BATCH_SIZE = 150
+UPLOAD_CONCURRENCY = 7
+POLL_CONCURRENCY = 20
+STAGGER = 1.0
+COOLDOWN = 30.0
+UPLOAD_MEDIAN = 4.0
+POLL_MEDIAN = 20.0
+SLOW_FRACTION = 0.02
+FAIL_FRACTION = 0.03
+
+console = Console()
+
+
+class FakeApi:
+    """Deterministic per-file latencies and first-attempt failures."""
+
+    def __init__(self, files: int, scale: float, seed: int = 7) -> None:
+        rng = random.Random(seed)
+        self.scale = scale
+        self.upload_s = {}
+        self.poll_s = {}
+        self.fails_first = set()
+        for i in range(files):
+            slow = 10.0 if rng.random() < SLOW_FRACTION else 1.0
+            self.upload_s[i] = UPLOAD_MEDIAN * rng.lognormvariate(0, 0.5) * slow
+            self.poll_s[i] = POLL_MEDIAN * rng.lognormvariate(0, 0.5) * slow
+            if rng.random() < FAIL_FRACTION:
+                self.fails_first.add(i)
+        self.attempts: dict[int, int] = {}
+
+    async def upload(self, i: int) -> int:
+        self.attempts[i] = self.attempts.get(i, 0) + 1
+        await asyncio.sleep(self.upload_s[i] * self.scale)
+        return i
+
+    async def poll(self, i: int) -> bool:
+        await asyncio.sleep(self.poll_s[i] * self.scale)
+        return not (i in self.fails_first and self.attempts[i] == 1)
+
+
+async def batched(api: FakeApi, files: list[int]) -> int:
+    """The batch-barrier loop: upload all, poll all, cooldown, retry."""
+    ok = 0
+    for start in range(0, len(files), BATCH_SIZE):
+        batch = files[start : start + BATCH_SIZE]
+        up_sem = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+        poll_sem = asyncio.Semaphore(POLL_CONCURRENCY)
+
+        async def _upload(idx: int, i: int) -> int:
+            async with up_sem:
+                if idx > 0:
+                    await asyncio.sleep(STAGGER * api.scale)
+                return await api.upload(i)
+
+        async def _poll(i: int) -> bool:
+            async with poll_sem:
+                return await api.poll(i)
+
+        ops = await asyncio.gather(*(_upload(n, i) for n, i in enumerate(batch)))
+        results = await asyncio.gather(*(_poll(i) for i in ops))
+        failed = [i for i, r in zip(ops, results) if not r]
+        ok += sum(results)
+        if failed:
+            await asyncio.sleep(COOLDOWN * api.scale)
+            retry_ops = [await api.upload(i) for i in failed]
+            ok += sum(await asyncio.gather(*(_poll(i) for i in retry_ops)))
+    return ok
+
+
+async def pipelined(api: FakeApi, files: list[int]) -> int:
+    async def _retry(i: int) -> int:
+        return i
+
+    pipeline = UploadPipeline(
+        api.upload, api.poll,
+        upload_concurrency=UPLOAD_CONCURRENCY,
+        poll_concurrency=POLL_CONCURRENCY,
+        launch_interval=STAGGER * api.scale,
+        retry=_retry,
+        retry_delay=COOLDOWN * api.scale,
+    )
+    stats = await pipeline.run(files)
+    return stats.poll.completed
+
+
+async def run(files: int, scale: float) -> dict[str, tuple[float, int]]:
+    results = {}
+    for name, fn in (("batched", batched), ("pipelined", pipelined)):
+        api = FakeApi(files, scale)
+        t0 = perf_counter()
+        ok = await fn(api, list(range(files)))
+        results[name] = ((perf_counter() - t0) / scale, ok)
+    return results
+
+
+def print_results(results: dict[str, tuple[float, int]], files: int) -> None:
+    table = Table(title=f"Simulated enriched upload of {files} files (real-world seconds)")
+    table.add_column("Scheduler", style="bold")
+    table.add_column("Wall (min)", justify="right")
+    table.add_column("Indexed", justify="right")
+    table.add_column("Speedup", justify="right")
+    base = results["batched"][0]
+    for name, (wall, ok) in results.items():
+        table.add_row(name, f"{wall / 60:.1f}", str(ok), f"{base / wall:.2f}x")
+    console.print(table)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Upload scheduler wall-clock benchmark")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Files to upload")
+    parser.add_argument(
+        "--scale", type=float, default=DEFAULT_SCALE,
+        help="Simulated seconds per real-world second",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = asyncio.run(run(args.files, args.scale))
+    print_results(results, args.files)
+
+
+if __name__ == "__main__":
+    main()
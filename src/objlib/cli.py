@@ -6,6 +6,7 @@ Provides commands:
   - purge: Remove old LOCAL_DELETE records from the database
   - upload: Upload pending files to Gemini File Search store
   - search: Semantic search across the library via Gemini File Search
+            (--local: offline FTS5 full-text search)
   - view: View detailed info about a document by filename
   - browse: Hierarchical exploration of library structure
   - filter: Metadata-only file queries against SQLite
@@ -28,11 +29,14 @@ from rich.table import Table
 
 from objlib.config import ScannerConfig, load_config
 from objlib.database import Database
+from objlib.hashing import DEFAULT_HASH_WORKERS
 from objlib.metadata import MetadataExtractor
 from objlib.scanner import FileScanner
 
 if TYPE_CHECKING:
     from objlib.models import AppState
+    from objlib.upload.dedup import DedupStats
+    from objlib.upload.pipeline import PipelineStats
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +79,18 @@ def app_callback(
 
     import shutil
 
+    # Local (FTS5 / embedding) search works offline: no API key, no store resolution
+    if "--local" in sys.argv or "--semantic" in sys.argv:
+        from objlib.models import AppState as AppStateClass
+
+        ctx.obj = AppStateClass(
+            gemini_client=None,
+            store_resource_name="",
+            db_path=str(db_path),
+            terminal_width=shutil.get_terminal_size().columns,
+        )
+        return
+
     from google import genai
 
     from objlib.config import get_api_key
@@ -167,6 +183,31 @@ def scan(
         bool,
         typer.Option("--verbose", "-v", help="Show individual file changes"),
     ] = False,
+    rehash: Annotated[
+        bool,
+        typer.Option(
+            "--rehash",
+            help="Ignore stored size/mtime/inode fingerprints and re-hash every file",
+        ),
+    ] = False,
+    hash_workers: Annotated[
+        int,
+        typer.Option("--hash-workers", help="Parallel hashing threads"),
+    ] = DEFAULT_HASH_WORKERS,
+    local_index: Annotated[
+        bool,
+        typer.Option(
+            "--local-index/--no-local-index",
+            help="Refresh the local full-text index for 'search --local' (default: on)",
+        ),
+    ] = True,
+    embeddings: Annotated[
+        bool,
+        typer.Option(
+            "--embeddings",
+            help="Also refresh the passage embedding index for 'search --semantic' (loads sentence-transformers)",
+        ),
+    ] = False,
 ) -> None:
     """Scan a library directory for files, extract metadata, and persist to SQLite."""
     # Build config: from file if it exists, otherwise defaults
@@ -219,7 +260,7 @@ def scan(
     # Run scan
     with Database(config.db_path) as db:
         extractor = MetadataExtractor()
-        scanner = FileScanner(config, db, extractor)
+        scanner = FileScanner(config, db, extractor, hash_workers=hash_workers)
 
         console.print(
             Panel(
@@ -228,7 +269,7 @@ def scan(
             )
         )
 
-        changes = scanner.scan()
+        changes = scanner.scan(force_rehash=rehash)
 
         # Results table
         table = Table(title="Scan Results")
@@ -241,6 +282,30 @@ def scan(
         table.add_row("Unchanged files", f"{len(changes.unchanged)}")
         console.print(table)
 
+        hs = scanner.hash_stats
+        console.print(
+            f"[dim]Hashing: {hs.files_hashed} hashed, {hs.files_skipped} skipped "
+            f"(fingerprint unchanged), {hs.bytes_hashed / (1024 * 1024):.1f} MiB "
+            f"in {hs.elapsed_seconds:.2f}s "
+            f"({hs.bytes_per_second / (1024 * 1024):.1f} MiB/s)[/dim]"
+        )
+
+        if local_index:
+            from objlib.search.local_index import LocalSearchIndex
+
+            ls = LocalSearchIndex(db).refresh()
+            console.print(
+                f"[dim]Local index: {ls.indexed} indexed, {ls.unchanged} unchanged, "
+                f"{ls.removed} removed, {ls.failed} unreadable "
+                f"in {ls.elapsed_seconds:.2f}s[/dim]"
+            )
+
+        if embeddings:
+            from objlib.search.embeddings import EmbeddingIndex
+
+            es = EmbeddingIndex(db).refresh()
+            console.print(f"[dim]Embedding index: {es.summary}[/dim]")
+
         # Verbose: show individual files
         if verbose:
             if changes.new:
@@ -344,6 +409,15 @@ def status(
         console.print(f"\n[bold]Total files:[/bold] {total}")
         console.print(f"[bold]Last scan:[/bold] {last_scan}")
 
+        from objlib.search.cache import read_search_cache_stats
+
+        cache_stats = read_search_cache_stats(db.conn)
+        console.print(
+            f"[bold]Search cache:[/bold] {cache_stats.entries} entries, "
+            f"{cache_stats.hits} hits / {cache_stats.misses} misses "
+            f"({cache_stats.hit_rate:.0%} hit rate)"
+        )
+
 
 @app.command()
 def purge(
@@ -579,6 +653,39 @@ def store_sync(
     asyncio.run(run_sync())
 
 
+def _print_pipeline_stats(stats: PipelineStats | None) -> None:
+    """Print per-stage queue depth and latency percentiles of an upload run."""
+    if stats is None:
+        return
+    from objlib.upload.pipeline import percentile
+
+    table = Table(title=f"Pipeline ({stats.wall_seconds:.0f}s wall)")
+    table.add_column("Stage", style="bold")
+    for col in ("Done", "Failed", "Limit min/max", "Queue p50/max", "Wait p50", "p50", "p95",
+                "p99"):
+        table.add_column(col, justify="right")
+    for stage in (stats.upload, stats.poll):
+        lat = stage.latencies
+        low, high = stage.limit_range
+        table.add_row(
+            stage.name,
+            str(stage.completed),
+            str(stage.failed),
+            f"{low}/{high}",
+            f"{percentile(stage.depths, 50):.0f}/{stage.max_depth}",
+            f"{percentile(stage.waits, 50):.1f}s",
+            f"{percentile(lat, 50):.1f}s",
+            f"{percentile(lat, 95):.1f}s",
+            f"{percentile(lat, 99):.1f}s",
+        )
+    console.print(table)
+    if stats.retried or stats.not_started:
+        console.print(
+            f"[dim]Retried {stats.retried} ({stats.retry_succeeded} recovered), "
+            f"{stats.not_started} not started[/dim]"
+        )
+
+
 @app.command()
 def upload(
     store_name: Annotated[
@@ -595,8 +702,17 @@ def upload(
     ] = 150,
     max_concurrent: Annotated[
         int,
-        typer.Option("--concurrency", "-n", help="Max concurrent uploads (3-10)"),
+        typer.Option("--concurrency", "-n", help="Concurrent uploads (starting value with --adaptive)"),
     ] = 7,
+    adaptive: Annotated[
+        bool,
+        typer.Option("--adaptive/--fixed-concurrency",
+                     help="Grow/shrink concurrency from 429s, errors and quota headers"),
+    ] = True,
+    target_error_rate: Annotated[
+        float,
+        typer.Option("--target-error-rate", help="Highest API error rate that still grows concurrency"),
+    ] = 0.02,
     dry_run: Annotated[
         bool,
         typer.Option("--dry-run", help="Show what would be uploaded without uploading"),
@@ -703,6 +819,8 @@ def upload(
         store_name=store_name,
         api_key=api_key,
         max_concurrent_uploads=max_concurrent,
+        adaptive_concurrency=adaptive,
+        target_error_rate=target_error_rate,
         batch_size=batch_size,
         db_path=str(db_path),
     )
@@ -740,7 +858,7 @@ def upload(
         total_files=pending_count, total_batches=total_batches
     )
 
-    async def _run_upload() -> dict[str, int]:
+    async def _run_upload() -> tuple[dict[str, int], PipelineStats | None]:
         async with AsyncUploadStateManager(str(db_path)) as state:
             orchestrator = UploadOrchestrator(
                 client=client,
@@ -749,9 +867,10 @@ def upload(
                 config=config,
                 progress=progress,
             )
-            return await orchestrator.run(store_name)
+            result = await orchestrator.run(store_name)
+            return result, orchestrator.pipeline_stats
 
-    result = asyncio.run(_run_upload())
+    result, pipeline_stats = asyncio.run(_run_upload())
 
     # Print final summary
     summary_table = Table(title="Upload Summary")
@@ -765,6 +884,7 @@ def upload(
     summary_table.add_row("Pending", str(result["pending"]))
 
     console.print(Panel(summary_table, title="Upload Complete"))
+    _print_pipeline_stats(pipeline_stats)
 
 
 @app.command("enriched-upload")
@@ -783,8 +903,17 @@ def enriched_upload(
     ] = 100,
     max_concurrent: Annotated[
         int,
-        typer.Option("--concurrency", "-n", help="Max concurrent uploads (default 2)"),
+        typer.Option("--concurrency", "-n", help="Concurrent uploads (starting value with --adaptive)"),
     ] = 2,
+    adaptive: Annotated[
+        bool,
+        typer.Option("--adaptive/--fixed-concurrency",
+                     help="Grow/shrink concurrency from 429s, errors and quota headers"),
+    ] = True,
+    target_error_rate: Annotated[
+        float,
+        typer.Option("--target-error-rate", help="Highest API error rate that still grows concurrency"),
+    ] = 0.02,
     dry_run: Annotated[
         bool,
         typer.Option("--dry-run", help="Show what would be uploaded without uploading"),
@@ -921,6 +1050,8 @@ def enriched_upload(
         store_name=store_name,
         api_key=api_key,
         max_concurrent_uploads=max_concurrent,
+        adaptive_concurrency=adaptive,
+        target_error_rate=target_error_rate,
         batch_size=batch_size,
         db_path=str(db_path),
         rate_limit_tier="tier1",
@@ -981,7 +1112,7 @@ def enriched_upload(
         total_files=total_count, total_batches=total_batches
     )
 
-    async def _run_enriched_upload() -> dict[str, int]:
+    async def _run_enriched_upload() -> tuple[dict[str, int], PipelineStats | None]:
         async with AsyncUploadStateManager(str(db_path)) as state:
             orchestrator = EnrichedUploadOrchestrator(
                 client=client,
@@ -993,9 +1124,10 @@ def enriched_upload(
                 include_needs_review=include_needs_review,
                 file_limit=limit,
             )
-            return await orchestrator.run_enriched(store_name)
+            result = await orchestrator.run_enriched(store_name)
+            return result, orchestrator.pipeline_stats
 
-    result = asyncio.run(_run_enriched_upload())
+    result, pipeline_stats = asyncio.run(_run_enriched_upload())
 
     # Print final summary
     summary_table = Table(title="Enriched Upload Summary")
@@ -1012,6 +1144,7 @@ def enriched_upload(
     summary_table.add_row("Pending", str(result["pending"]))
 
     console.print(Panel(summary_table, title="Enriched Upload Complete"))
+    _print_pipeline_stats(pipeline_stats)
 
 
 @app.command("fsm-upload")
@@ -1030,8 +1163,17 @@ def fsm_upload(
     ] = 10,
     max_concurrent: Annotated[
         int,
-        typer.Option("--concurrency", "-n", help="Max concurrent uploads (default 2)"),
+        typer.Option("--concurrency", "-n", help="Concurrent uploads (starting value with --adaptive)"),
     ] = 2,
+    adaptive: Annotated[
+        bool,
+        typer.Option("--adaptive/--fixed-concurrency",
+                     help="Grow/shrink concurrency from 429s, errors and quota headers"),
+    ] = True,
+    target_error_rate: Annotated[
+        float,
+        typer.Option("--target-error-rate", help="Highest API error rate that still grows concurrency"),
+    ] = 0.02,
     limit: Annotated[
         int,
         typer.Option("--limit", "-l", help="Max files to upload (0 = all untracked). Default: 50."),
@@ -1040,6 +1182,15 @@ def fsm_upload(
         bool,
         typer.Option("--reset-existing/--no-reset-existing", help="Reset and re-upload already-indexed files"),
     ] = False,
+    bulk_recovery: Annotated[
+        bool,
+        typer.Option("--bulk-recovery/--per-file-recovery",
+                     help="Startup recovery from one store listing in one transaction"),
+    ] = True,
+    dedup: Annotated[
+        bool,
+        typer.Option("--dedup/--no-dedup", help="Upload identical payloads once and share the document"),
+    ] = True,
 ) -> None:
     """Upload files to Gemini File Search using FSM-mediated state transitions.
 
@@ -1097,9 +1248,13 @@ def fsm_upload(
         store_name=store_name,
         api_key=api_key,
         max_concurrent_uploads=max_concurrent,
+        adaptive_concurrency=adaptive,
+        target_error_rate=target_error_rate,
         batch_size=batch_size,
         db_path=str(db_path),
         rate_limit_tier="tier1",
+        bulk_recovery=bulk_recovery,
+        dedup_uploads=dedup,
     )
 
     # Reset FAILED files to UNTRACKED before counting pending files
@@ -1159,7 +1314,7 @@ def fsm_upload(
         rate_limiter=rate_limiter,
     )
 
-    async def _run_fsm_upload() -> dict[str, int]:
+    async def _run_fsm_upload() -> tuple[dict[str, int], PipelineStats | None, DedupStats | None]:
         async with AsyncUploadStateManager(str(db_path)) as state:
             orchestrator = FSMUploadOrchestrator(
                 client=client,
@@ -1169,9 +1324,10 @@ def fsm_upload(
                 reset_existing=reset_existing,
                 file_limit=limit,
             )
-            return await orchestrator.run_fsm(store_name)
+            result = await orchestrator.run_fsm(store_name)
+            return result, orchestrator.pipeline_stats, orchestrator.dedup_stats
 
-    result = asyncio.run(_run_fsm_upload())
+    result, pipeline_stats, dedup_stats = asyncio.run(_run_fsm_upload())
 
     # Print final summary
     summary_table = Table(title="FSM Upload Summary")
@@ -1185,9 +1341,14 @@ def fsm_upload(
     summary_table.add_row("Reset (re-uploaded)", f"[cyan]{result['reset']}[/cyan]")
     if result.get("retried", 0) > 0:
         summary_table.add_row("Retried (successful)", f"[magenta]{result['retried']}[/magenta]")
+    if result.get("deduplicated", 0) > 0:
+        summary_table.add_row("Deduplicated (shared)", f"[cyan]{result['deduplicated']}[/cyan]")
     summary_table.add_row("Pending", str(result["pending"]))
 
     console.print(Panel(summary_table, title="FSM Upload Complete"))
+    _print_pipeline_stats(pipeline_stats)
+    if dedup_stats is not None:
+        console.print(f"[dim]Dedup: {dedup_stats.summary()}[/dim]")
 
 
 @app.command()
@@ -1228,6 +1389,15 @@ def sync(
         bool,
         typer.Option("--cleanup-orphans", help="Remove orphaned Gemini entries"),
     ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", min=1,
+                     help="New/modified files synced concurrently (each file stays upload-first)"),
+    ] = 4,
+    dedup: Annotated[
+        bool,
+        typer.Option("--dedup/--no-dedup", help="Upload identical new files once and share the document"),
+    ] = True,
 ) -> None:
     """Incremental sync: detect changes, upload new/modified, mark missing.
 
@@ -1245,6 +1415,7 @@ def sync(
       objlib sync --force                          # Re-process all files
       objlib sync --skip-enrichment                # Simple metadata only
       objlib sync --prune-missing                  # Clean up old missing files
+      objlib sync --jobs 1                         # One file at a time
     """
     import asyncio
 
@@ -1294,6 +1465,7 @@ def sync(
 
     # Create Gemini client only when needed (dry-run doesn't call API)
     client = None
+    circuit_breaker = None
     if not dry_run:
         circuit_breaker = RollingWindowCircuitBreaker()
         rate_limiter_config = RateLimiterConfig(tier="tier1")
@@ -1316,6 +1488,9 @@ def sync(
             api_key=api_key,
             console=console,
             store_name=store_name,
+            jobs=jobs,
+            circuit_breaker=circuit_breaker,
+            dedup=dedup,
         )
         return await orchestrator.run(
             force=force,
@@ -1343,6 +1518,56 @@ def sync(
         )
 
 
+def _search_local(
+    state: AppState,
+    query: str,
+    filters: list[str] | None,
+    limit: int,
+    mode: str,
+    top_k: int,
+    semantic: bool = False,
+) -> None:
+    """Run ``search --local`` (BM25 full text) or ``--semantic`` (embeddings) offline."""
+    import time
+
+    from objlib.search.formatter import display_search_results
+    from objlib.search.local_index import LocalSearchIndex, filters_from_args
+    from objlib.search.reranker import apply_difficulty_ordering
+
+    console.print(f"[dim]Local search for:[/dim] [bold]{query}[/bold]")
+    with Database(state.db_path) as db:
+        if semantic:
+            from objlib.search.embeddings import EmbeddingIndex
+
+            index = EmbeddingIndex(db)
+            empty = index.passage_count() == 0
+            build_hint, label = "objlib scan --embeddings", "cosine"
+        else:
+            index = LocalSearchIndex(db)
+            empty = index.document_count() == 0
+            build_hint, label = "objlib scan", "BM25"
+        if empty:
+            console.print(
+                f"[yellow]Local index is empty -- run '{build_hint}' to build it.[/yellow]"
+            )
+            raise typer.Exit(code=1)
+        start = time.perf_counter()
+        try:
+            citations = index.search(query, limit=top_k, filters=filters_from_args(filters))
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    citations = apply_difficulty_ordering(citations, mode=mode)
+    display_search_results(
+        f"{len(citations)} local matches in {elapsed_ms:.1f} ms ({label}, offline)",
+        citations,
+        state.terminal_width,
+        limit=limit,
+    )
+
+
 @app.command()
 def search(
     ctx: typer.Context,
@@ -1382,6 +1607,27 @@ def search(
     debug: Annotated[
         bool, typer.Option("--debug", help="Write debug log to ~/.objlib/debug.log")
     ] = False,
+    local: Annotated[
+        bool,
+        typer.Option(
+            "--local",
+            help='Offline full-text search of the local transcript index ("quoted" = exact phrase)',
+        ),
+    ] = False,
+    semantic: Annotated[
+        bool,
+        typer.Option(
+            "--semantic",
+            help="Offline semantic search of the local passage embedding index",
+        ),
+    ] = False,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help="Reuse cached Gemini results for identical queries (default: on)",
+        ),
+    ] = True,
 ) -> None:
     """Search the library by meaning with optional metadata filters."""
     import asyncio
@@ -1413,6 +1659,10 @@ def search(
         fh.setLevel(_logging.DEBUG)
         _logging.getLogger("objlib").addHandler(fh)
 
+    if local or semantic:
+        _search_local(state, query, filter, limit, mode, top_k, semantic=semantic)
+        return
+
     # --- Stage 1: Query Expansion ---
     display_query = query
     search_query = query
@@ -1432,7 +1682,14 @@ def search(
         console.print(f"[dim]Filter:[/dim] {metadata_filter}")
 
     # --- Stage 2: Gemini File Search ---
-    search_client = GeminiSearchClient(state.gemini_client, state.store_resource_name)
+    result_cache = None
+    if cache:
+        from objlib.search.cache import SearchResultCache
+
+        result_cache = SearchResultCache(state.db_path)
+    search_client = GeminiSearchClient(
+        state.gemini_client, state.store_resource_name, cache=result_cache
+    )
     try:
         response = asyncio.run(search_client.query_with_retry(
             search_query, metadata_filter=metadata_filter, top_k=top_k, model=model
@@ -1467,8 +1724,15 @@ def search(
     # --- Stage 4: Reranking ---
     if rerank and len(citations) > 1:
         try:
+            from objlib.search.cache import RerankCache
             from objlib.search.reranker import rerank_passages
-            reranked = rerank_passages(state.gemini_client, display_query, citations)
+            reranked = rerank_passages(
+                state.gemini_client,
+                display_query,
+                citations,
+                cache=RerankCache(state.db_path) if cache else None,
+                local_fallback=True,
+            )
             if reranked is not None:
                 citations = reranked
         except Exception:
@@ -1668,7 +1932,11 @@ def view(
             console.print(f"[red]Failed to resolve store '{store}':[/red] {e}")
             raise typer.Exit(code=1)
 
-        search_client = GeminiSearchClient(client, resource_name)
+        from objlib.search.cache import SearchResultCache
+
+        search_client = GeminiSearchClient(
+            client, resource_name, cache=SearchResultCache(db_path)
+        )
 
         # Read a brief excerpt from the file for the similarity query
         excerpt = ""
@@ -2589,6 +2857,21 @@ def extract_production(
         bool,
         typer.Option("--dry-run", help="Show file count and cost estimate without processing"),
     ] = False,
+    max_concurrent: Annotated[
+        int,
+        typer.Option(
+            "--max-concurrent", "-c", min=1,
+            help="Ceiling for concurrent API requests (adjusted adaptively below it)",
+        ),
+    ] = 16,
+    reuse_cached: Annotated[
+        bool,
+        typer.Option(
+            "--reuse-cached/--force",
+            help="Serve validated outputs cached for identical content, prompt and config "
+            "(--force re-sends every file and refreshes the cache)",
+        ),
+    ] = True,
 ) -> None:
     """Run Wave 2 production extraction on remaining unknown files.
 
@@ -2598,6 +2881,8 @@ def extract_production(
 
     Use --dry-run to preview file count and estimated cost.
     Use --resume to continue after credit exhaustion.
+    Use --max-concurrent to cap API requests in flight (default 16).
+    Use --force to ignore cached outputs and re-send every file.
     Use --set-pending to mark extracted files for re-upload with enriched metadata.
     """
     import asyncio
@@ -2636,7 +2921,10 @@ def extract_production(
     with Database(db_path) as db:
         # Get pending extraction files
         checkpoint = CheckpointManager()
-        config = ExtractionConfig()
+        config = ExtractionConfig(
+            max_concurrent=min(ExtractionConfig.max_concurrent, max_concurrent),
+            concurrency_ceiling=max_concurrent,
+        )
         client = MistralClient(api_key=api_key)
         orchestrator = ExtractionOrchestrator(
             client=client, db=db, checkpoint=checkpoint, config=config
@@ -2678,7 +2966,7 @@ def extract_production(
 
         start_time = time_mod.monotonic()
         summary = asyncio.run(
-            orchestrator.run_production(pending_files, strategy_name)
+            orchestrator.run_production(pending_files, strategy_name, reuse_cached=reuse_cached)
         )
         elapsed = time_mod.monotonic() - start_time
 
@@ -2693,6 +2981,16 @@ def extract_production(
         summary_table.add_row("Total Tokens", f"{summary.get('total_tokens', 0):,}")
         summary_table.add_row("Estimated Cost", f"${summary.get('estimated_cost', 0):.2f}")
         summary_table.add_row("Avg Latency", f"{summary.get('avg_latency_ms', 0):,.0f} ms")
+        throughput = summary.get("throughput", {})
+        summary_table.add_row("Files / min", f"{throughput.get('files_per_minute', 0):,.1f}")
+        summary_table.add_row("Tokens / s", f"{throughput.get('tokens_per_second', 0):,.1f}")
+        summary_table.add_row("API Concurrency", str(throughput.get("api_concurrency", "-")))
+        summary_table.add_row("Write Batches", str(throughput.get("write_batches", 0)))
+        cache_stats = summary.get("cache", {})
+        if cache_stats.get("hits"):
+            summary_table.add_row("Served From Cache", str(cache_stats["hits"]))
+            summary_table.add_row("Tokens Avoided", f"{cache_stats['tokens_avoided']:,}")
+            summary_table.add_row("Cost Avoided", f"${cache_stats['cost_avoided']:.2f}")
         summary_table.add_row("Time Elapsed", f"{elapsed:.1f}s")
 
         console.print(summary_table)
@@ -2905,18 +3203,43 @@ def batch_extract_metadata(
         int,
         typer.Option("--poll", "-p", help="Seconds between status checks"),
     ] = 30,
+    shards: Annotated[
+        int,
+        typer.Option(
+            "--shards",
+            "-s",
+            min=1,
+            help="Split pending files into this many batch jobs of similar token size",
+        ),
+    ] = 4,
+    resume: Annotated[
+        str | None,
+        typer.Option(
+            "--resume",
+            help="Finish an earlier batch job by ID: apply its results from the last committed line",
+        ),
+    ] = None,
     db_path: Annotated[
         Path,
         typer.Option("--db", "-d", help="Path to SQLite database"),
     ] = Path("data/library.db"),
+    reuse_cached: Annotated[
+        bool,
+        typer.Option(
+            "--reuse-cached/--force",
+            help="Serve validated outputs cached for identical content, prompt and config "
+            "(--force re-sends every file and refreshes the cache)",
+        ),
+    ] = True,
 ) -> None:
     """Extract metadata using Mistral Batch API (50% cost savings, no rate limits).
 
     Uses Mistral's async Batch API for bulk extraction:
     - 50% lower cost than synchronous extraction
     - Zero rate limiting issues (perfect for 116-1,093 pending files)
-    - Submits all requests as one batch job
-    - Polls for completion (typically 20-60 minutes)
+    - Splits requests into --shards jobs of similar token size, submitted together
+    - Polls all jobs on one schedule (typically 20-60 minutes)
+    - Applies each job's results as soon as it finishes; resubmits a failed job once
     - Updates database with results
     - Tracks failed requests for retry
 
@@ -2929,6 +3252,12 @@ def batch_extract_metadata(
 
         # Custom job name
         objlib metadata batch-extract --name "unknown-files-batch-1"
+
+        # Finish a job whose run was interrupted (results resume where they stopped)
+        objlib metadata batch-extract --resume <batch-id>
+
+        # Re-send files even when a cached output exists
+        objlib metadata batch-extract --force
     """
     import asyncio
 
@@ -2958,7 +3287,7 @@ def batch_extract_metadata(
 
     console.print("[bold]Mistral Batch API Extraction[/bold]")
     console.print(f"[dim]Database: {db_path}[/dim]")
-    console.print(f"[dim]Poll interval: {poll_interval}s[/dim]\n")
+    console.print(f"[dim]Poll interval: {poll_interval}s, shards: {shards}[/dim]\n")
 
     with Database(db_path) as db:
         client = MistralBatchClient(api_key=api_key)
@@ -2966,6 +3295,7 @@ def batch_extract_metadata(
             db=db,
             client=client,
             strategy_name="minimalist",  # Use winning Wave 1 strategy
+            reuse_cached=reuse_cached,
         )
 
         # Run batch extraction
@@ -2973,13 +3303,19 @@ def batch_extract_metadata(
 
         try:
             print("DEBUG: About to call asyncio.run()", flush=True)
-            summary = asyncio.run(
-                orchestrator.run_batch_extraction(
-                    max_files=max_files,
-                    job_name=job_name,
-                    poll_interval=poll_interval,
+            if resume:
+                summary = asyncio.run(
+                    orchestrator.resume_batch_extraction(resume, poll_interval=poll_interval)
+                )
+            else:
+                summary = asyncio.run(
+                    orchestrator.run_batch_extraction(
+                        max_files=max_files,
+                        job_name=job_name,
+                        poll_interval=poll_interval,
+                        shards=shards,
+                    )
                 )
-            )
         except KeyboardInterrupt:
             console.print("\n[yellow]Interrupted by user[/yellow]")
             raise typer.Exit(code=130)
@@ -2998,6 +3334,13 @@ def batch_extract_metadata(
     result_table.add_row("Total Files", str(summary["total"]))
     result_table.add_row("Succeeded", f"[green]{summary['succeeded']}[/green]")
     result_table.add_row("Failed", f"[red]{summary['failed']}[/red]")
+    if summary.get("resumed_lines"):
+        result_table.add_row("Resumed (already applied)", str(summary["resumed_lines"]))
+    cache_stats = summary.get("cache") or {}
+    if cache_stats.get("hits"):
+        result_table.add_row("Served From Cache", str(cache_stats["hits"]))
+        result_table.add_row("Tokens Avoided", f"{cache_stats['tokens_avoided']:,}")
+        result_table.add_row("Cost Avoided", f"${cache_stats['cost_avoided']:.2f}")
     result_table.add_row(
         "Processing Time",
         f"{summary['processing_time_seconds']:.1f}s ({summary['processing_time_seconds']/60:.1f}m)",
@@ -3005,6 +3348,26 @@ def batch_extract_metadata(
 
     console.print(result_table)
 
+    shard_rows = summary.get("shards") or []
+    if len(shard_rows) > 1 or any(row["error"] for row in shard_rows):
+        shard_table = Table(title="Shards")
+        shard_table.add_column("#", justify="right")
+        shard_table.add_column("Batch ID(s)")
+        shard_table.add_column("Requests", justify="right")
+        shard_table.add_column("~Tokens", justify="right")
+        shard_table.add_column("Status")
+        shard_table.add_column("Error", style="dim")
+        for number, row in enumerate(shard_rows, 1):
+            shard_table.add_row(
+                str(number),
+                ", ".join(row["batch_ids"]) or "—",
+                str(row["requests"]),
+                f"{row['estimated_tokens']:,}",
+                row["status"],
+                row["error"] or "",
+            )
+        console.print(shard_table)
+
     if summary["failed_files"]:
         console.print(f"\n[yellow]⚠ {len(summary['failed_files'])} files failed:[/yellow]")
         for file_path in summary["failed_files"][:10]:  # Show first 10
@@ -10,6 +10,7 @@ import logging
 import sqlite3
 from pathlib import Path
 
+from objlib.hashing import FileFingerprint
 from objlib.models import FileRecord, MetadataQuality
 
 logger = logging.getLogger(__name__)
@@ -71,7 +72,30 @@ CREATE TABLE IF NOT EXISTS files (
     version INTEGER NOT NULL DEFAULT 0,
     intent_type TEXT,
     intent_started_at TEXT,
-    intent_api_calls_completed INTEGER
+    intent_api_calls_completed INTEGER,
+
+    -- Scan fingerprint (V13)
+    inode INTEGER,
+
+    -- Hot metadata_json fields as virtual generated columns (V14).
+    -- No declared type: values keep json_extract() typing, so comparisons
+    -- and ordering match the original json_extract() expressions exactly.
+    meta_category GENERATED ALWAYS AS (json_extract(metadata_json, '$.category')) VIRTUAL,
+    meta_course GENERATED ALWAYS AS (json_extract(metadata_json, '$.course')) VIRTUAL,
+    meta_year GENERATED ALWAYS AS (json_extract(metadata_json, '$.year')) VIRTUAL,
+    meta_quarter GENERATED ALWAYS AS (json_extract(metadata_json, '$.quarter')) VIRTUAL,
+    meta_week GENERATED ALWAYS AS (json_extract(metadata_json, '$.week')) VIRTUAL,
+    meta_difficulty GENERATED ALWAYS AS (json_extract(metadata_json, '$.difficulty')) VIRTUAL,
+    meta_lesson_number GENERATED ALWAYS AS (json_extract(metadata_json, '$.lesson_number')) VIRTUAL,
+
+    -- Citation resolution key (V15): text before the first '-' of
+    -- gemini_store_doc_id, NULL when there is none. Derived, so every FSM
+    -- transition that sets or clears gemini_store_doc_id keeps it in sync.
+    gemini_store_doc_prefix GENERATED ALWAYS AS (
+        CASE WHEN INSTR(gemini_store_doc_id, '-') > 1
+             THEN SUBSTR(gemini_store_doc_id, 1, INSTR(gemini_store_doc_id, '-') - 1)
+        END
+    ) VIRTUAL
 );
 
 -- Indexes
@@ -641,15 +665,321 @@ CREATE TRIGGER update_files_timestamp
     END;
 """
 
+# V14: metadata_json fields promoted to virtual generated columns.
+# Maps filter/browse field name -> generated column name.
+METADATA_COLUMNS = {
+    "category": "meta_category",
+    "course": "meta_course",
+    "year": "meta_year",
+    "quarter": "meta_quarter",
+    "week": "meta_week",
+    "difficulty": "meta_difficulty",
+    "lesson_number": "meta_lesson_number",
+}
+
+MIGRATION_V14_INDEXES_SQL = """
+-- V14: indexes over the generated metadata columns (browse + filter paths)
+CREATE INDEX IF NOT EXISTS idx_meta_category_course ON files(meta_category, meta_course);
+CREATE INDEX IF NOT EXISTS idx_meta_category_filename ON files(meta_category, filename);
+CREATE INDEX IF NOT EXISTS idx_meta_course_order
+    ON files(meta_course, meta_lesson_number, meta_year, meta_quarter, meta_week, filename);
+CREATE INDEX IF NOT EXISTS idx_meta_year_int ON files(CAST(meta_year AS INTEGER));
+CREATE INDEX IF NOT EXISTS idx_meta_difficulty ON files(meta_difficulty);
+"""
+
+
+METADATA_FILTER_FIELDS = {"category", "course", "difficulty", "quarter", "date", "year", "week", "quality_score"}
+METADATA_NUMERIC_FIELDS = {"year", "week", "quality_score"}
+
+
+def metadata_filter_clauses(filters: dict[str, str]) -> tuple[list[str], list]:
+    """Build SQL WHERE clauses for metadata field filters on ``files``.
+
+    Values may carry a comparison prefix (>=, <=, >, <); without one the
+    filter is an exact match. Fields with a V14 generated column use it
+    (index-friendly); other fields fall back to json_extract().
+
+    Args:
+        filters: Dict of {field_name: value_or_comparison}.
+
+    Returns:
+        Tuple of (list of SQL condition strings, list of bound parameters).
+
+    Raises:
+        ValueError: If an unknown filter field is provided.
+    """
+    where_parts: list[str] = []
+    params: list = []
+
+    for field, value in filters.items():
+        if field not in METADATA_FILTER_FIELDS:
+            raise ValueError(
+                f"Unknown filter field: {field}. Valid: {', '.join(sorted(METADATA_FILTER_FIELDS))}"
+            )
+
+        # Generated columns (V14) avoid per-row JSON parsing and can use
+        # the idx_meta_* indexes; other fields fall back to json_extract.
+        column = METADATA_COLUMNS.get(field)
+        if column is not None:
+            expr, expr_params = column, []
+        else:
+            expr, expr_params = "json_extract(metadata_json, ?)", [f"$.{field}"]
+        num_expr = f"CAST({expr} AS INTEGER)"
+        is_numeric = field in METADATA_NUMERIC_FIELDS
+
+        # Check for comparison operators
+        op = next((o for o in (">=", "<=", ">", "<") if value.startswith(o)), None)
+        if op is not None:
+            operand = value[len(op):]
+            if is_numeric:
+                where_parts.append(f"{num_expr} {op} ?")
+                params.extend([*expr_params, int(operand)])
+            else:
+                where_parts.append(f"{expr} {op} ?")
+                params.extend([*expr_params, operand])
+        else:
+            # Exact match (try numeric for year/week/quality_score)
+            try:
+                numeric_val = int(value)
+                where_parts.append(f"{num_expr if is_numeric else expr} = ?")
+                params.extend([*expr_params, numeric_val])
+            except ValueError:
+                where_parts.append(f"{expr} = ?")
+                params.extend([*expr_params, value])
+
+    return where_parts, params
+
+# V15: citation resolution. enrich_citations() matches Gemini titles against
+# filename, store doc prefix and gemini_file_id -- index all three keys.
+STORE_DOC_PREFIX_EXPR = (
+    "CASE WHEN INSTR(gemini_store_doc_id, '-') > 1 "
+    "THEN SUBSTR(gemini_store_doc_id, 1, INSTR(gemini_store_doc_id, '-') - 1) END"
+)
+
+MIGRATION_V15_INDEXES_SQL = """
+-- V15: citation resolver lookup keys
+CREATE INDEX IF NOT EXISTS idx_store_doc_prefix ON files(gemini_store_doc_prefix);
+CREATE INDEX IF NOT EXISTS idx_gemini_file_id ON files(gemini_file_id);
+CREATE INDEX IF NOT EXISTS idx_filename ON files(filename);
+"""
+
+MIGRATION_V16_SQL = """
+-- V16: local full-text index over transcript text (offline search tier).
+-- transcript_index records which content_hash each document was built
+-- from; its doc_id is the rowid of the matching transcript_fts row.
+CREATE TABLE IF NOT EXISTS transcript_index (
+    doc_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL,
+    char_count INTEGER NOT NULL DEFAULT 0,
+    indexed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    filename,
+    content,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+MIGRATION_V17_SQL = """
+-- V17: id map for the on-disk passage embedding matrix (search/embeddings.py).
+-- row_id is the row in the float16 matrix named by library_config
+-- 'embedding_matrix'; spans are character offsets into the transcript.
+CREATE TABLE IF NOT EXISTS embedding_passages (
+    row_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    char_start INTEGER NOT NULL,
+    char_end INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_passages_file ON embedding_passages(file_path);
+"""
+
+MIGRATION_V18_SQL = """
+-- V18: persistent Gemini File Search result cache (search/cache.py).
+-- Entries are keyed by a hash of (query, metadata_filter, top_k, model,
+-- store) and are only valid for the indexed_generation they were written at.
+CREATE TABLE IF NOT EXISTS search_cache (
+    cache_key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    store_name TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache(last_used_at);
+
+INSERT OR IGNORE INTO library_config (key, value) VALUES ('indexed_generation', '0');
+INSERT OR IGNORE INTO library_config (key, value) VALUES ('search_cache_hits', '0');
+INSERT OR IGNORE INTO library_config (key, value) VALUES ('search_cache_misses', '0');
+
+-- Any change to the set of indexed store documents bumps the generation,
+-- whichever code path (FSM, recovery, reset) performs the write.
+CREATE TRIGGER IF NOT EXISTS bump_indexed_generation_on_update
+AFTER UPDATE OF gemini_state, gemini_store_doc_id ON files
+WHEN (OLD.gemini_state = 'indexed') <> (NEW.gemini_state = 'indexed')
+  OR (NEW.gemini_state = 'indexed' AND OLD.gemini_store_doc_id IS NOT NEW.gemini_store_doc_id)
+BEGIN
+    UPDATE library_config SET value = CAST(value AS INTEGER) + 1
+    WHERE key = 'indexed_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS bump_indexed_generation_on_insert
+AFTER INSERT ON files WHEN NEW.gemini_state = 'indexed'
+BEGIN
+    UPDATE library_config SET value = CAST(value AS INTEGER) + 1
+    WHERE key = 'indexed_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS bump_indexed_generation_on_delete
+AFTER DELETE ON files WHEN OLD.gemini_state = 'indexed'
+BEGIN
+    UPDATE library_config SET value = CAST(value AS INTEGER) + 1
+    WHERE key = 'indexed_generation';
+END;
+"""
+
+MIGRATION_V19_SQL = """
+-- V19: rerank score cache (search/cache.py RerankCache). Scores are keyed
+-- by normalized query + passage content hash, so they survive re-uploads.
+CREATE TABLE IF NOT EXISTS rerank_cache (
+    query_key TEXT NOT NULL,
+    passage_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (query_key, passage_hash, model)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_rerank_cache_created ON rerank_cache(created_at);
+"""
+
+MIGRATION_V20_SQL = """
+-- V20: materialized File Search store listing (upload/store_index.py).
+-- file_id is the document display_name without 'files/' (the Gemini file
+-- ID at import time); doc_id is the suffix kept in files.gemini_store_doc_id.
+CREATE TABLE IF NOT EXISTS store_documents (
+    document_name TEXT PRIMARY KEY,
+    store_name TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    display_name TEXT,
+    file_id TEXT,
+    state TEXT,
+    listed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_store_documents_file ON store_documents(store_name, file_id);
+CREATE INDEX IF NOT EXISTS idx_store_documents_doc ON store_documents(store_name, doc_id);
+"""
+
+MIGRATION_V21_SQL = """
+-- V21: upload preparation cache (upload/preparation.py). One row per file:
+-- the identity header, [AI Analysis] header and custom metadata built from
+-- inputs whose SHA-256 is input_hash; a different hash means rebuild.
+CREATE TABLE IF NOT EXISTS upload_prep_cache (
+    file_path TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    identity_header TEXT NOT NULL,
+    ai_header TEXT,
+    custom_metadata_json TEXT NOT NULL,
+    upload_hash TEXT NOT NULL,
+    aspect_count INTEGER NOT NULL,
+    built_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+MIGRATION_V22_SQL = """
+-- V22: content-addressed upload dedup (upload/dedup.py). One row per file
+-- planned for upload: payload_key is a SHA-256 of what is sent. A file
+-- that uploads its own copy is its own canonical_path; an alias names the
+-- file whose store document it shares.
+CREATE TABLE IF NOT EXISTS upload_payloads (
+    file_path TEXT PRIMARY KEY,
+    payload_key TEXT NOT NULL,
+    canonical_path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload_bytes INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_upload_payloads_key ON upload_payloads(payload_key);
+CREATE INDEX IF NOT EXISTS idx_upload_payloads_canonical ON upload_payloads(canonical_path);
+
+-- Aliases that still share a live document: the canonical file is indexed
+-- under the same key and neither file's content changed since recording.
+CREATE VIEW IF NOT EXISTS shared_upload_aliases AS
+SELECT a.file_path AS alias_path, a.canonical_path AS canonical_path, a.payload_key
+FROM upload_payloads a
+JOIN upload_payloads c
+  ON c.file_path = a.canonical_path AND c.canonical_path = c.file_path
+ AND c.payload_key = a.payload_key
+JOIN files cf
+  ON cf.file_path = c.file_path AND cf.gemini_state = 'indexed'
+ AND cf.content_hash = c.content_hash
+JOIN files af
+  ON af.file_path = a.file_path AND af.content_hash = a.content_hash AND NOT af.is_deleted
+WHERE a.canonical_path <> a.file_path;
+"""
+
+MIGRATION_V23_SQL = """
+-- V23: resumable Mistral batch extraction (extraction/batch_orchestrator.py).
+-- A submitted job records its custom_id -> file_path map; applied_lines and
+-- last_custom_id are the cursor into the job's output file, advanced in the
+-- same transaction as each chunk of results written to file_metadata_ai.
+CREATE TABLE IF NOT EXISTS extraction_batch_jobs (
+    batch_id TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    request_count INTEGER NOT NULL,
+    submitted_at REAL NOT NULL,
+    applied_lines INTEGER NOT NULL DEFAULT 0,
+    last_custom_id TEXT,
+    succeeded INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    completed_at REAL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS extraction_batch_requests (
+    batch_id TEXT NOT NULL,
+    custom_id TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    PRIMARY KEY (batch_id, custom_id)
+) WITHOUT ROWID;
+"""
+
+MIGRATION_V24_SQL = """
+-- V24: extraction result cache (extraction/cache.py). Validated Mistral
+-- outputs keyed by transcript content hash plus everything else that shapes
+-- the request, so duplicate transcripts and re-runs after a reset are served
+-- without an API call. A prompt, config or model change is a different key.
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_hash TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    metadata_json TEXT NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, strategy, prompt_hash, config_hash, model)
+) WITHOUT ROWID;
+"""
+
 UPSERT_SQL = """
 INSERT INTO files(file_path, content_hash, filename, file_size,
-                  metadata_json, metadata_quality)
-VALUES (?, ?, ?, ?, ?, ?)
+                  metadata_json, metadata_quality, mtime, inode)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
 ON CONFLICT(file_path) DO UPDATE SET
     content_hash = excluded.content_hash,
     file_size = excluded.file_size,
     metadata_json = excluded.metadata_json,
-    metadata_quality = excluded.metadata_quality
+    metadata_quality = excluded.metadata_quality,
+    mtime = COALESCE(excluded.mtime, files.mtime),
+    inode = COALESCE(excluded.inode, files.inode)
 """
 
 
@@ -665,13 +995,44 @@ class Database:
             counts = db.get_status_counts()
     """
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        read_only: bool = False,
+        check_same_thread: bool = True,
+    ) -> None:
+        """Open a connection to the library database.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            read_only: Open with ``mode=ro`` and ``query_only`` set. Skips
+                schema setup -- the schema must already exist (see
+                :mod:`objlib.services.pool`, which runs it once via the writer).
+            check_same_thread: Passed through to ``sqlite3.connect``. Pooled
+                connections set this to False because executor threads vary
+                between checkouts (one thread uses a connection at a time).
+        """
         self.db_path = str(db_path)
+        self.read_only = read_only
+
+        if read_only:
+            self.conn = sqlite3.connect(
+                f"{Path(db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
+                autocommit=sqlite3.LEGACY_TRANSACTION_CONTROL,
+                check_same_thread=check_same_thread,
+            )
+            self.conn.row_factory = sqlite3.Row
+            self._setup_pragmas()
+            return
+
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         self.conn = sqlite3.connect(
             self.db_path,
             autocommit=sqlite3.LEGACY_TRANSACTION_CONTROL,
+            check_same_thread=check_same_thread,
         )
         self.conn.row_factory = sqlite3.Row
         self._setup_pragmas()
@@ -679,6 +1040,14 @@ class Database:
 
     def _setup_pragmas(self) -> None:
         """Configure SQLite pragmas for performance and reliability."""
+        if getattr(self, "read_only", False):
+            # journal_mode is persistent in the file; readers only need
+            # per-connection cache settings plus a hard write guard.
+            self.conn.execute("PRAGMA query_only=ON")
+            self.conn.execute("PRAGMA cache_size=-10000")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            return
+
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA synchronous=NORMAL")
         self.conn.execute("PRAGMA cache_size=-10000")
@@ -705,6 +1074,18 @@ class Database:
         - v10: OCC version, intent_type, intent_started_at, intent_api_calls_completed columns (Phase 10)
         - v11: Drop legacy status column, add is_deleted, CHECK on gemini_state (Phase 13)
         - v12: CRAD tables: series_genus, file_discrimination_phrases (Phase 16.6)
+        - v13: inode column for the incremental scan fingerprint (size, mtime, inode)
+        - v14: Virtual generated columns for hot metadata_json fields + indexes
+        - v15: gemini_store_doc_prefix generated column + citation resolver indexes
+        - v16: transcript_index + transcript_fts (FTS5) for local search
+        - v17: embedding_passages id map for the passage embedding matrix
+        - v18: search_cache table + indexed_generation triggers and hit/miss counters
+        - v19: rerank_cache table (rerank scores per query, passage hash and model)
+        - v20: store_documents table mapping file IDs to store document names
+        - v21: upload_prep_cache table (prepared headers + metadata by input hash)
+        - v22: upload_payloads + shared_upload_aliases tables for upload dedup
+        - v23: extraction_batch_jobs + extraction_batch_requests for resumable batches
+        - v24: extraction_cache table (validated outputs by content + request hash)
         """
         self.conn.executescript(SCHEMA_SQL)
 
@@ -806,7 +1187,74 @@ class Database:
             # V12: CRAD tables (Phase 16.6 — Corpus-Relative Aspect Differentiation)
             self.conn.executescript(MIGRATION_V12_SQL)
 
-        self.conn.execute("PRAGMA user_version = 12")
+        if version < 13:
+            # V13: inode completes the (size, mtime, inode) scan fingerprint
+            try:
+                self.conn.execute("ALTER TABLE files ADD COLUMN inode INTEGER")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+
+        if version < 14:
+            # V14: ADD COLUMN only supports VIRTUAL generated columns, which
+            # is what we want -- no table rewrite, values live in the indexes.
+            for field, column in METADATA_COLUMNS.items():
+                try:
+                    self.conn.execute(
+                        f"ALTER TABLE files ADD COLUMN {column} GENERATED ALWAYS AS "
+                        f"(json_extract(metadata_json, '$.{field}')) VIRTUAL"
+                    )
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+            self.conn.executescript(MIGRATION_V14_INDEXES_SQL)
+
+        if version < 15:
+            # V15: store doc prefix used by citation resolution
+            try:
+                self.conn.execute(
+                    "ALTER TABLE files ADD COLUMN gemini_store_doc_prefix GENERATED ALWAYS AS "
+                    f"({STORE_DOC_PREFIX_EXPR}) VIRTUAL"
+                )
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            self.conn.executescript(MIGRATION_V15_INDEXES_SQL)
+
+        if version < 16:
+            # V16: FTS5 transcript index (local/offline search tier)
+            self.conn.executescript(MIGRATION_V16_SQL)
+
+        if version < 17:
+            # V17: passage embedding id map (local semantic search)
+            self.conn.executescript(MIGRATION_V17_SQL)
+
+        if version < 18:
+            # V18: Gemini search result cache + indexed-generation triggers
+            self.conn.executescript(MIGRATION_V18_SQL)
+
+        if version < 19:
+            # V19: rerank score cache
+            self.conn.executescript(MIGRATION_V19_SQL)
+
+        if version < 20:
+            # V20: store document index (file ID -> store document name)
+            self.conn.executescript(MIGRATION_V20_SQL)
+
+        if version < 21:
+            # V21: upload preparation cache (headers + custom metadata)
+            self.conn.executescript(MIGRATION_V21_SQL)
+
+        if version < 22:
+            # V22: content-addressed upload dedup (payload keys + aliases)
+            self.conn.executescript(MIGRATION_V22_SQL)
+
+        if version < 23:
+            # V23: resumable batch extraction (request map + apply cursor)
+            self.conn.executescript(MIGRATION_V23_SQL)
+
+        if version < 24:
+            # V24: extraction result cache (content hash + prompt/config key)
+            self.conn.executescript(MIGRATION_V24_SQL)
+
+        self.conn.execute("PRAGMA user_version = 24")
 
     def upsert_file(self, record: FileRecord) -> None:
         """Insert or update a single file record.
@@ -828,6 +1276,8 @@ class Database:
                     record.file_size,
                     record.metadata_json,
                     record.metadata_quality.value,
+                    record.mtime,
+                    record.inode,
                 ),
             )
 
@@ -848,6 +1298,8 @@ class Database:
                         r.file_size,
                         r.metadata_json,
                         r.metadata_quality.value,
+                        r.mtime,
+                        r.inode,
                     )
                     for r in records
                 ],
@@ -864,6 +1316,45 @@ class Database:
         ).fetchall()
         return {row["file_path"]: (row["content_hash"], row["file_size"]) for row in rows}
 
+    def get_file_fingerprints(self) -> dict[str, FileFingerprint]:
+        """Return stored scan fingerprints for all non-deleted files.
+
+        Used by the HashEngine to skip re-hashing files whose size, mtime
+        and inode are unchanged since the last scan or sync.
+
+        Returns:
+            Dict mapping file_path -> FileFingerprint.
+        """
+        rows = self.conn.execute(
+            "SELECT file_path, content_hash, file_size, mtime, inode FROM files "
+            "WHERE NOT is_deleted"
+        ).fetchall()
+        return {
+            row["file_path"]: FileFingerprint(
+                content_hash=row["content_hash"],
+                file_size=row["file_size"],
+                mtime=row["mtime"],
+                inode=row["inode"],
+            )
+            for row in rows
+        }
+
+    def update_file_fingerprints(
+        self, fingerprints: list[tuple[str, float, int]]
+    ) -> None:
+        """Batch-update mtime and inode for files whose content is unchanged.
+
+        Args:
+            fingerprints: List of (file_path, mtime, inode) tuples.
+        """
+        if not fingerprints:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE files SET mtime = ?, inode = ? WHERE file_path = ?",
+                [(mtime, inode, path) for path, mtime, inode in fingerprints],
+            )
+
     def mark_deleted(self, file_paths: set[str]) -> None:
         """Mark files as locally deleted.
 
@@ -884,13 +1375,22 @@ class Database:
     def get_status_counts(self) -> dict[str, int]:
         """Return count of files grouped by gemini_state.
 
+        Live dedup aliases (``shared_upload_aliases``) are counted as
+        ``shared`` rather than under their own (normally untracked) state:
+        they are served by their canonical file's document.
+
         Returns:
             Dictionary mapping gemini_state string to count.
         """
         rows = self.conn.execute(
-            "SELECT gemini_state, COUNT(*) as cnt FROM files GROUP BY gemini_state"
+            """SELECT CASE WHEN s.alias_path IS NULL THEN f.gemini_state
+                           ELSE 'shared' END AS state,
+                      COUNT(*) as cnt
+               FROM files f
+               LEFT JOIN shared_upload_aliases s ON s.alias_path = f.file_path
+               GROUP BY state"""
         ).fetchall()
-        return {row["gemini_state"]: row["cnt"] for row in rows}
+        return {row["state"]: row["cnt"] for row in rows}
 
     def get_quality_counts(self) -> dict[str, int]:
         """Return count of files grouped by metadata quality.
@@ -1029,8 +1529,8 @@ class Database:
         gemini_file_id=NULL) because gemini_store_doc_id is never NULL
         for indexed files.
 
-        Uses SUBSTR-based exact-match extraction (no LIKE):
-          SUBSTR(gemini_store_doc_id, 1, INSTR(gemini_store_doc_id, '-') - 1)
+        Matches the indexed ``gemini_store_doc_prefix`` generated column
+        (V15), i.e. the text before the first ``-`` of gemini_store_doc_id.
 
         Args:
             prefixes: List of 12-character store doc ID prefix strings.
@@ -1042,9 +1542,9 @@ class Database:
             return {}
         placeholders = ",".join("?" * len(prefixes))
         rows = self.conn.execute(
-            f"SELECT SUBSTR(gemini_store_doc_id, 1, INSTR(gemini_store_doc_id, '-') - 1) as prefix, "
+            f"SELECT gemini_store_doc_prefix as prefix, "
             f"filename, file_path, metadata_json FROM files "
-            f"WHERE SUBSTR(gemini_store_doc_id, 1, INSTR(gemini_store_doc_id, '-') - 1) IN ({placeholders})",
+            f"WHERE gemini_store_doc_prefix IN ({placeholders})",
             prefixes,
         ).fetchall()
 
@@ -1060,6 +1560,101 @@ class Database:
             }
         return result
 
+    def resolve_citation_titles(self, titles: list[str]) -> dict[str, dict]:
+        """Resolve Gemini citation titles to local files in one query.
+
+        Combines the three lookups used by ``enrich_citations`` -- filename,
+        store doc prefix, Gemini file ID -- into a single UNION ALL round
+        trip over indexed columns. When a title matches more than one way,
+        the earlier strategy wins (filename, then prefix, then file ID),
+        matching the original sequential passes.
+
+        Args:
+            titles: Citation titles (filenames, store doc prefixes, or
+                Gemini file IDs with or without the ``files/`` prefix).
+
+        Returns:
+            Dict mapping title -> {"filename": str, "file_path": str,
+            "metadata": dict, "matched_by": str}, where ``matched_by`` is
+            ``"filename"``, ``"store_doc_prefix"`` or ``"gemini_file_id"``.
+            Unresolved titles are omitted.
+        """
+        titles = list(dict.fromkeys(t for t in titles if t))
+        if not titles:
+            return {}
+
+        # Normalized Gemini file ID -> titles that produced it
+        by_file_id: dict[str, list[str]] = {}
+        for title in titles:
+            normalized = title if title.startswith("files/") else f"files/{title}"
+            by_file_id.setdefault(normalized, []).append(title)
+
+        placeholders = ",".join("?" * len(titles))
+        id_placeholders = ",".join("?" * len(by_file_id))
+        rows = self.conn.execute(
+            f"""SELECT 0 AS pass, filename AS match_key, filename, file_path, metadata_json
+                FROM files WHERE filename IN ({placeholders}) AND NOT is_deleted
+                UNION ALL
+                SELECT 1, gemini_store_doc_prefix, filename, file_path, metadata_json
+                FROM files WHERE gemini_store_doc_prefix IN ({placeholders})
+                UNION ALL
+                SELECT 2, gemini_file_id, filename, file_path, metadata_json
+                FROM files WHERE gemini_file_id IN ({id_placeholders})""",
+            [*titles, *titles, *by_file_id],
+        ).fetchall()
+
+        import json
+
+        passes = ("filename", "store_doc_prefix", "gemini_file_id")
+        best: dict[str, tuple[int, sqlite3.Row]] = {}
+        for row in rows:
+            keys = by_file_id[row["match_key"]] if row["pass"] == 2 else [row["match_key"]]
+            for title in keys:
+                current = best.get(title)
+                # Lower pass wins; within a pass the last row wins, like the dict
+                # assignment in the per-strategy lookups.
+                if current is None or row["pass"] <= current[0]:
+                    best[title] = (row["pass"], row)
+
+        result = {}
+        for title, (pass_no, row) in best.items():
+            result[title] = {
+                "filename": row["filename"],
+                "file_path": row["file_path"],
+                "metadata": json.loads(row["metadata_json"]) if row["metadata_json"] else {},
+                "matched_by": passes[pass_no],
+            }
+        return result
+
+    def get_shared_paths(self, file_paths: list[str]) -> dict[str, list[str]]:
+        """Return the live dedup aliases of each canonical file.
+
+        A canonical file's store document also stands for every alias in
+        the ``shared_upload_aliases`` view (identical payloads uploaded
+        once, see ``upload/dedup.py``).
+
+        Args:
+            file_paths: Canonical file paths (e.g. resolved citation paths).
+
+        Returns:
+            Dict mapping canonical path -> sorted alias paths. Paths without
+            live aliases are omitted.
+        """
+        paths = list(dict.fromkeys(p for p in file_paths if p))
+        if not paths:
+            return {}
+        placeholders = ",".join("?" * len(paths))
+        rows = self.conn.execute(
+            f"""SELECT canonical_path, alias_path FROM shared_upload_aliases
+                WHERE canonical_path IN ({placeholders})
+                ORDER BY canonical_path, alias_path""",
+            paths,
+        ).fetchall()
+        shared: dict[str, list[str]] = {}
+        for row in rows:
+            shared.setdefault(row["canonical_path"], []).append(row["alias_path"])
+        return shared
+
     def get_canonical_gemini_file_id_suffixes(self) -> set[str]:
         """Return the bare file ID suffixes for all canonical uploaded files.
 
@@ -1137,7 +1732,8 @@ class Database:
     def get_pending_files(self, limit: int = 200) -> list[sqlite3.Row]:
         """Return files with gemini_state='untracked' for upload processing.
 
-        Filters to .txt files only -- other file types are skipped.
+        Filters to .txt files only -- other file types are skipped, as are
+        live dedup aliases (they share an indexed document).
 
         Args:
             limit: Maximum number of rows to return.
@@ -1148,8 +1744,10 @@ class Database:
         """
         return self.conn.execute(
             """SELECT file_path, content_hash, filename, file_size, metadata_json
-               FROM files
+               FROM files f
                WHERE gemini_state = 'untracked' AND filename LIKE '%.txt'
+                 AND NOT EXISTS (SELECT 1 FROM shared_upload_aliases s
+                                 WHERE s.alias_path = f.file_path)
                ORDER BY file_path
                LIMIT ?""",
             (limit,),
@@ -1175,7 +1773,7 @@ class Database:
             List of (category_name, count) tuples, ordered by count descending.
         """
         rows = self.conn.execute(
-            """SELECT COALESCE(json_extract(metadata_json, '$.category'), 'uncategorized') as category,
+            """SELECT COALESCE(meta_category, 'uncategorized') as category,
                       COUNT(*) as count
                FROM files
                WHERE metadata_json IS NOT NULL AND NOT is_deleted
@@ -1194,13 +1792,13 @@ class Database:
             List of (course_name, count) tuples, ordered by course name.
         """
         rows = self.conn.execute(
-            """SELECT json_extract(metadata_json, '$.course') as course,
+            """SELECT meta_course as course,
                       COUNT(*) as count
                FROM files
-               WHERE json_extract(metadata_json, '$.category') = 'course'
+               WHERE meta_category = 'course'
                  AND NOT is_deleted
-               GROUP BY course
-               ORDER BY course"""
+               GROUP BY meta_course
+               ORDER BY meta_course"""
         ).fetchall()
         return [(row["course"], row["count"]) for row in rows]
 
@@ -1222,7 +1820,7 @@ class Database:
         params: list = [course]
         year_clause = ""
         if year is not None:
-            year_clause = "AND json_extract(metadata_json, '$.year') = ? "
+            year_clause = "AND meta_year = ? "
             try:
                 params.append(int(year))
             except ValueError:
@@ -1230,14 +1828,10 @@ class Database:
 
         sql = f"""
             SELECT filename, file_path, metadata_json FROM files
-            WHERE json_extract(metadata_json, '$.course') = ?
+            WHERE meta_course = ?
               AND NOT is_deleted
               {year_clause}
-            ORDER BY json_extract(metadata_json, '$.lesson_number'),
-                     json_extract(metadata_json, '$.year'),
-                     json_extract(metadata_json, '$.quarter'),
-                     json_extract(metadata_json, '$.week'),
-                     filename
+            ORDER BY meta_lesson_number, meta_year, meta_quarter, meta_week, filename
         """
 
         rows = self.conn.execute(sql, params).fetchall()
@@ -1266,7 +1860,7 @@ class Database:
 
         rows = self.conn.execute(
             """SELECT filename, file_path, metadata_json FROM files
-               WHERE json_extract(metadata_json, '$.category') = ?
+               WHERE meta_category = ?
                  AND NOT is_deleted
                ORDER BY filename""",
             (category,),
@@ -1302,67 +1896,8 @@ class Database:
         """
         import json as json_module
 
-        VALID_FIELDS = {"category", "course", "difficulty", "quarter", "date", "year", "week", "quality_score"}
-        NUMERIC_FIELDS = {"year", "week", "quality_score"}
-
-        where_parts: list[str] = ["NOT is_deleted", "metadata_json IS NOT NULL"]
-        params: list = []
-
-        for field, value in filters.items():
-            if field not in VALID_FIELDS:
-                raise ValueError(f"Unknown filter field: {field}. Valid: {', '.join(sorted(VALID_FIELDS))}")
-
-            json_path = f"$.{field}"
-            is_numeric = field in NUMERIC_FIELDS
-
-            def _coerce_numeric(val: str) -> int | str:
-                """Try to convert to int for proper numeric comparison in SQLite."""
-                try:
-                    return int(val)
-                except ValueError:
-                    return val
-
-            # Check for comparison operators
-            if value.startswith(">="):
-                if is_numeric:
-                    where_parts.append("CAST(json_extract(metadata_json, ?) AS INTEGER) >= ?")
-                    params.extend([json_path, int(value[2:])])
-                else:
-                    where_parts.append("json_extract(metadata_json, ?) >= ?")
-                    params.extend([json_path, value[2:]])
-            elif value.startswith("<="):
-                if is_numeric:
-                    where_parts.append("CAST(json_extract(metadata_json, ?) AS INTEGER) <= ?")
-                    params.extend([json_path, int(value[2:])])
-                else:
-                    where_parts.append("json_extract(metadata_json, ?) <= ?")
-                    params.extend([json_path, value[2:]])
-            elif value.startswith(">"):
-                if is_numeric:
-                    where_parts.append("CAST(json_extract(metadata_json, ?) AS INTEGER) > ?")
-                    params.extend([json_path, int(value[1:])])
-                else:
-                    where_parts.append("json_extract(metadata_json, ?) > ?")
-                    params.extend([json_path, value[1:]])
-            elif value.startswith("<"):
-                if is_numeric:
-                    where_parts.append("CAST(json_extract(metadata_json, ?) AS INTEGER) < ?")
-                    params.extend([json_path, int(value[1:])])
-                else:
-                    where_parts.append("json_extract(metadata_json, ?) < ?")
-                    params.extend([json_path, value[1:]])
-            else:
-                # Exact match (try numeric for year/week/quality_score)
-                try:
-                    numeric_val = int(value)
-                    if is_numeric:
-                        where_parts.append("CAST(json_extract(metadata_json, ?) AS INTEGER) = ?")
-                    else:
-                        where_parts.append("json_extract(metadata_json, ?) = ?")
-                    params.extend([json_path, numeric_val])
-                except ValueError:
-                    where_parts.append("json_extract(metadata_json, ?) = ?")
-                    params.extend([json_path, value])
+        where_parts, params = metadata_filter_clauses(filters)
+        where_parts = ["NOT is_deleted", "metadata_json IS NOT NULL", *where_parts]
 
         where_clause = " AND ".join(where_parts)
         sql = f"""
@@ -1491,7 +2026,7 @@ class Database:
         row = self.conn.execute(
             "SELECT COUNT(*) as cnt FROM files "
             "WHERE filename LIKE '%.txt' "
-            "AND json_extract(metadata_json, '$.category') = 'unknown'"
+            "AND meta_category = 'unknown'"
         ).fetchone()
         total_unknown = row["cnt"] if row else 0
 
@@ -16,12 +16,15 @@ Workflow:
 Usage:
     client = MistralBatchClient(api_key="...")
     batch_id = await client.submit_batch(requests, job_name="wave2-extraction")
+    # or, for requests spooled to disk (see batch_spool.BatchSpool):
+    batch_id = await client.submit_batch_file(spool.path, spool.stats.requests)
 
     # Poll for completion (uses RxPY rx.interval internally)
     final_status = await client.wait_for_completion(batch_id, poll_interval=30)
 
-    # Download results
-    results = await client.download_results(batch_id)
+    # Stream results (download_results() collects them into a list)
+    async for result in client.iter_results(batch_id):
+        ...
 """
 
 from __future__ import annotations
@@ -29,6 +32,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -180,10 +184,60 @@ class MistralBatchClient:
         )
 
         logger.info("Uploaded input file: %s (%d bytes)", input_file.id, len(jsonl_content))
+        return await self._create_job(input_file.id, metadata)
 
-        # Create batch job
+    async def submit_batch_file(
+        self,
+        jsonl_path: Path,
+        request_count: int,
+        job_name: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> str:
+        """Submit a batch job from a JSONL file already on disk.
+
+        The file is uploaded from an open handle, so the requests are never
+        held in memory together (see :class:`~objlib.extraction.batch_spool.BatchSpool`).
+
+        Args:
+            jsonl_path: File with one request per line (``BatchRequest.to_jsonl_line``).
+            request_count: Number of lines, for logging.
+            job_name: Optional descriptive name for the job.
+            metadata: Optional metadata dict (key-value pairs).
+
+        Returns:
+            Batch job ID for polling and retrieval.
+
+        Raises:
+            SDKError: On API errors.
+            ValueError: If the file holds no requests.
+        """
+        if request_count < 1:
+            raise ValueError("Cannot submit empty batch")
+
+        size = jsonl_path.stat().st_size
+        logger.info(
+            "Submitting batch job: %d requests (%d bytes spooled), model=%s, name=%s",
+            request_count,
+            size,
+            self._model,
+            job_name or "unnamed",
+        )
+
+        from mistralai import File
+
+        with open(jsonl_path, "rb") as fh:
+            input_file = await self._client.files.upload_async(
+                file=File(file_name=f"{job_name or 'batch'}.jsonl", content=fh),
+                purpose="batch",
+            )
+
+        logger.info("Uploaded input file: %s (%d bytes)", input_file.id, size)
+        return await self._create_job(input_file.id, metadata)
+
+    async def _create_job(self, input_file_id: str, metadata: dict[str, str] | None) -> str:
+        """Create the batch job for an uploaded input file; return its ID."""
         batch_job = await self._client.batch.jobs.create_async(
-            input_files=[input_file.id],
+            input_files=[input_file_id],
             model=self._model,
             endpoint="/v1/chat/completions",
             timeout_hours=6,  # For ~1.2M token batches; 4-8 hours is plenty
@@ -332,12 +386,42 @@ class MistralBatchClient:
     async def download_results(self, batch_id: str) -> list[BatchResult]:
         """Download and parse results from completed batch job.
 
+        Collects :meth:`iter_results` into a list; prefer iterating for
+        large jobs.
+
         Args:
             batch_id: Batch job ID.
 
         Returns:
             List of BatchResult objects (one per request).
 
+        Raises:
+            SDKError: On API errors.
+            RuntimeError: If job is not complete or has no output file.
+        """
+        results = [result async for result in self.iter_results(batch_id)]
+
+        logger.info(
+            "Downloaded %d results (succeeded=%d, errors=%d)",
+            len(results),
+            sum(1 for r in results if r.response),
+            sum(1 for r in results if r.error),
+        )
+
+        return results
+
+    async def iter_results(self, batch_id: str) -> AsyncIterator[BatchResult]:
+        """Stream results of a completed batch job, one output line at a time.
+
+        The output file is read from the streaming download response, so
+        memory stays at one line regardless of the output size.
+
+        Args:
+            batch_id: Batch job ID.
+
+        Yields:
+            BatchResult objects in output file order.
+
         Raises:
             SDKError: On API errors.
             RuntimeError: If job is not complete or has no output file.
@@ -375,27 +459,14 @@ class MistralBatchClient:
 
         logger.info("Downloading output file: %s", job.output_file)
 
-        # Download output file
+        # Streaming response; structure per line is {custom_id, response: {body: {...}}}
         output_response = await self._client.files.download_async(file_id=job.output_file)
-
-        # Read content from streaming response
-        output_content = await output_response.aread()
-
-        # Parse JSONL results
-        # Note: Response structure is {custom_id, response: {body: {...}}}
-        results = []
-        for line in output_content.decode("utf-8").strip().split("\n"):
-            if line:  # Skip empty lines
-                results.append(BatchResult.from_jsonl_line(line))
-
-        logger.info(
-            "Downloaded %d results (succeeded=%d, errors=%d)",
-            len(results),
-            sum(1 for r in results if r.response),
-            sum(1 for r in results if r.error),
-        )
-
-        return results
+        try:
+            async for line in output_response.aiter_lines():
+                if line.strip():  # Skip empty lines
+                    yield BatchResult.from_jsonl_line(line)
+        finally:
+            await output_response.aclose()
 
     async def cancel_batch(self, batch_id: str) -> None:
         """Cancel a running batch job.
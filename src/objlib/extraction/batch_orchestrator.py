@@ -17,39 +17,106 @@ Advantages:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from objlib.constants import BOOK_SIZE_BYTES
-from objlib.extraction.batch_client import BatchRequest, MistralBatchClient
+from objlib.extraction.batch_client import BatchResult, MistralBatchClient
+from objlib.extraction.batch_spool import (
+    MAX_DOCUMENT_TOKENS,
+    BatchSpool,
+    estimate_token_count,
+    estimate_tokens_from_size,
+    size_token_bound,
+)
+from objlib.extraction.cache import CacheKey, ExtractionCache
 from objlib.extraction.confidence import calculate_confidence
 from objlib.extraction.parser import parse_magistral_response
-from objlib.extraction.prompts import build_system_prompt, build_user_prompt
+from objlib.extraction.prompts import (
+    build_system_prompt,
+    build_user_prompt,
+    hash_prompt_template,
+    production_config_hash,
+)
 from objlib.extraction.validator import validate_extraction
+from objlib.upload.operation_tracker import OperationTracker
 
 if TYPE_CHECKING:
     from objlib.database import Database
 
 logger = logging.getLogger(__name__)
 
-# Token limits for Mistral models
-# Leave headroom for system/user prompts (~8K tokens)
-MAX_DOCUMENT_TOKENS = 100_000  # Mistral has 128K context window
-TOKENS_PER_WORD = 1.3  # Approximation for English text
+APPLY_CHUNK_SIZE = 50  # Results written (and cursor advanced) per transaction
+JOB_TIMEOUT_SECONDS = 7200  # Per batch job
+POLL_INTERVAL_MAX = 120  # Seconds; status poll interval backs off up to this
+BATCH_MODEL = "magistral-medium-latest"  # Model used in batch
+BATCH_COST_PER_REQUEST = 0.01  # Half the synchronous ~$0.02 estimate
 
 
-def _estimate_token_count(text: str) -> int:
-    """Estimate token count for text (words * 1.3 approximation).
+class CursorMismatchError(RuntimeError):
+    """A job's output does not match the apply cursor saved for it."""
 
-    Args:
-        text: Input text string.
 
-    Returns:
-        Estimated token count.
-    """
-    word_count = len(text.split())
-    return int(word_count * TOKENS_PER_WORD)
+class BatchJobFailedError(RuntimeError):
+    """A batch job ended without succeeding (FAILED, CANCELLED or TIMEOUT_EXCEEDED)."""
+
+    def __init__(self, batch_id: str, status: str) -> None:
+        super().__init__(f"Batch job {status.lower()}: {batch_id}")
+        self.batch_id = batch_id
+        self.status = status
+
+
+@dataclass
+class _ResultOutcome:
+    """One evaluated batch result, ready to be written."""
+
+    custom_id: str
+    file_path: str | None
+    metadata: dict | None = None
+    confidence: float = 0.0
+    status: str = "extracted"
+    review_reason: str | None = None
+    error: str | None = None
+    tokens: int = 0
+    cached: bool = False  # Served from the extraction cache (no request)
+
+
+@dataclass
+class _Shard:
+    """One batch job's worth of files and what became of it."""
+
+    index: int
+    entries: list[tuple[str, dict]] = field(default_factory=list)  # (custom_id, file record)
+    estimated_tokens: int = 0
+    file_map: dict[str, str] = field(default_factory=dict)  # Submitted custom_id -> path
+    batch_ids: list[str] = field(default_factory=list)  # One per submission
+    status: str = "pending"  # applied | interrupted | failed | empty
+    error: str | None = None
+    progress: _ApplyProgress | None = None
+
+
+@dataclass
+class _ApplyProgress:
+    """Counters for one pass over a job's output."""
+
+    resumed_lines: int = 0  # Lines applied by an earlier run, skipped
+    lines: int = 0  # Output lines seen, including skipped ones
+    succeeded: int = 0
+    failed_files: list[str] = field(default_factory=list)
+    needs_review_files: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class _SkippedFile:
+    """A file left out of the spool, to be marked in the database."""
+
+    file_path: str
+    kind: str  # book | oversized
+    size: int  # Bytes for a book, estimated tokens for an oversized file
 
 
 class BatchExtractionOrchestrator:
@@ -62,6 +129,11 @@ class BatchExtractionOrchestrator:
         db: Database instance for state management.
         client: MistralBatchClient for API interactions.
         strategy_name: Strategy name for prompt selection (default: "minimalist").
+        spool_dir: Directory for the temporary request spool (default: system temp).
+        apply_chunk_size: Results written per transaction (default: 50).
+        max_resubmits: Times a shard whose job ends FAILED is resubmitted (default: 1).
+        reuse_cached: Apply cached outputs instead of submitting their files;
+            False (``--force``) submits every file and refreshes the cache.
     """
 
     def __init__(
@@ -69,53 +141,83 @@ class BatchExtractionOrchestrator:
         db: "Database",
         client: MistralBatchClient,
         strategy_name: str = "minimalist",
+        spool_dir: Path | None = None,
+        apply_chunk_size: int = APPLY_CHUNK_SIZE,
+        max_resubmits: int = 1,
+        reuse_cached: bool = True,
     ) -> None:
         self._db = db
         self._client = client
         self._strategy_name = strategy_name
+        self._spool_dir = spool_dir
+        self._apply_chunk_size = apply_chunk_size
+        self._max_resubmits = max_resubmits
+        self._poller = OperationTracker(final_errors=(RuntimeError,))
+        self._cache = ExtractionCache(
+            db,
+            CacheKey(
+                strategy=strategy_name,
+                prompt_hash=hash_prompt_template(
+                    build_system_prompt(strategy_name), strategy_name, "full"
+                ),
+                config_hash=production_config_hash(),
+                model=BATCH_MODEL,
+            ),
+            reuse=reuse_cached,
+        )
+        self._cache_progress = _ApplyProgress()
 
     async def run_batch_extraction(
         self,
         max_files: int | None = None,
         job_name: str | None = None,
-        poll_interval: int = 30,
+        poll_interval: float = 30,
+        shards: int = 1,
     ) -> dict:
         """Run complete batch extraction workflow.
 
         Steps:
-        1. Load pending files from database
-        2. Build batch requests with extraction prompts
-        3. Submit batch job
-        4. Poll until completion
-        5. Download and parse results
-        6. Update database with extracted metadata
-        7. Return summary with failed request tracking
+        1. Load pending files from database and apply cached outputs
+           (see :class:`ExtractionCache`) for those that have one
+        2. Split the rest into ``shards`` jobs of similar estimated tokens
+        3. Per shard, concurrently: spool requests to a JSONL file, submit
+           the job, wait for it (one shared poller for all shards), stream
+           its results into the database; resubmit the shard if its job
+           ends FAILED. A job still running after JOB_TIMEOUT_SECONDS is
+           left running and its shard reported for ``--resume``
+        4. Return summary with failed request tracking
+
+        A finished shard is applied while the others are still running, so
+        one slow or failed job no longer holds back the rest.
 
         Args:
             max_files: Maximum files to process (None = all pending).
-            job_name: Descriptive name for batch job.
-            poll_interval: Seconds between status polls (default: 30).
+            job_name: Descriptive name for batch job (shards add ``-<n>``).
+            poll_interval: Initial seconds between status polls (default: 30).
+            shards: Number of batch jobs to split the files into (default: 1).
 
         Returns:
             Summary dict:
             {
-                "batch_id": str,
+                "batch_id": str,  # Comma-separated when there are several jobs
                 "total": int,
                 "succeeded": int,
                 "failed": int,
                 "failed_files": list[str],  # File paths that failed
+                "shards": list[dict],  # Per shard: batch_ids, requests, status, error
+                "cache": dict,  # hits, misses, rejected, stored, tokens/cost avoided
                 "processing_time_seconds": float,
             }
-        """
-        import time
 
+            ``total`` and ``succeeded`` include files served from the cache.
+        """
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
         start_time = time.time()
 
         # Step 1: Load pending files
-        print("DEBUG: Loading pending files...", flush=True)
         logger.info("Loading pending files from database...")
         pending_files = self._get_pending_files(max_files)
-        print(f"DEBUG: Got {len(pending_files)} pending files", flush=True)
 
         if not pending_files:
             logger.warning("No pending files found for batch extraction")
@@ -130,68 +232,35 @@ class BatchExtractionOrchestrator:
 
         logger.info("Found %d pending files for batch extraction", len(pending_files))
 
-        # Step 2: Build batch requests (skip oversized files)
-        print("DEBUG: Building batch requests...", flush=True)
-        logger.info("Building batch requests...")
-        batch_requests = []
-        file_map = {}  # custom_id -> file_path mapping
-        oversized_files = []  # Track files too large for Mistral
-
-        for idx, file_record in enumerate(pending_files):
-            print(f"DEBUG: Processing file {idx+1}/{len(pending_files)}", flush=True)
-            file_path = file_record["file_path"]
-            custom_id = str(idx)  # Use simple numeric ID
-
-            # Book routing: files >= BOOK_SIZE_BYTES are books, skip extraction entirely.
-            # This check runs BEFORE read_text to avoid loading large files into memory.
-            file_size = Path(file_path).stat().st_size
-            if file_size >= BOOK_SIZE_BYTES:
-                logger.info(
-                    "Skipping book file %s (%d bytes >= %d BOOK_SIZE_BYTES)",
-                    Path(file_path).name, file_size, BOOK_SIZE_BYTES,
-                )
-                oversized_files.append(file_path)
-                self._mark_book(file_path, file_size)
-                continue
-
-            # Read file content
-            try:
-                content = Path(file_path).read_text(encoding="utf-8")
-            except Exception as e:
-                logger.error("Failed to read file %s: %s", file_path, e)
-                continue
-
-            # Check if file is too large for Mistral context window
-            estimated_tokens = _estimate_token_count(content)
-            if estimated_tokens > MAX_DOCUMENT_TOKENS:
-                logger.warning(
-                    "Skipping oversized file %s (~%d tokens, max %d)",
-                    Path(file_path).name,
-                    estimated_tokens,
-                    MAX_DOCUMENT_TOKENS,
-                )
-                oversized_files.append(file_path)
-                # Mark as skipped in database (will upload to Gemini without enrichment)
-                self._mark_oversized(file_path, estimated_tokens)
-                continue
+        pending_files = self._apply_cached(pending_files)
+        if not pending_files:
+            logger.info("Every pending file was served from the extraction cache")
+            return self._summarize([], [], start_time)
 
-            # Build prompts using existing extraction logic
-            system_prompt = build_system_prompt(self._strategy_name)
-            user_prompt = build_user_prompt(content, self._strategy_name)
+        # Step 2: Shard by estimated tokens
+        plan = self._plan_shards(pending_files, shards)
+        logger.info(
+            "Planned %d shard(s): %s", len(plan),
+            ", ".join(f"{len(s.entries)} files/~{s.estimated_tokens:,} tokens" for s in plan),
+        )
 
-            # Create batch request
-            request = self._client.build_extraction_request(
-                custom_id=custom_id,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                temperature=1.0,  # Production temperature
-                max_tokens=8000,
+        # Step 3: Run every shard; they share one status poller. A shard that
+        # raises (cursor mismatch) cancels the others rather than leaving them running
+        oversized_files: list[str] = []
+        tasks = [
+            asyncio.create_task(
+                self._run_shard(shard, len(plan), job_name, poll_interval, oversized_files)
             )
+            for shard in plan
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-            batch_requests.append(request)
-            file_map[custom_id] = file_path
-
-        if not batch_requests:
+        if not any(shard.file_map for shard in plan):
             logger.error("No valid batch requests created")
             return {
                 "batch_id": None,
@@ -200,184 +269,569 @@ class BatchExtractionOrchestrator:
                 "failed": len(pending_files) - len(oversized_files),
                 "failed_files": [f["file_path"] for f in pending_files if f["file_path"] not in oversized_files],
                 "oversized_files": oversized_files,
+                "cache": self._cache.stats.report(BATCH_COST_PER_REQUEST),
                 "processing_time_seconds": time.time() - start_time,
             }
 
-        logger.info("Built %d batch requests", len(batch_requests))
+        return self._summarize(plan, oversized_files, start_time)
 
-        # Debug: Log first request structure
-        if batch_requests:
-            import json
-            logger.info("Sample request structure: %s", json.dumps(
-                {
-                    "custom_id": batch_requests[0].custom_id,
-                    "method": batch_requests[0].method,
-                    "url": batch_requests[0].url,
-                    "body_keys": list(batch_requests[0].body.keys()) if batch_requests[0].body else []
-                },
-                indent=2
-            ))
+    async def resume_batch_extraction(self, batch_id: str, poll_interval: float = 30) -> dict:
+        """Finish a batch job submitted by an earlier, interrupted run.
 
-        # Step 3: Submit batch
-        print(f"DEBUG: About to submit {len(batch_requests)} requests...", flush=True)
-        logger.info("Submitting batch job to Mistral...")
-        batch_id = await self._client.submit_batch(
-            requests=batch_requests,
-            job_name=job_name or f"extraction-{len(batch_requests)}",
-            metadata={"strategy": self._strategy_name},
-        )
-        print(f"DEBUG: Batch submitted, ID: {batch_id}", flush=True)
+        Waits for the job if it is still running, then applies its results
+        from the saved cursor: output lines committed before the
+        interruption are skipped, not written twice.
 
-        logger.info("Batch job submitted: %s", batch_id)
+        Args:
+            batch_id: Batch job ID recorded by :meth:`run_batch_extraction`.
+            poll_interval: Initial seconds between status polls (default: 30).
 
-        # Step 4: Poll until completion
-        print(f"DEBUG: Starting to poll (interval={poll_interval}s)...", flush=True)
-        logger.info("Polling for batch completion (interval=%ds)...", poll_interval)
-        try:
-            final_status = await self._client.wait_for_completion(
-                batch_id=batch_id,
-                poll_interval=poll_interval,
-                timeout=7200,  # 2 hours max
-            )
-            print(f"DEBUG: Polling completed, status: {final_status}", flush=True)
+        Returns:
+            Summary dict as for :meth:`run_batch_extraction`, plus
+            ``resumed_lines`` (output lines already applied).
 
-            logger.info(
-                "Batch completed: %d succeeded, %d failed",
-                final_status["succeeded_requests"],
-                final_status["failed_requests"],
-            )
-        except (TimeoutError, RuntimeError) as e:
-            logger.error("Batch job failed: %s", e)
-            return {
-                "batch_id": batch_id,
-                "total": len(batch_requests),
-                "succeeded": 0,
-                "failed": len(batch_requests),
-                "failed_files": list(file_map.values()),
-                "oversized_files": oversized_files,
-                "processing_time_seconds": time.time() - start_time,
-            }
+        Raises:
+            ValueError: If no requests were recorded for ``batch_id``.
+            CursorMismatchError: If the job's output does not match the cursor.
+        """
+        start_time = time.time()
+        file_map = self._load_request_map(batch_id)
+        if not file_map:
+            raise ValueError(f"No recorded requests for batch job {batch_id}")
+        logger.info("Resuming batch job %s (%d requests)", batch_id, len(file_map))
+        shard = _Shard(index=0, file_map=file_map, batch_ids=[batch_id])
+        await self._complete_shard(shard, batch_id, poll_interval)
+        return self._summarize([shard], [], start_time)
+
+    # ------------------------------------------------------------------
+    # Shards
+    # ------------------------------------------------------------------
+
+    def _plan_shards(self, pending_files: list[dict], shards: int) -> list[_Shard]:
+        """Split files into at most ``shards`` shards of similar estimated tokens.
+
+        Largest file first into the lightest shard, with sizes from
+        ``stat`` (no file is read here). Custom IDs are the positions in
+        ``pending_files``, unique across shards.
+        """
+        sized = []
+        for idx, file_record in enumerate(pending_files):
+            try:
+                size = Path(file_record["file_path"]).stat().st_size
+            except OSError:
+                size = 0  # _spool_requests logs and skips it
+            sized.append((estimate_tokens_from_size(size), str(idx), file_record))
+
+        plan = [_Shard(index=i) for i in range(min(shards, len(pending_files)))]
+        for tokens, custom_id, file_record in sorted(sized, key=lambda t: -t[0]):
+            shard = min(plan, key=lambda s: (s.estimated_tokens, len(s.entries)))
+            shard.entries.append((custom_id, file_record))
+            shard.estimated_tokens += tokens
+        for shard in plan:
+            shard.entries.sort(key=lambda entry: int(entry[0]))  # Back to path order
+        return plan
+
+    async def _run_shard(
+        self,
+        shard: _Shard,
+        shard_count: int,
+        job_name: str | None,
+        poll_interval: float,
+        oversized_files: list[str],
+    ) -> None:
+        """Spool, submit, wait for and apply one shard, resubmitting on job failure."""
+        for attempt in range(self._max_resubmits + 1):
+            spool = BatchSpool.create(self._spool_dir)
+            try:
+                # Reading transcripts and writing the spool is blocking I/O;
+                # keep it off the loop so the other shards keep polling
+                skipped = await asyncio.to_thread(self._spool_requests, shard.entries, spool)
+                spool.close()
+                if attempt == 0:
+                    # Books and oversized files are marked once, not per attempt
+                    self._mark_skipped(skipped)
+                    oversized_files.extend(entry.file_path for entry in skipped)
+                    shard.entries = [e for e in shard.entries if e[0] in spool.file_map]
+                request_count = spool.stats.requests
+                if not request_count:
+                    shard.status = "empty"
+                    return
+                shard.file_map = dict(spool.file_map)
+                logger.info(
+                    "Shard %d/%d: built %d batch requests: %s",
+                    shard.index + 1, shard_count, request_count, spool.stats.summary(),
+                )
+
+                name = job_name or f"extraction-{request_count}"
+                if shard_count > 1:
+                    name = f"{name}-{shard.index + 1}"
+                batch_id = await self._client.submit_batch_file(
+                    spool.path,
+                    request_count,
+                    job_name=name,
+                    metadata={
+                        "strategy": self._strategy_name,
+                        "shard": f"{shard.index + 1}/{shard_count}",
+                    },
+                )
+            except Exception as e:
+                shard.error = f"Submission failed: {e}"
+                logger.error("Shard %d/%d: %s", shard.index + 1, shard_count, shard.error)
+                continue
+            finally:
+                spool.remove()
+
+            logger.info("Shard %d/%d: batch job submitted: %s", shard.index + 1, shard_count, batch_id)
+            shard.batch_ids.append(batch_id)
+            self._record_job(batch_id, shard.file_map)
+            if await self._complete_shard(shard, batch_id, poll_interval):
+                return
+            if attempt < self._max_resubmits:
+                logger.warning(
+                    "Shard %d/%d: resubmitting %d requests after: %s",
+                    shard.index + 1, shard_count, request_count, shard.error,
+                )
+        shard.status = "failed"
 
-        # Step 5: Download and parse results
-        logger.info("Downloading batch results...")
-        results = await self._client.download_results(batch_id)
+    async def _complete_shard(self, shard: _Shard, batch_id: str, poll_interval: float) -> bool:
+        """Wait for ``batch_id`` and apply its results.
 
-        # Step 6: Process results and update database
-        logger.info("Processing %d results (submitted %d requests)...", len(results), len(batch_requests))
+        A job still running after JOB_TIMEOUT_SECONDS is left running (it
+        may only be queued behind other work) and the shard is marked
+        interrupted for ``--resume``; only a job that ended FAILED is worth
+        resubmitting.
 
-        # Debug: Check if all requests got results
-        if len(results) != len(batch_requests):
-            logger.warning(
-                "Result count mismatch! Submitted %d requests but received %d results",
-                len(batch_requests),
-                len(results),
-            )
-        succeeded_count = 0
-        failed_files = []
-        needs_review_files: list[tuple[str, str]] = []
-
-        for result in results:
-            file_path = file_map.get(result.custom_id)
-            if not file_path:
-                logger.warning("Unknown custom_id in results: %s", result.custom_id)
-                continue
+        Returns:
+            False if the job ended FAILED (worth resubmitting); True once
+            results were applied, their apply was interrupted or the wait
+            timed out (``--resume`` finishes it), or the job was cancelled
+            or expired server-side.
 
-            if result.error:
-                # Request failed
-                logger.error("Extraction failed for %s: %s", file_path, result.error)
-                failed_files.append(file_path)
-                self._mark_failed(file_path, str(result.error))
-            elif result.response:
-                # Request succeeded, validate and save
-                try:
-                    # Parse response (same structure as sync API)
-                    # Response should have choices[0].message.content with JSON
-                    metadata_dict = self._extract_metadata_from_response(result.response)
-
-                    # Read transcript for confidence calculation and semantic topic selection
-                    transcript_text = Path(file_path).read_text(encoding="utf-8")
-                    transcript_length = len(transcript_text)
-
-                    # Validate extraction (with document text for semantic topic selection)
-                    validation = validate_extraction(
-                        metadata_dict,
-                        document_text=transcript_text,
-                        filename=Path(file_path).name,
-                    )
+        Raises:
+            CursorMismatchError: The output does not match the saved cursor.
+        """
+        try:
+            await self._wait_for_job(batch_id, poll_interval)
+        except TimeoutError as e:
+            shard.status = "interrupted"
+            shard.error = f"{e} (finish with `objlib metadata batch-extract --resume {batch_id}`)"
+            logger.warning("Stopped waiting for batch job %s: %s", batch_id, shard.error)
+            return True
+        except BatchJobFailedError as e:
+            shard.status, shard.error = "failed", str(e)
+            logger.error("Batch job failed: %s", e)
+            return e.status != "FAILED"
 
-                    if not validation.hard_failures:
-                        # Passed validation (extracted or needs_review)
-                        # Calculate confidence score
-                        try:
-                            model_confidence = float(metadata_dict.get("confidence_score", 0))
-                        except (TypeError, ValueError):
-                            model_confidence = 0.0
-
-                        confidence = calculate_confidence(
-                            model_confidence=model_confidence,
-                            validation=validation,
-                            transcript_length=transcript_length,
-                        )
-
-                        # Determine status based on confidence and soft warnings
-                        review_reason: str | None = None
-                        if validation.soft_warnings or confidence < 0.85:
-                            status = "needs_review"
-                            reasons = validation.soft_warnings[:]
-                            if confidence < 0.85:
-                                reasons.append(f"low confidence ({confidence*100:.0f}%)")
-                            review_reason = "; ".join(reasons)
-                        else:
-                            status = "extracted"
-
-                        # Save to database
-                        self._save_extracted_metadata(
-                            file_path,
-                            metadata_dict,
-                            confidence,
-                            status,
-                            review_reason=review_reason,
-                        )
-                        if review_reason:
-                            needs_review_files.append((file_path, review_reason))
-                        succeeded_count += 1
-                        print(f"✓ Saved: {Path(file_path).name} (conf: {confidence*100:.1f}%, status={status})")
-                    else:
-                        # Hard validation failures - reject
-                        logger.warning("Hard validation failures for %s: %s", file_path, validation.hard_failures)
-                        failed_files.append(file_path)
-                        self._mark_failed(file_path, f"Validation failed: {', '.join(validation.hard_failures)}")
-
-                except Exception as e:
-                    logger.error("Failed to process result for %s: %s", file_path, e)
-                    failed_files.append(file_path)
-                    self._mark_failed(file_path, str(e))
-            else:
-                logger.warning("Result for %s has no response or error", file_path)
-                failed_files.append(file_path)
-                self._mark_failed(file_path, "No response or error in result")
+        try:
+            shard.progress = await self._apply_results(batch_id, shard.file_map)
+            shard.status, shard.error = "applied", None
+            if shard.progress.lines != len(shard.file_map):
+                logger.warning(
+                    "Result count mismatch! Submitted %d requests but received %d results",
+                    len(shard.file_map),
+                    shard.progress.lines,
+                )
+        except CursorMismatchError:
+            raise  # Resuming would hit it again
+        except Exception as e:
+            shard.status = "interrupted"
+            shard.error = f"{e} (finish with `objlib metadata batch-extract --resume {batch_id}`)"
+            logger.error("Applying results of %s was interrupted: %s", batch_id, shard.error)
+        return True
+
+    async def _wait_for_job(self, batch_id: str, poll_interval: float) -> dict:
+        """Wait until ``batch_id`` succeeds, on the poller shared by all shards.
+
+        Raises:
+            BatchJobFailedError: If the job failed, was cancelled or timed out
+                server-side.
+            TimeoutError: If it did not finish within JOB_TIMEOUT_SECONDS
+                (the job itself keeps running).
+        """
 
-        processing_time = time.time() - start_time
+        async def _check() -> tuple[bool, dict]:
+            status = await self._client.get_status(batch_id)
+            logger.info(
+                "Batch %s: %s (%d/%d requests completed)",
+                batch_id[:8],
+                status["status"],
+                status["succeeded_requests"],
+                status["total_requests"],
+            )
+            if status["status"] in ("FAILED", "CANCELLED", "TIMEOUT_EXCEEDED"):
+                raise BatchJobFailedError(batch_id, status["status"])
+            return status["status"] == "SUCCESS", status
+
+        return await self._poller.wait(
+            batch_id,
+            _check,
+            timeout=JOB_TIMEOUT_SECONDS,
+            timeout_message=f"Batch job {batch_id} did not complete within {JOB_TIMEOUT_SECONDS}s",
+            base_delay=poll_interval,
+            max_delay=max(poll_interval, POLL_INTERVAL_MAX),
+        )
+
+    def _summarize(self, plan: list[_Shard], oversized_files: list[str], start_time: float) -> dict:
+        """Build the run summary from every shard's outcome."""
+        cached = self._cache_progress
+        succeeded = cached.succeeded
+        resumed_lines = 0
+        failed_files: list[str] = []
+        needs_review_files: list[tuple[str, str]] = list(cached.needs_review_files)
+        for shard in plan:
+            if shard.progress is not None:
+                succeeded += shard.progress.succeeded
+                resumed_lines += shard.progress.resumed_lines
+                failed_files.extend(shard.progress.failed_files)
+                needs_review_files.extend(shard.progress.needs_review_files)
+            elif shard.status == "failed":
+                failed_files.extend(shard.file_map.values())
 
+        processing_time = time.time() - start_time
         logger.info(
-            "Batch extraction complete: %d succeeded, %d failed, %d oversized (%.1fs)",
-            succeeded_count,
+            "Batch extraction complete: %d succeeded (%d from cache), %d failed, "
+            "%d oversized, %d lines resumed, %d shard(s) (%.1fs)",
+            succeeded,
+            cached.succeeded,
             len(failed_files),
             len(oversized_files),
+            resumed_lines,
+            len(plan),
             processing_time,
         )
-
+        batch_ids = [shard.batch_ids[-1] for shard in plan if shard.batch_ids]
         return {
-            "batch_id": batch_id,
-            "total": len(batch_requests),
-            "succeeded": succeeded_count,
+            "batch_id": ", ".join(batch_ids) or None,
+            "total": sum(len(shard.file_map) for shard in plan) + cached.succeeded,
+            "succeeded": succeeded,
             "failed": len(failed_files),
             "failed_files": failed_files,
             "needs_review_files": needs_review_files,
             "oversized_files": oversized_files,
+            "resumed_lines": resumed_lines,
+            "shards": [
+                {
+                    "batch_ids": shard.batch_ids,
+                    "requests": len(shard.file_map),
+                    "estimated_tokens": shard.estimated_tokens,
+                    "status": shard.status,
+                    "error": shard.error,
+                }
+                for shard in plan
+            ],
+            "cache": self._cache.stats.report(BATCH_COST_PER_REQUEST),
             "processing_time_seconds": processing_time,
         }
 
+    async def _apply_results(
+        self, batch_id: str, file_map: dict[str, str]
+    ) -> _ApplyProgress:
+        """Stream the job's output and apply it from the saved cursor.
+
+        Each result is parsed and validated as its line arrives; every
+        ``apply_chunk_size`` results are written in one transaction that
+        also advances the cursor, so an interruption loses at most one
+        uncommitted chunk and a resume continues after the last committed
+        custom_id.
+        """
+        applied_lines, last_custom_id = self._load_cursor(batch_id)
+        progress = _ApplyProgress(resumed_lines=applied_lines)
+        chunk: list[_ResultOutcome] = []
+
+        async for result in self._client.iter_results(batch_id):
+            progress.lines += 1
+            if progress.lines <= applied_lines:
+                if progress.lines == applied_lines and result.custom_id != last_custom_id:
+                    raise CursorMismatchError(
+                        f"Output of batch {batch_id} does not match its saved cursor: line "
+                        f"{applied_lines} is custom_id {result.custom_id}, expected {last_custom_id}"
+                    )
+                continue
+            # Reading and validating (topic embeddings) is CPU-bound; keep it
+            # off the loop so the other shards' polls and applies keep running
+            chunk.append(await asyncio.to_thread(
+                self._evaluate_result, result, file_map.get(result.custom_id)
+            ))
+            if len(chunk) >= self._apply_chunk_size:
+                self._commit_chunk(batch_id, chunk, progress)
+                chunk = []
+
+        if chunk:
+            self._commit_chunk(batch_id, chunk, progress)
+        with self._db.conn:
+            self._db.conn.execute(
+                "UPDATE extraction_batch_jobs SET completed_at = ? WHERE batch_id = ?",
+                (time.time(), batch_id),
+            )
+        return progress
+
+    def _evaluate_result(self, result: BatchResult, file_path: str | None) -> _ResultOutcome:
+        """Parse and validate one result; no database writes."""
+        outcome = _ResultOutcome(custom_id=result.custom_id, file_path=file_path)
+        if not file_path:
+            logger.warning("Unknown custom_id in results: %s", result.custom_id)
+            return outcome
+
+        if result.error:
+            # Request failed
+            logger.error("Extraction failed for %s: %s", file_path, result.error)
+            outcome.error = str(result.error)
+        elif result.response:
+            # Request succeeded, validate
+            try:
+                # Parse response (same structure as sync API)
+                # Response should have choices[0].message.content with JSON
+                metadata_dict = self._extract_metadata_from_response(result.response)
+                usage = result.response.get("usage") or {}
+                outcome.tokens = int(usage.get("total_tokens") or 0)
+                self._evaluate_metadata(outcome, metadata_dict, file_path)
+            except Exception as e:
+                logger.error("Failed to process result for %s: %s", file_path, e)
+                outcome.error = str(e)
+        else:
+            logger.warning("Result for %s has no response or error", file_path)
+            outcome.error = "No response or error in result"
+        return outcome
+
+    def _evaluate_metadata(
+        self, outcome: _ResultOutcome, metadata_dict: dict, file_path: str
+    ) -> None:
+        """Validate parsed metadata against the transcript and fill in ``outcome``."""
+        # Read transcript for confidence calculation and semantic topic selection
+        transcript_text = Path(file_path).read_text(encoding="utf-8")
+        transcript_length = len(transcript_text)
+
+        # Validate extraction (with document text for semantic topic selection)
+        validation = validate_extraction(
+            metadata_dict,
+            document_text=transcript_text,
+            filename=Path(file_path).name,
+        )
+
+        if not validation.hard_failures:
+            # Passed validation (extracted or needs_review)
+            # Calculate confidence score
+            try:
+                model_confidence = float(metadata_dict.get("confidence_score", 0))
+            except (TypeError, ValueError):
+                model_confidence = 0.0
+
+            confidence = calculate_confidence(
+                model_confidence=model_confidence,
+                validation=validation,
+                transcript_length=transcript_length,
+            )
+
+            # Determine status based on confidence and soft warnings
+            if validation.soft_warnings or confidence < 0.85:
+                outcome.status = "needs_review"
+                reasons = validation.soft_warnings[:]
+                if confidence < 0.85:
+                    reasons.append(f"low confidence ({confidence*100:.0f}%)")
+                outcome.review_reason = "; ".join(reasons)
+            else:
+                outcome.status = "extracted"
+            outcome.metadata = metadata_dict
+            outcome.confidence = confidence
+        else:
+            # Hard validation failures - reject
+            logger.warning("Hard validation failures for %s: %s", file_path, validation.hard_failures)
+            outcome.error = f"Validation failed: {', '.join(validation.hard_failures)}"
+
+    def _apply_cached(self, pending_files: list[dict]) -> list[dict]:
+        """Write cached outputs for pending files that have one.
+
+        A cached output is re-validated against the current transcript
+        first; one that no longer passes is left for the batch job.
+
+        Returns:
+            The pending files still to be submitted.
+        """
+        remaining = []
+        chunk: list[_ResultOutcome] = []
+        for file_record in pending_files:
+            file_path = file_record["file_path"]
+            entry = self._cache.lookup(file_path)
+            if entry is None:
+                remaining.append(file_record)
+                continue
+            outcome = _ResultOutcome(custom_id="cache", file_path=file_path, cached=True)
+            try:
+                self._evaluate_metadata(outcome, dict(entry.metadata), file_path)
+            except Exception as e:
+                outcome.error = str(e)
+            if outcome.error is not None:
+                logger.info("Cached output for %s not reused: %s", file_path, outcome.error)
+                self._cache.record_rejected()
+                remaining.append(file_record)
+                continue
+            self._cache.record_hit(entry)
+            chunk.append(outcome)
+            if len(chunk) >= self._apply_chunk_size:
+                self._commit_cached(chunk)
+                chunk = []
+        if chunk:
+            self._commit_cached(chunk)
+        if self._cache.stats.lookups:
+            logger.info("Extraction cache: %s", self._cache.stats.summary())
+        return remaining
+
+    def _commit_cached(self, chunk: list[_ResultOutcome]) -> None:
+        """Write a chunk of cache-served outcomes in one transaction."""
+        with self._db.conn:
+            saved, failed = self._write_outcomes(chunk)
+        self._tally(saved, failed, self._cache_progress)
+
+    def _commit_chunk(
+        self, batch_id: str, chunk: list[_ResultOutcome], progress: _ApplyProgress
+    ) -> None:
+        """Write a chunk of outcomes and advance the cursor in one transaction."""
+        with self._db.conn:
+            saved, failed = self._write_outcomes(chunk)
+            self._db.conn.execute(
+                "UPDATE extraction_batch_jobs SET applied_lines = ?, last_custom_id = ?, "
+                "succeeded = succeeded + ?, failed = failed + ? WHERE batch_id = ?",
+                (progress.lines, chunk[-1].custom_id, len(saved), len(failed), batch_id),
+            )
+        self._tally(saved, failed, progress)
+
+    def _write_outcomes(
+        self, chunk: list[_ResultOutcome]
+    ) -> tuple[list[_ResultOutcome], list[_ResultOutcome]]:
+        """Write outcomes in the caller's transaction; return (saved, failed).
+
+        Fresh validated outputs are also stored in the extraction cache.
+        """
+        saved = [o for o in chunk if o.file_path and o.error is None]
+        failed = [o for o in chunk if o.file_path and o.error is not None]
+        for outcome in saved:
+            self._write_extracted_metadata(
+                outcome.file_path,
+                outcome.metadata,
+                outcome.confidence,
+                outcome.status,
+                review_reason=outcome.review_reason,
+            )
+            if not outcome.cached:
+                self._cache.store(outcome.file_path, outcome.metadata, outcome.tokens)
+        for outcome in failed:
+            self._write_failed(outcome.file_path, outcome.error)
+        return saved, failed
+
+    @staticmethod
+    def _tally(
+        saved: list[_ResultOutcome], failed: list[_ResultOutcome], progress: _ApplyProgress
+    ) -> None:
+        progress.succeeded += len(saved)
+        progress.failed_files.extend(o.file_path for o in failed)
+        for outcome in saved:
+            if outcome.review_reason:
+                progress.needs_review_files.append((outcome.file_path, outcome.review_reason))
+            source = ", cached" if outcome.cached else ""
+            logger.info("✓ Saved: %s (conf: %.1f%%, status=%s%s)",
+                        Path(outcome.file_path).name, outcome.confidence * 100,
+                        outcome.status, source)
+
+    def _record_job(self, batch_id: str, file_map: dict[str, str]) -> None:
+        """Persist a submitted job's request map so its results can be resumed."""
+        with self._db.conn:
+            self._db.conn.execute(
+                "INSERT OR REPLACE INTO extraction_batch_jobs "
+                "(batch_id, strategy, request_count, submitted_at) VALUES (?, ?, ?, ?)",
+                (batch_id, self._strategy_name, len(file_map), time.time()),
+            )
+            self._db.conn.executemany(
+                "INSERT OR REPLACE INTO extraction_batch_requests "
+                "(batch_id, custom_id, file_path) VALUES (?, ?, ?)",
+                [(batch_id, custom_id, path) for custom_id, path in file_map.items()],
+            )
+
+    def _load_request_map(self, batch_id: str) -> dict[str, str]:
+        rows = self._db.conn.execute(
+            "SELECT custom_id, file_path FROM extraction_batch_requests WHERE batch_id = ?",
+            (batch_id,),
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def _load_cursor(self, batch_id: str) -> tuple[int, str | None]:
+        row = self._db.conn.execute(
+            "SELECT applied_lines, last_custom_id FROM extraction_batch_jobs WHERE batch_id = ?",
+            (batch_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    def _spool_requests(
+        self, entries: list[tuple[str, dict]], spool: BatchSpool
+    ) -> list[_SkippedFile]:
+        """Build one request per ``(custom_id, file record)`` and append it to ``spool``.
+
+        Transcripts are read one at a time and dropped once their request
+        line is written. Books and files too large for the context window
+        are left out and returned for :meth:`_mark_skipped`. Runs in a worker
+        thread, so it does not touch the database.
+
+        Returns:
+            Files skipped as books or oversized.
+        """
+        oversized_files = []  # Track files too large for Mistral
+        system_prompt = build_system_prompt(self._strategy_name)
+
+        for custom_id, file_record in entries:
+            file_path = file_record["file_path"]
+
+            # Book routing: files >= BOOK_SIZE_BYTES are books, skip extraction entirely.
+            # This check runs BEFORE read_text to avoid loading large files into memory.
+            try:
+                file_size = Path(file_path).stat().st_size
+            except OSError as e:
+                logger.error("Failed to read file %s: %s", file_path, e)
+                continue
+            if file_size >= BOOK_SIZE_BYTES:
+                logger.info(
+                    "Skipping book file %s (%d bytes >= %d BOOK_SIZE_BYTES)",
+                    Path(file_path).name, file_size, BOOK_SIZE_BYTES,
+                )
+                oversized_files.append(_SkippedFile(file_path, "book", file_size))
+                continue
+
+            # Read file content
+            try:
+                content = Path(file_path).read_text(encoding="utf-8")
+            except Exception as e:
+                logger.error("Failed to read file %s: %s", file_path, e)
+                continue
+
+            # Check if file is too large for Mistral context window; the size
+            # bound settles it for most files without counting words
+            if size_token_bound(file_size) > MAX_DOCUMENT_TOKENS:
+                estimated_tokens = estimate_token_count(content)
+                spool.stats.words_counted += 1
+            else:
+                estimated_tokens = estimate_tokens_from_size(file_size)
+            if estimated_tokens > MAX_DOCUMENT_TOKENS:
+                logger.warning(
+                    "Skipping oversized file %s (~%d tokens, max %d)",
+                    Path(file_path).name,
+                    estimated_tokens,
+                    MAX_DOCUMENT_TOKENS,
+                )
+                # Marked as skipped later (will upload to Gemini without enrichment)
+                oversized_files.append(_SkippedFile(file_path, "oversized", estimated_tokens))
+                continue
+
+            # Build prompts using existing extraction logic, then spool the request
+            request = self._client.build_extraction_request(
+                custom_id=custom_id,
+                system_prompt=system_prompt,
+                user_prompt=build_user_prompt(content, self._strategy_name),
+                temperature=1.0,  # Production temperature
+                max_tokens=8000,
+            )
+            spool.write(custom_id, file_path, request)
+            spool.stats.estimated_tokens += estimated_tokens
+
+        return oversized_files
+
     def _get_pending_files(self, max_files: int | None) -> list[dict]:
         """Get pending files from database for batch extraction."""
         query = """
@@ -429,7 +883,7 @@ class BatchExtractionOrchestrator:
         minimal_response = MinimalResponse(message_content)
         return parse_magistral_response(minimal_response)
 
-    def _save_extracted_metadata(
+    def _write_extracted_metadata(
         self,
         file_path: str,
         metadata: dict,
@@ -437,59 +891,59 @@ class BatchExtractionOrchestrator:
         status: str = "extracted",
         review_reason: str | None = None,
     ) -> None:
-        """Save extracted metadata to database (matches synchronous orchestrator pattern)."""
+        """Write extracted metadata (matches synchronous orchestrator pattern).
+
+        Runs inside the caller's transaction (see :meth:`_commit_chunk`).
+        """
         import json
 
-        with self._db.conn:
-            # 1. Update files table status (persist review_reason to error_message for visibility)
-            self._db.conn.execute(
-                "UPDATE files SET ai_metadata_status = ?, ai_confidence_score = ?, "
-                "error_message = ? WHERE file_path = ?",
-                (status, confidence_score, review_reason, file_path),
-            )
+        # 1. Update files table status (persist review_reason to error_message for visibility)
+        self._db.conn.execute(
+            "UPDATE files SET ai_metadata_status = ?, ai_confidence_score = ?, "
+            "error_message = ? WHERE file_path = ?",
+            (status, confidence_score, review_reason, file_path),
+        )
 
-            # 2. Mark previous versions as not current
-            self._db.conn.execute(
-                "UPDATE file_metadata_ai SET is_current = 0 "
-                "WHERE file_path = ? AND is_current = 1",
-                (file_path,),
-            )
+        # 2. Mark previous versions as not current
+        self._db.conn.execute(
+            "UPDATE file_metadata_ai SET is_current = 0 "
+            "WHERE file_path = ? AND is_current = 1",
+            (file_path,),
+        )
 
-            # 3. Insert new versioned metadata
+        # 3. Insert new versioned metadata
+        self._db.conn.execute(
+            """INSERT INTO file_metadata_ai
+               (file_path, metadata_json, model, prompt_version,
+                extraction_config_hash, is_current)
+               VALUES (?, ?, ?, ?, ?, 1)""",
+            (
+                file_path,
+                json.dumps(metadata),
+                BATCH_MODEL,
+                "batch-v1",  # Batch API version
+                f"batch-{self._strategy_name}",  # Config identifier
+            ),
+        )
+
+        # 4. Insert primary topics
+        valid_topics = metadata.get("primary_topics", [])
+        if valid_topics:
+            # Clear existing topics
             self._db.conn.execute(
-                """INSERT INTO file_metadata_ai
-                   (file_path, metadata_json, model, prompt_version,
-                    extraction_config_hash, is_current)
-                   VALUES (?, ?, ?, ?, ?, 1)""",
-                (
-                    file_path,
-                    json.dumps(metadata),
-                    "magistral-medium-latest",  # Model used in batch
-                    "batch-v1",  # Batch API version
-                    f"batch-{self._strategy_name}",  # Config identifier
-                ),
+                "DELETE FROM file_primary_topics WHERE file_path = ?",
+                (file_path,),
             )
-
-            # 4. Insert primary topics
-            valid_topics = metadata.get("primary_topics", [])
-            if valid_topics:
-                # Clear existing topics
+            # Insert new topics
+            for topic in valid_topics:
                 self._db.conn.execute(
-                    "DELETE FROM file_primary_topics WHERE file_path = ?",
-                    (file_path,),
+                    "INSERT INTO file_primary_topics (file_path, topic_tag) "
+                    "VALUES (?, ?)",
+                    (file_path, topic),
                 )
-                # Insert new topics
-                for topic in valid_topics:
-                    self._db.conn.execute(
-                        "INSERT INTO file_primary_topics (file_path, topic_tag) "
-                        "VALUES (?, ?)",
-                        (file_path, topic),
-                    )
-
-        self._db.conn.commit()
 
-    def _mark_failed(self, file_path: str, error_message: str) -> None:
-        """Mark file as failed in database for retry tracking."""
+    def _write_failed(self, file_path: str, error_message: str) -> None:
+        """Mark file as failed for retry tracking (in the caller's transaction)."""
         self._db.conn.execute(
             """
             UPDATE files
@@ -500,7 +954,14 @@ class BatchExtractionOrchestrator:
             """,
             (error_message, file_path),
         )
-        self._db.conn.commit()
+
+    def _mark_skipped(self, skipped: list[_SkippedFile]) -> None:
+        """Mark the books and oversized files left out of a spool."""
+        for entry in skipped:
+            if entry.kind == "book":
+                self._mark_book(entry.file_path, entry.size)
+            else:
+                self._mark_oversized(entry.file_path, entry.size)
 
     def _mark_oversized(self, file_path: str, token_count: int) -> None:
         """Mark file as oversized (skip extraction, use Gemini File Search only).
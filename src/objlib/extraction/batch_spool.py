@@ -0,0 +1,142 @@
+"""On-disk JSONL spool for Mistral batch requests.
+
+``run_batch_extraction()`` used to read every pending transcript into
+memory, keep all ``BatchRequest`` objects (each holding a full copy of its
+transcript inside the prompt) in a list, and only then join them into one
+JSONL string for upload -- for a full-library batch, hundreds of MB held
+two or three times over.
+
+``BatchSpool`` writes each request to a JSONL file as soon as it is built,
+so only one transcript and its prompt are in memory at a time; the client
+then uploads the spool from an open file handle. Token estimates come from
+the file size whenever a conservative bound already proves the file fits
+(``size_token_bound``); words are only counted for files near the limit.
+
+Usage::
+
+    with BatchSpool.create() as spool:
+        for custom_id, path in files:
+            spool.write(custom_id, path, client.build_extraction_request(...))
+        spool.close()
+        batch_id = await client.submit_batch_file(spool.path, spool.stats.requests)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Token limits for Mistral models
+# Leave headroom for system/user prompts (~8K tokens)
+MAX_DOCUMENT_TOKENS = 100_000  # Mistral has 128K context window
+TOKENS_PER_WORD = 1.3  # Approximation for English text
+BYTES_PER_TOKEN = 4  # Typical English transcript; used for size-only estimates
+
+_WORD = re.compile(r"\S+")
+
+
+class _JsonlRequest(Protocol):
+    def to_jsonl_line(self) -> str: ...
+
+
+def estimate_token_count(text: str) -> int:
+    """Estimate token count for text (words * 1.3 approximation).
+
+    Args:
+        text: Input text string.
+
+    Returns:
+        Estimated token count.
+    """
+    word_count = sum(1 for _ in _WORD.finditer(text))
+    return int(word_count * TOKENS_PER_WORD)
+
+
+def size_token_bound(file_size: int) -> int:
+    """Upper bound of :func:`estimate_token_count` for a file of ``file_size`` bytes.
+
+    Every word but the last is followed by at least one whitespace byte,
+    so a file holds at most ``(size + 1) // 2`` words.
+    """
+    return int(((file_size + 1) // 2) * TOKENS_PER_WORD)
+
+
+def estimate_tokens_from_size(file_size: int) -> int:
+    """Typical token count for a file of ``file_size`` bytes (for reporting)."""
+    return file_size // BYTES_PER_TOKEN
+
+
+@dataclass
+class SpoolStats:
+    """Counters for one BatchSpool."""
+
+    requests: int = 0
+    bytes_written: int = 0
+    largest_request_bytes: int = 0
+    estimated_tokens: int = 0
+    words_counted: int = 0  # Files whose size bound was too close to the limit
+
+    def summary(self) -> str:
+        """One-line report for logs."""
+        return (
+            f"{self.requests} requests, {self.bytes_written / 1_048_576:.1f} MiB spooled "
+            f"(largest request {self.largest_request_bytes / 1024:.0f} KiB), "
+            f"~{self.estimated_tokens:,} document tokens, "
+            f"{self.words_counted} files word-counted"
+        )
+
+
+@dataclass
+class BatchSpool:
+    """Append-only JSONL file of batch requests plus its custom_id map.
+
+    Args:
+        path: Spool file; created (truncated) on construction.
+    """
+
+    path: Path
+    file_map: dict[str, str] = field(default_factory=dict)  # custom_id -> file_path
+    stats: SpoolStats = field(default_factory=SpoolStats)
+
+    def __post_init__(self) -> None:
+        self._fh: Any = open(self.path, "w", encoding="utf-8", newline="\n")
+
+    @classmethod
+    def create(cls, directory: Path | None = None) -> BatchSpool:
+        """Spool in a fresh temporary file (in ``directory`` if given)."""
+        fd, name = tempfile.mkstemp(prefix="objlib-batch-", suffix=".jsonl", dir=directory)
+        os.close(fd)
+        return cls(Path(name))
+
+    def write(self, custom_id: str, file_path: str, request: _JsonlRequest) -> None:
+        """Append one request line and record its file."""
+        line = request.to_jsonl_line() + "\n"
+        size = len(line.encode("utf-8"))
+        self._fh.write(line)
+        self.file_map[custom_id] = file_path
+        self.stats.requests += 1
+        self.stats.bytes_written += size
+        self.stats.largest_request_bytes = max(self.stats.largest_request_bytes, size)
+
+    def close(self) -> None:
+        """Flush and close the spool file (idempotent)."""
+        if not self._fh.closed:
+            self._fh.close()
+
+    def remove(self) -> None:
+        """Close and delete the spool file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> BatchSpool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.remove()
@@ -0,0 +1,159 @@
+"""Content-addressed cache of validated Mistral extraction outputs (SQLite, V24).
+
+``file_metadata_ai`` keeps every extraction per file path, but nothing let
+a run find an earlier output for the same request: re-running ``metadata
+extract`` or ``batch-extract`` after a status reset, or extracting a
+duplicate transcript at another path, sent the identical prompt again.
+
+``ExtractionCache`` keys each output by
+
+* the transcript's ``files.content_hash`` (so duplicates share entries),
+* the strategy,
+* :func:`~objlib.extraction.prompts.hash_prompt_template` (system prompt,
+  user framing and how the transcript was cut),
+* :func:`~objlib.extraction.prompts.production_config_hash`, and
+* the model.
+
+Only outputs that passed validation are stored. Callers re-validate a
+cached output against the current transcript before serving it, so a
+validator or schema change that rejects it falls through to the API.
+
+With ``reuse=False`` (``--force``) lookups always miss but new outputs are
+still stored, replacing the old entry.
+
+Usage::
+
+    cache = ExtractionCache(db, CacheKey(strategy, prompt_hash, config_hash, model))
+    entry = cache.lookup(file_path)
+    if entry is not None and passes_validation(entry.metadata):
+        cache.record_hit(entry)
+    ...
+    with db.conn:
+        cache.store(file_path, metadata, tokens)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from objlib.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Everything in the cache key except the transcript's content hash."""
+
+    strategy: str
+    prompt_hash: str
+    config_hash: str
+    model: str
+
+
+@dataclass
+class CachedExtraction:
+    """One cached output and the tokens its original request used."""
+
+    metadata: dict
+    tokens: int
+
+
+@dataclass
+class CacheStats:
+    """Counters for one run."""
+
+    lookups: int = 0
+    hits: int = 0  # Served instead of an API call
+    rejected: int = 0  # Found, but failed re-validation
+    stored: int = 0
+    tokens_avoided: int = 0
+
+    @property
+    def misses(self) -> int:
+        return self.lookups - self.hits
+
+    def report(self, cost_per_request: float) -> dict:
+        """Summary fields for the run summary and the CLI."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "stored": self.stored,
+            "tokens_avoided": self.tokens_avoided,
+            "cost_avoided": round(self.hits * cost_per_request, 2),
+        }
+
+    def summary(self) -> str:
+        """One-line report for logs."""
+        return (
+            f"{self.hits} of {self.lookups} served from cache "
+            f"({self.rejected} rejected by validation), {self.stored} stored, "
+            f"~{self.tokens_avoided:,} tokens avoided"
+        )
+
+
+class ExtractionCache:
+    """Validated extraction outputs keyed by content hash and request shape.
+
+    Args:
+        db: Database holding ``files`` and ``extraction_cache``.
+        key: Strategy, prompt hash, config hash and model of this run.
+        reuse: Serve cached outputs; False (``--force``) only refreshes them.
+    """
+
+    def __init__(self, db: "Database", key: CacheKey, reuse: bool = True) -> None:
+        self._db = db
+        self.key = key
+        self.reuse = reuse
+        self.stats = CacheStats()
+
+    def lookup(self, file_path: str) -> CachedExtraction | None:
+        """Cached output for the file's current content, or None."""
+        if not self.reuse:
+            return None
+        self.stats.lookups += 1
+        row = self._db.conn.execute(
+            "SELECT c.metadata_json, c.tokens FROM files f "
+            "JOIN extraction_cache c ON c.content_hash = f.content_hash "
+            "WHERE f.file_path = ? AND c.strategy = ? AND c.prompt_hash = ? "
+            "AND c.config_hash = ? AND c.model = ?",
+            (file_path, *self._key_values()),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            metadata = json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning("Ignoring unreadable cache entry for %s", file_path)
+            return None
+        return CachedExtraction(metadata=metadata, tokens=row[1])
+
+    def record_hit(self, entry: CachedExtraction) -> None:
+        """Count an entry that was served (after re-validation passed)."""
+        self.stats.hits += 1
+        self.stats.tokens_avoided += entry.tokens
+
+    def record_rejected(self) -> None:
+        """Count an entry that failed re-validation and was re-extracted."""
+        self.stats.rejected += 1
+
+    def store(self, file_path: str, metadata: dict, tokens: int) -> None:
+        """Store a validated output for the file's content (caller's transaction)."""
+        cursor = self._db.conn.execute(
+            "INSERT OR REPLACE INTO extraction_cache "
+            "(content_hash, strategy, prompt_hash, config_hash, model, "
+            " metadata_json, tokens, created_at) "
+            "SELECT content_hash, ?, ?, ?, ?, ?, ?, ? FROM files WHERE file_path = ?",
+            (*self._key_values(), json.dumps(metadata), tokens, time.time(), file_path),
+        )
+        self.stats.stored += cursor.rowcount
+
+    def _key_values(self) -> tuple[str, str, str, str]:
+        key = self.key
+        return (key.strategy, key.prompt_hash, key.config_hash, key.model)
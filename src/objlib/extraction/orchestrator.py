@@ -6,18 +6,25 @@ two-level validation, multi-dimensional confidence scoring, and
 versioned metadata persistence to file_metadata_ai / file_primary_topics.
 
 Both waves enforce rate limits (60 req/min) via RxPY rx.timer-based
-pacing. On credit exhaustion (HTTP 402), saves checkpoint and exits
-cleanly. On rate limiting (HTTP 429), applies exponential backoff with
-jitter using rx.timer delays.
+pacing. Wave 2 runs files through a staged ProductionPipeline (threaded
+transcript preparation, adaptively concurrent API calls, one batching
+writer) and reports files/min and tokens/s. On credit exhaustion
+(HTTP 402), saves checkpoint and exits cleanly. On rate limiting
+(HTTP 429), applies exponential backoff with jitter using rx.timer
+delays.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 import random
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -26,24 +33,30 @@ import rx
 from pydantic import ValidationError
 
 from objlib.upload._operators import subscribe_awaitable
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.concurrency import AIMDConcurrencyController
 
+from objlib.extraction.cache import CacheKey, CachedExtraction, ExtractionCache
 from objlib.extraction.checkpoint import CheckpointManager, CreditExhaustionHandler
 from objlib.extraction.chunker import prepare_transcript
 from objlib.extraction.client import CreditExhaustedException, RateLimitException
 from objlib.extraction.confidence import calculate_confidence
+from objlib.extraction.production_pipeline import ProductionPipeline
 from objlib.extraction.prompts import (
     PROMPT_VERSION,
     build_production_prompt,
     build_system_prompt,
     build_user_prompt,
-    hash_extraction_config,
+    hash_prompt_template,
+    production_config_hash,
 )
 from objlib.extraction.schemas import CONTROLLED_VOCABULARY, ExtractedMetadata, MetadataStatus
 from objlib.extraction.strategies import StrategyConfig
 from objlib.extraction.validator import ValidationResult, build_retry_prompt, validate_extraction
 
+from objlib.database import Database
+
 if TYPE_CHECKING:
-    from objlib.database import Database
     from objlib.extraction.client import MistralClient
 
 logger = logging.getLogger(__name__)
@@ -51,20 +64,50 @@ logger = logging.getLogger(__name__)
 # Cost estimate: ~$0.02 per request for magistral-medium-latest (approximate)
 _ESTIMATED_COST_PER_REQUEST = 0.02
 
+# Production sends prepare_transcript()'s default 18K-token cut (cache key part)
+_TRANSCRIPT_POLICY = "chunked-18000"
+
 
 @dataclass
 class ExtractionConfig:
     """Configuration for the extraction orchestrator.
 
     Attributes:
-        max_concurrent: Maximum simultaneous API requests.
+        max_concurrent: Simultaneous API requests at the start of a
+            production run (grown adaptively up to concurrency_ceiling).
         rate_limit_rpm: Maximum requests per minute.
         max_retries: Maximum retry attempts for rate-limited requests.
+        concurrency_ceiling: Upper bound on production API requests in flight.
+        prepare_workers: Threads reading and chunking transcripts ahead of
+            the API stage.
+        write_batch_size: Production results saved per transaction and
+            checkpoint write.
     """
 
     max_concurrent: int = 3
     rate_limit_rpm: int = 60
     max_retries: int = 2
+    concurrency_ceiling: int = 16
+    prepare_workers: int = 4
+    write_batch_size: int = 20
+
+
+@dataclass
+class _ProductionOutcome:
+    """Result of one production file, handed from the API stage to the writer.
+
+    ``metadata`` is None when the file failed (read error, API error or
+    rate-limit retries exhausted); such files are only checkpointed.
+    """
+
+    file_path: str
+    filename: str = ""
+    metadata: dict | None = None
+    validation: ValidationResult | None = None
+    confidence: float = 0.0
+    tokens: int = 0
+    latency_ms: int = 0
+    cached: bool = False  # Served from the extraction cache (no API call)
 
 
 class ExtractionOrchestrator:
@@ -97,8 +140,12 @@ class ExtractionOrchestrator:
         self._config = config or ExtractionConfig()
         # Rate limit delay: 60 req/min = 1 request per second minimum
         self._rate_limit_delay_s = 60.0 / self._config.rate_limit_rpm
+        self._next_call_at = 0.0
         self._total_calls = 0
         self._credit_handler = CreditExhaustionHandler()
+        self._circuit_breaker = RollingWindowCircuitBreaker()
+        self._cpu_executor: ThreadPoolExecutor | None = None
+        self._paused_at = ""
 
     async def run_wave1(
         self,
@@ -242,11 +289,15 @@ class ExtractionOrchestrator:
     async def _rate_limit_delay(self) -> None:
         """Apply rate-limit pacing via rx.timer.
 
-        Replaces AsyncLimiter — enforces minimum delay between API calls
-        to stay within rate_limit_rpm. Uses rx.timer() instead of
-        asyncio.sleep() for RxPY consistency.
+        Replaces AsyncLimiter — each call reserves the next start slot,
+        spaced ``60 / rate_limit_rpm`` seconds apart, and waits for it, so
+        concurrent production workers share one rate_limit_rpm budget.
+        Uses rx.timer() instead of asyncio.sleep() for RxPY consistency.
         """
-        await subscribe_awaitable(rx.timer(self._rate_limit_delay_s))
+        now = time.monotonic()
+        slot = max(self._next_call_at, now)
+        self._next_call_at = slot + self._rate_limit_delay_s
+        await subscribe_awaitable(rx.timer(slot - now))
 
     async def _process_one(
         self,
@@ -416,7 +467,7 @@ class ExtractionOrchestrator:
         return len(test_files)
 
     async def run_production(
-        self, files: list[dict], strategy_name: str
+        self, files: list[dict], strategy_name: str, reuse_cached: bool = True
     ) -> dict:
         """Run Wave 2 production extraction on a batch of files.
 
@@ -428,19 +479,37 @@ class ExtractionOrchestrator:
         - Versioned metadata persistence to file_metadata_ai and
           file_primary_topics tables
 
+        Files flow through a :class:`ProductionPipeline`: transcripts are
+        read and chunked in worker threads, API calls run concurrently
+        (starting at ``max_concurrent`` and adjusted by an AIMD controller
+        up to ``concurrency_ceiling``, starts paced to ``rate_limit_rpm``),
+        and one writer task saves results and the checkpoint in batches of
+        ``write_batch_size``.
+
+        Validated outputs are kept in the :class:`ExtractionCache`; a file
+        whose content, prompt, config and model match a cached output that
+        still passes validation is served from it without an API call.
+
         Temperature is always 1.0 for production (magistral requirement).
 
-        On credit exhaustion (HTTP 402): saves checkpoint and exits.
-        On rate limiting (HTTP 429): exponential backoff with jitter.
-        Each file's result is saved atomically (checkpoint per file).
+        On credit exhaustion (HTTP 402): stops intake, writes the results
+        already extracted, saves checkpoint and exits.
+        On rate limiting (HTTP 429): exponential backoff with jitter, and
+        the concurrency limit is halved.
 
         Args:
             files: List of file dicts with file_path, filename, file_size.
             strategy_name: Winning strategy from Wave 1 (e.g., 'minimalist').
+            reuse_cached: Serve cached outputs; False (``--force``) calls the
+                API for every file and refreshes the cache.
 
         Returns:
             Summary dict: {total, extracted, needs_review, failed, partial,
-            total_tokens, estimated_cost, avg_latency_ms}
+            total_tokens, estimated_cost, avg_latency_ms, throughput, cache},
+            where throughput holds files_per_minute, tokens_per_second,
+            elapsed_seconds, api_concurrency, write_batches and not_started,
+            and cache holds hits, misses, rejected, stored, tokens_avoided
+            and cost_avoided.
         """
         # Get temperature from Wave 1 strategy config
         from objlib.extraction.strategies import WAVE1_STRATEGIES
@@ -454,17 +523,28 @@ class ExtractionOrchestrator:
         )
 
         # Config hash for versioning
-        import hashlib
-
-        vocab_hash = hashlib.sha256(
-            ",".join(sorted(CONTROLLED_VOCABULARY)).encode()
-        ).hexdigest()[:16]
-
-        config_hash = hash_extraction_config(
-            temperature=1.0,
-            timeout=240,
-            schema_version="1.0",
-            vocab_hash=vocab_hash,
+        config_hash = production_config_hash()
+        save_config = {
+            "model": self._client._model,
+            "prompt_version": PROMPT_VERSION,
+            "config_hash": config_hash,
+        }
+        # Cache lookups (prepare threads) and batch saves (a worker thread)
+        # run off the loop, so the run gets its own connection usable across
+        # threads; the lock keeps it to one user at a time
+        run_db = Database(self._db.db_path, check_same_thread=False)
+        db_lock = threading.Lock()
+        cache = ExtractionCache(
+            run_db,
+            CacheKey(
+                strategy=strategy_name,
+                prompt_hash=hash_prompt_template(
+                    system_prompt, strategy_name, _TRANSCRIPT_POLICY
+                ),
+                config_hash=config_hash,
+                model=self._client._model,
+            ),
+            reuse=reuse_cached,
         )
 
         # Check checkpoint for resume
@@ -494,169 +574,82 @@ class ExtractionOrchestrator:
             "failed": [],
         }
 
-        current_file_path = ""
-        try:
-            for file_info in files:
-                file_path = file_info["file_path"]
-                current_file_path = file_path
-
-                if file_path in completed_files:
-                    logger.info(
-                        "Skipping %s (already completed)", file_info.get("filename", file_path)
-                    )
-                    continue
-
-                # Read and chunk transcript
-                try:
-                    transcript = prepare_transcript(file_path)
-                except (OSError, FileNotFoundError) as e:
-                    logger.error("Failed to read file %s: %s", file_path, e)
-                    results["failed"] += 1
-                    prod_state["failed"].append(file_path)
-                    continue
-
-                transcript_length = len(transcript)
-
-                # Build user prompt
-                user_prompt = build_user_prompt(transcript, strategy_name)
-
-                # API call with validation and retry
-                metadata_dict = None
-                tokens = 0
-                latency_ms = 0
-                validation = None
-
-                for attempt in range(2):  # Initial + 1 retry
-                    try:
-                        # Rate-limit pacing via rx.timer (replaces AsyncLimiter)
-                        await self._rate_limit_delay()
-
-                        start_time = time.monotonic()
-                        retry_suffix = ""
-                        if attempt > 0 and validation and validation.hard_failures:
-                            retry_suffix = build_retry_prompt(validation.hard_failures)
-
-                        metadata_dict, tokens = await self._client.extract_metadata(
-                            transcript_text=user_prompt + retry_suffix,
-                            system_prompt=system_prompt,
-                            max_tokens=8000,
-                            temperature=temperature,  # From Wave 1 winning strategy
-                        )
-                        latency_ms = int((time.monotonic() - start_time) * 1000)
-
-                        self._total_calls += 1
-
-                        # Validate extraction (pass transcript for semantic topic normalization)
-                        validation = validate_extraction(
-                            metadata_dict,
-                            document_text=transcript,
-                            filename=Path(file_path).name,
-                        )
-
-                        if not validation.hard_failures:
-                            # Passed validation (extracted or needs_review)
-                            break
-
-                        if attempt == 0:
-                            logger.warning(
-                                "Hard validation failure for %s (attempt 1), retrying: %s",
-                                file_path, validation.hard_failures,
-                            )
-                        # Continue to retry
-
-                    except CreditExhaustedException:
-                        raise  # Let orchestrator handle
-
-                    except RateLimitException:
-                        backoff = (2 ** attempt) + random.uniform(0, 1)
-                        logger.warning(
-                            "Rate limited on %s, backing off %.1fs (attempt %d)",
-                            file_path, backoff, attempt + 1,
-                        )
-                        # Exponential backoff via rx.timer (replaces asyncio.sleep)
-                        await subscribe_awaitable(rx.timer(backoff))
-
-                    except Exception as e:
-                        logger.error(
-                            "Unexpected error for %s: %s", file_path, e
-                        )
-                        metadata_dict = None
-                        validation = ValidationResult(
-                            status=MetadataStatus.FAILED_VALIDATION,
-                            hard_failures=[str(e)],
-                        )
-                        break
-
-                # Calculate confidence and determine final status
-                if metadata_dict is not None and validation is not None:
-                    model_confidence = metadata_dict.get("confidence_score", 0.0)
-                    try:
-                        model_confidence = float(model_confidence)
-                    except (TypeError, ValueError):
-                        model_confidence = 0.0
-
-                    confidence = calculate_confidence(
-                        model_confidence=model_confidence,
-                        validation=validation,
-                        transcript_length=transcript_length,
-                    )
-
-                    # Save result to database
-                    self._save_production_result(
-                        file_path=file_path,
-                        metadata=metadata_dict,
-                        validation=validation,
-                        confidence=confidence,
-                        tokens=tokens,
-                        config={
-                            "model": self._client._model,
-                            "prompt_version": PROMPT_VERSION,
-                            "config_hash": config_hash,
-                        },
-                    )
-
-                    # Track results
-                    status_value = validation.status.value
-                    if status_value == "extracted":
-                        results["extracted"] += 1
-                        logger.info("✓ Extracted: %s (conf: %.1f%%, %dms)",
-                                    file_info.get("filename", file_path), confidence * 100, latency_ms)
-                    elif status_value == "needs_review":
-                        results["needs_review"] += 1
-                        logger.info("⚠ Needs review: %s (conf: %.1f%%, %dms)",
-                                    file_info.get("filename", file_path), confidence * 100, latency_ms)
-                    elif status_value == "failed_validation":
-                        results["failed"] += 1
-                    else:
-                        results["partial"] += 1
-
-                    results["total_tokens"] += tokens
-                    results["latencies_ms"].append(latency_ms)
+        pending = []
+        for file_info in files:
+            if file_info["file_path"] in completed_files:
+                logger.info(
+                    "Skipping %s (already completed)",
+                    file_info.get("filename", file_info["file_path"]),
+                )
+            else:
+                pending.append(file_info)
+
+        def prepare(file_info: dict) -> tuple[str, str, CachedExtraction | None]:
+            transcript = prepare_transcript(file_info["file_path"])
+            with db_lock:
+                entry = cache.lookup(file_info["file_path"])
+            return transcript, build_user_prompt(transcript, strategy_name), entry
+
+        async def extract(
+            file_info: dict, prepared: tuple[str, str, CachedExtraction | None]
+        ) -> _ProductionOutcome:
+            transcript, user_prompt, entry = prepared
+            if entry is not None:
+                outcome = await self._serve_cached(file_info, transcript, entry)
+                if outcome is not None:
+                    cache.record_hit(entry)
+                    return outcome
+                cache.record_rejected()
+            return await self._extract_production(
+                file_info, transcript, user_prompt, system_prompt, temperature
+            )
 
-                    prod_state["completed"].append(file_path)
+        def failed(file_info: dict, exc: BaseException) -> _ProductionOutcome:
+            logger.error("Failed to process %s: %s", file_info["file_path"], exc)
+            return _ProductionOutcome(file_info["file_path"])
 
-                else:
-                    results["failed"] += 1
-                    prod_state["failed"].append(file_path)
+        async def write(batch: list[_ProductionOutcome]) -> None:
+            await asyncio.to_thread(
+                self._save_production_batch, run_db, db_lock, batch, save_config, cache
+            )
+            for outcome in batch:
+                self._tally_production_outcome(outcome, results, prod_state)
+            await asyncio.to_thread(self._checkpoint.save, {
+                "wave": "production",
+                "completed": prod_state["completed"],
+                "failed": prod_state["failed"],
+                "prompt_version": PROMPT_VERSION,
+                "strategy": strategy_name,
+            })
 
-                # Save checkpoint after each file
-                self._checkpoint.save({
-                    "wave": "production",
-                    "completed": prod_state["completed"],
-                    "failed": prod_state["failed"],
-                    "prompt_version": PROMPT_VERSION,
-                    "strategy": strategy_name,
-                })
+        controller = AIMDConcurrencyController(
+            self._circuit_breaker,
+            upload=(self._config.max_concurrent, self._config.concurrency_ceiling),
+        )
+        pipeline: ProductionPipeline[dict, _ProductionOutcome] = ProductionPipeline(
+            prepare, extract, write,
+            failed=failed,
+            api_concurrency=self._config.concurrency_ceiling,
+            api_limit=controller.upload_limit,
+            prepare_workers=self._config.prepare_workers,
+            write_batch_size=self._config.write_batch_size,
+            tokens=lambda outcome: outcome.tokens,
+            succeeded=lambda outcome: outcome.metadata is not None,
+            stop_errors=(CreditExhaustedException,),
+        )
+        self._paused_at = ""
 
+        try:
+            stats = await pipeline.run(pending)
         except CreditExhaustedException:
-            # Save checkpoint and notify
+            # In-flight results were written by the pipeline; save and notify
             self._checkpoint.save({
                 "wave": "production",
                 "completed": prod_state["completed"],
                 "failed": prod_state["failed"],
                 "prompt_version": PROMPT_VERSION,
                 "strategy": strategy_name,
-                "paused_at": current_file_path,
+                "paused_at": self._paused_at,
             })
             estimated_cost = self._total_calls * _ESTIMATED_COST_PER_REQUEST
             self._credit_handler.display_pause_notification(
@@ -670,6 +663,13 @@ class ExtractionOrchestrator:
                 total_files=len(files),
             )
             sys.exit(0)
+        finally:
+            self._shutdown_cpu()
+            run_db.close()
+
+        for line in stats.report_lines():
+            logger.info(line)
+        logger.info("Extraction cache: %s", cache.stats.summary())
 
         # Clear checkpoint on successful completion
         self._checkpoint.clear()
@@ -682,10 +682,242 @@ class ExtractionOrchestrator:
             **results,
             "estimated_cost": round(self._total_calls * _ESTIMATED_COST_PER_REQUEST, 2),
             "avg_latency_ms": round(avg_latency, 1),
+            "throughput": stats.throughput(),
+            "cache": cache.stats.report(_ESTIMATED_COST_PER_REQUEST),
         }
 
-    def _save_production_result(
+    async def _extract_production(
         self,
+        file_info: dict,
+        transcript: str,
+        user_prompt: str,
+        system_prompt: str,
+        temperature: float,
+    ) -> _ProductionOutcome:
+        """Call the API for one file, validate, and retry once on hard failures.
+
+        Every call is recorded on the circuit breaker that drives the
+        concurrency controller. Re-raises CreditExhaustedException (after
+        noting the file in ``_paused_at``) to stop the pipeline.
+        """
+        file_path = file_info["file_path"]
+        metadata_dict = None
+        tokens = 0
+        latency_ms = 0
+        validation = None
+
+        for attempt in range(2):  # Initial + 1 retry
+            try:
+                # Rate-limit pacing via rx.timer (shared start slots)
+                await self._rate_limit_delay()
+
+                start_time = time.monotonic()
+                retry_suffix = ""
+                if attempt > 0 and validation and validation.hard_failures:
+                    retry_suffix = build_retry_prompt(validation.hard_failures)
+
+                metadata_dict, tokens = await self._client.extract_metadata(
+                    transcript_text=user_prompt + retry_suffix,
+                    system_prompt=system_prompt,
+                    max_tokens=8000,
+                    temperature=temperature,  # From Wave 1 winning strategy
+                )
+                latency_ms = int((time.monotonic() - start_time) * 1000)
+
+                self._total_calls += 1
+                self._circuit_breaker.record_success()
+
+                # Validate extraction (pass transcript for semantic topic normalization)
+                validation = await self._run_cpu(
+                    validate_extraction,
+                    metadata_dict,
+                    document_text=transcript,
+                    filename=Path(file_path).name,
+                )
+
+                if not validation.hard_failures:
+                    # Passed validation (extracted or needs_review)
+                    break
+
+                if attempt == 0:
+                    logger.warning(
+                        "Hard validation failure for %s (attempt 1), retrying: %s",
+                        file_path, validation.hard_failures,
+                    )
+                # Continue to retry
+
+            except CreditExhaustedException:
+                self._paused_at = self._paused_at or file_path
+                raise  # Stops the pipeline
+
+            except RateLimitException:
+                self._circuit_breaker.record_429()
+                backoff = (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(
+                    "Rate limited on %s, backing off %.1fs (attempt %d)",
+                    file_path, backoff, attempt + 1,
+                )
+                # Exponential backoff via rx.timer (replaces asyncio.sleep)
+                await subscribe_awaitable(rx.timer(backoff))
+
+            except Exception as e:
+                self._circuit_breaker.record_error()
+                logger.error(
+                    "Unexpected error for %s: %s", file_path, e
+                )
+                metadata_dict = None
+                validation = ValidationResult(
+                    status=MetadataStatus.FAILED_VALIDATION,
+                    hard_failures=[str(e)],
+                )
+                break
+
+        if metadata_dict is None or validation is None:
+            return _ProductionOutcome(file_path)
+
+        # Calculate confidence
+        model_confidence = metadata_dict.get("confidence_score", 0.0)
+        try:
+            model_confidence = float(model_confidence)
+        except (TypeError, ValueError):
+            model_confidence = 0.0
+
+        confidence = calculate_confidence(
+            model_confidence=model_confidence,
+            validation=validation,
+            transcript_length=len(transcript),
+        )
+        return _ProductionOutcome(
+            file_path,
+            filename=file_info.get("filename", file_path),
+            metadata=metadata_dict,
+            validation=validation,
+            confidence=confidence,
+            tokens=tokens,
+            latency_ms=latency_ms,
+        )
+
+    async def _serve_cached(
+        self, file_info: dict, transcript: str, entry: CachedExtraction
+    ) -> _ProductionOutcome | None:
+        """Re-validate a cached output; the outcome to write, or None to re-extract."""
+        file_path = file_info["file_path"]
+        metadata = dict(entry.metadata)
+        validation = await self._run_cpu(
+            validate_extraction,
+            metadata,
+            document_text=transcript,
+            filename=Path(file_path).name,
+        )
+        if validation.hard_failures:
+            logger.info(
+                "Cached output for %s no longer validates, re-extracting: %s",
+                file_path, validation.hard_failures,
+            )
+            return None
+        try:
+            model_confidence = float(metadata.get("confidence_score", 0.0))
+        except (TypeError, ValueError):
+            model_confidence = 0.0
+        return _ProductionOutcome(
+            file_path,
+            filename=file_info.get("filename", file_path),
+            metadata=metadata,
+            validation=validation,
+            confidence=calculate_confidence(
+                model_confidence=model_confidence,
+                validation=validation,
+                transcript_length=len(transcript),
+            ),
+            cached=True,
+        )
+
+    async def _run_cpu(self, func, /, *args, **kwargs):
+        """Run CPU-bound work (validation, topic embeddings) off the event loop.
+
+        One dedicated thread, so the lazily loaded embedding model is
+        initialised once and validations do not contend for the GIL.
+        """
+        if self._cpu_executor is None:
+            self._cpu_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="objlib-validate"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._cpu_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def _shutdown_cpu(self) -> None:
+        """Release the ``_run_cpu`` thread; the next run starts a fresh one."""
+        if self._cpu_executor is not None:
+            self._cpu_executor.shutdown(wait=False, cancel_futures=True)
+            self._cpu_executor = None
+
+    @staticmethod
+    def _tally_production_outcome(
+        outcome: _ProductionOutcome, results: dict, prod_state: dict
+    ) -> None:
+        """Count one written result in the run summary and checkpoint lists."""
+        if outcome.validation is None:
+            results["failed"] += 1
+            prod_state["failed"].append(outcome.file_path)
+            return
+
+        status_value = outcome.validation.status.value
+        if status_value == "extracted":
+            results["extracted"] += 1
+            logger.info("✓ Extracted: %s (conf: %.1f%%, %dms%s)",
+                        outcome.filename, outcome.confidence * 100, outcome.latency_ms,
+                        ", cached" if outcome.cached else "")
+        elif status_value == "needs_review":
+            results["needs_review"] += 1
+            logger.info("⚠ Needs review: %s (conf: %.1f%%, %dms%s)",
+                        outcome.filename, outcome.confidence * 100, outcome.latency_ms,
+                        ", cached" if outcome.cached else "")
+        elif status_value == "failed_validation":
+            results["failed"] += 1
+        else:
+            results["partial"] += 1
+
+        results["total_tokens"] += outcome.tokens
+        if not outcome.cached:
+            results["latencies_ms"].append(outcome.latency_ms)
+        prod_state["completed"].append(outcome.file_path)
+
+    def _save_production_batch(
+        self,
+        db: Database,
+        lock: threading.Lock,
+        outcomes: list[_ProductionOutcome],
+        config: dict,
+        cache: ExtractionCache,
+    ) -> None:
+        """Save a batch of production results in one transaction.
+
+        Runs in a worker thread, holding ``lock`` for the whole transaction.
+        Failed outcomes (no metadata) are not written; they only appear in
+        the checkpoint's failed list. Fresh outputs without hard validation
+        failures are also stored in ``cache``.
+        """
+        with lock, db.conn:
+            for outcome in outcomes:
+                if outcome.metadata is None or outcome.validation is None:
+                    continue
+                self._write_production_result(
+                    db,
+                    file_path=outcome.file_path,
+                    metadata=outcome.metadata,
+                    validation=outcome.validation,
+                    confidence=outcome.confidence,
+                    tokens=outcome.tokens,
+                    config=config,
+                )
+                if not outcome.cached and not outcome.validation.hard_failures:
+                    cache.store(outcome.file_path, outcome.metadata, outcome.tokens)
+
+    def _write_production_result(
+        self,
+        db: Database,
         file_path: str,
         metadata: dict,
         validation: ValidationResult,
@@ -693,15 +925,16 @@ class ExtractionOrchestrator:
         tokens: int,
         config: dict,
     ) -> None:
-        """Save a production extraction result to the database atomically.
+        """Write one production extraction result (caller owns the transaction).
 
-        In a single transaction:
+        Run inside the batch transaction of :meth:`_save_production_batch`:
         1. Updates files table: ai_metadata_status, ai_confidence_score
         2. Marks previous metadata versions as not current
         3. Inserts new versioned metadata into file_metadata_ai
         4. Clears and re-inserts primary topics into file_primary_topics
 
         Args:
+            db: Database the batch transaction is open on.
             file_path: File path of the processed file.
             metadata: Raw metadata dict from API response.
             validation: ValidationResult from validate_extraction().
@@ -712,51 +945,50 @@ class ExtractionOrchestrator:
         metadata_json = json.dumps(metadata)
         status = validation.status.value
 
-        with self._db.conn:
-            # 1. Update files table
-            self._db.conn.execute(
-                "UPDATE files SET ai_metadata_status = ?, ai_confidence_score = ? "
-                "WHERE file_path = ?",
-                (status, confidence, file_path),
-            )
+        # 1. Update files table
+        db.conn.execute(
+            "UPDATE files SET ai_metadata_status = ?, ai_confidence_score = ? "
+            "WHERE file_path = ?",
+            (status, confidence, file_path),
+        )
 
-            # 2. Mark previous versions as not current
-            self._db.conn.execute(
-                "UPDATE file_metadata_ai SET is_current = 0 "
-                "WHERE file_path = ? AND is_current = 1",
-                (file_path,),
-            )
+        # 2. Mark previous versions as not current
+        db.conn.execute(
+            "UPDATE file_metadata_ai SET is_current = 0 "
+            "WHERE file_path = ? AND is_current = 1",
+            (file_path,),
+        )
 
-            # 3. Insert new versioned metadata
-            self._db.conn.execute(
-                """INSERT INTO file_metadata_ai
-                   (file_path, metadata_json, model, prompt_version,
-                    extraction_config_hash, is_current)
-                   VALUES (?, ?, ?, ?, ?, 1)""",
-                (
-                    file_path,
-                    metadata_json,
-                    config.get("model", "magistral-medium-latest"),
-                    config.get("prompt_version", PROMPT_VERSION),
-                    config.get("config_hash", ""),
-                ),
-            )
+        # 3. Insert new versioned metadata
+        db.conn.execute(
+            """INSERT INTO file_metadata_ai
+               (file_path, metadata_json, model, prompt_version,
+                extraction_config_hash, is_current)
+               VALUES (?, ?, ?, ?, ?, 1)""",
+            (
+                file_path,
+                metadata_json,
+                config.get("model", "magistral-medium-latest"),
+                config.get("prompt_version", PROMPT_VERSION),
+                config.get("config_hash", ""),
+            ),
+        )
 
-            # 4. Clear old topics and insert new ones
-            self._db.conn.execute(
-                "DELETE FROM file_primary_topics WHERE file_path = ?",
-                (file_path,),
-            )
+        # 4. Clear old topics and insert new ones
+        db.conn.execute(
+            "DELETE FROM file_primary_topics WHERE file_path = ?",
+            (file_path,),
+        )
 
-            primary_topics = metadata.get("primary_topics", [])
-            if isinstance(primary_topics, list):
-                valid_topics = [t for t in primary_topics if t in CONTROLLED_VOCABULARY]
-                for topic in valid_topics:
-                    self._db.conn.execute(
-                        "INSERT INTO file_primary_topics (file_path, topic_tag) "
-                        "VALUES (?, ?)",
-                        (file_path, topic),
-                    )
+        primary_topics = metadata.get("primary_topics", [])
+        if isinstance(primary_topics, list):
+            valid_topics = [t for t in primary_topics if t in CONTROLLED_VOCABULARY]
+            for topic in valid_topics:
+                db.conn.execute(
+                    "INSERT INTO file_primary_topics (file_path, topic_tag) "
+                    "VALUES (?, ?)",
+                    (file_path, topic),
+                )
 
     def _get_pending_extraction_files(self) -> list[dict]:
         """Query files pending AI metadata extraction.
@@ -0,0 +1,342 @@
+"""Staged scheduler for Wave 2 production extraction: prepare -> API -> writer.
+
+``run_production()`` used to handle one file at a time on the event loop:
+read and chunk the transcript, call Mistral, validate, then commit the
+result to SQLite and rewrite the JSON checkpoint before the next file
+could start. The API sat idle during every read and write, and only one
+request was ever in flight however much rate-limit headroom was left.
+
+``ProductionPipeline`` decouples the stages:
+
+* A pool of prepare workers runs ``prepare(item)`` in threads (file read,
+  chunking, prompt building) and feeds a bounded queue, so transcripts
+  are ready before an API slot frees up without reading the whole library
+  ahead.
+* API workers run ``extract(item, prepared)``. The number in flight is
+  capped by ``api_limit()``, re-read before every call, so an
+  :class:`~objlib.upload.concurrency.AIMDConcurrencyController` can grow
+  it while calls succeed and halve it on 429s.
+* One writer task collects results into batches of up to
+  ``write_batch_size`` (or whatever arrived within ``flush_interval``) and
+  hands each batch to ``write(batch)`` -- one transaction and one
+  checkpoint per batch instead of per file.
+
+An exception listed in ``stop_errors`` (credit exhaustion) stops intake:
+queued items are dropped, in-flight calls finish, everything already
+extracted is written, and :meth:`ProductionPipeline.run` re-raises it.
+
+Throughput (files/min, tokens/s) and per-stage percentiles are collected
+in :class:`ProductionStats`. Files/min counts only successful results;
+failure results (``failed(...)`` placeholders and results ``succeeded``
+rejects) are written too but reported separately, since an unreadable
+file fails almost instantly and would inflate the rate.
+
+Usage::
+
+    pipeline = ProductionPipeline(prepare, extract, write, failed=failed,
+                                  api_concurrency=16,
+                                  api_limit=controller.upload_limit)
+    stats = await pipeline.run(files)
+    for line in stats.report_lines():
+        logger.info(line)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from objlib.upload.pipeline import QUEUE_SLACK, StageStats, SlotGate
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_PREPARE_WORKERS = 4
+DEFAULT_WRITE_BATCH_SIZE = 20
+DEFAULT_FLUSH_INTERVAL = 2.0  # Max seconds a result waits for its batch to fill
+
+
+@dataclass
+class ProductionStats:
+    """Result of one :meth:`ProductionPipeline.run`."""
+
+    prepare: StageStats
+    api: StageStats
+    write: StageStats
+    files: int = 0  # Successful results written
+    failed: int = 0  # Failure results written (not in files/min)
+    tokens: int = 0
+    batches: int = 0
+    not_started: int = 0
+    wall_seconds: float = 0.0
+
+    @property
+    def files_per_minute(self) -> float:
+        return self.files * 60 / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.wall_seconds if self.wall_seconds else 0.0
+
+    def throughput(self) -> dict[str, Any]:
+        """Summary fields for ``run_production()`` and the CLI."""
+        low, high = self.api.limit_range
+        return {
+            "files_per_minute": round(self.files_per_minute, 1),
+            "tokens_per_second": round(self.tokens_per_second, 1),
+            "elapsed_seconds": round(self.wall_seconds, 1),
+            "api_concurrency": f"{low}-{high}",
+            "write_batches": self.batches,
+            "failed": self.failed,
+            "not_started": self.not_started,
+        }
+
+    def report_lines(self) -> list[str]:
+        """Human-readable per-stage report for logs."""
+        return [
+            self.prepare.summary(),
+            self.api.summary(),
+            self.write.summary(),
+            f"{self.files} files ({self.failed} failed) in {self.batches} write batches, "
+            f"{self.files_per_minute:.1f} files/min, "
+            f"{self.tokens_per_second:.1f} tokens/s, "
+            f"not started {self.not_started}, wall {self.wall_seconds:.1f}s",
+        ]
+
+
+@dataclass
+class _Job(Generic[T]):
+    item: T
+    prepared: Any = None
+    enqueued_at: float = 0.0
+
+
+class ProductionPipeline(Generic[T, R]):
+    """Three-stage prepare/extract/write scheduler.
+
+    Args:
+        prepare: ``prepare(item)`` runs in a worker thread and returns the
+            payload handed to ``extract``.
+        extract: ``extract(item, prepared)`` makes the API call(s) and
+            returns the result to write.
+        write: ``write(batch)`` persists a list of results; called from a
+            single task, so batches never overlap.
+        failed: ``failed(item, exc)`` builds the result recorded for an
+            item whose prepare or extract step raised.
+        api_concurrency: API workers (upper bound on calls in flight).
+        api_limit: Current cap on calls in flight, re-read before each
+            call (defaults to ``api_concurrency``).
+        prepare_workers: Threads reading and chunking transcripts.
+        write_batch_size: Most results per ``write`` call.
+        flush_interval: Seconds the writer waits for a batch to fill.
+        tokens: Token count of a result, for the throughput report.
+        succeeded: Whether a result from ``extract`` is a success, for the
+            throughput report (defaults to always; ``failed`` results never are).
+        stop_errors: Exceptions from ``extract`` that stop the whole run.
+    """
+
+    def __init__(
+        self,
+        prepare: Callable[[T], Any],
+        extract: Callable[[T, Any], Awaitable[R]],
+        write: Callable[[list[R]], Awaitable[None]],
+        *,
+        failed: Callable[[T, BaseException], R],
+        api_concurrency: int,
+        api_limit: Callable[[], int] | None = None,
+        prepare_workers: int = DEFAULT_PREPARE_WORKERS,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        tokens: Callable[[R], int] | None = None,
+        succeeded: Callable[[R], bool] | None = None,
+        stop_errors: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        if api_concurrency < 1 or prepare_workers < 1 or write_batch_size < 1:
+            raise ValueError("stage concurrency and batch size must be >= 1")
+        self._prepare = prepare
+        self._extract = extract
+        self._write = write
+        self._failed = failed
+        self._write_batch_size = write_batch_size
+        self._flush_interval = flush_interval
+        self._tokens = tokens or (lambda result: 0)
+        self._succeeded = succeeded or (lambda result: True)
+        self._stop_errors = stop_errors
+
+        self.stats = ProductionStats(
+            prepare=StageStats("prepare", prepare_workers),
+            api=StageStats("api", api_concurrency),
+            write=StageStats("write", 1),
+        )
+        self._prepare_q: asyncio.Queue[_Job[T]] = asyncio.Queue(
+            maxsize=prepare_workers * QUEUE_SLACK
+        )
+        self._api_q: asyncio.Queue[_Job[T]] = asyncio.Queue(
+            maxsize=api_concurrency * QUEUE_SLACK
+        )
+        self._write_q: asyncio.Queue[tuple[R, bool]] = asyncio.Queue()  # (result, ok)
+        self._api_gate = SlotGate(api_limit or (lambda: api_concurrency))
+        self._stop: BaseException | None = None
+
+    @property
+    def stopping(self) -> bool:
+        """True once a stop error or a failed write has ended intake."""
+        return self._stop is not None
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, items: Iterable[T]) -> ProductionStats:
+        """Push every item through the three stages; return the stats.
+
+        Raises:
+            The first stop error from ``extract`` or exception from
+            ``write``, after in-flight results have been written.
+        """
+        started = time.monotonic()
+        workers = (
+            [asyncio.create_task(self._prepare_worker())
+             for _ in range(self.stats.prepare.concurrency)]
+            + [asyncio.create_task(self._api_worker())
+               for _ in range(self.stats.api.concurrency)]
+            + [asyncio.create_task(self._writer())]
+        )
+        try:
+            pending = list(items)
+            for i, item in enumerate(pending):
+                if self._stop is not None:
+                    self.stats.not_started += len(pending) - i
+                    break
+                self.stats.prepare.depths.append(self._prepare_q.qsize())
+                await self._prepare_q.put(_Job(item, enqueued_at=time.monotonic()))
+            for queue in (self._prepare_q, self._api_q, self._write_q):
+                await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.stats.wall_seconds = time.monotonic() - started
+        if self._stop is not None:
+            if self.stats.not_started:
+                logger.warning("Extraction stopped, %d files not started",
+                               self.stats.not_started)
+            raise self._stop
+        return self.stats
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _prepare_worker(self) -> None:
+        stage = self.stats.prepare
+        while True:
+            job = await self._prepare_q.get()
+            try:
+                if self._stop is not None:
+                    self.stats.not_started += 1
+                    continue
+                t0 = time.monotonic()
+                stage.waits.append(t0 - job.enqueued_at)
+                try:
+                    job.prepared = await asyncio.to_thread(self._prepare, job.item)
+                except Exception as exc:
+                    stage.failed += 1
+                    await self._write_q.put((self._failed(job.item, exc), False))
+                    continue
+                finally:
+                    stage.latencies.append(time.monotonic() - t0)
+                stage.completed += 1
+                job.enqueued_at = time.monotonic()
+                self.stats.api.depths.append(self._api_q.qsize())
+                await self._api_q.put(job)
+            finally:
+                self._prepare_q.task_done()
+
+    async def _api_worker(self) -> None:
+        stage = self.stats.api
+        while True:
+            job = await self._api_q.get()
+            try:
+                if self._stop is None:
+                    await self._api_gate.acquire(stage)
+                    try:
+                        await self._call(job)
+                    finally:
+                        await self._api_gate.release()
+                else:
+                    self.stats.not_started += 1
+            finally:
+                self._api_q.task_done()
+
+    async def _call(self, job: _Job[T]) -> None:
+        stage = self.stats.api
+        if self._stop is not None:  # Stopped while waiting for a slot
+            self.stats.not_started += 1
+            return
+        t0 = time.monotonic()
+        stage.waits.append(t0 - job.enqueued_at)
+        try:
+            result = await self._extract(job.item, job.prepared)
+        except self._stop_errors as exc:
+            if self._stop is None:
+                self._stop = exc
+            self.stats.not_started += 1
+            return
+        except Exception as exc:
+            logger.error("Extraction task exception: %s", exc)
+            stage.failed += 1
+            entry = (self._failed(job.item, exc), False)
+        else:
+            stage.completed += 1
+            entry = (result, True)
+        finally:
+            stage.latencies.append(time.monotonic() - t0)
+        self.stats.write.depths.append(self._write_q.qsize())
+        await self._write_q.put(entry)
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_q.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._write_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_q.get(), remaining))
+                except TimeoutError:
+                    break
+            await self._flush(batch)
+            for _ in batch:
+                self._write_q.task_done()
+
+    async def _flush(self, entries: list[tuple[R, bool]]) -> None:
+        stage = self.stats.write
+        batch = [result for result, _ in entries]
+        if self._stop is not None and not isinstance(self._stop, self._stop_errors):
+            stage.failed += len(batch)  # An earlier write failed; keep draining
+            return
+        t0 = time.monotonic()
+        try:
+            await self._write(batch)
+        except Exception as exc:
+            logger.error("Writing %d results failed: %s", len(batch), exc)
+            stage.failed += len(batch)
+            self._stop = exc
+            return
+        finally:
+            stage.latencies.append(time.monotonic() - t0)
+        stage.completed += len(batch)
+        self.stats.batches += 1
+        ok = sum(1 for result, extracted in entries if extracted and self._succeeded(result))
+        self.stats.files += ok
+        self.stats.failed += len(batch) - ok
+        self.stats.tokens += sum(self._tokens(result) for result in batch)
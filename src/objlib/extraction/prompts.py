@@ -233,3 +233,46 @@ def hash_extraction_config(
     }
     canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
     return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def production_config_hash() -> str:
+    """Config hash of production extraction (Wave 2 and the Batch API).
+
+    Temperature 1.0, 240s timeout, schema 1.0 and the current controlled
+    vocabulary, as recorded in ``file_metadata_ai.extraction_config_hash``.
+    """
+    vocab_hash = hashlib.sha256(
+        ",".join(_SORTED_VOCABULARY).encode()
+    ).hexdigest()[:16]
+    return hash_extraction_config(
+        temperature=1.0,
+        timeout=240,
+        schema_version="1.0",
+        vocab_hash=vocab_hash,
+    )
+
+
+def hash_prompt_template(system_prompt: str, strategy: str, transcript_policy: str) -> str:
+    """Create a deterministic hash of everything in a prompt except the transcript.
+
+    Used as part of the extraction cache key (see
+    :mod:`objlib.extraction.cache`): any edit to the system prompt or the
+    user-prompt framing changes the hash, so earlier outputs are not reused.
+
+    Args:
+        system_prompt: Complete system prompt sent with every request.
+        strategy: Strategy whose user-prompt framing wraps the transcript.
+        transcript_policy: How the transcript is cut before framing (e.g.
+            ``"chunked-18000"`` or ``"full"``); the same file sent two ways
+            is two different prompts.
+
+    Returns:
+        SHA256 hexdigest truncated to 16 characters.
+    """
+    template = {
+        "system": system_prompt,
+        "user": build_user_prompt("{transcript}", strategy),
+        "transcript": transcript_policy,
+    }
+    canonical = json.dumps(template, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
@@ -0,0 +1,246 @@
+"""Parallel, incremental SHA-256 content hashing for library scans.
+
+``FileScanner.scan()`` used to re-read every file on every run. The
+HashEngine reuses the stored (size, mtime, inode) fingerprint to skip
+files that have not changed since the last scan, and hashes the rest on
+a thread pool. ``hashlib`` releases the GIL while digesting buffers
+larger than 2 KiB, so worker threads overlap disk reads with hashing on
+slow external drives.
+
+Large files (books) are hashed through ``mmap`` in one ``update()`` call;
+smaller files use large sequential reads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024  # 1 MiB sequential reads
+MMAP_THRESHOLD = 8 * 1024 * 1024  # mmap files at or above 8 MiB
+DEFAULT_HASH_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def hash_file(
+    file_path: Path,
+    chunk_size: int = READ_CHUNK_SIZE,
+    mmap_threshold: int = MMAP_THRESHOLD,
+) -> str:
+    """Compute the SHA-256 hex digest of a file.
+
+    Files of at least ``mmap_threshold`` bytes are memory-mapped and hashed
+    in a single call; anything else (or any file mmap refuses) is read in
+    ``chunk_size`` blocks.
+
+    Args:
+        file_path: Path to the file.
+        chunk_size: Read size for the streaming path.
+        mmap_threshold: Minimum size in bytes for the mmap path.
+
+    Returns:
+        Hex digest string, or empty string on permission/read error
+        (same contract as ``FileScanner.compute_hash``).
+    """
+    sha256 = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= mmap_threshold:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        sha256.update(mm)
+                    return sha256.hexdigest()
+                except (ValueError, OSError):
+                    # Fall through to streaming reads (e.g. fake/special files)
+                    f.seek(0)
+            for block in iter(lambda: f.read(chunk_size), b""):
+                sha256.update(block)
+    except PermissionError:
+        logger.warning("Permission denied reading %s", file_path)
+        return ""
+    except OSError as e:
+        logger.warning("Error reading %s: %s", file_path, e)
+        return ""
+    return sha256.hexdigest()
+
+
+@dataclass(slots=True)
+class FileFingerprint:
+    """Stat-derived identity of a file plus the content hash it produced."""
+
+    content_hash: str
+    file_size: int
+    mtime: float | None
+    inode: int | None = None
+
+
+@dataclass
+class HashStats:
+    """Throughput and skip counters for one HashEngine run."""
+
+    files_hashed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    bytes_hashed: int = 0
+    bytes_skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Hashing throughput over wall-clock time (0.0 if nothing hashed)."""
+        if self.elapsed_seconds <= 0 or self.bytes_hashed == 0:
+            return 0.0
+        return self.bytes_hashed / self.elapsed_seconds
+
+    @property
+    def summary(self) -> str:
+        """Human-readable summary of the run."""
+        mb_per_sec = self.bytes_per_second / (1024 * 1024)
+        return (
+            f"hashed={self.files_hashed}, skipped={self.files_skipped}, "
+            f"failed={self.files_failed}, "
+            f"bytes={self.bytes_hashed:,} in {self.elapsed_seconds:.2f}s "
+            f"({mb_per_sec:.1f} MiB/s)"
+        )
+
+
+@dataclass(slots=True)
+class HashResult:
+    """Outcome for one file: its fingerprint and whether it was re-hashed."""
+
+    file_path: str
+    fingerprint: FileFingerprint
+    rehashed: bool = field(default=True)
+
+
+class HashEngine:
+    """Incremental, thread-pooled content hasher.
+
+    Usage::
+
+        engine = HashEngine(workers=8)
+        results = engine.hash_files(paths, known=db.get_file_fingerprints())
+        print(engine.stats.summary)
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_HASH_WORKERS,
+        mmap_threshold: int = MMAP_THRESHOLD,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.mmap_threshold = mmap_threshold
+        self.chunk_size = chunk_size
+        self.stats = HashStats()
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def is_unchanged(stat: os.stat_result, known: FileFingerprint | None) -> bool:
+        """Return True when the stored fingerprint still matches ``stat``.
+
+        Size and mtime must match exactly. The inode is compared only when
+        one was stored -- rows written before inode tracking (or by the
+        sync path) still get the size+mtime shortcut.
+        """
+        if known is None or not known.content_hash or known.mtime is None:
+            return False
+        if stat.st_size != known.file_size:
+            return False
+        if abs(stat.st_mtime - known.mtime) >= 1e-6:
+            return False
+        if known.inode is not None and stat.st_ino != known.inode:
+            return False
+        return True
+
+    def _hash_one(self, path: Path, stat: os.stat_result) -> HashResult | None:
+        content_hash = hash_file(path, self.chunk_size, self.mmap_threshold)
+        with self._stats_lock:
+            if not content_hash:
+                self.stats.files_failed += 1
+                return None
+            self.stats.files_hashed += 1
+            self.stats.bytes_hashed += stat.st_size
+        return HashResult(
+            file_path=str(path),
+            fingerprint=FileFingerprint(
+                content_hash=content_hash,
+                file_size=stat.st_size,
+                mtime=stat.st_mtime,
+                inode=stat.st_ino,
+            ),
+        )
+
+    def hash_files(
+        self,
+        paths: list[Path],
+        known: dict[str, FileFingerprint] | None = None,
+        force: bool = False,
+    ) -> dict[str, HashResult]:
+        """Hash ``paths``, reusing ``known`` fingerprints for unchanged files.
+
+        Args:
+            paths: Files to hash.
+            known: Stored fingerprints keyed by file path string.
+            force: Ignore stored fingerprints and re-hash everything.
+
+        Returns:
+            Dict mapping file path string to HashResult. Files that could
+            not be stat'ed or read are omitted (and logged).
+        """
+        known = known or {}
+        self.stats = HashStats()
+        start = time.perf_counter()
+        results: dict[str, HashResult] = {}
+        to_hash: list[tuple[Path, os.stat_result]] = []
+
+        for path in paths:
+            path_str = str(path)
+            try:
+                stat = path.stat()
+            except OSError as e:
+                logger.warning("Cannot stat %s: %s", path, e)
+                self.stats.files_failed += 1
+                continue
+
+            prior = known.get(path_str)
+            if not force and self.is_unchanged(stat, prior):
+                self.stats.files_skipped += 1
+                self.stats.bytes_skipped += stat.st_size
+                results[path_str] = HashResult(
+                    file_path=path_str,
+                    fingerprint=FileFingerprint(
+                        content_hash=prior.content_hash,  # type: ignore[union-attr]
+                        file_size=stat.st_size,
+                        mtime=stat.st_mtime,
+                        inode=stat.st_ino,
+                    ),
+                    rehashed=False,
+                )
+                continue
+            to_hash.append((path, stat))
+
+        if to_hash:
+            if self.workers == 1 or len(to_hash) == 1:
+                hashed = [self._hash_one(p, s) for p, s in to_hash]
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="objlib-hash"
+                ) as pool:
+                    hashed = list(pool.map(lambda item: self._hash_one(*item), to_hash))
+            for result in hashed:
+                if result is not None:
+                    results[result.file_path] = result
+
+        self.stats.elapsed_seconds = time.perf_counter() - start
+        logger.info("Hashing complete: %s", self.stats.summary)
+        return results
@@ -27,6 +27,8 @@ class FileRecord:
     file_size: int
     metadata_json: str | None = None
     metadata_quality: MetadataQuality = MetadataQuality.UNKNOWN
+    mtime: float | None = None  # Scan fingerprint; None keeps the stored value
+    inode: int | None = None
 
     def to_dict(self) -> dict[str, object]:
         """Convert to dictionary with enum values as strings."""
@@ -57,12 +59,18 @@ class UploadConfig:
     api_key: str | None = None
     max_concurrent_uploads: int = 7
     max_concurrent_polls: int = 20
+    adaptive_concurrency: bool = True  # AIMD-resize the limits above (start values)
+    max_adaptive_uploads: int = 20  # Ceiling for adaptive upload concurrency
+    max_adaptive_polls: int = 50  # Ceiling for adaptive poll concurrency
+    target_error_rate: float = 0.02  # Highest API error rate that still grows concurrency
     batch_size: int = 150
     poll_timeout_seconds: int = 3600
     poll_min_wait: int = 5
     poll_max_wait: int = 60
     rate_limit_tier: str = "tier1"
     recovery_timeout_seconds: int = 14400
+    bulk_recovery: bool = True  # One store listing + one transaction at startup (fsm-upload)
+    dedup_uploads: bool = True  # Upload identical payloads once (fsm-upload, upload/dedup.py)
     db_path: str = "data/library.db"
 
 
@@ -78,6 +86,9 @@ class Citation:
     confidence: float  # Aggregated confidence score (0.0-1.0)
     file_path: str | None = None  # Local file path from SQLite (enriched)
     metadata: dict | None = None  # Full metadata from SQLite (enriched)
+    score: float | None = None  # Tier relevance: BM25, cosine or fused RRF (higher is better)
+    snippet_offsets: tuple[int, int] | None = None  # (start, end) of text in transcript (local tier)
+    shared_paths: list[str] = field(default_factory=list)  # Dedup aliases sharing this document
 
 
 @dataclass
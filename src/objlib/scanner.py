@@ -3,12 +3,13 @@
 Discovers all eligible files in the Objectivism Library, computes
 SHA-256 content hashes, extracts metadata, and detects changes
 against the database state. Uses os.walk() for symlink-safe traversal
-with cycle detection via inode tracking.
+with cycle detection via inode tracking. Hashing is delegated to
+HashEngine, which skips files whose (size, mtime, inode) fingerprint
+is unchanged and hashes the rest on a thread pool.
 """
 
 from __future__ import annotations
 
-import hashlib
 import json
 import logging
 import os
@@ -17,6 +18,7 @@ from pathlib import Path
 
 from objlib.config import ScannerConfig
 from objlib.database import Database
+from objlib.hashing import DEFAULT_HASH_WORKERS, HashEngine, HashStats, hash_file
 from objlib.metadata import MetadataExtractor
 from objlib.models import FileRecord, MetadataQuality
 
@@ -62,10 +64,17 @@ class FileScanner:
         config: ScannerConfig,
         db: Database,
         metadata_extractor: MetadataExtractor,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
     ) -> None:
         self.config = config
         self.db = db
         self.metadata_extractor = metadata_extractor
+        self.hash_engine = HashEngine(workers=hash_workers)
+
+    @property
+    def hash_stats(self) -> HashStats:
+        """Hashing throughput and skip counters from the most recent scan."""
+        return self.hash_engine.stats
 
     def discover_files(self) -> list[Path]:
         """Discover all eligible files recursively from the library root.
@@ -172,6 +181,9 @@ class FileScanner:
     def compute_hash(file_path: Path, buf_size: int = 65536) -> str:
         """Compute SHA-256 hex digest of file content using streaming reads.
 
+        Thin wrapper over :func:`objlib.hashing.hash_file` kept for
+        SyncDetector and other single-file callers.
+
         Args:
             file_path: Path to the file.
             buf_size: Read buffer size in bytes (default 64KB).
@@ -179,49 +191,55 @@ class FileScanner:
         Returns:
             Hex digest string, or empty string on permission error.
         """
-        sha256 = hashlib.sha256()
-        try:
-            with open(file_path, "rb") as f:
-                for block in iter(lambda: f.read(buf_size), b""):
-                    sha256.update(block)
-        except PermissionError:
-            logger.warning("Permission denied reading %s", file_path)
-            return ""
-        except OSError as e:
-            logger.warning("Error reading %s: %s", file_path, e)
-            return ""
-        return sha256.hexdigest()
+        return hash_file(file_path, chunk_size=buf_size)
 
-    def scan(self) -> ChangeSet:
+    def scan(self, force_rehash: bool = False) -> ChangeSet:
         """Run a full scan: discover, hash, extract metadata, detect changes.
 
         Orchestrates the complete scanning pipeline:
         1. Discover eligible files
-        2. Compute hashes and extract metadata for each file
+        2. Hash changed files in parallel (unchanged fingerprints reuse
+           the stored hash) and extract metadata for each file
         3. Detect changes against database state
-        4. Persist new/modified files via UPSERT
+        4. Persist new/modified files via UPSERT, refresh fingerprints
+           for unchanged files
         5. Mark deleted files as LOCAL_DELETE
         6. Log extraction failures
 
+        Args:
+            force_rehash: Ignore stored fingerprints and re-hash every file.
+
         Returns:
             ChangeSet with new/modified/deleted/unchanged file sets.
         """
         files = self.discover_files()
 
+        known = {} if force_rehash else self.db.get_file_fingerprints()
+        hashed = self.hash_engine.hash_files(files, known=known, force=force_rehash)
+
         # Build scan results: {file_path_str: FileRecord}
         scan_results: dict[str, FileRecord] = {}
         extraction_failures: list[tuple[str, str | None, str | None]] = []
+        fingerprint_updates: list[tuple[str, float, int]] = []
 
         for file_path in files:
-            content_hash = self.compute_hash(file_path)
-            if not content_hash:
-                # Hash failed (permission error) -- skip this file
-                continue
-
-            try:
-                file_size = file_path.stat().st_size
-            except OSError:
+            result = hashed.get(str(file_path))
+            if result is None:
+                # Hash or stat failed (permission error) -- skip this file
                 continue
+            fingerprint = result.fingerprint
+
+            # Stored fingerprint predates inode tracking or mtime moved
+            # without a content change: refresh it so the next scan skips.
+            prior = known.get(str(file_path))
+            if (
+                prior is not None
+                and prior.content_hash == fingerprint.content_hash
+                and (prior.mtime != fingerprint.mtime or prior.inode != fingerprint.inode)
+            ):
+                fingerprint_updates.append(
+                    (str(file_path), fingerprint.mtime, fingerprint.inode)
+                )
 
             # Extract metadata
             metadata, quality = self.metadata_extractor.extract(
@@ -248,11 +266,13 @@ class FileScanner:
 
             record = FileRecord(
                 file_path=str(file_path),
-                content_hash=content_hash,
+                content_hash=fingerprint.content_hash,
                 filename=file_path.name,
-                file_size=file_size,
+                file_size=fingerprint.file_size,
                 metadata_json=metadata_json,
                 metadata_quality=quality,
+                mtime=fingerprint.mtime,
+                inode=fingerprint.inode,
             )
             scan_results[str(file_path)] = record
 
@@ -273,6 +293,10 @@ class FileScanner:
                 len(changes.modified),
             )
 
+        self.db.update_file_fingerprints(
+            [u for u in fingerprint_updates if u[0] in changes.unchanged]
+        )
+
         # Mark deleted files
         if changes.deleted:
             # Safety guard: if >50% of library appears deleted, the disk is
@@ -10,11 +10,14 @@ from objlib.search.formatter import (
     display_synthesis,
     score_bar,
 )
+from objlib.search.hybrid import reciprocal_rank_fusion
+from objlib.search.local_index import LocalSearchIndex
 from objlib.search.reranker import apply_difficulty_ordering, rerank_passages
 from objlib.search.synthesizer import apply_mmr_diversity, synthesize_answer, validate_citations
 
 __all__ = [
     "GeminiSearchClient",
+    "LocalSearchIndex",
     "extract_citations",
     "enrich_citations",
     "score_bar",
@@ -26,6 +29,7 @@ __all__ = [
     "load_glossary",
     "rerank_passages",
     "apply_difficulty_ordering",
+    "reciprocal_rank_fusion",
     "synthesize_answer",
     "apply_mmr_diversity",
     "validate_citations",
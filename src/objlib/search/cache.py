@@ -0,0 +1,328 @@
+"""Persistent Gemini File Search result and rerank caches (SQLite, V18/V19).
+
+Every ``GeminiSearchClient.query()`` is a ``generate_content`` call that
+costs seconds and API quota, and the TUI, ``objlib search`` and the audit
+scripts routinely repeat the same queries. This cache stores the trimmed
+response (grounding chunks/supports and response text) keyed by
+(query, metadata_filter, top_k, model, store resource name).
+
+Entries expire three ways:
+
+- **Generation:** triggers on ``files`` bump ``library_config``
+  ``indexed_generation`` whenever a file enters or leaves ``indexed`` (or an
+  indexed file gets a new store document). An entry written at an older
+  generation is a miss, so uploads, syncs and recovery invalidate it without
+  any explicit call.
+- **TTL:** entries older than ``ttl_seconds`` are misses.
+- **LRU:** beyond ``max_entries``, the least recently used rows are evicted.
+
+Lookups run on a pooled read-only connection. Hit and miss counters and
+hit recency (``last_used_at``) are kept in memory and flushed in one
+write transaction on the next ``put()``, every ``FLUSH_EVERY`` lookups or
+``FLUSH_INTERVAL_SECONDS``, and at interpreter exit. The counters are
+persisted in ``library_config`` so ``objlib status`` can report them
+across processes.
+
+``RerankCache`` (schema V19) keeps Gemini Flash rerank scores per
+(normalized query, passage content hash, model). Scores depend only on
+the query and the passage text, so entries never need store-driven
+invalidation; only age and a row bound limit them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+FLUSH_EVERY = 50  # Lookups between bookkeeping flushes
+FLUSH_INTERVAL_SECONDS = 30.0
+RERANK_TTL_SECONDS = 30 * 24 * 3600
+RERANK_MAX_ROWS = 50_000
+
+_GENERATION_SQL = (
+    "SELECT CAST(value AS INTEGER) FROM library_config WHERE key = 'indexed_generation'"
+)
+
+
+def make_cache_key(
+    query: str,
+    metadata_filter: str | None,
+    top_k: int,
+    model: str,
+    store_name: str,
+) -> str:
+    """Stable SHA-256 key for one Gemini File Search request."""
+    raw = json.dumps([query, metadata_filter, top_k, model, store_name])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SearchCacheStats:
+    """Snapshot of the cache for ``objlib status``."""
+
+    entries: int
+    hits: int
+    misses: int
+    generation: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def read_search_cache_stats(conn: sqlite3.Connection) -> SearchCacheStats:
+    """Persisted cache stats read through an already open connection."""
+    config = dict(
+        conn.execute(
+            "SELECT key, CAST(value AS INTEGER) FROM library_config WHERE key IN "
+            "('indexed_generation', 'search_cache_hits', 'search_cache_misses')"
+        ).fetchall()
+    )
+    entries = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+    return SearchCacheStats(
+        entries=entries,
+        hits=config.get("search_cache_hits", 0),
+        misses=config.get("search_cache_misses", 0),
+        generation=config.get("indexed_generation", 0),
+    )
+
+
+class SearchResultCache:
+    """LRU + TTL cache of serialized Gemini search responses.
+
+    Thread-safe: lookups check out a reader and writes the shared writer
+    from the process-wide pool, and the in-memory bookkeeping is guarded
+    by a lock, so it can be called from executor threads.
+
+    Usage::
+
+        cache = SearchResultCache("data/library.db")
+        key = make_cache_key(query, metadata_filter, top_k, model, store_name)
+        payload = cache.get(key)
+        if payload is None:
+            cache.put(key, query, store_name, serialize(response))
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        from objlib.services.pool import get_pool
+
+        self._pool = get_pool(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._hits = 0  # Lookups not yet flushed to library_config
+        self._misses = 0
+        self._touched: dict[str, tuple[float, int]] = {}  # key -> (last hit, hits)
+        self._last_flush = time.monotonic()
+        _live_caches.add(self)
+
+    def get(self, cache_key: str) -> str | None:
+        """Return the cached payload, or None on a miss (counted either way)."""
+        now = time.time()
+        with self._pool.read() as db:
+            conn = db.conn
+            generation = conn.execute(_GENERATION_SQL).fetchone()[0]
+            row = conn.execute(
+                "SELECT payload FROM search_cache "
+                "WHERE cache_key = ? AND generation = ? AND created_at > ?",
+                (cache_key, generation, now - self.ttl_seconds),
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                _, hits = self._touched.get(cache_key, (now, 0))
+                self._touched[cache_key] = (now, hits + 1)
+            due = (
+                self._hits + self._misses >= FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS
+            )
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("Search cache bookkeeping flush failed", exc_info=True)
+        return row[0] if row else None
+
+    def flush(self) -> None:
+        """Write pending hit/miss counters and hit recency to the database."""
+        with self._lock:
+            if not (self._hits or self._misses or self._touched):
+                self._last_flush = time.monotonic()
+                return
+        with self._pool.write() as db, db.conn:
+            self._flush_into(db.conn)
+
+    def _flush_into(self, conn: sqlite3.Connection) -> None:
+        """Apply pending bookkeeping inside the caller's write transaction.
+
+        Pending state is restored if a statement fails; counts applied by a
+        transaction that is rolled back later are lost (they are only stats).
+        """
+        with self._lock:
+            hits, misses, touched = self._hits, self._misses, self._touched
+            self._hits = self._misses = 0
+            self._touched = {}
+            self._last_flush = time.monotonic()
+        try:
+            conn.executemany(
+                "UPDATE library_config SET value = CAST(value AS INTEGER) + ? WHERE key = ?",
+                [(n, key) for n, key in ((hits, "search_cache_hits"),
+                                         (misses, "search_cache_misses")) if n],
+            )
+            conn.executemany(
+                "UPDATE search_cache SET last_used_at = MAX(last_used_at, ?), "
+                "hit_count = hit_count + ? WHERE cache_key = ?",
+                [(used, n, key) for key, (used, n) in touched.items()],
+            )
+        except Exception:
+            with self._lock:
+                self._hits += hits
+                self._misses += misses
+                for key, (used, n) in touched.items():
+                    prev_used, prev_n = self._touched.get(key, (used, 0))
+                    self._touched[key] = (max(used, prev_used), n + prev_n)
+            raise
+
+    def put(self, cache_key: str, query: str, store_name: str, payload: str) -> None:
+        """Store a payload at the current generation and enforce the size bound.
+
+        Entries from older generations are dropped at the same time, since
+        they can never be served again.
+        """
+        now = time.time()
+        with self._pool.write() as db, db.conn:
+            conn = db.conn
+            self._flush_into(conn)  # Recency first, so LRU eviction sees it
+            generation = conn.execute(_GENERATION_SQL).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(cache_key, query, store_name, generation, payload, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, query, store_name, generation, payload, now, now),
+            )
+            conn.execute("DELETE FROM search_cache WHERE generation <> ?", (generation,))
+            conn.execute(
+                "DELETE FROM search_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM search_cache ORDER BY last_used_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed."""
+        with self._pool.write() as db, db.conn:
+            return db.conn.execute("DELETE FROM search_cache").rowcount
+
+    def stats(self) -> SearchCacheStats:
+        """Current entry count, lifetime hit/miss counters and generation.
+
+        Includes this instance's lookups that have not been flushed yet.
+        """
+        with self._pool.read() as db:
+            stats = read_search_cache_stats(db.conn)
+        with self._lock:
+            stats.hits += self._hits
+            stats.misses += self._misses
+        return stats
+
+
+_live_caches: weakref.WeakSet[SearchResultCache] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_caches() -> None:
+    """Persist bookkeeping of caches still alive at interpreter exit."""
+    for cache in list(_live_caches):
+        try:
+            cache.flush()
+        except Exception:
+            logger.debug("Search cache flush at exit failed", exc_info=True)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, for cache keys."""
+    return " ".join(query.lower().split())
+
+
+class RerankCache:
+    """Per-passage rerank scores keyed by (query, passage hash, model).
+
+    Lets repeated queries skip the rerank model call entirely, and
+    queries whose results partly overlap score only the new passages.
+
+    Usage::
+
+        cache = RerankCache("data/library.db")
+        scores = cache.get_scores(query, hashes, model)   # {hash: score}
+        cache.put_scores(query, {h: 8.5}, model)
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl_seconds: float = RERANK_TTL_SECONDS,
+        max_rows: int = RERANK_MAX_ROWS,
+    ) -> None:
+        from objlib.services.pool import get_pool
+
+        self._pool = get_pool(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+
+    def get_scores(self, query: str, passage_hashes: list[str], model: str) -> dict[str, float]:
+        """Return cached scores for whichever of ``passage_hashes`` are known."""
+        if not passage_hashes:
+            return {}
+        placeholders = ",".join("?" * len(passage_hashes))
+        with self._pool.read() as db:
+            rows = db.conn.execute(
+                f"SELECT passage_hash, score FROM rerank_cache "
+                f"WHERE query_key = ? AND model = ? AND created_at > ? "
+                f"AND passage_hash IN ({placeholders})",
+                [normalize_query(query), model, time.time() - self.ttl_seconds, *passage_hashes],
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def put_scores(self, query: str, scores: dict[str, float], model: str) -> None:
+        """Store fresh scores and trim the table to ``max_rows``."""
+        if not scores:
+            return
+        now = time.time()
+        query_key = normalize_query(query)
+        with self._pool.write() as db, db.conn:
+            db.conn.executemany(
+                "INSERT OR REPLACE INTO rerank_cache "
+                "(query_key, passage_hash, model, score, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(query_key, h, model, score, now) for h, score in scores.items()],
+            )
+            db.conn.execute(
+                "DELETE FROM rerank_cache WHERE created_at <= ?", (now - self.ttl_seconds,)
+            )
+            db.conn.execute(
+                "DELETE FROM rerank_cache WHERE (query_key, passage_hash, model) IN ("
+                "SELECT query_key, passage_hash, model FROM rerank_cache "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
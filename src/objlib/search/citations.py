@@ -6,7 +6,10 @@ with local SQLite metadata (course, year, difficulty, etc).
 
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from typing import TYPE_CHECKING, Any
 
 import typer
@@ -137,9 +140,10 @@ def enrich_citations(
     Collects all titles from citations, looks up matching filenames in
     SQLite, and populates ``file_path`` and ``metadata`` on each citation.
 
-    Tries four lookup strategies in order:
+    Tries four lookup strategies in order (1-3 in a single
+    ``Database.resolve_citation_titles`` query):
     1. Lookup by filename (when Gemini returns display_name as title)
-    2. Lookup by store doc prefix (SUBSTR extraction from gemini_store_doc_id;
+    2. Lookup by store doc prefix (indexed gemini_store_doc_prefix column;
        covers all 1,749 indexed files including 1,075 with NULL gemini_file_id)
     3. Lookup by Gemini file ID (when Gemini returns file ID as title)
     4. API fallback via ``files.get()`` for orphaned/duplicate file IDs not
@@ -169,74 +173,120 @@ def enrich_citations(
     if not citations:
         return citations
 
-    titles = [c.title for c in citations if c.title]
+    _apply_db_resolution(citations, db)
+
+    # Fourth pass: API fallback for IDs still unresolved after DB lookups
+    if gemini_client is not None:
+        _apply_api_fallback(citations, db, gemini_client)
+
+    return dedupe_citations(citations)
+
+
+async def enrich_citations_async(
+    citations: list[Citation],
+    open_db: Callable[[], AbstractContextManager[Database]],
+    gemini_client: Any | None = None,
+) -> list[Citation]:
+    """``enrich_citations`` for the event loop, with an async API fallback.
+
+    The database passes are single indexed queries and run inline; a
+    connection is only held while they run. The Files API fallback
+    issues every ``client.aio.files.get()`` concurrently instead of one
+    blocking call per orphaned ID, and is cancelled with the caller.
+
+    Args:
+        citations: List of Citation objects (mutated in place).
+        open_db: Zero-argument context manager yielding a Database
+            (e.g. ``get_pool(db_path).read``).
+        gemini_client: Optional ``genai.Client`` for the API fallback.
+
+    Returns:
+        Deduplicated list of enriched citations.
+    """
+    if not citations:
+        return citations
 
-    # First pass: lookup by filename
-    filename_lookup = db.get_file_metadata_by_filenames(titles)
-
-    # Second pass: for unmatched titles, try store doc prefix lookup
-    # (covers all indexed files including those with NULL gemini_file_id)
-    unmatched_after_filename = [t for t in titles if t not in filename_lookup]
-    store_prefix_lookup = (
-        db.get_file_metadata_by_store_doc_prefix(unmatched_after_filename)
-        if unmatched_after_filename
-        else {}
-    )
-
-    # Third pass: for still-unmatched, try gemini_file_id lookup
-    unmatched_after_prefix = [
-        t for t in unmatched_after_filename if t not in store_prefix_lookup
-    ]
-    gemini_id_lookup = (
-        db.get_file_metadata_by_gemini_ids(unmatched_after_prefix)
-        if unmatched_after_prefix
-        else {}
-    )
+    with open_db() as db:
+        _apply_db_resolution(citations, db)
+
+    raw_ids = sorted({c.title for c in citations if c.title and not is_resolved(c)})
+    if gemini_client is not None and raw_ids:
+
+        async def _display_name(raw_id: str) -> str | None:
+            full_id = raw_id if raw_id.startswith("files/") else f"files/{raw_id}"
+            try:
+                file_obj = await gemini_client.aio.files.get(name=full_id)
+            except Exception:
+                return None  # Best-effort: API errors silently ignored
+            return getattr(file_obj, "display_name", None)
+
+        names = await asyncio.gather(*(_display_name(raw_id) for raw_id in raw_ids))
+        display_names = {raw_id: name for raw_id, name in zip(raw_ids, names) if name}
+        if display_names:
+            with open_db() as db:
+                matches = db.get_file_metadata_by_filenames(sorted(set(display_names.values())))
+            for citation in citations:
+                display_name = display_names.get(citation.title)
+                match = matches.get(display_name) if display_name else None
+                if match:
+                    citation.title = display_name
+                    citation.file_path = match["file_path"]
+                    citation.metadata = match["metadata"]
+
+    return dedupe_citations(citations)
+
+
+def _apply_db_resolution(citations: list[Citation], db: Database) -> None:
+    """Passes 1-3: resolve titles by filename, store doc prefix or file ID.
+
+    All three strategies run in one indexed query; earlier strategies take
+    precedence per title. Resolved citations also get the paths that share
+    their document through upload dedup (``shared_paths``).
+    """
+    titles = [c.title for c in citations if c.title]
+    resolved = db.resolve_citation_titles(titles)
 
     for citation in citations:
-        # Try filename lookup first
-        match = filename_lookup.get(citation.title)
-        if match:
-            citation.file_path = match["file_path"]
-            citation.metadata = match["metadata"]
+        match = resolved.get(citation.title)
+        if not match:
             continue
+        if match["matched_by"] != "filename":
+            # Prefix / file ID titles are replaced with the actual filename
+            citation.title = match["filename"]
+        citation.file_path = match["file_path"]
+        citation.metadata = match["metadata"]
+
+    # A deduplicated document stands for its canonical file and every alias
+    shared = db.get_shared_paths([c.file_path for c in citations if c.file_path])
+    for citation in citations:
+        if citation.file_path in shared:
+            citation.shared_paths = shared[citation.file_path]
 
-        # Try store doc prefix lookup
-        prefix_match = store_prefix_lookup.get(citation.title)
-        if prefix_match:
-            citation.title = prefix_match["filename"]
-            citation.file_path = prefix_match["file_path"]
-            citation.metadata = prefix_match["metadata"]
-            continue
 
-        # Fall back to Gemini file ID lookup
-        gemini_match = gemini_id_lookup.get(citation.title)
-        if gemini_match:
-            # Update citation title to the actual filename
-            citation.title = gemini_match["filename"]
-            citation.file_path = gemini_match["file_path"]
-            citation.metadata = gemini_match["metadata"]
+def passage_key(citation: Citation) -> str:
+    """Key identifying a passage across results: its first 100 chars, normalized."""
+    return citation.text[:100].strip().lower()
 
-    # Fourth pass: API fallback for IDs still unresolved after DB lookups
-    if gemini_client is not None:
-        _apply_api_fallback(citations, db, gemini_client)
 
-    # Deduplicate by passage text: keep enriched citations over raw-ID ones.
-    # A citation is "resolved" when its title contains a "." (looks like a filename).
+def is_resolved(citation: Citation) -> bool:
+    """Whether a citation's title is a filename (contains a ".") rather than a raw Gemini ID."""
+    return "." in citation.title
+
+
+def dedupe_citations(citations: list[Citation]) -> list[Citation]:
+    """Drop citations that repeat an earlier passage.
+
+    When two citations share a ``passage_key``, the resolved
+    (filename-titled) one is kept; otherwise the first wins. Surviving
+    citations keep their original relative order.
+    """
     seen_text: dict[str, Citation] = {}  # passage_key -> best citation so far
     for citation in citations:
-        passage_key = citation.text[:100].strip().lower()
-        existing = seen_text.get(passage_key)
-        if existing is None:
-            seen_text[passage_key] = citation
-        else:
-            # Prefer the one with a resolved filename (has "." in title)
-            existing_resolved = "." in existing.title
-            current_resolved = "." in citation.title
-            if current_resolved and not existing_resolved:
-                seen_text[passage_key] = citation
+        key = passage_key(citation)
+        existing = seen_text.get(key)
+        if existing is None or (is_resolved(citation) and not is_resolved(existing)):
+            seen_text[key] = citation
 
-    # Rebuild list preserving original relative order
     kept = set(id(c) for c in seen_text.values())
     return [c for c in citations if id(c) in kept]
 
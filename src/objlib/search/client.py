@@ -1,26 +1,52 @@
 """Gemini File Search query client with retry logic.
 
 Provides a client for querying Gemini File Search stores via
-``generate_content()`` with the ``FileSearch`` tool. Includes
-automatic retry with exponential backoff via RxPY observable.
+``generate_content()`` with the ``FileSearch`` tool. The async path uses
+the SDK's native ``client.aio`` API with in-task retry and exponential
+backoff, so cancellation reaches the HTTP request.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from google import genai
 from google.genai import types
 from rich.console import Console
 
-from objlib.upload._operators import make_retrying_observable, subscribe_awaitable
+from objlib.search.cache import make_cache_key
+from objlib.upload._operators import retry_async
+
+if TYPE_CHECKING:
+    from objlib.search.cache import SearchResultCache
 
 logger = logging.getLogger(__name__)
 console = Console()
 
 
+def _cache_payload(response: Any) -> str | None:
+    """Serialize the parts of a response that search consumers read.
+
+    Keeps the first candidate's content (response text) and grounding
+    metadata (chunks and supports). Returns None for responses that are
+    not worth caching (no candidates, or not a ``GenerateContentResponse``).
+    """
+    if not isinstance(response, types.GenerateContentResponse) or not response.candidates:
+        return None
+    candidate = response.candidates[0]
+    trimmed = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=candidate.content,
+                grounding_metadata=candidate.grounding_metadata,
+            )
+        ]
+    )
+    return trimmed.model_dump_json(exclude_none=True)
+
+
 class GeminiSearchClient:
     """Client for querying Gemini File Search stores.
 
@@ -33,11 +59,20 @@ class GeminiSearchClient:
         store_name = GeminiSearchClient.resolve_store_name(client, "my-store")
         search = GeminiSearchClient(client, store_name)
         response = await search.query_with_retry("What is the nature of rights?")
+
+    When a ``SearchResultCache`` is supplied, ``query()`` serves repeated
+    requests from it and only calls the API on a miss.
     """
 
-    def __init__(self, client: genai.Client, store_resource_name: str) -> None:
+    def __init__(
+        self,
+        client: genai.Client,
+        store_resource_name: str,
+        cache: SearchResultCache | None = None,
+    ) -> None:
         self._client = client
         self._store_resource_name = store_resource_name
+        self._cache = cache
 
     def query(
         self,
@@ -46,7 +81,7 @@ class GeminiSearchClient:
         top_k: int = 20,
         model: str = "gemini-2.5-flash",
     ) -> Any:
-        """Query the File Search store via generate_content.
+        """Query the File Search store via generate_content (blocking).
 
         Args:
             query: Natural language search query.
@@ -55,25 +90,59 @@ class GeminiSearchClient:
             model: Gemini model to use.
 
         Returns:
-            GenerateContentResponse from Gemini.
+            GenerateContentResponse from Gemini (trimmed to content and
+            grounding metadata when served from the cache).
         """
-        config = types.GenerateContentConfig(
-            tools=[
-                types.Tool(
-                    file_search=types.FileSearch(
-                        file_search_store_names=[self._store_resource_name],
-                        metadata_filter=metadata_filter,
-                        top_k=top_k,
-                    )
-                )
-            ],
+        cache_key, cached = self._cache_lookup(query, metadata_filter, top_k, model)
+        if cached is not None:
+            return cached
+
+        response = self._client.models.generate_content(
+            model=model,
+            contents=query,
+            config=self._config(metadata_filter, top_k),
         )
+        self._cache_store(cache_key, query, response)
+        return response
+
+    async def aquery(
+        self,
+        query: str,
+        metadata_filter: str | None = None,
+        top_k: int = 20,
+        model: str = "gemini-2.5-flash",
+    ) -> Any:
+        """Async ``query()`` on the SDK's native ``client.aio`` API.
+
+        The API call runs on the event loop without a thread hop;
+        cancelling the awaiting task aborts the in-flight HTTP request.
+        Cache reads and writes are SQLite calls and run in a worker thread.
+
+        Args:
+            query: Natural language search query.
+            metadata_filter: Optional AIP-160 filter string.
+            top_k: Maximum number of citation chunks to retrieve (default 20).
+            model: Gemini model to use.
 
-        return self._client.models.generate_content(
+        Returns:
+            GenerateContentResponse from Gemini.
+        """
+        cache_key, cached = None, None
+        if self._cache is not None:
+            cache_key, cached = await asyncio.to_thread(
+                self._cache_lookup, query, metadata_filter, top_k, model
+            )
+        if cached is not None:
+            return cached
+
+        response = await self._client.aio.models.generate_content(
             model=model,
             contents=query,
-            config=config,
+            config=self._config(metadata_filter, top_k),
         )
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache_store, cache_key, query, response)
+        return response
 
     async def query_with_retry(
         self,
@@ -84,11 +153,9 @@ class GeminiSearchClient:
     ) -> Any:
         """Query with automatic retry (3 attempts, exponential backoff).
 
-        Uses RxPY make_retrying_observable with exponential backoff
-        (base_delay=0.5s, delays ~0.5s, 1s, 2s).
-
-        The sync ``query()`` call is offloaded to a thread executor to
-        avoid blocking the event loop.
+        Retries ``aquery()`` in the caller's task via ``retry_async``
+        (base_delay=0.5s, delays ~0.5s, 1s, 2s), so cancellation reaches
+        the in-flight request and any pending backoff.
 
         Args:
             query: Natural language search query.
@@ -102,19 +169,53 @@ class GeminiSearchClient:
         Raises:
             Exception: After 3 failed attempts, the last exception is reraised.
         """
-        loop = asyncio.get_event_loop()
-
-        async def _attempt() -> Any:
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.query(
-                    query, metadata_filter=metadata_filter, top_k=top_k, model=model
-                ),
-            )
-            return result
+        return await retry_async(
+            lambda: self.aquery(query, metadata_filter=metadata_filter, top_k=top_k, model=model),
+            max_retries=2,
+            base_delay=0.5,
+        )
+
+    def _config(self, metadata_filter: str | None, top_k: int) -> types.GenerateContentConfig:
+        """Build the FileSearch tool config for one query."""
+        return types.GenerateContentConfig(
+            tools=[
+                types.Tool(
+                    file_search=types.FileSearch(
+                        file_search_store_names=[self._store_resource_name],
+                        metadata_filter=metadata_filter,
+                        top_k=top_k,
+                    )
+                )
+            ],
+        )
 
-        obs = make_retrying_observable(_attempt, max_retries=2, base_delay=0.5)
-        return await subscribe_awaitable(obs)
+    def _cache_lookup(
+        self, query: str, metadata_filter: str | None, top_k: int, model: str
+    ) -> tuple[str | None, Any | None]:
+        """Return (cache key, cached response); both None without a cache."""
+        if self._cache is None:
+            return None, None
+        cache_key = make_cache_key(query, metadata_filter, top_k, model, self._store_resource_name)
+        try:
+            payload = self._cache.get(cache_key)
+        except Exception:
+            logger.warning("Search cache lookup failed", exc_info=True)
+            return cache_key, None
+        if payload is None:
+            return cache_key, None
+        return cache_key, types.GenerateContentResponse.model_validate_json(payload)
+
+    def _cache_store(self, cache_key: str | None, query: str, response: Any) -> None:
+        """Write a fresh response to the cache (best-effort)."""
+        if cache_key is None:
+            return
+        payload = _cache_payload(response)
+        if payload is None:
+            return
+        try:
+            self._cache.put(cache_key, query, self._store_resource_name, payload)
+        except Exception:
+            logger.warning("Search cache write failed", exc_info=True)
 
     @staticmethod
     def resolve_store_name(client: genai.Client, display_name: str) -> str:
@@ -0,0 +1,457 @@
+"""On-disk passage embedding index for local semantic search.
+
+Transcripts are split into overlapping passages, embedded with the same
+sentence-transformers model the topic selector uses (all-MiniLM-L6-v2,
+via ``extraction.topic_selector._get_model``) and stored as a float16
+NumPy matrix that is memory-mapped at query time. The id map lives in
+the ``embedding_passages`` table (schema V17): ``row_id`` is the matrix
+row, plus the file, content hash and character span of the passage.
+
+Refreshes are keyed by ``content_hash``: only files whose hash changed
+are re-embedded; each file's vectors are spooled to disk as they are
+encoded, and both they and the unchanged rows are copied block-wise into
+the new matrix, so a full build never holds the library's vectors in
+RAM. The new matrix is written under a fresh name and swapped in by the
+same SQLite transaction that rewrites the id map, so a crash never
+leaves the map pointing at the wrong rows.
+
+Search is a blocked cosine top-k: rows are converted to float32 one
+block at a time, so resident memory stays bounded by the block size no
+matter how many passages the matrix holds.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from objlib.database import Database, metadata_filter_clauses
+from objlib.models import Citation
+from objlib.search.local_index import _read_transcript
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+CHUNK_CHARS = 1000  # ~200-250 tokens, inside MiniLM's 256-token window
+CHUNK_OVERLAP = 200
+SEARCH_BLOCK_ROWS = 16384  # rows converted to float32 per step (~25 MB at 384 dims)
+COPY_BLOCK_ROWS = 65536
+
+_CONFIG_MATRIX_KEY = "embedding_matrix"
+_CONFIG_MODEL_KEY = "embedding_model"
+
+Encoder = Callable[[list[str]], np.ndarray]
+
+
+def _default_encoder(texts: list[str]) -> np.ndarray:
+    from objlib.extraction.topic_selector import _get_model
+
+    return _get_model().encode(
+        texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+    )
+
+
+def _last_space(text: str, lo: int, hi: int) -> int:
+    return max(text.rfind(" ", lo, hi), text.rfind("\n", lo, hi))
+
+
+def chunk_passages(
+    text: str,
+    chunk_chars: int = CHUNK_CHARS,
+    overlap: int = CHUNK_OVERLAP,
+) -> list[tuple[int, int]]:
+    """Split text into overlapping passages on whitespace boundaries.
+
+    Args:
+        text: Full transcript text.
+        chunk_chars: Target passage length in characters.
+        overlap: Characters shared between consecutive passages.
+
+    Returns:
+        List of (start, end) character spans; whitespace-only spans are
+        dropped.
+    """
+    spans: list[tuple[int, int]] = []
+    n = len(text)
+    start = 0
+    while start < n:
+        end = min(n, start + chunk_chars)
+        if end < n:
+            cut = _last_space(text, start + chunk_chars * 4 // 5, end)
+            if cut > start:
+                end = cut
+        if text[start:end].strip():
+            spans.append((start, end))
+        if end >= n:
+            break
+        next_start = max(start + 1, end - overlap)
+        space = _last_space(text, next_start - overlap // 2, next_start)
+        start = space + 1 if space > start else next_start
+    return spans
+
+
+def top_k_cosine(
+    matrix: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    mask: np.ndarray | None = None,
+    block_rows: int = SEARCH_BLOCK_ROWS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Blocked top-k dot product over a (possibly memory-mapped) matrix.
+
+    Rows are expected to be L2-normalized, so the dot product with a
+    normalized query is the cosine similarity.
+
+    Args:
+        matrix: (N, D) float16/float32 array, typically ``np.load(mmap_mode="r")``.
+        query: (D,) query vector.
+        k: Number of results.
+        mask: Optional (N,) bool array; False rows are never returned.
+        block_rows: Rows converted to float32 per step.
+
+    Returns:
+        Tuple of (row indices, scores), best first.
+    """
+    n = matrix.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    q = np.asarray(query, dtype=np.float32)
+    scores = np.empty(n, dtype=np.float32)
+    buf = np.empty((min(block_rows, n), matrix.shape[1]), dtype=np.float32)
+    for lo in range(0, n, block_rows):
+        hi = min(n, lo + block_rows)
+        block = buf[: hi - lo]
+        np.copyto(block, matrix[lo:hi])
+        np.dot(block, q, out=scores[lo:hi])
+    if mask is not None:
+        scores[~mask] = -np.inf
+
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    top = top[np.isfinite(scores[top])]
+    return top, scores[top]
+
+
+@dataclass
+class EmbeddingIndexStats:
+    """Counters for one EmbeddingIndex.refresh() run."""
+
+    files_embedded: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    files_failed: int = 0
+    passages_embedded: int = 0
+    passages_total: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def summary(self) -> str:
+        """Human-readable summary of the run."""
+        return (
+            f"embedded={self.files_embedded} files/{self.passages_embedded} passages, "
+            f"unchanged={self.files_unchanged}, removed={self.files_removed}, "
+            f"failed={self.files_failed}, total={self.passages_total} passages "
+            f"in {self.elapsed_seconds:.2f}s"
+        )
+
+
+class EmbeddingIndex:
+    """Memory-mapped float16 passage embeddings with cosine top-k search.
+
+    Usage::
+
+        index = EmbeddingIndex(db)              # matrix under <db dir>/embeddings/
+        index.refresh()                         # re-embeds changed files only
+        citations = index.search("free will and volition", limit=10)
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        index_dir: Path | None = None,
+        encode: Encoder | None = None,
+        model_name: str = DEFAULT_MODEL_NAME,
+    ) -> None:
+        self.db = db
+        self.index_dir = Path(index_dir) if index_dir else Path(db.db_path).parent / "embeddings"
+        self.model_name = model_name
+        self._encode = encode or _default_encoder
+
+    # ------------------------------------------------------------------
+    # Matrix file
+    # ------------------------------------------------------------------
+
+    def _matrix_path(self) -> Path | None:
+        name = self.db.get_library_config(_CONFIG_MATRIX_KEY)
+        return self.index_dir / name if name else None
+
+    def open_matrix(self) -> np.ndarray | None:
+        """Memory-map the current matrix read-only (None if not built)."""
+        path = self._matrix_path()
+        if path is None or not path.exists():
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def passage_count(self) -> int:
+        """Number of passages in the id map."""
+        return self.db.conn.execute("SELECT COUNT(*) FROM embedding_passages").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def refresh(
+        self,
+        read_text: Callable[[str], str | None] = _read_transcript,
+    ) -> EmbeddingIndexStats:
+        """Re-embed files whose content_hash changed and drop deleted ones.
+
+        Unreadable files keep their existing passages. Switching
+        ``model_name`` re-embeds everything.
+
+        Args:
+            read_text: Callable returning a file's text, or None on error.
+
+        Returns:
+            EmbeddingIndexStats for this run.
+        """
+        stats = EmbeddingIndexStats()
+        start = time.perf_counter()
+        conn = self.db.conn
+
+        current = {
+            row["file_path"]: row["content_hash"]
+            for row in conn.execute(
+                "SELECT file_path, content_hash FROM files WHERE NOT is_deleted"
+            )
+        }
+        same_model = self.db.get_library_config(_CONFIG_MODEL_KEY) == self.model_name
+        old_matrix = self.open_matrix() if same_model else None
+        indexed: dict[str, str] = {}
+        if old_matrix is not None:
+            indexed = {
+                row["file_path"]: row["content_hash"]
+                for row in conn.execute(
+                    "SELECT DISTINCT file_path, content_hash FROM embedding_passages"
+                )
+            }
+
+        stale = [fp for fp, h in current.items() if indexed.get(fp) != h]
+        removed = {fp for fp in indexed if fp not in current}
+        stats.files_unchanged = len(current) - len(stale)
+        stats.files_removed = len(removed)
+
+        # Embed changed files; unreadable ones keep their old passages. Each
+        # file's vectors are appended to a float16 spool as soon as they are
+        # encoded, so memory holds one file's vectors, not the whole library's.
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        token = uuid.uuid4().hex[:12]
+        spool_path = self.index_dir / f"passages-{token}.f16.spool"
+        try:
+            new_rows: list[tuple[str, str, int, int]] = []
+            replaced: set[str] = set()
+            dim: int | None = None
+            with spool_path.open("wb") as spool:
+                for file_path in stale:
+                    text = read_text(file_path)
+                    if text is None:
+                        stats.files_failed += 1
+                        continue
+                    replaced.add(file_path)
+                    spans = chunk_passages(text)
+                    if not spans:
+                        continue
+                    vectors = np.asarray(
+                        self._encode([text[s:e] for s, e in spans]), dtype=np.float32
+                    )
+                    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                    vectors /= np.where(norms == 0, 1, norms)
+                    spool.write(vectors.astype(np.float16).tobytes())
+                    dim = vectors.shape[1]
+                    new_rows.extend((file_path, current[file_path], s, e) for s, e in spans)
+                    stats.files_embedded += 1
+            stats.passages_embedded = len(new_rows)
+
+            if not replaced and not removed and old_matrix is not None:
+                stats.passages_total = old_matrix.shape[0]
+                stats.elapsed_seconds = time.perf_counter() - start
+                return stats
+
+            kept = [
+                row
+                for row in conn.execute(
+                    "SELECT row_id, file_path, content_hash, char_start, char_end "
+                    "FROM embedding_passages ORDER BY row_id"
+                )
+                if row["file_path"] not in replaced and row["file_path"] not in removed
+            ] if old_matrix is not None else []
+
+            old_path = self._matrix_path()
+            total = len(kept) + len(new_rows)
+            if total == 0:
+                with conn:
+                    conn.execute("DELETE FROM embedding_passages")
+                    conn.execute(
+                        "DELETE FROM library_config WHERE key = ?", (_CONFIG_MATRIX_KEY,)
+                    )
+                del old_matrix
+                if old_path is not None:
+                    old_path.unlink(missing_ok=True)
+                stats.elapsed_seconds = time.perf_counter() - start
+                return stats
+
+            dim = dim if dim is not None else old_matrix.shape[1]
+            new_name = f"passages-{token}.f16.npy"
+            new_path = self.index_dir / new_name
+            out = np.lib.format.open_memmap(
+                new_path, mode="w+", dtype=np.float16, shape=(total, dim)
+            )
+            kept_ids = np.fromiter(
+                (row["row_id"] for row in kept), dtype=np.int64, count=len(kept)
+            )
+            for lo in range(0, len(kept_ids), COPY_BLOCK_ROWS):
+                ids = kept_ids[lo:lo + COPY_BLOCK_ROWS]
+                out[lo:lo + len(ids)] = old_matrix[ids]
+            if new_rows:
+                spooled = np.memmap(
+                    spool_path, dtype=np.float16, mode="r", shape=(len(new_rows), dim)
+                )
+                for lo in range(0, len(new_rows), COPY_BLOCK_ROWS):
+                    block = spooled[lo:lo + COPY_BLOCK_ROWS]
+                    out[len(kept) + lo:len(kept) + lo + len(block)] = block
+                del spooled
+            out.flush()
+            del out
+        finally:
+            spool_path.unlink(missing_ok=True)
+
+        with conn:
+            conn.execute("DELETE FROM embedding_passages")
+            conn.executemany(
+                "INSERT INTO embedding_passages(row_id, file_path, content_hash, char_start, char_end) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (i, fp, h, s, e)
+                    for i, (fp, h, s, e) in enumerate(
+                        [(r["file_path"], r["content_hash"], r["char_start"], r["char_end"]) for r in kept]
+                        + new_rows
+                    )
+                ),
+            )
+            for key, value in ((_CONFIG_MATRIX_KEY, new_name), (_CONFIG_MODEL_KEY, self.model_name)):
+                conn.execute(
+                    "INSERT OR REPLACE INTO library_config (key, value, updated_at) "
+                    "VALUES (?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now'))",
+                    (key, value),
+                )
+
+        del old_matrix
+        if old_path is not None and old_path != new_path:
+            old_path.unlink(missing_ok=True)
+
+        stats.passages_total = total
+        stats.elapsed_seconds = time.perf_counter() - start
+        logger.info("Embedding index refresh: %s", stats.summary)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: dict[str, str] | None = None,
+    ) -> list[Citation]:
+        """Return the passages most similar to ``query``.
+
+        Args:
+            query: Natural language query.
+            limit: Maximum number of citations.
+            filters: Optional metadata filters, as for
+                ``Database.filter_files_by_metadata``.
+
+        Returns:
+            Citations best first. ``score`` and ``confidence`` hold the
+            cosine similarity; ``snippet_offsets`` the passage span.
+
+        Raises:
+            ValueError: If an unknown filter field is provided.
+        """
+        matrix = self.open_matrix()
+        if matrix is None or matrix.shape[0] == 0 or not query.strip():
+            return []
+
+        mask = None
+        if filters:
+            where_parts, params = metadata_filter_clauses(filters)
+            mask = np.zeros(matrix.shape[0], dtype=bool)
+            allowed = [
+                row[0]
+                for row in self.db.conn.execute(
+                    "SELECT ep.row_id FROM embedding_passages ep "
+                    "JOIN files ON files.file_path = ep.file_path "
+                    f"WHERE NOT is_deleted AND {' AND '.join(where_parts)}",
+                    params,
+                )
+            ]
+            mask[np.asarray(allowed, dtype=np.int64)] = True
+
+        q = np.asarray(self._encode([query]), dtype=np.float32)[0]
+        q /= np.linalg.norm(q) or 1.0
+        rows, scores = top_k_cosine(matrix, q, limit, mask)
+        if len(rows) == 0:
+            return []
+
+        placeholders = ",".join("?" * len(rows))
+        passages = {
+            row["row_id"]: row
+            for row in self.db.conn.execute(
+                f"""SELECT ep.row_id, ep.file_path, ep.content_hash, ep.char_start, ep.char_end,
+                           f.filename, f.metadata_json,
+                           substr(tf.content, ep.char_start + 1, ep.char_end - ep.char_start) AS text
+                    FROM embedding_passages ep
+                    JOIN files f ON f.file_path = ep.file_path
+                    LEFT JOIN transcript_index ti
+                           ON ti.file_path = ep.file_path AND ti.content_hash = ep.content_hash
+                    LEFT JOIN transcript_fts tf ON tf.rowid = ti.doc_id
+                    WHERE ep.row_id IN ({placeholders})""",
+                [int(r) for r in rows],
+            )
+        }
+
+        citations: list[Citation] = []
+        for rank, (row_id, score) in enumerate(zip(rows, scores), start=1):
+            p = passages.get(int(row_id))
+            if p is None:
+                continue
+            text = p["text"]
+            if text is None:
+                # Local FTS index not built for this version: read from disk
+                full = _read_transcript(p["file_path"]) or ""
+                text = full[p["char_start"]:p["char_end"]]
+            citations.append(
+                Citation(
+                    index=rank,
+                    title=p["filename"],
+                    uri=None,
+                    text=text,
+                    document_name=None,
+                    confidence=max(0.0, min(1.0, float(score))),
+                    file_path=p["file_path"],
+                    metadata=json.loads(p["metadata_json"]) if p["metadata_json"] else {},
+                    score=float(score),
+                    snippet_offsets=(p["char_start"], p["char_end"]),
+                )
+            )
+        return citations
@@ -186,6 +186,8 @@ def display_detailed_view(
         lines.append(f"[bold]File:[/bold]       {citation.file_path}")
     elif citation.title:
         lines.append(f"[bold]File:[/bold]       {citation.title}")
+    for shared_path in citation.shared_paths:
+        lines.append(f"[bold]Also at:[/bold]    {shared_path}")
 
     course = meta.get("course", "")
     if course:
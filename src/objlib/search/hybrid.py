@@ -0,0 +1,60 @@
+"""Hybrid retrieval: reciprocal rank fusion of Gemini and local tiers.
+
+Gemini File Search, the local FTS5 index and the passage embedding
+index score relevance on incomparable scales (grounding confidence,
+BM25, cosine). Reciprocal rank fusion ignores the raw scores and sums
+``1 / (k + rank)`` over every tier that returned a passage, so passages
+that several tiers agree on rise to the top while a file only one tier
+can find (e.g. one Gemini structurally fails to retrieve) still makes
+the list.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from objlib.models import Citation
+from objlib.search.citations import is_resolved, passage_key
+
+RRF_K = 60  # Rank damping constant (Cormack et al., 2009)
+
+
+def reciprocal_rank_fusion(
+    ranked: dict[str, list[Citation]],
+    k: int = RRF_K,
+    limit: int | None = None,
+) -> list[Citation]:
+    """Merge per-tier ranked citation lists into one list.
+
+    Passages are identified by ``passage_key`` (the same key
+    ``enrich_citations`` deduplicates on); when tiers return the same
+    passage, the resolved (filename-titled) citation represents it.
+
+    Args:
+        ranked: Tier name -> citations, best first. Dict order breaks
+            score ties (earlier tiers win).
+        k: RRF damping constant; larger values flatten rank differences.
+        limit: Maximum number of citations to return.
+
+    Returns:
+        New Citation objects, best first, renumbered from 1, with
+        ``score`` set to the fused RRF score. Inputs are not mutated.
+    """
+    scores: dict[str, float] = {}
+    best: dict[str, Citation] = {}
+    for citations in ranked.values():
+        for rank, citation in enumerate(citations, start=1):
+            key = passage_key(citation)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            existing = best.get(key)
+            if existing is None or (is_resolved(citation) and not is_resolved(existing)):
+                best[key] = citation
+
+    # sorted() is stable: ties keep first-seen order
+    ordered = sorted(scores, key=lambda key: scores[key], reverse=True)
+    if limit is not None:
+        ordered = ordered[:limit]
+    return [
+        replace(best[key], index=i, score=scores[key])
+        for i, key in enumerate(ordered, start=1)
+    ]
@@ -0,0 +1,343 @@
+"""Local full-text search tier over transcript text (SQLite FTS5).
+
+Every Gemini search is a network round trip, so search is unavailable
+offline and slow for exact phrase lookups. This module keeps an FTS5
+index (``transcript_fts``, schema V16) of the text of every file in the
+``files`` table and answers queries locally with BM25 ranking.
+
+The index is incremental: ``transcript_index`` records the
+``content_hash`` each document was built from, so a refresh after
+scan/sync only re-reads files whose hash changed and drops documents
+for files that were deleted.
+
+Query syntax: bare words are ANDed (falling back to OR when nothing
+matches every word); ``"double quoted"`` text is an exact phrase.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from objlib.database import Database, metadata_filter_clauses
+from objlib.models import Citation
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_CHARS = 400  # Target length of a citation's text window
+SNIPPET_LEAD = 40  # Context kept before the first match (excerpts show the head)
+REFRESH_BATCH_SIZE = 100  # Documents per write transaction during refresh
+
+# Column weights for bm25(): filename, content
+_BM25_WEIGHTS = (4.0, 1.0)
+
+# highlight() markers -- control chars never present in transcript text
+_HL_OPEN = "\x02"
+_HL_CLOSE = "\x03"
+
+_TOKEN_RE = re.compile(r'"([^"]+)"|([^\s"]+)')
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+
+
+def build_fts_query(query: str, match_any: bool = False) -> str:
+    """Translate a user query into a safe FTS5 MATCH expression.
+
+    Every term and quoted phrase is emitted as an FTS5 string literal,
+    so user punctuation can never produce an FTS5 syntax error.
+
+    Args:
+        query: Raw user query.
+        match_any: OR the terms together instead of requiring all of them.
+
+    Returns:
+        FTS5 query string, or empty string if the query has no terms.
+    """
+    parts: list[str] = []
+    for phrase, word in _TOKEN_RE.findall(query):
+        text = phrase or word
+        if not _WORD_RE.search(text):
+            continue
+        parts.append('"' + text.replace('"', '""') + '"')
+    return (" OR " if match_any else " ").join(parts)
+
+
+def filters_from_args(filters: list[str] | None) -> dict[str, str]:
+    """Convert ``--filter field:value`` strings to a metadata filter dict.
+
+    Same ``field:value`` / ``field:>=value`` syntax as
+    ``build_metadata_filter``, in the dict form consumed by
+    ``metadata_filter_clauses``.
+    """
+    result: dict[str, str] = {}
+    for f in filters or []:
+        key, _, value = f.partition(":")
+        if key and value:
+            result[key] = value
+    return result
+
+
+def _read_transcript(file_path: str) -> str | None:
+    """Read a transcript from disk, or None if it cannot be read."""
+    try:
+        return Path(file_path).read_text(encoding="utf-8", errors="replace")
+    except OSError as e:
+        logger.warning("Cannot read %s for local index: %s", file_path, e)
+        return None
+
+
+def _strip_highlight(marked: str) -> tuple[str, list[tuple[int, int]]]:
+    """Remove highlight markers, returning plain text and match offsets."""
+    plain: list[str] = []
+    offsets: list[tuple[int, int]] = []
+    pos = 0
+    start = 0
+    for chunk in re.split(f"([{_HL_OPEN}{_HL_CLOSE}])", marked):
+        if chunk == _HL_OPEN:
+            start = pos
+        elif chunk == _HL_CLOSE:
+            offsets.append((start, pos))
+        else:
+            plain.append(chunk)
+            pos += len(chunk)
+    return "".join(plain), offsets
+
+
+def _snippet_window(text: str, matches: list[tuple[int, int]]) -> tuple[int, int]:
+    """Pick the SNIPPET_CHARS window covering the most matches.
+
+    The window is widened to whitespace so it never cuts a word in half.
+    """
+    if len(text) <= SNIPPET_CHARS:
+        return 0, len(text)
+    if not matches:
+        start = 0
+    else:
+        starts = [s for s, _ in matches]
+        best_start, best_count = starts[0], 0
+        for i, m_start in enumerate(starts):
+            count = bisect.bisect_left(starts, m_start + SNIPPET_CHARS) - i
+            if count > best_count:
+                best_start, best_count = m_start, count
+        # Keep a few words of context before the leading match
+        start = max(0, best_start - SNIPPET_LEAD)
+    end = min(len(text), start + SNIPPET_CHARS)
+
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+
+@dataclass
+class LocalIndexStats:
+    """Counters for one LocalSearchIndex.refresh() run."""
+
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def summary(self) -> str:
+        """Human-readable summary of the run."""
+        return (
+            f"indexed={self.indexed}, unchanged={self.unchanged}, "
+            f"removed={self.removed}, failed={self.failed} "
+            f"in {self.elapsed_seconds:.2f}s"
+        )
+
+
+class LocalSearchIndex:
+    """FTS5-backed transcript search that needs no network.
+
+    Usage::
+
+        index = LocalSearchIndex(db)
+        index.refresh()                      # after scan/sync
+        citations = index.search('"concept formation" measurement', limit=10)
+    """
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+
+    def document_count(self) -> int:
+        """Number of documents currently in the index."""
+        return self.db.conn.execute("SELECT COUNT(*) FROM transcript_index").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def refresh(
+        self,
+        read_text: Callable[[str], str | None] = _read_transcript,
+        batch_size: int = REFRESH_BATCH_SIZE,
+    ) -> LocalIndexStats:
+        """Bring the index in line with the active rows of ``files``.
+
+        Files whose ``content_hash`` matches the indexed one are skipped
+        without touching the disk. Unreadable files keep their previous
+        document (if any), so an unmounted library never empties the index.
+
+        Args:
+            read_text: Callable returning a file's text, or None on error.
+            batch_size: Documents written per transaction.
+
+        Returns:
+            LocalIndexStats for this run.
+        """
+        stats = LocalIndexStats()
+        start = time.perf_counter()
+        conn = self.db.conn
+
+        with conn:
+            orphans = [
+                row[0]
+                for row in conn.execute(
+                    """SELECT ti.doc_id FROM transcript_index ti
+                       LEFT JOIN files f ON f.file_path = ti.file_path
+                       WHERE f.file_path IS NULL OR f.is_deleted"""
+                )
+            ]
+            self._delete_docs(orphans)
+            stats.removed = len(orphans)
+
+        rows = conn.execute(
+            """SELECT f.file_path, f.filename, f.content_hash,
+                      ti.doc_id, ti.content_hash AS indexed_hash
+               FROM files f
+               LEFT JOIN transcript_index ti ON ti.file_path = f.file_path
+               WHERE NOT f.is_deleted"""
+        ).fetchall()
+
+        stale = [row for row in rows if row["indexed_hash"] != row["content_hash"]]
+        stats.unchanged = len(rows) - len(stale)
+
+        for i in range(0, len(stale), batch_size):
+            batch = []
+            for row in stale[i:i + batch_size]:
+                text = read_text(row["file_path"])
+                if text is None:
+                    stats.failed += 1
+                    continue
+                batch.append((row, text))
+            with conn:
+                self._delete_docs([row["doc_id"] for row, _ in batch if row["doc_id"] is not None])
+                for row, text in batch:
+                    cursor = conn.execute(
+                        "INSERT INTO transcript_index(file_path, content_hash, char_count) "
+                        "VALUES (?, ?, ?)",
+                        (row["file_path"], row["content_hash"], len(text)),
+                    )
+                    conn.execute(
+                        "INSERT INTO transcript_fts(rowid, filename, content) VALUES (?, ?, ?)",
+                        (cursor.lastrowid, row["filename"], text),
+                    )
+            stats.indexed += len(batch)
+
+        stats.elapsed_seconds = time.perf_counter() - start
+        logger.info("Local index refresh: %s", stats.summary)
+        return stats
+
+    def _delete_docs(self, doc_ids: list[int]) -> None:
+        """Remove documents from both index tables (caller owns the transaction)."""
+        for doc_id in doc_ids:
+            self.db.conn.execute("DELETE FROM transcript_fts WHERE rowid = ?", (doc_id,))
+            self.db.conn.execute("DELETE FROM transcript_index WHERE doc_id = ?", (doc_id,))
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: dict[str, str] | None = None,
+    ) -> list[Citation]:
+        """Run a BM25-ranked full-text query.
+
+        Args:
+            query: User query (bare words and/or ``"quoted phrases"``).
+            limit: Maximum number of citations.
+            filters: Optional metadata filters, as for
+                ``Database.filter_files_by_metadata``.
+
+        Returns:
+            Citations ordered by relevance. ``score`` holds the BM25 score
+            (higher is better), ``confidence`` the score relative to the
+            best hit, ``text`` a snippet around the densest cluster of
+            matches and ``snippet_offsets`` its character span in the
+            transcript.
+
+        Raises:
+            ValueError: If an unknown filter field is provided.
+        """
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return []
+        hits = self._ranked(fts_query, limit, filters or {})
+        if not hits:
+            any_query = build_fts_query(query, match_any=True)
+            if any_query != fts_query:
+                fts_query = any_query
+                hits = self._ranked(fts_query, limit, filters or {})
+        if not hits:
+            return []
+
+        # highlight() only for the final hits, not every matching row
+        placeholders = ",".join("?" * len(hits))
+        marked = {
+            row[0]: row[1]
+            for row in self.db.conn.execute(
+                f"SELECT rowid, highlight(transcript_fts, 1, ?, ?) FROM transcript_fts "
+                f"WHERE transcript_fts MATCH ? AND rowid IN ({placeholders})",
+                [_HL_OPEN, _HL_CLOSE, fts_query, *(h["doc_id"] for h in hits)],
+            )
+        }
+
+        top_score = -hits[0]["rank_score"] or 1.0
+        citations: list[Citation] = []
+        for i, hit in enumerate(hits, start=1):
+            text, matches = _strip_highlight(marked.get(hit["doc_id"], ""))
+            start, end = _snippet_window(text, matches)
+            score = -hit["rank_score"]
+            citations.append(
+                Citation(
+                    index=i,
+                    title=hit["filename"],
+                    uri=None,
+                    text=text[start:end],
+                    document_name=None,
+                    confidence=max(0.0, min(1.0, score / top_score)),
+                    file_path=hit["file_path"],
+                    metadata=json.loads(hit["metadata_json"]) if hit["metadata_json"] else {},
+                    score=score,
+                    snippet_offsets=(start, end),
+                )
+            )
+        return citations
+
+    def _ranked(self, fts_query: str, limit: int, filters: dict[str, str]) -> list:
+        where_parts, params = metadata_filter_clauses(filters)
+        extra = "".join(f" AND {part}" for part in where_parts)
+        w_filename, w_content = _BM25_WEIGHTS
+        return self.db.conn.execute(
+            f"""SELECT ti.doc_id, ti.file_path, f.filename, f.metadata_json,
+                       bm25(transcript_fts, {w_filename}, {w_content}) AS rank_score
+                FROM transcript_fts
+                JOIN transcript_index ti ON ti.doc_id = transcript_fts.rowid
+                JOIN files f ON f.file_path = ti.file_path
+                WHERE transcript_fts MATCH ? AND NOT f.is_deleted{extra}
+                ORDER BY rank_score
+                LIMIT ?""",
+            [fts_query, *params, limit],
+        ).fetchall()
@@ -13,17 +13,28 @@ Usage::
 
     # Then apply difficulty ordering for learn mode
     ordered = apply_difficulty_ordering(reranked, mode="learn")
+
+Scores can be cached per (query, passage hash) with ``RerankCache``, and
+``local_fallback`` orders passages by embedding similarity
+(``score_passages_local``) when the API fails or times out.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from google.genai import types
 
 from objlib.models import Citation
 from objlib.search.models import RankedResults
 
+if TYPE_CHECKING:
+    from objlib.search.cache import RerankCache
+
 logger = logging.getLogger(__name__)
 
 RERANK_SYSTEM_INSTRUCTION = (
@@ -36,57 +47,205 @@ RERANK_SYSTEM_INSTRUCTION = (
 )
 
 MAX_PASSAGE_CHARS = 500
+RERANK_MODEL = "gemini-2.0-flash"
+RERANK_TIMEOUT_SECONDS = 8.0  # Async rerank budget before the local fallback
+
+
+def passage_hash(citation: Citation) -> str:
+    """Content hash of a passage's text (rerank cache key component)."""
+    return hashlib.sha256(citation.text.encode("utf-8")).hexdigest()
 
 
 def rerank_passages(
     client,  # genai.Client (untyped to avoid import dependency)
     query: str,
     citations: list[Citation],
-    model: str = "gemini-2.0-flash",
+    model: str = RERANK_MODEL,
+    cache: RerankCache | None = None,
+    local_fallback: bool = False,
 ) -> list[Citation]:
     """Rerank citations using Gemini Flash structured output.
 
     Sends passages to Gemini Flash for relevance scoring against the
-    query, then reorders citations by score descending.
+    query, then reorders citations by score descending. With a ``cache``,
+    passages already scored for this query are not sent again; when
+    every passage is cached no API call is made.
 
     Args:
         client: Authenticated genai.Client instance.
         query: The user's search query.
         citations: List of Citation objects from initial search.
         model: Gemini model to use for reranking.
+        cache: Optional RerankCache for per-passage scores.
+        local_fallback: On API failure, order by local embedding
+            similarity (``score_passages_local``) when available.
 
     Returns:
         Citations reordered by relevance score (highest first).
-        On any failure, returns the original list unchanged.
+        On any failure, returns the original list unchanged (or the
+        local-similarity order when ``local_fallback`` is set).
     """
     if len(citations) <= 1:
         return citations
 
+    hashes, scores, missing = _cached_scores(cache, query, citations, model)
+    if missing:
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=_build_rerank_prompt(query, [citations[i] for i in missing]),
+                config=_rerank_config(),
+            )
+            scores.update(_new_scores(response, hashes, missing, cache, query, model))
+
+        except Exception:
+            logger.warning(
+                "Reranking failed, returning original order",
+                exc_info=True,
+            )
+            return _fallback(query, citations) if local_fallback else citations
+
+    return _order_by_scores(citations, [scores.get(h, -1.0) for h in hashes])
+
+
+async def rerank_passages_async(
+    client,  # genai.Client (untyped to avoid import dependency)
+    query: str,
+    citations: list[Citation],
+    model: str = RERANK_MODEL,
+    cache: RerankCache | None = None,
+    local_fallback: bool = False,
+    timeout: float | None = None,
+) -> list[Citation]:
+    """``rerank_passages`` on the SDK's native ``client.aio`` API.
+
+    Same contract as the sync version; cancelling the awaiting task
+    aborts the scoring request (CancelledError is not swallowed). A
+    request exceeding ``timeout`` seconds counts as a failure, so a slow
+    API degrades to the local fallback instead of stalling the search.
+    """
+    if len(citations) <= 1:
+        return citations
+
+    hashes, scores, missing = _cached_scores(cache, query, citations, model)
+    if missing:
+        try:
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model=model,
+                    contents=_build_rerank_prompt(query, [citations[i] for i in missing]),
+                    config=_rerank_config(),
+                ),
+                timeout,
+            )
+            scores.update(_new_scores(response, hashes, missing, cache, query, model))
+
+        except Exception:
+            logger.warning(
+                "Reranking failed, returning original order",
+                exc_info=True,
+            )
+            if local_fallback:
+                return await asyncio.to_thread(_fallback, query, citations)
+            return citations
+
+    return _order_by_scores(citations, [scores.get(h, -1.0) for h in hashes])
+
+
+def score_passages_local(
+    query: str,
+    citations: list[Citation],
+    encode: Callable[[list[str]], Any] | None = None,
+) -> list[float] | None:
+    """Score passages by embedding cosine similarity to the query (CPU only).
+
+    Uses the same all-MiniLM-L6-v2 encoder as the local embedding index.
+
+    Args:
+        query: The user's search query.
+        citations: Passages to score.
+        encode: Optional encoder (texts -> 2-D array); defaults to the
+            sentence-transformers model.
+
+    Returns:
+        One similarity per citation, or None when numpy or
+        sentence-transformers is not installed.
+    """
     try:
-        prompt = _build_rerank_prompt(query, citations)
+        import numpy as np
 
-        config = types.GenerateContentConfig(
-            system_instruction=RERANK_SYSTEM_INSTRUCTION,
-            response_mime_type="application/json",
-            response_schema=RankedResults,
-            temperature=0.0,
-        )
+        if encode is None:
+            from objlib.search.embeddings import _default_encoder as encode
 
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=config,
-        )
+        vectors = np.asarray(encode([query, *(c.text for c in citations)]), dtype=np.float32)
+    except ImportError:
+        return None
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    vectors /= norms[:, None]
+    return [float(s) for s in vectors[1:] @ vectors[0]]
 
-        ranked = RankedResults.model_validate_json(response.text)
-        return _apply_rankings(citations, ranked)
 
+def _fallback(query: str, citations: list[Citation]) -> list[Citation]:
+    """Order by local similarity, or keep the original order if unavailable."""
+    try:
+        scores = score_passages_local(query, citations)
     except Exception:
-        logger.warning(
-            "Reranking failed, returning original order",
-            exc_info=True,
-        )
+        logger.warning("Local rerank fallback failed", exc_info=True)
+        scores = None
+    if scores is None:
         return citations
+    return _order_by_scores(citations, scores)
+
+
+def _rerank_config() -> types.GenerateContentConfig:
+    """Structured-output config shared by the sync and async rerankers."""
+    return types.GenerateContentConfig(
+        system_instruction=RERANK_SYSTEM_INSTRUCTION,
+        response_mime_type="application/json",
+        response_schema=RankedResults,
+        temperature=0.0,
+    )
+
+
+def _cached_scores(
+    cache: RerankCache | None,
+    query: str,
+    citations: list[Citation],
+    model: str,
+) -> tuple[list[str], dict[str, float], list[int]]:
+    """Return (passage hashes, cached scores, indices still needing a score)."""
+    hashes = [passage_hash(c) for c in citations]
+    scores: dict[str, float] = {}
+    if cache is not None:
+        try:
+            scores = cache.get_scores(query, sorted(set(hashes)), model)
+        except Exception:
+            logger.warning("Rerank cache lookup failed", exc_info=True)
+    missing = [i for i, h in enumerate(hashes) if h not in scores]
+    return hashes, scores, missing
+
+
+def _new_scores(
+    response: Any,
+    hashes: list[str],
+    missing: list[int],
+    cache: RerankCache | None,
+    query: str,
+    model: str,
+) -> dict[str, float]:
+    """Map a rerank response (over the ``missing`` passages) to hash -> score."""
+    ranked = RankedResults.model_validate_json(response.text)
+    fresh: dict[str, float] = {}
+    for rp in ranked.rankings:
+        if 0 <= rp.passage_index < len(missing):
+            fresh[hashes[missing[rp.passage_index]]] = rp.score
+    if cache is not None:
+        try:
+            cache.put_scores(query, fresh, model)
+        except Exception:
+            logger.warning("Rerank cache write failed", exc_info=True)
+    return fresh
 
 
 def _build_rerank_prompt(query: str, citations: list[Citation]) -> str:
@@ -118,29 +277,13 @@ def _build_rerank_prompt(query: str, citations: list[Citation]) -> str:
     return "\n".join(lines)
 
 
-def _apply_rankings(
-    citations: list[Citation], ranked: RankedResults
-) -> list[Citation]:
-    """Apply ranking scores to reorder citations.
+def _order_by_scores(citations: list[Citation], scores: list[float]) -> list[Citation]:
+    """Sort citations by score descending, original index breaking ties.
 
-    Maps passage_index from rankings back to citations and sorts
-    by score descending. Citations not present in rankings keep
-    their original position at the end with score -1.
+    Citations without a score (-1) keep their relative order at the end.
     """
-    score_map: dict[int, float] = {}
-    for rp in ranked.rankings:
-        if 0 <= rp.passage_index < len(citations):
-            score_map[rp.passage_index] = rp.score
-
-    indexed: list[tuple[int, Citation, float]] = []
-    for i, citation in enumerate(citations):
-        score = score_map.get(i, -1.0)
-        indexed.append((i, citation, score))
-
-    # Sort by score descending, then original index for ties
-    indexed.sort(key=lambda x: (-x[2], x[0]))
-
-    return [citation for _, citation, _ in indexed]
+    order = sorted(range(len(citations)), key=lambda i: (-scores[i], i))
+    return [citations[i] for i in order]
 
 
 # -- Difficulty-aware ordering --
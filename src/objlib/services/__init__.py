@@ -6,7 +6,15 @@ database.py) directly.
 """
 
 from objlib.services.library import LibraryService
+from objlib.services.pool import ConnectionPool, close_all_pools, get_pool
 from objlib.services.search import SearchService
 from objlib.services.session import SessionService
 
-__all__ = ["SearchService", "LibraryService", "SessionService"]
+__all__ = [
+    "SearchService",
+    "LibraryService",
+    "SessionService",
+    "ConnectionPool",
+    "get_pool",
+    "close_all_pools",
+]
@@ -2,7 +2,8 @@
 
 Provides async methods for browsing, filtering, and viewing library
 content without Gemini API calls. All SQLite operations are offloaded
-to a thread executor via RxPY observables with Future-based subscription.
+to a thread executor via RxPY observables with Future-based subscription,
+using read-only connections checked out of the process-wide pool.
 """
 
 from __future__ import annotations
@@ -13,6 +14,7 @@ from typing import Callable, TypeVar
 
 import rx
 
+from objlib.services.pool import get_pool
 from objlib.upload._operators import subscribe_awaitable
 
 logger = logging.getLogger(__name__)
@@ -53,9 +55,7 @@ class LibraryService:
         """
 
         def _query() -> list[tuple[str, int]]:
-            from objlib.database import Database
-
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.get_categories_with_counts()
 
         return await self._run_in_executor(_query)
@@ -68,9 +68,7 @@ class LibraryService:
         """
 
         def _query() -> list[tuple[str, int]]:
-            from objlib.database import Database
-
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.get_courses_with_counts()
 
         return await self._run_in_executor(_query)
@@ -89,9 +87,7 @@ class LibraryService:
         """
 
         def _query() -> list[dict]:
-            from objlib.database import Database
-
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.get_files_by_course(course, year)
 
         return await self._run_in_executor(_query)
@@ -107,9 +103,7 @@ class LibraryService:
         """
 
         def _query() -> list[dict]:
-            from objlib.database import Database
-
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.get_items_by_category(category)
 
         return await self._run_in_executor(_query)
@@ -129,8 +123,6 @@ class LibraryService:
         """
 
         def _query() -> list[dict]:
-            from objlib.database import Database
-
             # Parse "field:value" strings into dict format
             filter_dict: dict[str, str] = {}
             for f in filters:
@@ -138,7 +130,7 @@ class LibraryService:
                 if key and value:
                     filter_dict[key] = value
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.filter_files_by_metadata(filter_dict, limit)
 
         return await self._run_in_executor(_query)
@@ -171,9 +163,7 @@ class LibraryService:
         """
 
         def _query() -> int:
-            from objlib.database import Database
-
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 return db.get_file_count()
 
         return await self._run_in_executor(_query)
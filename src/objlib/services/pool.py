@@ -0,0 +1,204 @@
+"""Process-wide SQLite connection pool for the service facades.
+
+Opening a ``Database`` runs every pragma plus the full migration probe in
+``_setup_schema()``. The TUI issues a query per keystroke and per nav-tree
+expansion, so paying that on every call adds up. The pool opens one
+writer (which runs schema setup once per process) and a fixed set of
+read-only WAL connections that are checked out and returned.
+
+Usage::
+
+    pool = get_pool("data/library.db")
+    with pool.read() as db:
+        rows = db.get_categories_with_counts()
+    with pool.write() as db:
+        SessionManager(db.conn).create("My Research")
+    print(pool.stats())
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator
+
+from objlib.database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READERS = 4
+
+
+class ConnectionPool:
+    """Fixed-size pool: N read-only connections plus a single writer.
+
+    Readers are handed out from a FIFO queue; when all are checked out the
+    caller blocks until one is returned (counted as a saturation event).
+    The writer is serialized behind a lock -- SQLite allows one writer at a
+    time anyway, and WAL lets readers proceed concurrently with it.
+
+    Connections are opened with ``check_same_thread=False`` because the
+    services run queries on arbitrary executor threads. A connection is
+    only ever used by the thread that holds its checkout.
+    """
+
+    def __init__(self, db_path: str | Path, readers: int = DEFAULT_READERS) -> None:
+        if readers < 1:
+            raise ValueError(f"readers must be >= 1, got {readers}")
+        self.db_path = str(db_path)
+        self.size = readers
+
+        # Writer first: creates the file, enables WAL and runs migrations once.
+        self._writer = Database(self.db_path, check_same_thread=False)
+        self._writer_lock = threading.Lock()
+
+        self._readers: queue.Queue[Database] = queue.Queue()
+        self._all_readers: list[Database] = []
+        for _ in range(readers):
+            db = Database(self.db_path, read_only=True, check_same_thread=False)
+            self._all_readers.append(db)
+            self._readers.put(db)
+
+        self._stats_lock = threading.Lock()
+        self._read_checkouts = 0
+        self._write_checkouts = 0
+        self._saturated_checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._closed = False
+
+    def _record_checkout(self, waited: float, saturated: bool, write: bool) -> None:
+        with self._stats_lock:
+            if write:
+                self._write_checkouts += 1
+            else:
+                self._read_checkouts += 1
+                self._in_use += 1
+                self._peak_in_use = max(self._peak_in_use, self._in_use)
+            if saturated:
+                self._saturated_checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    @contextmanager
+    def read(self, timeout: float | None = None) -> Generator[Database, None, None]:
+        """Check out a read-only ``Database`` for the duration of the block.
+
+        Args:
+            timeout: Seconds to wait for a free reader (None blocks forever).
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+            queue.Empty: If no reader became free within ``timeout``.
+        """
+        if self._closed:
+            raise RuntimeError("ConnectionPool is closed")
+        start = time.perf_counter()
+        try:
+            db = self._readers.get_nowait()
+            saturated = False
+        except queue.Empty:
+            saturated = True
+            db = self._readers.get(timeout=timeout)
+        self._record_checkout(time.perf_counter() - start, saturated, write=False)
+        try:
+            yield db
+        finally:
+            # Readers run in autocommit-legacy mode; end any implicit read txn
+            # so the connection does not pin an old WAL snapshot.
+            if db.conn.in_transaction:
+                db.conn.rollback()
+            with self._stats_lock:
+                self._in_use -= 1
+            self._readers.put(db)
+
+    @contextmanager
+    def write(self) -> Generator[Database, None, None]:
+        """Check out the single writer ``Database`` for the duration of the block.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("ConnectionPool is closed")
+        start = time.perf_counter()
+        saturated = not self._writer_lock.acquire(blocking=False)
+        if saturated:
+            self._writer_lock.acquire()
+        self._record_checkout(time.perf_counter() - start, saturated, write=True)
+        try:
+            yield self._writer
+        finally:
+            # Same contract as closing a scoped Database: work not committed
+            # by the caller (Database methods use ``with self.conn``) is dropped.
+            if self._writer.conn.in_transaction:
+                self._writer.conn.rollback()
+            self._writer_lock.release()
+
+    def stats(self) -> dict[str, float | int]:
+        """Return checkout latency and saturation counters.
+
+        Returns:
+            Dict with size, in_use, peak_in_use, read_checkouts,
+            write_checkouts, saturated_checkouts, saturation_ratio,
+            avg_wait_ms and max_wait_ms keys.
+        """
+        with self._stats_lock:
+            total = self._read_checkouts + self._write_checkouts
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "read_checkouts": self._read_checkouts,
+                "write_checkouts": self._write_checkouts,
+                "saturated_checkouts": self._saturated_checkouts,
+                "saturation_ratio": (
+                    round(self._saturated_checkouts / total, 4) if total else 0.0
+                ),
+                "avg_wait_ms": round(self._wait_total / total * 1000, 3) if total else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def close(self) -> None:
+        """Close every pooled connection. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        logger.info("Connection pool %s closing: %s", self.db_path, self.stats())
+        for db in self._all_readers:
+            db.close()
+        self._writer.close()
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str | Path, readers: int = DEFAULT_READERS) -> ConnectionPool:
+    """Return the process-wide pool for ``db_path``, creating it on first use.
+
+    Pools are keyed by resolved path, so ``"data/library.db"`` and its
+    absolute form share one pool. ``readers`` only applies on creation.
+    """
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path, readers=readers)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    """Close and forget every process-wide pool (app shutdown, tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
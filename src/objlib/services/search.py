@@ -1,14 +1,17 @@
 """Search service facade wrapping Gemini File Search internals.
 
-Provides async methods for search and synthesis. Blocking I/O
-(SQLite, Gemini API) is offloaded to thread executors via RxPY
-observables with Future-based subscription.
+Provides async methods for search and synthesis. The Gemini search
+path (query, citation enrichment, rerank) runs on the SDK's native
+``client.aio`` API, so cancelling a search aborts its HTTP requests.
+Local index tiers and synthesis are offloaded to thread executors via
+RxPY observables with Future-based subscription.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 import rx
@@ -19,12 +22,19 @@ from objlib.upload._operators import subscribe_awaitable
 from objlib.models import Citation, SearchResult
 from objlib.search.citations import (
     build_metadata_filter,
-    enrich_citations,
+    enrich_citations_async,
     extract_citations,
 )
 from objlib.search.expansion import expand_query
-from objlib.search.reranker import apply_difficulty_ordering, rerank_passages
+from objlib.search.hybrid import reciprocal_rank_fusion
+from objlib.search.local_index import LocalSearchIndex, filters_from_args
+from objlib.search.reranker import (
+    RERANK_TIMEOUT_SECONDS,
+    apply_difficulty_ordering,
+    rerank_passages_async,
+)
 from objlib.search.synthesizer import apply_mmr_diversity, synthesize_answer
+from objlib.services.pool import get_pool
 
 if TYPE_CHECKING:
     from objlib.search.models import SynthesisOutput
@@ -51,12 +61,15 @@ class SearchService:
         api_key: str,
         store_resource_name: str,
         db_path: str,
+        use_cache: bool = True,
     ) -> None:
         self._api_key = api_key
         self._store_resource_name = store_resource_name
         self._db_path = db_path
+        self._use_cache = use_cache  # Persistent Gemini result cache (search/cache.py)
         self._client = None  # genai.Client, lazily initialized
         self._search_client = None  # GeminiSearchClient, lazily initialized
+        self._rerank_cache = None  # RerankCache, created with the client
 
     def _ensure_client(self) -> None:
         """Lazily initialize genai.Client and GeminiSearchClient."""
@@ -65,12 +78,17 @@ class SearchService:
 
         from google import genai
 
+        from objlib.search.cache import RerankCache, SearchResultCache
         from objlib.search.client import GeminiSearchClient
 
         self._client = genai.Client(api_key=self._api_key)
         self._search_client = GeminiSearchClient(
-            self._client, self._store_resource_name
+            self._client,
+            self._store_resource_name,
+            cache=SearchResultCache(self._db_path) if self._use_cache else None,
         )
+        if self._use_cache:
+            self._rerank_cache = RerankCache(self._db_path)
 
     async def search(
         self,
@@ -80,9 +98,32 @@ class SearchService:
         rerank: bool = True,
         mode: str = "learn",
         top_k: int = 20,
+        local: bool = False,
+        semantic: bool = False,
+        hybrid: bool = True,
+        on_partial: Callable[[SearchResult], None] | None = None,
     ) -> SearchResult:
         """Execute a search query against the Gemini File Search store.
 
+        With ``hybrid`` (the default), the local FTS5 and passage
+        embedding tiers run concurrently with the Gemini query and the
+        three ranked lists are merged by reciprocal rank fusion. Each time
+        a local tier finishes while Gemini is still in flight,
+        ``on_partial`` receives the fused local results so far. If Gemini
+        fails, the local results are returned instead. Local tiers with
+        no index (or no numpy) simply contribute nothing.
+
+        Reranking is a streaming stage too: ``on_partial`` first receives
+        the un-reranked citations, and the returned result carries the
+        reranked order. Scores are cached per (query, passage hash); if
+        Gemini Flash is slow or offline, passages are ordered by local
+        embedding similarity instead.
+
+        When ``local`` is set the query is answered by the local FTS5
+        tier only (no network; citations carry BM25 scores). Without
+        ``hybrid``, a failed Gemini query falls back to that tier when the
+        index has documents.
+
         Args:
             query: Natural language search query.
             filters: Optional list of "field:value" filter strings.
@@ -90,10 +131,20 @@ class SearchService:
             rerank: Whether to rerank results with Gemini Flash.
             mode: "learn" for difficulty ordering, "research" for pure relevance.
             top_k: Maximum number of citation chunks to retrieve (default 20).
+            local: Search the local full-text index only.
+            semantic: Search the local passage embedding index only.
+            hybrid: Fuse Gemini results with the local tiers.
+            on_partial: Callback for provisional results (local tiers, then
+                the un-reranked list).
 
         Returns:
             SearchResult with response text, enriched citations, query, and filter.
         """
+        if semantic:
+            return await self.search_semantic(query, filters=filters, mode=mode, top_k=top_k)
+        if local:
+            return await self.search_local(query, filters=filters, mode=mode, top_k=top_k)
+
         self._ensure_client()
 
         # Expand query (CPU-only, fast, run inline)
@@ -104,7 +155,66 @@ class SearchService:
         # Build metadata filter
         metadata_filter = build_metadata_filter(filters) if filters else None
 
-        # Query Gemini (async with RxPY retry observable)
+        if hybrid:
+            response_text, citations = await self._search_hybrid(
+                query, search_query, filters, metadata_filter, mode, top_k, on_partial
+            )
+        else:
+            try:
+                response_text, citations = await self._search_gemini(
+                    search_query, metadata_filter, top_k
+                )
+            except Exception:
+                if not await asyncio.to_thread(self._local_index_available):
+                    raise
+                logger.warning("Gemini search failed; falling back to local index", exc_info=True)
+                return await self.search_local(query, filters=filters, mode=mode, top_k=top_k)
+
+        # Rerank as a streaming stage: show the un-reranked order first, then
+        # reorder once scores arrive (cached per passage; local fallback when
+        # the API is slow or offline).
+        if rerank and len(citations) > 1:
+            if on_partial is not None:
+                on_partial(
+                    SearchResult(
+                        response_text=response_text,
+                        citations=apply_difficulty_ordering(citations, mode=mode),
+                        query=query,
+                        metadata_filter=metadata_filter,
+                    )
+                )
+            citations = await rerank_passages_async(
+                self._client,
+                query,
+                citations,
+                cache=self._rerank_cache,
+                local_fallback=True,
+                timeout=RERANK_TIMEOUT_SECONDS,
+            )
+
+        # Apply difficulty ordering (CPU-only, inline)
+        citations = apply_difficulty_ordering(citations, mode=mode)
+
+        return SearchResult(
+            response_text=response_text,
+            citations=citations,
+            query=query,
+            metadata_filter=metadata_filter,
+        )
+
+    async def _search_gemini(
+        self,
+        search_query: str,
+        metadata_filter: str | None,
+        top_k: int,
+    ) -> tuple[str, list[Citation]]:
+        """Query Gemini and return (response text, enriched citations).
+
+        Runs entirely on the event loop via ``client.aio``: cancelling the
+        calling task (e.g. a superseded TUI search) aborts the in-flight
+        request instead of leaving it running on a worker thread.
+        """
+        # Query Gemini (native async with in-task retry)
         response = await self._search_client.query_with_retry(
             search_query,
             metadata_filter=metadata_filter,
@@ -119,48 +229,190 @@ class SearchService:
             )
         citations = extract_citations(grounding_metadata)
 
-        loop = asyncio.get_event_loop()
+        # Enrich citations with local SQLite metadata (one indexed query, inline)
+        citations = await enrich_citations_async(
+            citations, get_pool(self._db_path).read, self._client
+        )
 
-        # Enrich citations with local SQLite metadata (blocking I/O -> executor)
-        if citations:
+        # Extract response text
+        response_text = ""
+        if response.candidates and response.candidates[0].content:
+            parts = response.candidates[0].content.parts
+            if parts:
+                response_text = parts[0].text or ""
 
-            def _enrich() -> list[Citation]:
-                from objlib.database import Database
+        return response_text, citations
 
-                with Database(self._db_path) as db:
-                    return enrich_citations(citations, db, self._client)
+    async def _search_hybrid(
+        self,
+        query: str,
+        search_query: str,
+        filters: list[str] | None,
+        metadata_filter: str | None,
+        mode: str,
+        top_k: int,
+        on_partial: Callable[[SearchResult], None] | None,
+    ) -> tuple[str, list[Citation]]:
+        """Run Gemini and both local tiers concurrently and fuse their rankings.
+
+        Local tiers get the unexpanded query: glossary synonyms would turn
+        FTS5 phrase matching into an OR-soup and blur the query embedding.
+        """
+        loop = asyncio.get_event_loop()
+        local_filters = filters_from_args(filters)
+        gemini = asyncio.ensure_future(self._search_gemini(search_query, metadata_filter, top_k))
+        tiers = {
+            asyncio.ensure_future(
+                loop.run_in_executor(None, self._lexical_tier, query, local_filters, top_k)
+            ): "lexical",
+            asyncio.ensure_future(
+                loop.run_in_executor(None, self._vector_tier, query, local_filters, top_k)
+            ): "vector",
+        }
+        ranked: dict[str, list[Citation]] = {"gemini": []}
+
+        try:
+            pending: set[asyncio.Future] = {gemini, *tiers}
+            while gemini in pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished = [t for t in done if t in tiers]
+                for task in finished:
+                    ranked[tiers[task]] = task.result()
+                if on_partial is not None and finished and not gemini.done():
+                    fused = reciprocal_rank_fusion(ranked, limit=top_k)
+                    if fused:
+                        on_partial(
+                            SearchResult(
+                                response_text="",
+                                citations=apply_difficulty_ordering(fused, mode=mode),
+                                query=query,
+                                metadata_filter=metadata_filter,
+                            )
+                        )
+            for task in pending:
+                ranked[tiers[task]] = await task
+        finally:
+            for task in (gemini, *tiers):
+                if not task.done():
+                    task.cancel()
+
+        try:
+            response_text, ranked["gemini"] = gemini.result()
+        except Exception:
+            if not any(ranked.values()):
+                raise
+            logger.warning("Gemini search failed; using local results only", exc_info=True)
+            response_text = ""
+
+        return response_text, reciprocal_rank_fusion(ranked, limit=top_k)
+
+    def _lexical_tier(self, query: str, filters: dict[str, str], top_k: int) -> list[Citation]:
+        """Local FTS5 tier for hybrid search (best-effort: errors yield no results)."""
+        try:
+            with get_pool(self._db_path).read() as db:
+                return LocalSearchIndex(db).search(query, limit=top_k, filters=filters)
+        except Exception:
+            logger.warning("Local full-text tier failed", exc_info=True)
+            return []
+
+    def _vector_tier(self, query: str, filters: dict[str, str], top_k: int) -> list[Citation]:
+        """Local embedding tier for hybrid search (best-effort: errors yield no results)."""
+        try:
+            from objlib.search.embeddings import EmbeddingIndex
+        except ImportError:
+            return []  # numpy not installed
+        try:
+            with get_pool(self._db_path).read() as db:
+                return EmbeddingIndex(db).search(query, limit=top_k, filters=filters)
+        except Exception:
+            logger.warning("Local embedding tier failed", exc_info=True)
+            return []
+
+    async def search_local(
+        self,
+        query: str,
+        filters: list[str] | None = None,
+        mode: str = "learn",
+        top_k: int = 20,
+    ) -> SearchResult:
+        """Search the local FTS5 transcript index (no network).
 
-            obs = rx.from_future(asyncio.ensure_future(loop.run_in_executor(None, _enrich)))
-            citations = await subscribe_awaitable(obs)
+        Query expansion and Gemini reranking are skipped: glossary
+        synonyms would turn every phrase into an OR-soup, and reranking
+        needs the API. Difficulty ordering still applies.
 
-        # Rerank (Gemini API call -> executor via RxPY)
-        if rerank and len(citations) > 1:
-            _client = self._client
-            _cites = citations
-            obs = rx.from_future(
-                asyncio.ensure_future(
-                    loop.run_in_executor(None, rerank_passages, _client, query, _cites)
+        Args:
+            query: Search query; ``"quoted text"`` matches an exact phrase.
+            filters: Optional list of "field:value" filter strings.
+            mode: "learn" for difficulty ordering, "research" for pure relevance.
+            top_k: Maximum number of citations to return.
+
+        Returns:
+            SearchResult with empty response text and BM25-ranked citations.
+        """
+
+        def _search() -> list[Citation]:
+            with get_pool(self._db_path).read() as db:
+                return LocalSearchIndex(db).search(
+                    query, limit=top_k, filters=filters_from_args(filters)
                 )
-            )
-            citations = await subscribe_awaitable(obs)
 
-        # Apply difficulty ordering (CPU-only, inline)
-        citations = apply_difficulty_ordering(citations, mode=mode)
+        loop = asyncio.get_event_loop()
+        obs = rx.from_future(asyncio.ensure_future(loop.run_in_executor(None, _search)))
+        citations = await subscribe_awaitable(obs)
 
-        # Extract response text
-        response_text = ""
-        if response.candidates and response.candidates[0].content:
-            parts = response.candidates[0].content.parts
-            if parts:
-                response_text = parts[0].text or ""
+        return SearchResult(
+            response_text="",
+            citations=apply_difficulty_ordering(citations, mode=mode),
+            query=query,
+            metadata_filter=None,
+        )
+
+    async def search_semantic(
+        self,
+        query: str,
+        filters: list[str] | None = None,
+        mode: str = "learn",
+        top_k: int = 20,
+    ) -> SearchResult:
+        """Search the on-disk passage embedding index (no network).
+
+        Cosine top-k over the memory-mapped float16 matrix built by
+        ``EmbeddingIndex.refresh()``; the sentence-transformers model is
+        loaded on first use.
+
+        Args:
+            query: Natural language query.
+            filters: Optional list of "field:value" filter strings.
+            mode: "learn" for difficulty ordering, "research" for pure relevance.
+            top_k: Maximum number of passages to return.
+
+        Returns:
+            SearchResult with empty response text and similarity-ranked citations.
+        """
+        from objlib.search.embeddings import EmbeddingIndex
+
+        def _search() -> list[Citation]:
+            with get_pool(self._db_path).read() as db:
+                return EmbeddingIndex(db).search(
+                    query, limit=top_k, filters=filters_from_args(filters)
+                )
+
+        loop = asyncio.get_event_loop()
+        obs = rx.from_future(asyncio.ensure_future(loop.run_in_executor(None, _search)))
+        citations = await subscribe_awaitable(obs)
 
         return SearchResult(
-            response_text=response_text,
-            citations=citations,
+            response_text="",
+            citations=apply_difficulty_ordering(citations, mode=mode),
             query=query,
-            metadata_filter=metadata_filter,
+            metadata_filter=None,
         )
 
+    def _local_index_available(self) -> bool:
+        with get_pool(self._db_path).read() as db:
+            return LocalSearchIndex(db).document_count() > 0
+
     async def synthesize(
         self,
         query: str,
@@ -2,7 +2,8 @@
 
 Provides async CRUD for research sessions with append-only event
 logging. All SQLite operations are wrapped in asyncio.to_thread()
-with Database connections opened and closed within the sync function.
+with connections checked out of the process-wide pool: writes go
+through the single pooled writer, reads through read-only connections.
 """
 
 from __future__ import annotations
@@ -10,6 +11,8 @@ from __future__ import annotations
 import asyncio
 import logging
 
+from objlib.services.pool import get_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,8 +20,8 @@ class SessionService:
     """Async facade for research session management.
 
     Wraps SessionManager operations for creating sessions, adding
-    events, and querying session history. Database connections are
-    scoped to each operation.
+    events, and querying session history. Pooled connections are
+    checked out for the duration of each operation.
 
     Usage::
 
@@ -43,10 +46,9 @@ class SessionService:
         """
 
         def _create() -> str:
-            from objlib.database import Database
             from objlib.session.manager import SessionManager
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).write() as db:
                 mgr = SessionManager(db.conn)
                 return mgr.create(name)
 
@@ -71,10 +73,9 @@ class SessionService:
         """
 
         def _add() -> str:
-            from objlib.database import Database
             from objlib.session.manager import SessionManager
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).write() as db:
                 mgr = SessionManager(db.conn)
                 return mgr.add_event(session_id, event_type, payload)
 
@@ -89,10 +90,9 @@ class SessionService:
         """
 
         def _list() -> list[dict]:
-            from objlib.database import Database
             from objlib.session.manager import SessionManager
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 mgr = SessionManager(db.conn)
                 return mgr.list_sessions()
 
@@ -110,10 +110,9 @@ class SessionService:
         """
 
         def _get() -> list[dict]:
-            from objlib.database import Database
             from objlib.session.manager import SessionManager
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 mgr = SessionManager(db.conn)
                 return mgr.get_events(session_id)
 
@@ -131,10 +130,9 @@ class SessionService:
         """
 
         def _get() -> dict | None:
-            from objlib.database import Database
             from objlib.session.manager import SessionManager
 
-            with Database(self._db_path) as db:
+            with get_pool(self._db_path).read() as db:
                 mgr = SessionManager(db.conn)
                 # Try exact match first
                 session = mgr.get_session(session_id)
@@ -7,6 +7,8 @@ complete incremental sync workflow with:
 - Change detection with mtime optimization
 - Upload-first atomic replacement (new before old deleted)
 - Per-file SQLite commits for crash recovery
+- Bounded-concurrency execution of the per-file sequences (``jobs``)
+- Content-addressed dedup of new files (identical payloads upload once)
 - Missing file marking and optional pruning
 """
 
@@ -26,14 +28,20 @@ from objlib.config import ScannerConfig
 from objlib.database import Database
 from objlib.metadata import MetadataExtractor
 from objlib.models import FileRecord, MetadataQuality
+from objlib.search.local_index import LocalSearchIndex
 from objlib.sync.detector import (
     CURRENT_ENRICHMENT_VERSION,
     SyncChangeSet,
     SyncDetector,
 )
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
 from objlib.upload.client import GeminiFileSearchClient
-from objlib.upload.content_preparer import cleanup_temp_file, prepare_enriched_content
-from objlib.upload.metadata_builder import build_enriched_metadata, compute_upload_hash
+from objlib.upload.content_preparer import UploadSource, open_upload_source
+from objlib.upload.dedup import DedupStats, PayloadCandidate, UploadDeduplicator
+from objlib.upload.metadata_builder import compute_upload_hash
+from objlib.upload.pipeline import PipelineStats, UploadPipeline
+from objlib.upload.preparation import UploadPreparer
+from objlib.upload.store_index import StoreDocumentIndex
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +55,16 @@ class SyncOrchestrator:
     - Per-file SQLite commits for crash recovery
     - 404=success for store document deletion
 
+    New and modified files are synced by up to ``jobs`` concurrent
+    per-file sequences. Each sequence still runs upload -> poll -> commit
+    -> delete old document in order; only different files overlap. When a
+    circuit breaker is given (the one the client records into, shared
+    with the upload orchestrators), the number in flight follows its
+    recommended concurrency, capped at ``jobs``.
+
     Usage::
 
-        orchestrator = SyncOrchestrator(db, client, config, api_key, console)
+        orchestrator = SyncOrchestrator(db, client, config, api_key, console, jobs=4)
         await orchestrator.run(dry_run=True)
     """
 
@@ -61,14 +76,25 @@ class SyncOrchestrator:
         api_key: str,
         console: Console,
         store_name: str | None = None,
+        jobs: int = 1,
+        circuit_breaker: RollingWindowCircuitBreaker | None = None,
+        dedup: bool = True,
     ) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be >= 1")
         self.db = db
         self.client = client
         self.config = config
         self.api_key = api_key
         self.console = console
         self.store_name = store_name
+        self.jobs = jobs
+        self.dedup = dedup
+        self._circuit_breaker = circuit_breaker
+        self._pipeline_stats: PipelineStats | None = None
+        self._dedup_stats: DedupStats | None = None
         self._metadata_extractor = MetadataExtractor()
+        self._store_index: StoreDocumentIndex | None = None
 
         # Tracking
         self._uploaded_new = 0
@@ -78,6 +104,17 @@ class SyncOrchestrator:
         self._orphans_cleaned = 0
         self._errors = 0
 
+    @property
+    def store_index(self) -> StoreDocumentIndex:
+        """Store document index shared by every lookup in this run.
+
+        Orphan cleanup, pruning and replacement all resolve file IDs
+        through it, so a run lists the store at most once.
+        """
+        if self._store_index is None:
+            self._store_index = StoreDocumentIndex(self.db, self.client)
+        return self._store_index
+
     async def run(
         self,
         force: bool = False,
@@ -137,13 +174,8 @@ class SyncOrchestrator:
             self._print_dry_run(changeset)
             return self.summary
 
-        # Step 5: Upload new files
-        for file_info in changeset.new_files:
-            await self._upload_new_file(file_info, skip_enrichment)
-
-        # Step 6: Upload-first replacement for modified files
-        for file_info in changeset.modified_files:
-            await self._replace_modified_file(file_info, skip_enrichment)
+        # Steps 5-6: Upload new files and replace modified files (upload-first)
+        await self._sync_changed_files(changeset, skip_enrichment)
 
         # Step 7: Mark missing files
         if changeset.missing_files:
@@ -151,6 +183,9 @@ class SyncOrchestrator:
             self._marked_missing = len(changeset.missing_files)
             logger.info("Marked %d files as missing", self._marked_missing)
 
+        # Step 7b: Refresh the local full-text index (content-hash incremental)
+        self._refresh_local_index()
+
         # Step 8: Prune missing if requested
         if prune_missing:
             await self._prune_missing_files(prune_age_days)
@@ -163,6 +198,120 @@ class SyncOrchestrator:
         self._print_summary(changeset)
         return self.summary
 
+    # ------------------------------------------------------------------
+    # Concurrent execution of per-file sequences
+    # ------------------------------------------------------------------
+
+    async def _sync_changed_files(
+        self, changeset: SyncChangeSet, skip_enrichment: bool
+    ) -> None:
+        """Run every new/modified file's sequence, up to ``jobs`` at a time.
+
+        Each whole sequence is one upload-stage task of an
+        :class:`UploadPipeline` (it returns no operation, so the poll stage
+        stays idle); the pipeline supplies the live in-flight cap and the
+        per-stage report. The sequences share ``self.db.conn``, but every
+        statement and its commit run without an intervening await, so
+        commits stay per file.
+        """
+        new_files = changeset.new_files
+        if self.dedup and new_files:
+            new_files = self._dedup_new_files(new_files, skip_enrichment)
+
+        work = [(self._upload_new_file, f) for f in new_files] + [
+            (self._replace_modified_file, f) for f in changeset.modified_files
+        ]
+        if not work:
+            return
+
+        async def _run(item: tuple[Any, dict]) -> None:
+            handler, file_info = item
+            await handler(file_info, skip_enrichment)
+
+        pipeline: UploadPipeline[tuple[Any, dict]] = UploadPipeline(
+            _run,
+            self._never_polled,
+            upload_concurrency=self.jobs,
+            poll_concurrency=1,
+            upload_limit=self._job_limit,
+        )
+        stats = await pipeline.run(work)
+        self._pipeline_stats = stats
+        logger.info("Sync pipeline: %s", stats.upload.summary())
+
+    def _dedup_new_files(self, new_files: list[dict], skip_enrichment: bool) -> list[dict]:
+        """Alias new files whose payload is already (being) uploaded.
+
+        Every new file is recorded first (its payload is built from its
+        row). Aliases get their sync columns set, so the detector treats
+        them as unchanged, and are not uploaded; the others are returned.
+        Once the canonical file is indexed the alias is live: the upload
+        pending queries skip it and status counts report it as ``shared``.
+        """
+        self.db.upsert_files([self._file_record(f) for f in new_files])
+        paths = [f["file_path"] for f in new_files]
+        prepared = (
+            {}
+            if skip_enrichment
+            else UploadPreparer(self.db.conn, include_entities=True).prepare(paths)
+        )
+
+        candidates: list[PayloadCandidate] = []
+        upload_hashes: dict[str, str] = {}
+        for file_info in new_files:
+            file_path = file_info["file_path"]
+            item = prepared.get(file_path)
+            if item is not None:
+                # Sync bodies carry only the [AI Analysis] header
+                upload_hash = item.upload_hash
+                headers = [item.ai_header] if item.ai_header else []
+            else:
+                metadata = json.loads(file_info.get("metadata_json") or "{}")
+                upload_hash = compute_upload_hash(metadata, {}, [], file_info["content_hash"])
+                headers = []
+            upload_hashes[file_path] = upload_hash
+            candidates.append(PayloadCandidate.build(
+                file_path, file_info["content_hash"], file_info["file_size"],
+                upload_hash, headers,
+            ))
+
+        plan = UploadDeduplicator(self.db.conn).plan(candidates)
+        self._dedup_stats = plan.stats
+        for file_info in new_files:
+            file_path = file_info["file_path"]
+            if file_path in plan.aliases:
+                self.db.update_file_sync_columns(
+                    file_path,
+                    mtime=file_info.get("mtime"),
+                    upload_hash=upload_hashes[file_path],
+                    enrichment_version=CURRENT_ENRICHMENT_VERSION,
+                )
+                logger.info(
+                    "Deduplicated new file %s (shares %s)",
+                    file_path, plan.aliases[file_path],
+                )
+        return [f for f in new_files if f["file_path"] not in plan.aliases]
+
+    def _job_limit(self) -> int:
+        """Sequences allowed in flight: ``jobs``, lowered by the breaker."""
+        if self._circuit_breaker is None:
+            return self.jobs
+        return min(self.jobs, self._circuit_breaker.get_recommended_concurrency(self.jobs))
+
+    @staticmethod
+    async def _never_polled(_operation: Any) -> bool:
+        return True
+
+    @property
+    def pipeline_stats(self) -> PipelineStats | None:
+        """Stage stats of the last run's new/modified file pipeline."""
+        return self._pipeline_stats
+
+    @property
+    def dedup_stats(self) -> DedupStats | None:
+        """Content-addressed dedup outcome for the last run's new files."""
+        return self._dedup_stats
+
     # ------------------------------------------------------------------
     # New file upload
     # ------------------------------------------------------------------
@@ -180,26 +329,21 @@ class SyncOrchestrator:
 
         try:
             # Upsert file record to DB
-            record = FileRecord(
-                file_path=file_path,
-                content_hash=file_info["content_hash"],
-                filename=filename,
-                file_size=file_info["file_size"],
-                metadata_json=file_info.get("metadata_json"),
-                metadata_quality=MetadataQuality(
-                    file_info.get("metadata_quality", "unknown")
-                ),
-            )
-            self.db.upsert_file(record)
+            self.db.upsert_file(self._file_record(file_info))
 
             # Build metadata and upload
-            custom_metadata, upload_path, upload_hash = self._build_file_upload_data(
+            custom_metadata, source, upload_hash = await self._build_file_upload_data(
                 file_path, skip_enrichment
             )
 
-            file_obj, operation = await self.client.upload_and_import(
-                upload_path, filename[:512], custom_metadata
-            )
+            try:
+                file_obj, operation = await self.client.upload_and_import(
+                    source.stream if source is not None else file_path,
+                    filename[:512], custom_metadata,
+                )
+            finally:
+                if source is not None:
+                    source.close()
 
             # Poll operation to completion
             completed = await self.client.poll_operation(operation)
@@ -249,6 +393,21 @@ class SyncOrchestrator:
             self._errors += 1
             logger.error("Failed to upload new file %s: %s", filename, exc)
 
+    @staticmethod
+    def _file_record(file_info: dict) -> FileRecord:
+        """FileRecord for a detected new file."""
+        file_path = file_info["file_path"]
+        return FileRecord(
+            file_path=file_path,
+            content_hash=file_info["content_hash"],
+            filename=file_info.get("filename", os.path.basename(file_path)),
+            file_size=file_info["file_size"],
+            metadata_json=file_info.get("metadata_json"),
+            metadata_quality=MetadataQuality(
+                file_info.get("metadata_quality", "unknown")
+            ),
+        )
+
     # ------------------------------------------------------------------
     # Modified file replacement (upload-first atomicity)
     # ------------------------------------------------------------------
@@ -277,13 +436,18 @@ class SyncOrchestrator:
             self.db.conn.commit()
 
             # Build metadata and upload new version
-            custom_metadata, upload_path, upload_hash = self._build_file_upload_data(
+            custom_metadata, source, upload_hash = await self._build_file_upload_data(
                 file_path, skip_enrichment
             )
 
-            file_obj, operation = await self.client.upload_and_import(
-                upload_path, filename[:512], custom_metadata
-            )
+            try:
+                file_obj, operation = await self.client.upload_and_import(
+                    source.stream if source is not None else file_path,
+                    filename[:512], custom_metadata,
+                )
+            finally:
+                if source is not None:
+                    source.close()
 
             # Poll operation
             completed = await self.client.poll_operation(operation)
@@ -330,11 +494,9 @@ class SyncOrchestrator:
 
             # Step 3: Attempt to delete old store document
             if old_gemini_file_id:
-                doc_name = await self.client.find_store_document_name(
-                    old_gemini_file_id
-                )
+                doc_name = await self.store_index.find(old_gemini_file_id)
                 if doc_name:
-                    deleted = await self.client.delete_store_document(doc_name)
+                    deleted = await self.store_index.delete(doc_name)
                     if deleted:
                         self.db.clear_orphan(file_path)
                         logger.info(
@@ -360,78 +522,51 @@ class SyncOrchestrator:
     # Per-file enrichment helper
     # ------------------------------------------------------------------
 
-    def _build_file_upload_data(
+    async def _build_file_upload_data(
         self, file_path: str, skip_enrichment: bool
-    ) -> tuple[list[dict[str, Any]], str, str]:
+    ) -> tuple[list[dict[str, Any]], UploadSource | None, str]:
         """Build metadata and content for a single file upload.
 
+        The body is read off the event loop so concurrent sequences keep
+        uploading while one file is being read.
+
         Args:
             file_path: Path to the file.
             skip_enrichment: If True, use simple metadata only.
 
         Returns:
-            Tuple of (custom_metadata_list, upload_path, upload_hash).
-            upload_path may be original file or temp file with injected content.
+            Tuple of (custom_metadata_list, source, upload_hash). source is
+            the enriched in-memory body (caller closes it), or None to
+            upload the original file unchanged.
         """
-        # Load Phase 1 metadata from files table
-        row = self.db.conn.execute(
-            "SELECT metadata_json, content_hash FROM files WHERE file_path = ?",
-            (file_path,),
-        ).fetchone()
-        phase1_json = row["metadata_json"] if row else "{}"
-        content_hash = row["content_hash"] if row else ""
-        phase1_metadata = json.loads(phase1_json) if phase1_json else {}
-
         if skip_enrichment:
             # Simple metadata only (Tier 1)
+            row = self.db.conn.execute(
+                "SELECT metadata_json, content_hash FROM files WHERE file_path = ?",
+                (file_path,),
+            ).fetchone()
+            phase1_json = row["metadata_json"] if row else "{}"
+            content_hash = row["content_hash"] if row else ""
+            phase1_metadata = json.loads(phase1_json) if phase1_json else {}
             custom_metadata = GeminiFileSearchClient.build_custom_metadata(
                 phase1_metadata
             )
             upload_hash = compute_upload_hash(phase1_metadata, {}, [], content_hash)
-            return custom_metadata, file_path, upload_hash
-
-        # Load AI metadata
-        ai_row = self.db.conn.execute(
-            """SELECT metadata_json FROM file_metadata_ai
-               WHERE file_path = ? AND is_current = 1""",
-            (file_path,),
-        ).fetchone()
-        ai_json = ai_row["metadata_json"] if ai_row else "{}"
-        ai_metadata = json.loads(ai_json) if ai_json else {}
-
-        # Load entity names
-        entity_rows = self.db.conn.execute(
-            """SELECT p.canonical_name
-               FROM transcript_entity te
-               JOIN person p ON te.person_id = p.person_id
-               WHERE te.transcript_id = ?
-               ORDER BY te.mention_count DESC""",
-            (file_path,),
-        ).fetchall()
-        entity_names = [r["canonical_name"] for r in entity_rows]
-
-        # Build enriched metadata
-        custom_metadata = build_enriched_metadata(
-            phase1_metadata, ai_metadata, entity_names
-        )
-
-        # Prepare enriched content (temp file with Tier 4 header)
-        temp_path = prepare_enriched_content(file_path, ai_metadata)
-        upload_path = temp_path if temp_path is not None else file_path
-
-        # Compute upload hash for idempotency
-        upload_hash = compute_upload_hash(
-            phase1_metadata, ai_metadata, entity_names, content_hash
+            return custom_metadata, None, upload_hash
+
+        # Enriched metadata + [AI Analysis] header, cached by input hash
+        prepared = UploadPreparer(self.db.conn, include_entities=True).prepare(
+            [file_path]
+        )[file_path]
+
+        # Prepare enriched content (Tier 4 header + original, in memory)
+        source = (
+            await asyncio.to_thread(open_upload_source, file_path, [prepared.ai_header])
+            if prepared.ai_header
+            else None
         )
 
-        # Note: caller is NOT responsible for cleanup of temp_path here.
-        # The upload_and_import call reads the file synchronously,
-        # so we clean up after the upload call returns.
-        # For simplicity, we let the temp file persist until process exit
-        # or the next sync run -- Python's tempfile module handles cleanup.
-        # If this becomes a concern, the caller should handle cleanup.
-
-        return custom_metadata, upload_path, upload_hash
+        return prepared.custom_metadata, source, prepared.upload_hash
 
     # ------------------------------------------------------------------
     # LOCAL_DELETE restoration
@@ -503,9 +638,9 @@ class SyncOrchestrator:
             orphaned_id = orphan["orphaned_gemini_file_id"]
 
             try:
-                doc_name = await self.client.find_store_document_name(orphaned_id)
+                doc_name = await self.store_index.find(orphaned_id)
                 if doc_name:
-                    deleted = await self.client.delete_store_document(doc_name)
+                    deleted = await self.store_index.delete(doc_name)
                     if deleted:
                         self.db.clear_orphan(file_path)
                         self._orphans_cleaned += 1
@@ -545,11 +680,9 @@ class SyncOrchestrator:
 
             try:
                 if gemini_file_id:
-                    doc_name = await self.client.find_store_document_name(
-                        gemini_file_id
-                    )
+                    doc_name = await self.store_index.find(gemini_file_id)
                     if doc_name:
-                        await self.client.delete_store_document(doc_name)
+                        await self.store_index.delete(doc_name)
 
                 # Mark as deleted
                 self.db.mark_deleted({file_path})
@@ -564,6 +697,16 @@ class SyncOrchestrator:
     # Display helpers
     # ------------------------------------------------------------------
 
+    def _refresh_local_index(self) -> None:
+        """Re-index changed transcripts for local search (best-effort)."""
+        try:
+            stats = LocalSearchIndex(self.db).refresh()
+        except Exception as exc:
+            logger.warning("Local index refresh failed: %s", exc)
+            return
+        if stats.indexed or stats.removed:
+            self.console.print(f"[dim]Local index: {stats.summary}[/dim]")
+
     def _print_dry_run(self, changeset: SyncChangeSet) -> None:
         """Print what would happen without executing."""
         self.console.print("\n[bold yellow]DRY RUN[/bold yellow] -- no changes made\n")
@@ -624,6 +767,13 @@ class SyncOrchestrator:
 
         table.add_row("New uploaded", f"[green]{self._uploaded_new}[/green]")
         table.add_row("Modified replaced", f"[yellow]{self._uploaded_modified}[/yellow]")
+        if self._dedup_stats is not None and self._dedup_stats.skipped:
+            stats = self._dedup_stats
+            table.add_row(
+                "Deduplicated",
+                f"[cyan]{stats.skipped}[/cyan] ({stats.bytes_saved} bytes, "
+                f"{stats.api_calls_saved} API calls saved)",
+            )
         table.add_row("Marked missing", f"[red]{self._marked_missing}[/red]")
         table.add_row("Pruned", str(self._pruned))
         table.add_row("Orphans cleaned", str(self._orphans_cleaned))
@@ -653,5 +803,6 @@ class SyncOrchestrator:
             "marked_missing": self._marked_missing,
             "pruned": self._pruned,
             "orphans_cleaned": self._orphans_cleaned,
+            "deduplicated": self._dedup_stats.skipped if self._dedup_stats else 0,
             "errors": self._errors,
         }
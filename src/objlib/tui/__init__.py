@@ -58,7 +58,12 @@ def run_tui(
         print("Continuing with display name as fallback...")
 
     # Create service instances
-    from objlib.services import LibraryService, SearchService, SessionService
+    from objlib.services import (
+        LibraryService,
+        SearchService,
+        SessionService,
+        close_all_pools,
+    )
 
     search_service = SearchService(
         api_key=api_key,
@@ -74,4 +79,8 @@ def run_tui(
         library_service=library_service,
         session_service=session_service,
     )
-    app.run()
+    try:
+        app.run()
+    finally:
+        # Logs final checkout latency / saturation stats for each pool
+        close_all_pools()
@@ -259,11 +259,26 @@ class ObjlibApp(App):
             filters = filter_set.to_filter_strings()
 
         return defer_task(
-            lambda: self.search_service.search(query, filters=filters, top_k=20)
+            lambda: self.search_service.search(
+                query,
+                filters=filters,
+                top_k=20,
+                on_partial=lambda result: self._on_partial_result(query, result),
+            )
         ).pipe(
             ops.catch(lambda err, source: self._handle_search_error(err, query))
         )
 
+    def _on_partial_result(self, query: str, result) -> None:
+        """Show provisional results (local tiers, then un-reranked) while the search runs."""
+        if query != self.query or not self.is_searching:
+            return  # Superseded by a newer search
+        self.results = result.citations
+        self.query_one(ResultsList).update_results(self.results)
+        self.query_one("#status-bar", Static).update(
+            f"{len(self.results)} citations | {query[:30]} | Refining..."
+        )
+
     def _on_search_result(self, result) -> None:
         """Handle a successful search result from the pipeline."""
         self.results = result.citations if hasattr(result, "citations") else []
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from textual import events
 from textual.containers import VerticalScroll
+from textual.widget import Widget
 from textual.widgets import Static
 
 from rich.text import Text
@@ -159,21 +160,23 @@ class ResultsList(VerticalScroll):
             citations: List of Citation objects to display. Empty list
                 shows a 'No results found' message.
         """
-        self.remove_children()
         if not citations:
-            self.mount(Static("No results found"))
+            widgets: list[Widget] = [Static("No results found")]
         else:
             total = len(citations)
-            self.mount(Static(f"{total} citations retrieved"))
-            for i, citation in enumerate(citations):
-                self.mount(ResultItem(citation, i, rank=i + 1, total=total))
+            widgets = [Static(f"{total} citations retrieved")]
+            widgets.extend(
+                ResultItem(citation, i, rank=i + 1, total=total)
+                for i, citation in enumerate(citations)
+            )
             if total > 3:
-                self.mount(
+                widgets.append(
                     Static(
                         "\u2191/\u2193 to scroll, PgUp/PgDn for pages",
                         classes="scroll-hint",
                     )
                 )
+        self._replace_children(widgets)
 
     def update_status(self, text: str) -> None:
         """Show a status message, replacing all result cards.
@@ -183,8 +186,23 @@ class ResultsList(VerticalScroll):
         Args:
             text: Status message to display.
         """
-        self.remove_children()
-        self.mount(Static(text))
+        self._replace_children([Static(text)])
+
+    def _replace_children(self, widgets: list[Widget]) -> None:
+        """Swap in new children once the old ones have been removed.
+
+        ``remove_children()`` completes asynchronously, so mounting result
+        cards straight after it collides with the outgoing cards' IDs when
+        results are replaced twice in quick succession (local results, then
+        the fused Gemini results). Replacements are queued on this widget's
+        message loop and applied in call order.
+        """
+
+        async def replace() -> None:
+            await self.remove_children()
+            await self.mount_all(widgets)
+
+        self.call_later(replace)
 
     def select_index(self, index: int) -> None:
         """Highlight the result card at the given index.
@@ -21,7 +21,12 @@ from objlib.upload.client import (
     RateLimitError,
     TransientError,
 )
-from objlib.upload.content_preparer import cleanup_temp_file, prepare_enriched_content
+from objlib.upload.content_preparer import (
+    UploadSource,
+    cleanup_temp_file,
+    open_upload_source,
+    prepare_enriched_content,
+)
 from objlib.upload.metadata_builder import build_enriched_metadata, compute_upload_hash
 from objlib.upload.orchestrator import UploadOrchestrator
 from objlib.upload.progress import UploadProgressTracker
@@ -44,8 +49,10 @@ __all__ = [
     "TransientError",
     "UploadOrchestrator",
     "UploadProgressTracker",
+    "UploadSource",
     "build_enriched_metadata",
     "cleanup_temp_file",
     "compute_upload_hash",
+    "open_upload_source",
     "prepare_enriched_content",
 ]
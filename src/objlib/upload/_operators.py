@@ -28,6 +28,47 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+) -> T:
+    """Await fn() with exponential-backoff retries, in the caller's task.
+
+    Unlike ``make_retrying_observable`` (which schedules a detached task),
+    cancelling the awaiting task cancels the in-flight attempt or backoff
+    sleep, so a superseded request stops immediately.
+
+    Args:
+        fn: Async callable (no arguments) to invoke.
+        max_retries: Maximum number of retry attempts after the first failure.
+        base_delay: Base delay in seconds; doubles each retry (exponential backoff).
+
+    Returns:
+        The result of fn().
+
+    Raises:
+        Exception: The last exception after max_retries exhausted.
+    """
+    last_exc: Exception | None = None
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            last_exc = e
+            if attempt < max_retries:
+                delay = base_delay * (2**attempt)
+                logger.debug(
+                    "Retry %d/%d after %.1fs: %s",
+                    attempt + 1,
+                    max_retries,
+                    delay,
+                    e,
+                )
+                await asyncio.sleep(delay)
+    raise last_exc  # type: ignore[misc]
+
+
 def make_retrying_observable(
     fn: Callable[[], Awaitable[T]],
     max_retries: int = 3,
@@ -46,27 +87,9 @@ def make_retrying_observable(
         An Observable that emits the result of fn() or raises the last exception
         after max_retries exhausted.
     """
-
-    async def _run() -> T:
-        last_exc: Exception | None = None
-        for attempt in range(max_retries + 1):
-            try:
-                return await fn()
-            except Exception as e:
-                last_exc = e
-                if attempt < max_retries:
-                    delay = base_delay * (2**attempt)
-                    logger.debug(
-                        "Retry %d/%d after %.1fs: %s",
-                        attempt + 1,
-                        max_retries,
-                        delay,
-                        e,
-                    )
-                    await asyncio.sleep(delay)
-        raise last_exc  # type: ignore[misc]
-
-    return rx.from_future(asyncio.ensure_future(_run()))
+    return rx.from_future(
+        asyncio.ensure_future(retry_async(fn, max_retries=max_retries, base_delay=base_delay))
+    )
 
 
 async def subscribe_awaitable(obs: Observable) -> T:  # type: ignore[type-var]
@@ -0,0 +1,671 @@
+"""Bulk startup recovery: one store listing, one transaction.
+
+The per-file recovery path (:class:`~objlib.upload.recovery.RecoveryManager`,
+:class:`~objlib.upload.recovery.RecoveryCrawler`,
+:func:`~objlib.upload.recovery.cleanup_and_reset_failed_files` and
+:func:`~objlib.upload.recovery.recover_untracked_with_store_doc`) runs a
+SELECT, an UPDATE and a commit per file, and lists the whole store twice.
+After a crash with hundreds of files in ``uploading``/``processing``,
+startup took as long as a small upload run.
+
+:class:`BulkRecovery` reaches the same end states in six phases:
+
+1. **load** -- one SELECT of every file any recovery step could touch,
+   plus the pending rows of ``upload_operations``.
+2. **list** -- one ``documents.list`` of the store, joined in memory by
+   Gemini file ID (the document ``display_name``) and by document suffix.
+3. **verify** -- only ambiguous rows reach the API: pending operations
+   whose file has no ACTIVE store document are polled, with bounded
+   concurrency.
+4. **plan** -- the per-file steps are replayed in their original order
+   against in-memory copies of the rows, producing one final column set
+   per file.
+5. **delete** -- intent deletions, failed store documents and stale raw
+   files are deleted with bounded concurrency. Documents the listing shows
+   are already gone are skipped.
+6. **apply** -- every change is written in one transaction. Each UPDATE is
+   guarded by the row's loaded ``version`` and ``gemini_state``, so a row
+   changed since the load is left for the next startup (an OCC conflict).
+
+In addition to the per-file steps, files stuck in ``processing`` (their
+poll was lost in the crash) are resolved from the listing: an ACTIVE
+document makes them ``indexed``; a failed document makes them ``failed``,
+which the failed-file step then cleans up.
+
+Intent progress (``intent_api_calls_completed``) is not persisted between
+deletions: the deletions run before the transaction, and 404s are ignored,
+so a crash mid-recovery repeats them harmlessly.
+
+If the store cannot be listed, :meth:`BulkRecovery.run` returns ``None``
+and the caller falls back to the per-file path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import rx
+from rx import operators as ops
+
+from objlib.models import UploadConfig
+from objlib.upload._operators import subscribe_awaitable
+from objlib.upload.client import GeminiFileSearchClient
+from objlib.upload.recovery import (
+    RecoveryManager,
+    RecoveryResult,
+    RecoveryTimeoutError,
+    _OperationProxy,
+)
+from objlib.upload.state import AsyncUploadStateManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERIFY_CONCURRENCY = 8
+DEFAULT_DELETE_CONCURRENCY = 4
+
+_PHASES = ("load", "list", "verify", "plan", "delete", "apply")
+
+_INTENT_CLEARED = {
+    "intent_type": None,
+    "intent_started_at": None,
+    "intent_api_calls_completed": None,
+}
+
+_RESET_CLEARED = {
+    "gemini_state": "untracked",
+    "gemini_file_id": None,
+    "gemini_file_uri": None,
+    "gemini_store_doc_id": None,
+    "upload_timestamp": None,
+    "remote_expiration_ts": None,
+    "error_message": None,
+    **_INTENT_CLEARED,
+}
+
+
+@dataclass
+class PhaseReport:
+    """Wall time and API calls spent in one phase."""
+
+    seconds: float = 0.0
+    api_calls: int = 0
+
+
+@dataclass
+class BulkRecoveryReport:
+    """Outcome of one :meth:`BulkRecovery.run`.
+
+    Attributes:
+        recovery: Counters of the RecoveryManager steps (interrupted
+            uploads, pending operations, expiration deadlines).
+        intents_recovered: Files whose write-ahead intent was finalized.
+        intent_failures: Files whose intent deletions failed.
+        processing_indexed: ``processing`` files with an ACTIVE document.
+        failed_upgraded: ``failed`` files upgraded to ``indexed``.
+        failed_reset: ``failed`` files reset to ``untracked``.
+        untracked_restored: ``untracked`` files restored to ``indexed``.
+        store_doc_ids_cleared: Stale ``gemini_store_doc_id`` values cleared.
+        occ_conflicts: Files changed since the load (left for next startup).
+        phases: Per-phase wall time and API calls.
+    """
+
+    recovery: RecoveryResult = field(default_factory=RecoveryResult)
+    intents_recovered: list[str] = field(default_factory=list)
+    intent_failures: list[str] = field(default_factory=list)
+    processing_indexed: int = 0
+    failed_upgraded: int = 0
+    failed_reset: int = 0
+    untracked_restored: int = 0
+    store_doc_ids_cleared: int = 0
+    occ_conflicts: list[str] = field(default_factory=list)
+    phases: dict[str, PhaseReport] = field(
+        default_factory=lambda: {name: PhaseReport() for name in _PHASES}
+    )
+
+    @property
+    def api_calls(self) -> int:
+        return sum(phase.api_calls for phase in self.phases.values())
+
+    @property
+    def seconds(self) -> float:
+        return sum(phase.seconds for phase in self.phases.values())
+
+
+class _Row:
+    """In-memory copy of one files row with the changes planned for it."""
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        self.loaded = row
+        self.current = dict(row)
+        self.changes: dict[str, Any] = {}
+        self.bump = 0
+
+    def __getitem__(self, column: str) -> Any:
+        return self.current[column]
+
+    def set(self, bump: bool = False, **columns: Any) -> None:
+        self.current.update(columns)
+        self.changes.update(columns)
+        if bump:
+            self.bump += 1
+
+
+@dataclass
+class _Delete:
+    kind: str  # "document" or "file"
+    name: str
+    file_path: str
+    strict: bool = False  # Intent deletions: non-404 errors block finalize
+
+
+class BulkRecovery:
+    """Set-based replacement for the per-file startup recovery steps.
+
+    Args:
+        state: Async SQLite state manager.
+        client: Gemini client (store listing, operation polls, deletions).
+        config: Upload configuration (``recovery_timeout_seconds``).
+        verify_concurrency: Concurrent operation polls.
+        delete_concurrency: Concurrent deletion calls.
+    """
+
+    def __init__(
+        self,
+        state: AsyncUploadStateManager,
+        client: GeminiFileSearchClient,
+        config: UploadConfig,
+        verify_concurrency: int = DEFAULT_VERIFY_CONCURRENCY,
+        delete_concurrency: int = DEFAULT_DELETE_CONCURRENCY,
+    ) -> None:
+        self._state = state
+        self._client = client
+        self._config = config
+        self._verify_concurrency = verify_concurrency
+        self._delete_concurrency = delete_concurrency
+
+    async def run(self) -> BulkRecoveryReport | None:
+        """Run all phases under ``config.recovery_timeout_seconds``.
+
+        Returns:
+            The report, or ``None`` if the store could not be listed (nothing
+            was changed; use the per-file path).
+
+        Raises:
+            RecoveryTimeoutError: If recovery exceeds the timeout.
+        """
+        timeout = self._config.recovery_timeout_seconds
+        try:
+            obs = rx.from_future(asyncio.ensure_future(self._recover())).pipe(
+                ops.timeout(timeout)
+            )
+            return await subscribe_awaitable(obs)
+        except Exception as exc:
+            if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or str(exc) == "Timeout":
+                logger.critical("Bulk recovery timed out after %d seconds", timeout)
+                raise RecoveryTimeoutError(f"Recovery exceeded {timeout}s timeout") from None
+            raise
+
+    async def _recover(self) -> BulkRecoveryReport | None:
+        from google.genai.types import DocumentState
+
+        report = BulkRecoveryReport()
+        phases = report.phases
+
+        # Phase: load
+        started = time.perf_counter()
+        rows, operations = await self._load()
+        phases["load"].seconds = time.perf_counter() - started
+        if not rows and not operations:
+            logger.debug("Bulk recovery: nothing to recover")
+            return report
+
+        # Phase: list
+        started = time.perf_counter()
+        phases["list"].api_calls = 1
+        try:
+            documents = await self._client.list_store_documents()
+        except Exception as exc:
+            logger.warning("Bulk recovery: could not list store documents: %s", exc)
+            return None
+        by_file_id: dict[str, tuple[str, object, str]] = {}
+        by_suffix: dict[str, tuple[object, str]] = {}
+        for doc in documents:
+            full_name = getattr(doc, "name", None)
+            if not full_name:
+                continue
+            doc_state = getattr(doc, "state", None)
+            suffix = full_name.rsplit("/", 1)[-1]
+            by_suffix[suffix] = (doc_state, full_name)
+            display_name = getattr(doc, "display_name", None)
+            if display_name:
+                by_file_id[_raw_name(display_name)] = (suffix, doc_state, full_name)
+        phases["list"].seconds = time.perf_counter() - started
+
+        def _active(file_id: str | None) -> bool:
+            entry = by_file_id.get(_raw_name(file_id)) if file_id else None
+            return entry is not None and entry[1] == DocumentState.STATE_ACTIVE
+
+        # Phase: verify (only operations the listing cannot settle)
+        started = time.perf_counter()
+        ambiguous = [
+            op for op in operations
+            if not _active(op.get("gemini_file_name") or rows.get(op["file_path"], {}).get("gemini_file_id"))
+        ]
+        polled = await self._poll_operations(ambiguous)
+        phases["verify"].api_calls = len(ambiguous)
+        phases["verify"].seconds = time.perf_counter() - started
+
+        # Phase: plan (steps 1-3, then intents after their deletions)
+        started = time.perf_counter()
+        state = {path: _Row(row) for path, row in rows.items()}
+        now = self._state._now_iso()
+        op_updates: list[tuple[str, str, str | None]] = []
+        self._plan_interrupted_uploads(state, report.recovery, now)
+        self._plan_pending_operations(state, operations, polled, op_updates, report.recovery, now)
+        self._plan_expiration(state, report.recovery, now)
+        intents = sorted(
+            (row for row in state.values() if row["intent_type"] is not None),
+            key=lambda row: row["intent_started_at"] or "",
+        )
+        intent_deletes = []
+        for row in intents:
+            completed = row["intent_api_calls_completed"] or 0
+            doc_id = row["gemini_store_doc_id"]
+            if completed < 1 and doc_id and doc_id.rsplit("/", 1)[-1] in by_suffix:
+                intent_deletes.append(_Delete("document", doc_id, row["file_path"], strict=True))
+            if completed < 2 and row["gemini_file_id"]:
+                intent_deletes.append(
+                    _Delete("file", _raw_name(row["gemini_file_id"]), row["file_path"], strict=True)
+                )
+        phases["plan"].seconds = time.perf_counter() - started
+
+        # Phase: delete (intents first: their outcome decides finalization)
+        started = time.perf_counter()
+        blocked = await self._delete(intent_deletes)
+        phases["delete"].api_calls = len(intent_deletes)
+        phases["delete"].seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for row in intents:
+            if row["file_path"] in blocked:
+                report.intent_failures.append(row["file_path"])
+                continue
+            row.set(bump=True, **_RESET_CLEARED, gemini_state_updated_at=now)
+            report.intents_recovered.append(row["file_path"])
+        deletes: list[_Delete] = []
+        self._plan_processing(state, by_file_id, report, now, DocumentState)
+        self._plan_failed(state, by_file_id, by_suffix, deletes, report, now, DocumentState)
+        self._plan_untracked(state, by_suffix, deletes, report, now, DocumentState)
+        phases["plan"].seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        await self._delete(deletes)
+        phases["delete"].api_calls += len(deletes)
+        phases["delete"].seconds += time.perf_counter() - started
+
+        # Phase: apply
+        started = time.perf_counter()
+        report.occ_conflicts = await self._apply(state, op_updates, now)
+        phases["apply"].seconds = time.perf_counter() - started
+
+        self._log(report)
+        return report
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    async def _load(self) -> tuple[dict[str, dict], list[dict]]:
+        db = self._state._ensure_connected()
+        operations = [
+            dict(r) for r in await db.execute_fetchall(
+                """SELECT operation_name, file_path, gemini_file_name
+                   FROM upload_operations
+                   WHERE operation_state IN ('pending', 'in_progress')
+                   ORDER BY created_at"""
+            )
+        ]
+        rows = await db.execute_fetchall(
+            """SELECT file_path, gemini_state, gemini_file_id, gemini_file_uri,
+                      gemini_store_doc_id, remote_expiration_ts, intent_type,
+                      intent_started_at, intent_api_calls_completed, version
+               FROM files
+               WHERE gemini_state IN ('uploading', 'processing', 'failed')
+                  OR intent_type IS NOT NULL
+                  OR (remote_expiration_ts IS NOT NULL AND gemini_state = 'indexed')
+                  OR (gemini_state = 'untracked' AND gemini_store_doc_id IS NOT NULL
+                      AND gemini_store_doc_id != '')
+                  OR file_path IN (SELECT file_path FROM upload_operations
+                                   WHERE operation_state IN ('pending', 'in_progress'))
+               ORDER BY file_path"""
+        )
+        return {r["file_path"]: dict(r) for r in rows}, operations
+
+    # ------------------------------------------------------------------
+    # Verify
+    # ------------------------------------------------------------------
+
+    async def _poll_operations(self, operations: list[dict]) -> dict[str, Any]:
+        """Poll each operation once (bounded); value is the result or exception."""
+        semaphore = asyncio.Semaphore(self._verify_concurrency)
+
+        async def _poll(op_name: str) -> Any:
+            async with semaphore:
+                try:
+                    obs = rx.from_future(
+                        asyncio.ensure_future(
+                            self._client.poll_operation(_OperationProxy(op_name), timeout=60)
+                        )
+                    ).pipe(ops.timeout(65))  # slightly longer than poll timeout
+                    return await subscribe_awaitable(obs)
+                except Exception as exc:
+                    return exc
+
+        names = [op["operation_name"] for op in operations]
+        results = await asyncio.gather(*(_poll(name) for name in names))
+        return dict(zip(names, results))
+
+    # ------------------------------------------------------------------
+    # Plan: RecoveryManager steps
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _plan_interrupted_uploads(
+        state: dict[str, _Row], result: RecoveryResult, now: str
+    ) -> None:
+        for row in state.values():
+            if row["gemini_state"] != "uploading":
+                continue
+            expiration = row["remote_expiration_ts"]
+            if row["gemini_file_id"] and not (
+                expiration and RecoveryManager._is_expired(expiration)
+            ):
+                row.set(gemini_state="indexed", updated_at=now)
+                result.recovered_operations += 1
+            else:
+                if row["gemini_file_id"]:
+                    result.expired_files += 1
+                row.set(gemini_state="untracked", updated_at=now)
+                result.reset_to_pending += 1
+
+    @staticmethod
+    def _plan_pending_operations(
+        state: dict[str, _Row],
+        operations: list[dict],
+        polled: dict[str, Any],
+        op_updates: list[tuple[str, str, str | None]],
+        result: RecoveryResult,
+        now: str,
+    ) -> None:
+        for op in operations:
+            op_name = op["operation_name"]
+            row = state.get(op["file_path"])
+            outcome = polled.get(op_name)
+            if op_name not in polled:
+                # Settled by the listing: the file's document is ACTIVE
+                outcome_done, error = True, None
+            elif isinstance(outcome, Exception):
+                if isinstance(outcome, (asyncio.TimeoutError, TimeoutError)) or str(outcome) == "Timeout":
+                    logger.warning("Timeout polling operation %s, will retry later", op_name)
+                    continue
+                msg = f"Error polling operation {op_name}: {outcome}"
+                logger.error(msg)
+                result.errors.append(msg)
+                outcome_done, error = True, outcome
+            else:
+                outcome_done = getattr(outcome, "done", None) is True
+                error = getattr(outcome, "error", None)
+
+            if not outcome_done:
+                logger.info("Operation %s still in progress, leaving for orchestrator", op_name)
+            elif not error:
+                op_updates.append((op_name, "succeeded", None))
+                if row is not None:
+                    row.set(updated_at=now)
+                result.recovered_operations += 1
+            else:
+                op_updates.append((op_name, "failed", str(error)))
+                if row is not None:
+                    row.set(gemini_state="untracked", updated_at=now)
+                result.reset_to_pending += 1
+
+    @staticmethod
+    def _plan_expiration(state: dict[str, _Row], result: RecoveryResult, now: str) -> None:
+        current = datetime.now(timezone.utc)
+        for row in state.values():
+            expiration_str = row["remote_expiration_ts"]
+            if not expiration_str or row["gemini_state"] not in ("uploading", "indexed"):
+                continue
+            try:
+                expiration = datetime.fromisoformat(expiration_str.replace("Z", "+00:00"))
+                if expiration.tzinfo is None:
+                    expiration = expiration.replace(tzinfo=timezone.utc)
+            except (ValueError, TypeError) as exc:
+                msg = f"Error parsing expiration for {row['file_path']}: {exc}"
+                logger.error(msg)
+                result.errors.append(msg)
+                continue
+
+            hours_remaining = (expiration - current).total_seconds() / 3600
+            if hours_remaining <= 0:
+                cleared = {"gemini_file_uri": None, "gemini_file_id": None,
+                           "remote_expiration_ts": None, "updated_at": now}
+                if row["gemini_state"] == "indexed":
+                    # Raw file expired; the store document is permanent
+                    row.set(**cleared)
+                else:
+                    row.set(gemini_state="untracked", upload_timestamp=None, **cleared)
+                    result.reset_to_pending += 1
+                result.expired_files += 1
+            elif hours_remaining <= 8:
+                logger.warning(
+                    "File %s approaching deadline: %.1f hours remaining",
+                    row["file_path"], hours_remaining,
+                )
+                result.deadline_critical += 1
+
+    # ------------------------------------------------------------------
+    # Plan: listing-driven steps
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _plan_processing(
+        state: dict[str, _Row],
+        by_file_id: dict[str, tuple[str, object, str]],
+        report: BulkRecoveryReport,
+        now: str,
+        document_state: Any,
+    ) -> None:
+        for row in state.values():
+            if row["gemini_state"] != "processing" or not row["gemini_file_id"]:
+                continue
+            entry = by_file_id.get(_raw_name(row["gemini_file_id"]))
+            if entry is None or entry[1] == document_state.STATE_PENDING:
+                continue  # Import may still be running
+            if entry[1] == document_state.STATE_ACTIVE:
+                row.set(bump=True, gemini_state="indexed", gemini_store_doc_id=entry[0],
+                        error_message=None, gemini_state_updated_at=now)
+                report.processing_indexed += 1
+            else:
+                row.set(bump=True, gemini_state="failed",
+                        error_message="store document failed to index",
+                        gemini_state_updated_at=now)
+
+    @staticmethod
+    def _plan_failed(
+        state: dict[str, _Row],
+        by_file_id: dict[str, tuple[str, object, str]],
+        by_suffix: dict[str, tuple[object, str]],
+        deletes: list[_Delete],
+        report: BulkRecoveryReport,
+        now: str,
+        document_state: Any,
+    ) -> None:
+        for row in state.values():
+            if row["gemini_state"] != "failed":
+                continue
+            path = row["file_path"]
+            file_id = row["gemini_file_id"]
+            entry = by_file_id.get(_raw_name(file_id)) if file_id else None
+            if entry is not None and entry[1] == document_state.STATE_ACTIVE:
+                row.set(bump=True, gemini_state="indexed", gemini_store_doc_id=entry[0],
+                        error_message=None, gemini_state_updated_at=now, **_INTENT_CLEARED)
+                report.failed_upgraded += 1
+                continue
+            if entry is not None and entry[1] == document_state.STATE_PENDING:
+                continue  # Import in progress; next startup decides
+
+            if entry is not None:
+                deletes.append(_Delete("document", entry[2], path))
+            else:
+                stale = row["gemini_store_doc_id"]
+                listed = by_suffix.get(stale.rsplit("/", 1)[-1]) if stale else None
+                if listed is not None:
+                    deletes.append(_Delete("document", listed[1], path))
+            if file_id:
+                deletes.append(_Delete("file", _raw_name(file_id), path))
+            row.set(bump=True, **_RESET_CLEARED, gemini_state_updated_at=now)
+            report.failed_reset += 1
+
+    @staticmethod
+    def _plan_untracked(
+        state: dict[str, _Row],
+        by_suffix: dict[str, tuple[object, str]],
+        deletes: list[_Delete],
+        report: BulkRecoveryReport,
+        now: str,
+        document_state: Any,
+    ) -> None:
+        for row in state.values():
+            doc_id = row["gemini_store_doc_id"]
+            if row["gemini_state"] != "untracked" or not doc_id:
+                continue
+            entry = by_suffix.get(doc_id)
+            if entry is not None and entry[0] == document_state.STATE_ACTIVE:
+                row.set(bump=True, gemini_state="indexed", remote_expiration_ts=None,
+                        gemini_state_updated_at=now)
+                report.untracked_restored += 1
+            elif entry is not None and entry[0] == document_state.STATE_PENDING:
+                continue
+            else:
+                if entry is not None:
+                    deletes.append(_Delete("document", entry[1], row["file_path"]))
+                row.set(gemini_store_doc_id=None, updated_at=now)
+                report.store_doc_ids_cleared += 1
+
+    # ------------------------------------------------------------------
+    # Delete and apply
+    # ------------------------------------------------------------------
+
+    async def _delete(self, deletes: list[_Delete]) -> set[str]:
+        """Run deletions (bounded); return file paths whose strict deletion failed."""
+        semaphore = asyncio.Semaphore(self._delete_concurrency)
+        blocked: set[str] = set()
+
+        async def _run(item: _Delete) -> None:
+            async with semaphore:
+                try:
+                    if item.kind == "document":
+                        await self._client.delete_store_document(item.name)
+                    else:
+                        await self._client.delete_file(item.name)
+                except Exception as exc:
+                    if "404" in str(exc) or "NOT_FOUND" in str(exc):
+                        return
+                    if item.strict:
+                        logger.error("Failed to recover %s: %s", item.file_path, exc)
+                        blocked.add(item.file_path)
+                    else:
+                        logger.warning(
+                            "Bulk recovery: could not delete %s %s for %s: %s",
+                            item.kind, item.name, item.file_path, exc,
+                        )
+
+        await asyncio.gather(*(_run(item) for item in deletes))
+        return blocked
+
+    async def _apply(
+        self,
+        state: dict[str, _Row],
+        op_updates: list[tuple[str, str, str | None]],
+        now: str,
+    ) -> list[str]:
+        """Write every planned change in one transaction; return OCC conflicts."""
+        groups: dict[tuple[tuple[str, ...], int], list[_Row]] = defaultdict(list)
+        for row in state.values():
+            if row.changes:
+                groups[(tuple(sorted(row.changes)), row.bump)].append(row)
+
+        db = self._state._ensure_connected()
+        conflicts: list[str] = []
+        try:
+            for (columns, bump), group in groups.items():
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                if bump:
+                    assignments += f", version = version + {bump}"
+                sql = (
+                    f"UPDATE files SET {assignments} "
+                    "WHERE file_path = ? AND version = ? AND gemini_state = ? "
+                    "RETURNING file_path"
+                )
+                for row in group:
+                    params = [row.changes[c] for c in columns]
+                    params += [row["file_path"], row.loaded["version"], row.loaded["gemini_state"]]
+                    if not await db.execute_fetchall(sql, params):
+                        conflicts.append(row["file_path"])
+            for op_name, op_state, error in op_updates:
+                if op_state == "succeeded":
+                    await db.execute(
+                        """UPDATE upload_operations
+                           SET operation_state = 'succeeded', completed_at = ?
+                           WHERE operation_name = ?""",
+                        (now, op_name),
+                    )
+                else:
+                    await db.execute(
+                        """UPDATE upload_operations
+                           SET operation_state = 'failed', last_polled_at = ?,
+                               completed_at = ?, error_message = ?
+                           WHERE operation_name = ?""",
+                        (now, now, error, op_name),
+                    )
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+        if conflicts:
+            logger.warning(
+                "Bulk recovery: %d files changed since load, left for next startup",
+                len(conflicts),
+            )
+        return conflicts
+
+    @staticmethod
+    def _log(report: BulkRecoveryReport) -> None:
+        result = report.recovery
+        logger.info(
+            "Bulk recovery complete: %d ops recovered, %d reset to pending, %d expired, "
+            "%d deadline-critical, %d intents recovered, %d processing indexed, "
+            "%d failed upgraded, %d failed reset, %d untracked restored, "
+            "%d store doc IDs cleared, %d OCC conflicts, %d errors",
+            result.recovered_operations, result.reset_to_pending, result.expired_files,
+            result.deadline_critical, len(report.intents_recovered),
+            report.processing_indexed, report.failed_upgraded, report.failed_reset,
+            report.untracked_restored, report.store_doc_ids_cleared,
+            len(report.occ_conflicts), len(result.errors),
+        )
+        for name, phase in report.phases.items():
+            logger.info(
+                "Bulk recovery %-6s %7.3fs  %d API calls", name, phase.seconds, phase.api_calls
+            )
+
+
+def _raw_name(file_id: str) -> str:
+    """``'abc'`` and ``'files/abc'`` both give ``'files/abc'``."""
+    return file_id if file_id.startswith("files/") else f"files/{file_id}"
@@ -64,6 +64,7 @@ class RollingWindowCircuitBreaker:
         self._opened_at: float | None = None
         self._consecutive_429s = 0
         self._success_since_recovery = 0
+        self._counts = [0, 0, 0]  # successes, 429s, other errors (monotonic)
 
     # ------------------------------------------------------------------
     # Public recording methods
@@ -71,6 +72,7 @@ class RollingWindowCircuitBreaker:
 
     def record_success(self) -> None:
         """Record a successful API call."""
+        self._counts[0] += 1
         self._window.append(True)
         self._consecutive_429s = 0
         self._success_since_recovery += 1
@@ -87,6 +89,7 @@ class RollingWindowCircuitBreaker:
 
     def record_429(self) -> None:
         """Record a 429 rate-limit response."""
+        self._counts[1] += 1
         self._window.append(False)
         self._consecutive_429s += 1
 
@@ -98,6 +101,7 @@ class RollingWindowCircuitBreaker:
         # Non-rate-limit errors are tracked for observability but do not
         # affect the circuit breaker state machine.  We reset the
         # consecutive 429 counter since this was a different error.
+        self._counts[2] += 1
         self._consecutive_429s = 0
         logger.debug("Circuit breaker recorded non-429 error (state=%s)", self._state)
 
@@ -126,6 +130,15 @@ class RollingWindowCircuitBreaker:
             return 0.0
         return sum(1 for x in self._window if not x) / len(self._window)
 
+    @property
+    def outcome_counts(self) -> tuple[int, int, int]:
+        """Totals since creation: ``(successes, rate_limited, errors)``.
+
+        Unlike the rolling window these never reset, so callers can diff
+        two snapshots to see what happened in between.
+        """
+        return (self._counts[0], self._counts[1], self._counts[2])
+
     # ------------------------------------------------------------------
     # Concurrency recommendation
     # ------------------------------------------------------------------
@@ -12,16 +12,17 @@ The single-step ``upload_to_file_search_store()`` method does not support
 
 from __future__ import annotations
 
+import io
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 
 from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types as genai_types
-from objlib.upload._operators import subscribe_awaitable, make_retrying_observable
 
 from objlib.models import MetadataQuality
 from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.operation_tracker import OperationTracker
 from objlib.upload.rate_limiter import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
@@ -97,6 +98,22 @@ class GeminiFileSearchClient:
         self._circuit_breaker = circuit_breaker
         self._rate_limiter = rate_limiter
         self.store_name = store_name
+        self._operation_tracker: OperationTracker | None = None
+
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter:
+        """Rate limiter fed with the quota headers of every response."""
+        return self._rate_limiter
+
+    @property
+    def operation_tracker(self) -> OperationTracker:
+        """Shared scheduler behind :meth:`wait_for_active` and :meth:`poll_operation`."""
+        if self._operation_tracker is None:
+            self._operation_tracker = OperationTracker(
+                rate_limit_errors=(RateLimitError,),
+                final_errors=(RuntimeError,),
+            )
+        return self._operation_tracker
 
     # ------------------------------------------------------------------
     # Store management
@@ -147,29 +164,38 @@ class GeminiFileSearchClient:
     # Two-step upload pattern
     # ------------------------------------------------------------------
 
-    async def upload_file(self, file_path: str, display_name: str) -> Any:
+    async def upload_file(self, file_path: str | BinaryIO, display_name: str) -> Any:
         """Step 1: Upload a file to the Files API (temporary, 48hr TTL).
 
         Args:
-            file_path: Local path to the file.
+            file_path: Local path to the file, or a seekable binary stream
+                of plain text (e.g. :class:`~objlib.upload.content_preparer.UploadSource`
+                ``.stream``); streams are rewound first so retries resend
+                the whole body.
             display_name: Display name (max 512 chars).
 
         Returns:
             The Gemini File object.
         """
+        config: dict[str, Any] = {"display_name": display_name[:512]}
+        if isinstance(file_path, io.IOBase):
+            file_path.seek(0)
+            config["mime_type"] = "text/plain"
         await self._rate_limiter.wait_if_needed()
         result = await self._safe_call(
             self._client.aio.files.upload,
             file=file_path,
-            config={"display_name": display_name[:512]},
+            config=config,
         )
-        logger.debug("Uploaded file %s -> %s", file_path, result.name)
+        logger.debug("Uploaded file %s -> %s", display_name, result.name)
         return result
 
     async def wait_for_active(self, file_obj: Any, timeout: int = 300) -> Any:
-        """Step 2: Poll until the uploaded file reaches ACTIVE state.
+        """Step 2: Wait until the uploaded file reaches ACTIVE state.
 
-        Uses RxPY make_retrying_observable with exponential backoff (2-30s).
+        The check runs on the shared :attr:`operation_tracker` schedule
+        (2s growing to 30s between checks) and is not recorded on the
+        circuit breaker.
 
         Args:
             file_obj: File object returned by :meth:`upload_file`.
@@ -182,39 +208,25 @@ class GeminiFileSearchClient:
             RuntimeError: If the file transitions to FAILED state.
             TimeoutError: If the file does not become active within timeout.
         """
-        import time
-
-        start_time = time.monotonic()
         file_name = file_obj.name
 
-        class _StillProcessing(Exception):
-            """Sentinel: file is still in PROCESSING state, retry needed."""
-
-        async def _poll_once() -> Any:
-            elapsed = time.monotonic() - start_time
-            if elapsed >= timeout:
-                raise TimeoutError(
-                    f"File {file_name} did not become active within {timeout}s"
-                )
-            result = await self._client.aio.files.get(name=file_name)
+        async def _check() -> tuple[bool, Any]:
+            result = await self._status_call(self._client.aio.files.get, name=file_name)
             if hasattr(result, "state"):
                 if result.state.name == "FAILED":
-                    raise RuntimeError(
-                        f"File processing failed: {file_name}"
-                    )
+                    raise RuntimeError(f"File processing failed: {file_name}")
                 if result.state.name == "PROCESSING":
-                    raise _StillProcessing()
-            return result  # ACTIVE or no state attribute
-
-        # Exponential backoff: 2s base, ~30s max, enough retries for timeout
-        # max_retries calculated from timeout: at 2s doubling, 7 retries = ~256s
-        max_retries = max(20, timeout // 5)
-        obs = make_retrying_observable(
-            _poll_once,
-            max_retries=max_retries,
+                    return False, None
+            return True, result  # ACTIVE or no state attribute
+
+        return await self.operation_tracker.wait(
+            file_name,
+            _check,
+            timeout=timeout,
+            timeout_message=f"File {file_name} did not become active within {timeout}s",
             base_delay=2.0,
+            max_delay=30.0,
         )
-        return await subscribe_awaitable(obs)
 
     async def import_to_store(
         self, file_name: str, metadata: list[dict[str, Any]]
@@ -249,14 +261,14 @@ class GeminiFileSearchClient:
 
     async def upload_and_import(
         self,
-        file_path: str,
+        file_path: str | BinaryIO,
         display_name: str,
         metadata: list[dict[str, Any]],
     ) -> tuple[Any, Any]:
         """Full two-step upload: upload -> wait ACTIVE -> import with metadata.
 
         Args:
-            file_path: Local file path.
+            file_path: Local file path or seekable binary stream.
             display_name: Display name for the file.
             metadata: Custom metadata list.
 
@@ -273,9 +285,12 @@ class GeminiFileSearchClient:
     # ------------------------------------------------------------------
 
     async def poll_operation(self, operation: Any, timeout: int = 3600) -> Any:
-        """Poll a long-running operation until done.
+        """Wait for a long-running operation to complete.
 
-        Uses RxPY make_retrying_observable with exponential backoff (5-60s).
+        The check runs on the shared :attr:`operation_tracker` schedule
+        (5s growing to 60s between checks), so all outstanding operations
+        are polled in batches and back off together on 429s. Checks are
+        not recorded on the circuit breaker.
 
         Args:
             operation: Operation object from :meth:`import_to_store`.
@@ -283,34 +298,24 @@ class GeminiFileSearchClient:
 
         Returns:
             Completed operation.
-        """
-        import time
 
-        start_time = time.monotonic()
-
-        class _OperationNotDone(Exception):
-            """Sentinel: operation not yet complete, retry needed."""
+        Raises:
+            TimeoutError: If the operation does not complete within timeout.
+        """
 
-        async def _poll_once() -> Any:
+        async def _check() -> tuple[bool, Any]:
             nonlocal operation
-            elapsed = time.monotonic() - start_time
-            if elapsed >= timeout:
-                raise TimeoutError(
-                    f"Operation did not complete within {timeout}s"
-                )
-            operation = await self._client.aio.operations.get(operation)
-            if getattr(operation, "done", None) is not True:
-                raise _OperationNotDone()
-            return operation
-
-        # Exponential backoff: 5s base, enough retries for timeout
-        max_retries = max(20, timeout // 10)
-        obs = make_retrying_observable(
-            _poll_once,
-            max_retries=max_retries,
+            operation = await self._status_call(self._client.aio.operations.get, operation)
+            return getattr(operation, "done", None) is True, operation
+
+        return await self.operation_tracker.wait(
+            getattr(operation, "name", None) or f"operation-{id(operation)}",
+            _check,
+            timeout=timeout,
+            timeout_message=f"Operation did not complete within {timeout}s",
             base_delay=5.0,
+            max_delay=60.0,
         )
-        return await subscribe_awaitable(obs)
 
     async def delete_file(self, file_name: str) -> None:
         """Delete a raw file from the Gemini Files API (temporary, 48hr TTL).
@@ -431,6 +436,11 @@ class GeminiFileSearchClient:
         This method lists all documents and finds the one whose
         ``display_name`` matches the file's display name.
 
+        Every call pages through the whole store. Code that resolves more
+        than one file should use
+        :class:`~objlib.upload.store_index.StoreDocumentIndex`, which lists
+        once and answers lookups from SQLite.
+
         Args:
             gemini_file_id: Gemini file resource name (e.g. ``'files/xyz789'``).
             store_name: Optional override for store resource name.
@@ -546,21 +556,58 @@ class GeminiFileSearchClient:
 
         On 429 errors: records on circuit breaker and raises
         :class:`RateLimitError`.  On other API errors: records and
-        re-raises.  On success: records success.
+        re-raises.  On success: records success.  Rate limit headers, when
+        the response carries them, go to the rate limiter either way.
         """
+        return await self._call_api(func, args, kwargs, record=True)
+
+    async def _status_call(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Call a status check (:attr:`operation_tracker` poll) without recording.
+
+        Polls far outnumber uploads, so counting them would dilute the
+        error and 429 rates the circuit breaker and the AIMD concurrency
+        controller act on. A 429 still raises :class:`RateLimitError`
+        (the tracker backs off on it) and headers still reach the rate
+        limiter.
+        """
+        return await self._call_api(func, args, kwargs, record=False)
+
+    async def _call_api(
+        self, func: Any, args: tuple, kwargs: dict[str, Any], *, record: bool
+    ) -> Any:
+        breaker = self._circuit_breaker
         try:
             result = await func(*args, **kwargs)
-            self._circuit_breaker.record_success()
+            if record:
+                breaker.record_success()
+            self._rate_limiter.observe_headers(
+                _response_headers(getattr(result, "sdk_http_response", None))
+            )
             return result
         except genai_errors.APIError as exc:
+            self._rate_limiter.observe_headers(_response_headers(exc.response))
             if exc.code == 429:
-                self._circuit_breaker.record_429()
+                if record:
+                    breaker.record_429()
                 raise RateLimitError(
                     f"429 rate limit: {exc.message}"
                 ) from exc
             else:
-                self._circuit_breaker.record_error()
+                if record:
+                    breaker.record_error()
                 raise
         except Exception:
-            self._circuit_breaker.record_error()
+            if record:
+                breaker.record_error()
             raise
+
+
+def _response_headers(response: Any) -> dict[str, str] | None:
+    """Lower-cased headers of an SDK or transport response, if it has any."""
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return {str(k).lower(): str(v) for k, v in dict(headers).items()}
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,245 @@
+"""AIMD concurrency controller for the upload pipeline.
+
+Fixed concurrency is either too timid (the API has headroom and uploads
+queue behind a constant) or too aggressive (429 storms trip the circuit
+breaker). ``AIMDConcurrencyController`` sizes the upload and poll stages
+of :class:`~objlib.upload.pipeline.UploadPipeline` live, the way TCP
+sizes its congestion window:
+
+* **Additive increase** -- after every ``sample_size`` API calls whose
+  error rate is at or below ``target_error_rate``, both stage limits grow
+  by ``increase_step`` (up to their maximums).
+* **Multiplicative decrease** -- a 429, or a sample whose error rate is
+  above the target, multiplies both limits by ``decrease_factor``. Drops
+  are at most one per ``decrease_cooldown`` seconds, so one burst of
+  429s from requests that were already in flight counts once.
+* **Quota headers** -- while the last ``x-ratelimit-remaining`` seen by
+  the rate limiter is below the current upload limit, growth is held;
+  at zero the limits are decreased as for a 429.
+* **Circuit breaker** -- limits are additionally capped by
+  :meth:`RollingWindowCircuitBreaker.get_recommended_concurrency` while
+  the breaker is not CLOSED.
+
+Outcomes are read from the circuit breaker's cumulative
+:attr:`~RollingWindowCircuitBreaker.outcome_counts`, which every client
+call updates, so no call site needs instrumenting. The controller is
+evaluated lazily whenever the pipeline asks for a limit. Every change is
+logged and kept in :attr:`AIMDConcurrencyController.adjustments`.
+
+Usage::
+
+    controller = AIMDConcurrencyController(
+        circuit_breaker, upload=(7, 20), poll=(20, 50), target_error_rate=0.02
+    )
+    pipeline = UploadPipeline(upload, poll, upload_concurrency=20,
+                              poll_concurrency=50,
+                              upload_limit=controller.upload_limit,
+                              poll_limit=controller.poll_limit)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from objlib.upload.circuit_breaker import CircuitState, RollingWindowCircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_ERROR_RATE = 0.02
+DEFAULT_SAMPLE_SIZE = 20  # API calls per additive-increase decision
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_DECREASE_COOLDOWN = 10.0  # Seconds between multiplicative decreases
+
+
+@dataclass
+class ConcurrencyAdjustment:
+    """One limit change made by the controller."""
+
+    stage: str
+    old: int
+    new: int
+    reason: str
+    at: float
+
+
+@dataclass
+class _StageLimit:
+    name: str
+    limit: int
+    minimum: int
+    maximum: int
+    initial: int = 0
+
+    def __post_init__(self) -> None:
+        self.initial = self.limit
+
+
+class AIMDConcurrencyController:
+    """Resize upload and poll concurrency from observed API outcomes.
+
+    Args:
+        circuit_breaker: Breaker whose ``outcome_counts`` are sampled and
+            whose recommendation caps the limits while not CLOSED.
+        upload: ``(initial, maximum)`` concurrent uploads.
+        poll: ``(initial, maximum)`` concurrent polls, or None for a
+            pipeline without a polling stage (``poll_limit`` then raises).
+        target_error_rate: Highest error rate (429s plus other API errors
+            over all calls in a sample) that still allows growth.
+        minimum: Floor for both limits.
+        increase_step: Added to each limit after a healthy sample.
+        decrease_factor: Multiplier applied on a 429 or an unhealthy sample.
+        sample_size: API calls per increase decision.
+        decrease_cooldown: Minimum seconds between two decreases.
+        quota_remaining: Returns the last observed remaining-request quota
+            (``x-ratelimit-remaining``), or None when unknown.
+        on_adjust: Called after every change (e.g. to refresh progress).
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        circuit_breaker: RollingWindowCircuitBreaker,
+        *,
+        upload: tuple[int, int],
+        poll: tuple[int, int] | None = None,
+        target_error_rate: float = DEFAULT_TARGET_ERROR_RATE,
+        minimum: int = 1,
+        increase_step: int = 1,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        decrease_cooldown: float = DEFAULT_DECREASE_COOLDOWN,
+        quota_remaining: Callable[[], int | None] | None = None,
+        on_adjust: Callable[[ConcurrencyAdjustment], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0.0 <= target_error_rate < 1.0:
+            raise ValueError("target_error_rate must be in [0, 1)")
+        if not 0.0 < decrease_factor < 1.0:
+            raise ValueError("decrease_factor must be in (0, 1)")
+        self._breaker = circuit_breaker
+        self._upload = _StageLimit(
+            "upload", _clamp(upload[0], minimum, upload[1]), minimum, upload[1]
+        )
+        self._poll = (
+            _StageLimit("poll", _clamp(poll[0], minimum, poll[1]), minimum, poll[1])
+            if poll is not None else None
+        )
+        self._stages = [self._upload] + ([self._poll] if self._poll is not None else [])
+        self.target_error_rate = target_error_rate
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._sample_size = sample_size
+        self._decrease_cooldown = decrease_cooldown
+        self._quota_remaining = quota_remaining or (lambda: None)
+        self._on_adjust = on_adjust
+        self._clock = clock
+
+        self._baseline = circuit_breaker.outcome_counts
+        self._last_decrease: float | None = None
+        self.adjustments: list[ConcurrencyAdjustment] = []
+
+    # ------------------------------------------------------------------
+    # Limits (pipeline callbacks)
+    # ------------------------------------------------------------------
+
+    def upload_limit(self) -> int:
+        """Current cap on uploads in flight."""
+        self.update()
+        return self._capped(self._upload)
+
+    def poll_limit(self) -> int:
+        """Current cap on polls in flight."""
+        if self._poll is None:
+            raise RuntimeError("controller was built without a poll stage")
+        self.update()
+        return self._capped(self._poll)
+
+    def launch_interval(self, base: float) -> Callable[[], float]:
+        """Upload spacing that shrinks as the upload limit grows.
+
+        ``base`` applies at the initial limit; at twice the limit uploads
+        may start twice as often, so spacing never caps the gain.
+        """
+        upload = self._upload
+        return lambda: base * upload.initial / max(1, self.upload_limit())
+
+    @property
+    def limits(self) -> dict[str, int]:
+        """Uncapped AIMD limits per stage (for reports)."""
+        return {stage.name: stage.limit for stage in self._stages}
+
+    # ------------------------------------------------------------------
+    # Control loop
+    # ------------------------------------------------------------------
+
+    def update(self) -> None:
+        """Fold API outcomes since the last decision into the limits."""
+        successes, rate_limited, errors = (
+            now - then for now, then in zip(self._breaker.outcome_counts, self._baseline)
+        )
+        remaining = self._quota_remaining()
+        if not isinstance(remaining, int):
+            remaining = None
+
+        if rate_limited:
+            self._consume()
+            self._decrease(f"{rate_limited} rate-limit response(s)")
+            return
+        if remaining == 0:
+            self._consume()
+            self._decrease("rate-limit quota exhausted")
+            return
+
+        total = successes + errors
+        if total < self._sample_size:
+            return
+        self._consume()
+        error_rate = errors / total
+        if error_rate > self.target_error_rate:
+            self._decrease(
+                f"error rate {error_rate:.2f} > target {self.target_error_rate:.2f}"
+            )
+        elif remaining is not None and remaining < self._upload.limit:
+            logger.debug("Concurrency held: only %d requests of quota remaining", remaining)
+        else:
+            self._increase(
+                f"error rate {error_rate:.2f} <= target {self.target_error_rate:.2f}"
+            )
+
+    def _consume(self) -> None:
+        self._baseline = self._breaker.outcome_counts
+
+    def _increase(self, reason: str) -> None:
+        for stage in self._stages:
+            self._set(stage, min(stage.maximum, stage.limit + self._increase_step), reason)
+
+    def _decrease(self, reason: str) -> None:
+        now = self._clock()
+        if self._last_decrease is not None and now - self._last_decrease < self._decrease_cooldown:
+            return
+        self._last_decrease = now
+        for stage in self._stages:
+            self._set(stage, max(stage.minimum, int(stage.limit * self._decrease_factor)), reason)
+
+    def _set(self, stage: _StageLimit, new: int, reason: str) -> None:
+        if new == stage.limit:
+            return
+        adjustment = ConcurrencyAdjustment(stage.name, stage.limit, new, reason, self._clock())
+        stage.limit = new
+        self.adjustments.append(adjustment)
+        logger.info("%s concurrency %d -> %d (%s)", stage.name.capitalize(),
+                    adjustment.old, new, reason)
+        if self._on_adjust is not None:
+            self._on_adjust(adjustment)
+
+    def _capped(self, stage: _StageLimit) -> int:
+        if self._breaker.state == CircuitState.CLOSED:
+            return stage.limit
+        return min(stage.limit, self._breaker.get_recommended_concurrency(stage.maximum))
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(high, value))
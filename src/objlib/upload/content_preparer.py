@@ -1,28 +1,126 @@
 """Content preparation for enriched Gemini uploads.
 
-Creates temporary files with Tier 4 AI analysis prepended to the
-original file text. This ensures Gemini embeddings capture both the
-AI-generated philosophical context and the raw transcript content.
-
-The caller is responsible for cleaning up temporary files via
-:func:`cleanup_temp_file` or ``os.unlink()``.
+Prepends headers (identity metadata, Tier 4 AI analysis) to the original
+file text. This ensures Gemini embeddings capture both the AI-generated
+philosophical context and the raw transcript content.
+
+:func:`open_upload_source` builds the upload body without a temp file:
+the original is read once and, together with the headers, held in memory
+as a seekable stream the SDK uploads directly. Only bodies larger than
+``spool_threshold`` go through a :class:`tempfile.SpooledTemporaryFile`
+(which rolls over to disk), so memory stays bounded for large books.
+Each :class:`UploadSource` records the bytes it read and spooled.
+
+:func:`prepare_enriched_content` (temp-file output) is kept for scripts;
+the caller is responsible for cleaning up via :func:`cleanup_temp_file`.
 """
 
 from __future__ import annotations
 
+import io
 import logging
 import os
 import tempfile
+from collections.abc import Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024  # Larger bodies are spooled, not held in memory
+_SPOOL_CHUNK_CHARS = 1024 * 1024
 
-def prepare_enriched_content(
+
+@dataclass
+class UploadSource:
+    """Seekable binary upload body: headers followed by the original text.
+
+    Attributes:
+        stream: Binary stream positioned at 0 (BytesIO, or a spooled file).
+        size: Total body size in bytes.
+        header_bytes: Bytes contributed by the headers.
+        bytes_read: Bytes read from the original file (once).
+        bytes_spooled: Bytes written to a spooled temp file (0 in memory).
+    """
+
+    stream: BinaryIO
+    size: int
+    header_bytes: int
+    bytes_read: int
+    bytes_spooled: int = 0
+
+    @property
+    def spooled(self) -> bool:
+        return self.bytes_spooled > 0
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def __enter__(self) -> UploadSource:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_upload_source(
     original_file_path: str,
-    ai_metadata: dict,
-) -> str | None:
-    """Create a temporary file with AI analysis prepended to original text.
+    headers: Sequence[str],
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+) -> UploadSource:
+    """Concatenate ``headers`` and the original file into an upload stream.
+
+    The original is decoded as UTF-8 with universal newlines, exactly as
+    the temp-file path did, so the uploaded bytes are unchanged.
+
+    Args:
+        original_file_path: Path to the original .txt/.md file.
+        headers: Header strings, in order (empty strings are skipped).
+        spool_threshold: Bodies above this many bytes are spooled.
+
+    Returns:
+        An :class:`UploadSource`; close it (or use ``with``) after upload.
+    """
+    header = "".join(headers).encode("utf-8")
+    file_size = os.path.getsize(original_file_path)
+
+    if len(header) + file_size <= spool_threshold:
+        raw = Path(original_file_path).read_bytes()
+        text = raw.decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            body = text.encode("utf-8")
+        else:
+            body = raw
+        data = header + body
+        source = UploadSource(io.BytesIO(data), len(data), len(header), len(raw))
+    else:
+        spool = tempfile.SpooledTemporaryFile(max_size=spool_threshold, mode="w+b")
+        try:
+            spool.write(header)
+            with open(original_file_path, encoding="utf-8") as original:
+                while chunk := original.read(_SPOOL_CHUNK_CHARS):
+                    spool.write(chunk.encode("utf-8"))
+            size = spool.tell()
+            spool.seek(0)
+        except Exception:
+            spool.close()
+            raise
+        source = UploadSource(spool, size, len(header), file_size, bytes_spooled=size)
+
+    logger.debug(
+        "Upload source for %s: %d header + %d original bytes (%s)",
+        original_file_path,
+        source.header_bytes,
+        source.bytes_read,
+        f"spooled {source.bytes_spooled}" if source.spooled else "in memory",
+    )
+    return source
+
+
+def build_ai_analysis_header(ai_metadata: dict) -> str | None:
+    """Build the ``[AI Analysis]`` header from Tier 4 metadata.
 
     The header format is::
 
@@ -39,19 +137,17 @@ def prepare_enriched_content(
         - {position_1}
 
         [Original Content]
-        {original file text}
 
     If ALL Tier 4 fields are empty (no summary, no arguments, no
     positions), returns ``None`` indicating no content injection is
     needed and the original file should be uploaded as-is.
 
     Args:
-        original_file_path: Path to the original .txt file.
         ai_metadata: Parsed JSON from file_metadata_ai.metadata_json.
 
     Returns:
-        Path to the temporary file (caller must clean up), or ``None``
-        if no Tier 4 content is available.
+        The header (ending with a newline), or ``None`` if no Tier 4
+        content is available.
     """
     semantic = ai_metadata.get("semantic_description", {})
     summary = semantic.get("summary", "")
@@ -87,7 +183,29 @@ def prepare_enriched_content(
         header_parts.append("")
 
     header_parts.append("[Original Content]")
-    header = "\n".join(header_parts) + "\n"
+    return "\n".join(header_parts) + "\n"
+
+
+def prepare_enriched_content(
+    original_file_path: str,
+    ai_metadata: dict,
+) -> str | None:
+    """Create a temporary file with AI analysis prepended to original text.
+
+    See :func:`build_ai_analysis_header` for the header format. Upload
+    paths use :func:`open_upload_source` instead, which avoids the copy.
+
+    Args:
+        original_file_path: Path to the original .txt file.
+        ai_metadata: Parsed JSON from file_metadata_ai.metadata_json.
+
+    Returns:
+        Path to the temporary file (caller must clean up), or ``None``
+        if no Tier 4 content is available.
+    """
+    header = build_ai_analysis_header(ai_metadata)
+    if header is None:
+        return None
 
     # Read original file and create temp file with prepended content
     original_text = Path(original_file_path).read_text(encoding="utf-8")
@@ -0,0 +1,242 @@
+"""Content-addressed upload deduplication (schema V22 upload_payloads).
+
+The same transcript sometimes lives under several paths (duplicates,
+re-exports). Without dedup every path uploads its own copy: one Files API
+upload, one store import and its polls, and one more store document for
+retrieval to return twice.
+
+Every planned upload now has a payload key -- a SHA-256 of the file's
+content hash and its enrichment hash (the upload hash over metadata, AI
+metadata and entities). Headers built from the path (the identity header)
+are left out: two paths with the same content and enrichment would
+otherwise never match. ``UploadDeduplicator.plan()`` groups a run's
+candidates by key:
+
+* a key already owned by an indexed file -> the candidate becomes an
+  alias of that file and is not uploaded;
+* several candidates with a new key -> the first path (sorted) uploads,
+  the others become its aliases;
+* a candidate whose recorded alias is still live (``shared_upload_aliases``)
+  is skipped again and not counted as a new saving.
+
+Aliases keep their own ``gemini_state`` and have no store document of
+their own, so resets and deletions elsewhere never remove a document an
+alias relies on. While an alias is live, the pending-file queries skip it
+(:data:`NOT_SHARED_ALIAS`) and ``Database.get_status_counts()`` reports it
+as ``shared``, so it neither comes back every run nor fills a ``--limit``
+window. When the canonical file leaves ``indexed`` or either file's
+content changes, the alias drops out of the view and is planned (and
+normally uploaded) on the next run. Citations resolve the shared
+document to its canonical path; ``Database.get_shared_paths()`` adds the
+aliases.
+
+Usage::
+
+    dedup = UploadDeduplicator(conn)
+    plan = dedup.plan(candidates)
+    upload_only(plan.uploads)
+    logger.info(plan.stats.summary())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+API_CALLS_PER_UPLOAD = 3  # Files API upload, store import, first operation poll
+
+_VALUES = "SELECT value FROM json_each(?)"
+
+# WHERE-clause fragment for pending-file queries over ``files f``
+NOT_SHARED_ALIAS = (
+    "NOT EXISTS (SELECT 1 FROM shared_upload_aliases s WHERE s.alias_path = f.file_path)"
+)
+
+
+def payload_key(content_hash: str, upload_hash: str) -> str:
+    """SHA-256 identifying an upload payload by content and enrichment."""
+    raw = json.dumps([content_hash, upload_hash])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PayloadCandidate:
+    """One file that would be uploaded, keyed by its payload."""
+
+    file_path: str
+    payload_key: str
+    content_hash: str
+    payload_bytes: int  # File size plus header bytes
+
+    @classmethod
+    def build(
+        cls,
+        file_path: str,
+        content_hash: str,
+        file_size: int,
+        upload_hash: str,
+        headers: Sequence[str] = (),
+    ) -> PayloadCandidate:
+        header_bytes = len("".join(headers).encode("utf-8"))
+        return cls(
+            file_path,
+            payload_key(content_hash, upload_hash),
+            content_hash,
+            (file_size or 0) + header_bytes,
+        )
+
+
+@dataclass
+class DedupStats:
+    """Counters for one UploadDeduplicator.plan() call."""
+
+    candidates: int = 0
+    uploads: int = 0
+    aliased_to_store: int = 0  # Matched a document already indexed
+    aliased_in_run: int = 0  # Matched another candidate of this run
+    already_shared: int = 0  # Recorded alias still live; skipped, not counted as saved
+    bytes_saved: int = 0
+    api_calls_saved: int = 0
+
+    def add(self, other: DedupStats) -> None:
+        """Fold another plan's counters into these (paged selection)."""
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def skipped(self) -> int:
+        """Candidates not uploaded because their payload is already shared."""
+        return self.aliased_to_store + self.aliased_in_run + self.already_shared
+
+    def summary(self) -> str:
+        """One-line report for logs and the CLI."""
+        return (
+            f"{self.candidates} candidates, {self.uploads} to upload, "
+            f"{self.aliased_to_store} aliased to indexed documents, "
+            f"{self.aliased_in_run} to uploads in this run, "
+            f"{self.already_shared} already shared; saved {self.bytes_saved} bytes "
+            f"and {self.api_calls_saved} API calls"
+        )
+
+
+@dataclass
+class DedupPlan:
+    """Result of UploadDeduplicator.plan()."""
+
+    uploads: list[str] = field(default_factory=list)  # Paths that upload their own copy
+    aliases: dict[str, str] = field(default_factory=dict)  # Alias path -> canonical path
+    stats: DedupStats = field(default_factory=DedupStats)
+
+
+class UploadDeduplicator:
+    """Plans which candidates upload and which share an existing payload.
+
+    Args:
+        conn: Open connection to library.db (``upload_payloads`` lives there).
+        run_owners: Payload key -> path uploading it in this run. Pass the
+            same dict to every plan of one run (e.g. one per page of
+            pending files) so a duplicate on a later page is still aliased;
+            by default each plan starts empty.
+    """
+
+    def __init__(
+        self, conn: sqlite3.Connection, run_owners: dict[str, str] | None = None
+    ) -> None:
+        self._conn = conn
+        self._run_owners = run_owners
+
+    def plan(self, candidates: Iterable[PayloadCandidate]) -> DedupPlan:
+        """Group ``candidates`` by payload key and record the outcome.
+
+        Rows for uploads (their own canonical) and new aliases are written
+        and committed before returning, so a crash mid-run leaves aliases
+        that only become live once their canonical file is indexed.
+        """
+        by_path = {c.file_path: c for c in candidates}
+        ordered = [by_path[p] for p in sorted(by_path)]
+        plan = DedupPlan()
+        stats = plan.stats
+        stats.candidates = len(ordered)
+        if not ordered:
+            return plan
+
+        live = self._live_aliases(list(by_path))
+        owners = self._indexed_owners({c.payload_key for c in ordered})
+        run_owners = self._run_owners if self._run_owners is not None else {}
+        rows: list[tuple[PayloadCandidate, str]] = []
+
+        for candidate in ordered:
+            path, key = candidate.file_path, candidate.payload_key
+            if path in live:
+                plan.aliases[path] = live[path]
+                stats.already_shared += 1
+                continue
+            canonical = owners.get(key)
+            if canonical is not None and canonical != path:
+                stats.aliased_to_store += 1
+            elif key in run_owners:
+                canonical = run_owners[key]
+                stats.aliased_in_run += 1
+            else:
+                run_owners[key] = path
+                plan.uploads.append(path)
+                rows.append((candidate, path))
+                continue
+            plan.aliases[path] = canonical
+            rows.append((candidate, canonical))
+            stats.bytes_saved += candidate.payload_bytes
+            stats.api_calls_saved += API_CALLS_PER_UPLOAD
+
+        stats.uploads = len(plan.uploads)
+        self._record(rows)
+        logger.info("Upload dedup: %s", stats.summary())
+        return plan
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _live_aliases(self, paths: list[str]) -> dict[str, str]:
+        rows = self._conn.execute(
+            "SELECT alias_path, canonical_path FROM shared_upload_aliases "
+            f"WHERE alias_path IN ({_VALUES})",
+            (json.dumps(paths),),
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def _indexed_owners(self, keys: set[str]) -> dict[str, str]:
+        rows = self._conn.execute(
+            "SELECT p.payload_key, p.file_path FROM upload_payloads p "
+            "JOIN files f ON f.file_path = p.file_path "
+            "AND f.gemini_state = 'indexed' AND f.content_hash = p.content_hash "
+            f"WHERE p.canonical_path = p.file_path AND p.payload_key IN ({_VALUES}) "
+            "ORDER BY p.file_path",
+            (json.dumps(sorted(keys)),),
+        )
+        owners: dict[str, str] = {}
+        for key, path in rows:
+            owners.setdefault(key, path)
+        return owners
+
+    def _record(self, rows: list[tuple[PayloadCandidate, str]]) -> None:
+        if not rows:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO upload_payloads (file_path, payload_key, "
+                "canonical_path, content_hash, payload_bytes, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (c.file_path, c.payload_key, canonical, c.content_hash,
+                     c.payload_bytes, now)
+                    for c, canonical in rows
+                ],
+            )
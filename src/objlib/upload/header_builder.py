@@ -65,7 +65,6 @@ def build_identity_header(file_path: str, conn: sqlite3.Connection) -> str:
         return ""
 
     filename, metadata_json_str = row
-    stem = PurePosixPath(filename).stem  # e.g. "Objectivist Logic - Class 09-02"
 
     # Parse scanner metadata
     metadata = {}
@@ -75,17 +74,6 @@ def build_identity_header(file_path: str, conn: sqlite3.Connection) -> str:
         except (json.JSONDecodeError, TypeError):
             logger.warning("build_identity_header: invalid metadata_json for %s", filename)
 
-    # Extract course from parent directory
-    # file_path: /Volumes/.../Courses/Objectivist Logic/Objectivist Logic - Class 09-02.txt
-    course = PurePosixPath(file_path).parent.name
-
-    # Extract class identifier from filename (e.g., "Class 09-02")
-    class_match = re.search(r"Class\s+(\d{2}-\d{2})", filename)
-    class_id = f"Class {class_match.group(1)}" if class_match else None
-
-    # Scanner topic
-    scanner_topic = metadata.get("topic", "")
-
     # Primary topics from file_primary_topics table
     topic_rows = conn.execute(
         "SELECT topic_tag FROM file_primary_topics WHERE file_path = ?",
@@ -115,6 +103,50 @@ def build_identity_header(file_path: str, conn: sqlite3.Connection) -> str:
     ).fetchone()
     discrimination_phrase = disc_row[0] if disc_row and disc_row[0] else None
 
+    return render_identity_header(
+        file_path, filename, metadata, primary_topics, topic_aspects,
+        discrimination_phrase,
+    )
+
+
+def render_identity_header(
+    file_path: str,
+    filename: str,
+    metadata: dict,
+    primary_topics: list[str],
+    topic_aspects: list[str],
+    discrimination_phrase: str | None,
+) -> str:
+    """Format the identity header from already-loaded inputs.
+
+    The query-free half of :func:`build_identity_header`, used by the bulk
+    upload preparer (``upload/preparation.py``) which loads the inputs for
+    many files with set-based queries.
+
+    Args:
+        file_path: The file_path value as stored in the files table.
+        filename: files.filename.
+        metadata: Parsed files.metadata_json (scanner metadata).
+        primary_topics: file_primary_topics tags, in topic_tag order.
+        topic_aspects: Current AI metadata ``topic_aspects``.
+        discrimination_phrase: Validated CRAD phrase, or None.
+
+    Returns:
+        Formatted identity header string ending with newline.
+    """
+    stem = PurePosixPath(filename).stem  # e.g. "Objectivist Logic - Class 09-02"
+
+    # Extract course from parent directory
+    # file_path: /Volumes/.../Courses/Objectivist Logic/Objectivist Logic - Class 09-02.txt
+    course = PurePosixPath(file_path).parent.name
+
+    # Extract class identifier from filename (e.g., "Class 09-02")
+    class_match = re.search(r"Class\s+(\d{2}-\d{2})", filename)
+    class_id = f"Class {class_match.group(1)}" if class_match else None
+
+    # Scanner topic
+    scanner_topic = metadata.get("topic", "")
+
     # Build header
     lines = ["--- DOCUMENT METADATA ---"]
     lines.append(f"Title: {stem}")
@@ -0,0 +1,353 @@
+"""Shared scheduler for long-running operation and file-state checks.
+
+``poll_operation()`` and ``wait_for_active()`` used to run one retry loop
+per file, each with its own exponential backoff. With 50 uploads in
+flight that was 50 independent pollers: their checks never lined up, and
+after a 429 each backed off on its own schedule, so the others kept
+hitting the limit.
+
+``OperationTracker`` runs a single scheduler task instead. Callers
+``wait()`` on a key (operation or file name) with a ``check`` coroutine;
+the tracker keeps one entry per key and resolves a future shared by
+every waiter.
+
+* **Batching** -- each tick checks every entry due within
+  ``coalesce_window`` seconds (up to ``batch_size``, oldest first)
+  concurrently, so checks for many operations share one wakeup.
+* **Per-entry backoff** -- an entry's interval grows from ``base_delay``
+  by ``growth`` per check, capped at ``max_delay``.
+* **Shared, jittered backoff** -- a 429 on any check doubles a multiplier
+  applied to every entry's next interval (up to ``max_backoff``); a
+  clean batch halves it again. Intervals are jittered by ``±jitter`` so
+  entries spread out instead of polling in lockstep.
+* **Deadlines** -- an entry past its timeout fails with ``TimeoutError``.
+  Each check is bounded by ``check_timeout`` and the entry's remaining
+  deadline, so one hung request cannot stall the batch (and every other
+  entry's polling and expiry) behind it; a check that times out is
+  retried. When its last waiter is cancelled, the entry is dropped.
+
+``outstanding`` and ``oldest_age`` describe the live entries;
+:class:`TrackerStats` counts checks, batches and outcomes.
+
+Usage::
+
+    tracker = OperationTracker()
+    operation = await tracker.wait(
+        operation.name, check_operation, timeout=3600,
+        timeout_message="Operation did not complete within 3600s",
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 20  # Checks issued concurrently per tick
+DEFAULT_COALESCE_WINDOW = 1.0  # Seconds; entries due this soon join the current batch
+DEFAULT_JITTER = 0.2  # ±20% of each interval
+DEFAULT_MAX_BACKOFF = 16.0  # Cap on the shared 429 multiplier
+DEFAULT_CHECK_TIMEOUT = 60.0  # Seconds one check may take before it is retried
+
+# ``check()`` returns (done, value); any exception it raises is retried
+# unless it is one of the tracker's ``final_errors``
+Check = Callable[[], Awaitable[tuple[bool, Any]]]
+
+
+@dataclass
+class TrackerStats:
+    """Cumulative counters for one OperationTracker."""
+
+    tracked: int = 0
+    checks: int = 0
+    batches: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    rate_limited: int = 0  # Checks answered with a 429
+
+    def summary(self) -> str:
+        """One-line report for logs."""
+        per_batch = self.checks / self.batches if self.batches else 0.0
+        return (
+            f"{self.tracked} tracked, {self.checks} checks in {self.batches} batches "
+            f"({per_batch:.1f}/batch), {self.completed} completed, {self.failed} failed, "
+            f"{self.timed_out} timed out, {self.rate_limited} rate-limited"
+        )
+
+
+class _Entry:
+    __slots__ = (
+        "key", "check", "future", "added_at", "deadline", "timeout_message",
+        "delay", "base_delay", "max_delay", "next_check", "waiters",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        check: Check,
+        future: asyncio.Future,
+        now: float,
+        timeout: float,
+        timeout_message: str,
+        base_delay: float,
+        max_delay: float,
+    ) -> None:
+        self.key = key
+        self.check = check
+        self.future = future
+        self.added_at = now
+        self.deadline = now + timeout
+        self.timeout_message = timeout_message
+        self.delay = base_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.next_check = now  # First check on the next tick
+        self.waiters = 0
+
+
+class OperationTracker:
+    """One polling schedule for every outstanding operation.
+
+    Args:
+        batch_size: Most checks issued concurrently in one tick.
+        coalesce_window: Entries due within this many seconds are checked
+            in the current tick.
+        growth: Per-check multiplier of an entry's interval.
+        jitter: Fractional spread applied to every interval.
+        max_backoff: Cap on the shared multiplier raised by 429s.
+        check_timeout: Most seconds one check may run (less if the entry's
+            deadline is nearer); a check that overruns is retried.
+        rate_limit_errors: Exceptions that count as a 429 and raise the
+            shared backoff (the check is retried).
+        final_errors: Exceptions that fail the entry at once instead of
+            being retried.
+        clock: Monotonic time source (injectable for tests).
+        rng: Random source for jitter (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        growth: float = 2.0,
+        jitter: float = DEFAULT_JITTER,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        check_timeout: float = DEFAULT_CHECK_TIMEOUT,
+        rate_limit_errors: tuple[type[BaseException], ...] = (),
+        final_errors: tuple[type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if not 0.0 <= jitter < 1.0:
+            raise ValueError("jitter must be in [0, 1)")
+        self.batch_size = batch_size
+        self.coalesce_window = coalesce_window
+        self.growth = growth
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.check_timeout = check_timeout
+        self._rate_limit_errors = rate_limit_errors
+        self._final_errors = final_errors
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._entries: dict[str, _Entry] = {}
+        self._backoff = 1.0
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self.stats = TrackerStats()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def wait(
+        self,
+        key: str,
+        check: Check,
+        *,
+        timeout: float,
+        timeout_message: str,
+        base_delay: float = 5.0,
+        max_delay: float = 60.0,
+    ) -> Any:
+        """Wait until ``check()`` reports done for ``key``; return its value.
+
+        Waiters on a key that is already tracked share its entry (and its
+        schedule); the first waiter's check and timeout apply.
+
+        Raises:
+            TimeoutError: ``timeout`` seconds passed without completion.
+            Exception: Any of ``final_errors`` raised by the check.
+        """
+        self._bind_loop()
+        entry = self._entries.get(key)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            entry = _Entry(
+                key, check, loop.create_future(), self._clock(), timeout,
+                timeout_message, base_delay, max_delay,
+            )
+            self._entries[key] = entry
+            self.stats.tracked += 1
+            self._ensure_running()
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.future)
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.future.done():
+                # Every waiter gave up: stop checking this key
+                entry.future.cancel()
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                    if self._wakeup is not None:
+                        self._wakeup.set()  # Let an idle scheduler exit
+
+    @property
+    def outstanding(self) -> int:
+        """Entries still being checked."""
+        return len(self._entries)
+
+    @property
+    def oldest_age(self) -> float:
+        """Seconds since the oldest outstanding entry was added (0.0 if none)."""
+        if not self._entries:
+            return 0.0
+        return self._clock() - min(e.added_at for e in self._entries.values())
+
+    @property
+    def backoff(self) -> float:
+        """Current shared multiplier on every entry's interval."""
+        return self._backoff
+
+    # ------------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self) -> None:
+        """Forget state left by an earlier event loop (e.g. a previous asyncio.run)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._entries = {}
+            self._task = None
+            self._wakeup = asyncio.Event()
+            self._backoff = 1.0
+
+    def _ensure_running(self) -> None:
+        assert self._wakeup is not None
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while self._entries:
+            now = self._clock()
+            self._expire(now)
+            due = sorted(
+                (e for e in self._entries.values()
+                 if e.next_check <= now + self.coalesce_window),
+                key=lambda e: e.next_check,
+            )[: self.batch_size]
+            if not due:
+                if not self._entries:
+                    break
+                sleep = min(e.next_check for e in self._entries.values()) - now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, sleep))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._check_batch(due)
+        logger.debug("Operation tracker idle: %s", self.stats.summary())
+
+    def _expire(self, now: float) -> None:
+        for entry in [e for e in self._entries.values() if now >= e.deadline]:
+            self.stats.timed_out += 1
+            self._finish(entry, error=TimeoutError(entry.timeout_message))
+
+    async def _check_batch(self, batch: list[_Entry]) -> None:
+        self.stats.batches += 1
+        self.stats.checks += len(batch)
+        now = self._clock()
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    entry.check(),
+                    max(0.0, min(self.check_timeout, entry.deadline - now)),
+                )
+                for entry in batch
+            ),
+            return_exceptions=True,
+        )
+
+        rate_limited = 0
+        for entry, result in zip(batch, results):
+            if self._entries.get(entry.key) is not entry:
+                continue  # Dropped while its check was in flight
+            if isinstance(result, asyncio.CancelledError) and _cancelling():
+                raise result  # The scheduler itself is being cancelled
+            if isinstance(result, self._rate_limit_errors):
+                rate_limited += 1
+            elif isinstance(result, self._final_errors):
+                self.stats.failed += 1
+                self._finish(entry, error=result)
+            elif isinstance(result, BaseException):
+                # Includes a check cancelled from outside: retry it too
+                logger.debug("Check for %s failed, retrying: %r", entry.key, result)
+            else:
+                done, value = result
+                if done:
+                    self.stats.completed += 1
+                    self._finish(entry, value=value)
+
+        if rate_limited:
+            self.stats.rate_limited += rate_limited
+            self._backoff = min(self.max_backoff, self._backoff * 2)
+            logger.info(
+                "Operation tracker: %d rate-limited checks, shared backoff x%.0f",
+                rate_limited, self._backoff,
+            )
+        else:
+            self._backoff = max(1.0, self._backoff / 2)
+
+        now = self._clock()
+        for entry in batch:
+            if self._entries.get(entry.key) is entry:
+                self._reschedule(entry, now)
+
+    def _reschedule(self, entry: _Entry, now: float) -> None:
+        spread = 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+        entry.next_check = now + entry.delay * self._backoff * spread
+        entry.delay = min(entry.max_delay, entry.delay * self.growth)
+
+    def _finish(
+        self, entry: _Entry, *, value: Any = None, error: BaseException | None = None
+    ) -> None:
+        self._entries.pop(entry.key, None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+        else:
+            entry.future.set_result(value)
+
+
+def _cancelling() -> bool:
+    """Whether cancellation of the current task has been requested."""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
@@ -3,8 +3,9 @@
 Composes the upload primitives (client, state manager, circuit breaker,
 rate limiter, progress tracker) into a complete upload engine that:
 
-* Processes pending files in configurable batch sizes
-* Limits concurrency with RxPY ``ops.merge(max_concurrent=N)``
+* Streams pending files through a continuous upload -> poll pipeline
+  (:class:`~objlib.upload.pipeline.UploadPipeline`) with per-stage
+  concurrency limits and no batch barriers
 * Writes state before every API call (crash recovery)
 * Polls import operations to completion
 * Handles graceful shutdown via RxPY Subject two-signal system
@@ -18,19 +19,28 @@ import logging
 import os
 import signal
 import sqlite3
-import tempfile
 import uuid
-from pathlib import Path
+from collections import Counter
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from objlib.database import Database
 from objlib.models import UploadConfig
+from objlib.upload.bulk_recovery import BulkRecovery, BulkRecoveryReport
 from objlib.upload.circuit_breaker import CircuitState, RollingWindowCircuitBreaker
 from objlib.upload.client import GeminiFileSearchClient, RateLimitError
-from objlib.upload.content_preparer import cleanup_temp_file, prepare_enriched_content
-from objlib.upload.header_builder import build_identity_header
+from objlib.upload.concurrency import AIMDConcurrencyController, ConcurrencyAdjustment
+from objlib.upload.content_preparer import (
+    UploadSource,
+    build_ai_analysis_header,
+    open_upload_source,
+)
+from objlib.upload.dedup import DedupPlan, DedupStats, PayloadCandidate, UploadDeduplicator
 from objlib.upload.exceptions import OCCConflictError
 from objlib.upload.fsm import create_fsm
 from objlib.upload.metadata_builder import build_enriched_metadata, compute_upload_hash
+from objlib.upload.pipeline import PipelineStats, UploadPipeline
+from objlib.upload.preparation import PreparedUpload, UploadPreparer
 from objlib.upload.recovery import (
     RecoveryCrawler,
     RecoveryManager,
@@ -39,10 +49,9 @@ from objlib.upload.recovery import (
     retry_failed_file,
 )
 from objlib.upload.state import AsyncUploadStateManager
+from objlib.upload.store_index import StoreDocumentIndex
 from objlib.upload._operators import subscribe_awaitable, upload_with_retry
 
-import rx
-from rx import operators as ops
 from rx.subject import Subject
 
 logger = logging.getLogger(__name__)
@@ -52,6 +61,84 @@ MAX_429_RETRIES = 5
 BASE_DELAY = 1.0
 MAX_DELAY = 60.0
 
+# Pipeline pacing: spacing between upload starts (enriched/FSM) and the
+# per-file cooldown before a failed import is retried
+LAUNCH_INTERVAL_SECONDS = 1.0
+RETRY_COOLDOWN_SECONDS = 30.0
+
+
+class _BatchLedger:
+    """``upload_batches`` rows and batch progress for a pipelined run.
+
+    Files are still grouped into ``batch_size`` slices for the ledger and
+    the progress display, but a batch no longer gates the next one: its
+    row opens when its first file starts uploading and closes when its
+    last file resolves.
+    """
+
+    def __init__(
+        self,
+        state: AsyncUploadStateManager,
+        progress: Any | None,
+        files: list[dict],
+        batch_size: int,
+    ) -> None:
+        self._state = state
+        self._progress = progress
+        self._batch_of = {
+            f["file_path"]: i // max(1, batch_size) + 1 for i, f in enumerate(files)
+        }
+        self._sizes = Counter(self._batch_of.values())
+        self._remaining = dict(self._sizes)
+        self._counts = {batch: [0, 0] for batch in self._sizes}  # [succeeded, failed]
+        self._ids: dict[int, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def start(self, file_path: str) -> None:
+        """Open the file's batch row on its first upload."""
+        batch = self._batch_of.get(file_path)
+        if batch is None or batch in self._ids:
+            return
+        async with self._lock:
+            if batch in self._ids:
+                return
+            self._ids[batch] = await self._state.create_batch(batch, self._sizes[batch])
+            if self._progress is not None:
+                self._progress.start_batch(batch, self._sizes[batch])
+            logger.info("Starting batch %d (%d files)", batch, self._sizes[batch])
+
+    async def resolve(self, file_info: dict, outcome: bool | None, attempt: int) -> None:
+        """Count one finished file; close its batch when it was the last."""
+        batch = self._batch_of.get(file_info["file_path"])
+        if batch is None:
+            return
+        if outcome is True:
+            self._counts[batch][0] += 1
+        elif outcome is False:
+            self._counts[batch][1] += 1
+        self._remaining[batch] -= 1
+        if self._remaining[batch] == 0:
+            await self._close(batch)
+
+    async def close_unfinished(self) -> None:
+        """Close batches left open by a shutdown."""
+        for batch, remaining in self._remaining.items():
+            if remaining > 0:
+                await self._close(batch)
+
+    async def _close(self, batch: int) -> None:
+        batch_id = self._ids.get(batch)
+        if batch_id is None:
+            return  # No file of this batch ever started
+        succeeded, failed = self._counts[batch]
+        status = "completed" if failed == 0 else "failed"
+        await self._state.update_batch(batch_id, succeeded, failed, status)
+        if self._progress is not None:
+            self._progress.complete_batch(batch)
+        logger.info(
+            "Batch %d complete: %d succeeded, %d failed", batch, succeeded, failed
+        )
+
 
 class UploadOrchestrator:
     """Main upload engine coordinating the full Gemini upload pipeline.
@@ -95,6 +182,13 @@ class UploadOrchestrator:
         self._skipped = 0
         self._total = 0
         self._instance_id = f"upload-{uuid.uuid4().hex[:8]}-{os.getpid()}"
+        self._pipeline_stats: PipelineStats | None = None
+        self._concurrency: AIMDConcurrencyController | None = None
+        self._content_bytes: Counter[str] = Counter()
+        self._prepared: dict[str, PreparedUpload] = {}
+        self._startup_recovery: BulkRecoveryReport | None = None
+        self._dedup_stats: DedupStats | None = None
+        self._dedup_owners: dict[str, str] = {}  # Payload key -> path uploading it
 
     # ------------------------------------------------------------------
     # Signal handling
@@ -139,7 +233,7 @@ class UploadOrchestrator:
         1. Ensure Gemini store exists
         2. Acquire single-writer lock
         3. Fetch pending files from SQLite
-        4. Split into batches and process
+        4. Stream files through the upload/poll pipeline
         5. Release lock and return summary
 
         Args:
@@ -180,30 +274,20 @@ class UploadOrchestrator:
                 return self.summary
 
             logger.info(
-                "Found %d pending files, processing in batches of %d",
+                "Found %d pending files, pipelining with %d uploads / %d polls",
                 self._total,
-                self._config.batch_size,
+                self._config.max_concurrent_uploads,
+                self._max_concurrent_polls,
             )
 
-            # Step 4: Split into batches and process
-            batches = [
-                pending[i : i + self._config.batch_size]
-                for i in range(0, len(pending), self._config.batch_size)
-            ]
-
+            # Step 4: Stream every file through the upload/poll pipeline
             if self._progress is not None:
                 self._progress.start()
 
             try:
-                for batch_num, batch_files in enumerate(batches, start=1):
-                    if self._shutdown_requested:
-                        logger.warning("Shutdown requested, skipping remaining batches")
-                        self._skipped += sum(
-                            len(b)
-                            for b in batches[batch_num:]
-                        )
-                        break
-                    await self._process_batch(batch_files, batch_num)
+                await self._run_pipeline(
+                    pending, self._upload_single_file, self._poll_single_operation
+                )
             finally:
                 if self._progress is not None:
                     self._progress.stop()
@@ -224,97 +308,208 @@ class UploadOrchestrator:
         return self.summary
 
     # ------------------------------------------------------------------
-    # Batch processing
+    # Pipelined processing
     # ------------------------------------------------------------------
 
-    async def _process_batch(
-        self, files: list[dict], batch_number: int
-    ) -> None:
-        """Process a single logical batch of files.
-
-        Uploads all files concurrently (semaphore-limited), then polls
-        all resulting operations concurrently.
+    async def _run_pipeline(
+        self,
+        files: list[dict],
+        upload: Callable[[dict], Awaitable[Any]],
+        poll: Callable[[Any], Awaitable[bool]],
+        *,
+        launch_interval: float = 0.0,
+        retry: Callable[[dict], Awaitable[dict | None]] | None = None,
+        label: str = "Upload",
+    ) -> PipelineStats:
+        """Run ``files`` through the continuous upload -> poll pipeline.
+
+        Upload and polling run as separate bounded stages connected by a
+        queue (see :mod:`objlib.upload.pipeline`), so a slow file never
+        holds back the others. ``upload_batches`` rows and the batch
+        progress bar still follow ``batch_size`` slices of ``files``.
+
+        With ``adaptive_concurrency`` the stage limits (and the upload
+        spacing) are driven by an :class:`AIMDConcurrencyController`;
+        otherwise uploads follow the circuit breaker's recommendation.
         """
-        batch_id = await self._state.create_batch(batch_number, len(files))
+        ledger = _BatchLedger(self._state, self._progress, files, self._config.batch_size)
+
+        async def _upload(file_info: dict) -> Any:
+            await ledger.start(file_info["file_path"])
+            return await upload(file_info)
+
+        config = self._config
+        if config.adaptive_concurrency:
+            self._concurrency = self._build_concurrency_controller()
+            upload_workers = max(config.max_concurrent_uploads, config.max_adaptive_uploads)
+            poll_workers = max(self._max_concurrent_polls, config.max_adaptive_polls)
+            upload_limit = self._concurrency.upload_limit
+            poll_limit = self._concurrency.poll_limit
+            spacing = self._concurrency.launch_interval(launch_interval)
+        else:
+            upload_workers = config.max_concurrent_uploads
+            poll_workers = self._max_concurrent_polls
+            upload_limit = lambda: self._max_concurrent_uploads  # noqa: E731
+            poll_limit = None
+            spacing = launch_interval
+
+        pipeline: UploadPipeline[dict] = UploadPipeline(
+            _upload,
+            poll,
+            upload_concurrency=upload_workers,
+            poll_concurrency=poll_workers,
+            upload_limit=upload_limit,
+            poll_limit=poll_limit,
+            launch_interval=spacing,
+            retry=retry,
+            retry_delay=RETRY_COOLDOWN_SECONDS,
+            should_stop=lambda: self._shutdown_requested,
+            on_outcome=ledger.resolve,
+        )
+        stats = await pipeline.run(files)
+        await ledger.close_unfinished()
+
+        self._skipped += stats.not_started
+        self._pipeline_stats = stats
+        for line in stats.report_lines():
+            logger.info("%s pipeline: %s", label, line)
+        if self._concurrency is not None:
+            logger.info(
+                "%s pipeline: %d concurrency adjustments, final limits %s",
+                label, len(self._concurrency.adjustments), self._concurrency.limits,
+            )
+        if self._content_bytes["sources"]:
+            content = self._content_bytes
+            logger.info(
+                "%s content: %d enriched bodies, %d bytes read, %d header bytes, "
+                "%d bytes spooled (%d spooled bodies)",
+                label, content["sources"], content["read"], content["header"],
+                content["spooled"], content["spooled_sources"],
+            )
+        return stats
+
+    async def _open_upload_source(self, file_path: str, headers: list[str]) -> UploadSource:
+        """Build an upload body off the event loop and account its bytes."""
+        source = await asyncio.to_thread(open_upload_source, file_path, headers)
+        self._content_bytes["sources"] += 1
+        self._content_bytes["read"] += source.bytes_read
+        self._content_bytes["header"] += source.header_bytes
+        self._content_bytes["spooled"] += source.bytes_spooled
+        self._content_bytes["spooled_sources"] += int(source.spooled)
+        return source
+
+    async def _prepare_uploads(self, file_paths: list[str]) -> dict[str, PreparedUpload]:
+        """Bulk-build headers and custom metadata (cached by input hash)."""
+
+        def _prepare() -> dict[str, PreparedUpload]:
+            conn = sqlite3.connect(self._state.db_path)
+            try:
+                return UploadPreparer(conn).prepare(file_paths)
+            finally:
+                conn.close()
 
-        if self._progress is not None:
-            self._progress.start_batch(batch_number, len(files))
+        try:
+            return await asyncio.to_thread(_prepare)
+        except Exception as exc:
+            logger.warning("Upload preparation failed: %s", exc)
+            return {}
 
-        logger.info(
-            "Starting batch %d (%d files)", batch_number, len(files)
-        )
+    async def _dedup_pending(self, pending: list[dict]) -> list[dict]:
+        """Drop files whose prepared payload is already (being) uploaded.
 
-        # Phase 1: Upload all files in this batch (RxPY bounded concurrency)
-        async def _do_upload(f):
+        Only files with a prepared entry are candidates; their payload key
+        is the content hash plus the prepared upload (enrichment) hash.
+        """
+        candidates = []
+        for file_info in pending:
+            prepared = self._prepared.get(file_info["file_path"])
+            if prepared is None:
+                continue
+            candidates.append(PayloadCandidate.build(
+                file_info["file_path"],
+                file_info.get("content_hash") or "",
+                file_info.get("file_size") or 0,
+                prepared.upload_hash,
+                prepared.headers,
+            ))
+
+        def _plan() -> DedupPlan:
+            conn = sqlite3.connect(self._state.db_path)
             try:
-                return await self._upload_single_file(f)
-            except Exception as exc:
-                return exc
-
-        obs = rx.from_iterable(files).pipe(
-            ops.map(lambda f: rx.defer(
-                lambda f=f: rx.from_future(asyncio.ensure_future(_do_upload(f)))
-            )),
-            ops.merge(max_concurrent=self._max_concurrent_uploads),
-            ops.to_list(),
-        )
-        upload_results = await subscribe_awaitable(obs)
-
-        # Collect successful operations for polling
-        operations: list[tuple[str, Any]] = []
-        batch_succeeded = 0
-        batch_failed = 0
-
-        for result in upload_results:
-            if isinstance(result, Exception):
-                batch_failed += 1
-                logger.error("Upload task exception: %s", result)
-            elif result is None:
-                # Skipped (shutdown or circuit breaker open)
-                pass
-            else:
-                operations.append(result)
+                return UploadDeduplicator(conn, self._dedup_owners).plan(candidates)
+            finally:
+                conn.close()
 
-        # Phase 2: Poll all operations (RxPY bounded concurrency)
-        if operations:
-            async def _do_poll(op):
-                try:
-                    return await self._poll_single_operation(op)
-                except Exception as exc:
-                    return exc
-
-            poll_obs = rx.from_iterable(operations).pipe(
-                ops.map(lambda op: rx.defer(
-                    lambda op=op: rx.from_future(asyncio.ensure_future(_do_poll(op)))
-                )),
-                ops.merge(max_concurrent=self._max_concurrent_polls),
-                ops.to_list(),
+        try:
+            plan = await asyncio.to_thread(_plan)
+        except Exception as exc:
+            logger.warning("Upload dedup failed, uploading every file: %s", exc)
+            return pending
+        if self._dedup_stats is None:
+            self._dedup_stats = DedupStats()
+        self._dedup_stats.add(plan.stats)
+        return [f for f in pending if f["file_path"] not in plan.aliases]
+
+    async def _select_fsm_pending(self, limit: int) -> list[dict]:
+        """Fetch up to ``limit`` untracked files that need their own upload.
+
+        Live aliases are already excluded by the query. Files this run's
+        dedup plan turns into aliases are dropped and the window refilled
+        from the next page, so duplicates never use up a ``--limit``.
+        Headers and metadata are prepared page by page.
+        """
+        selected: list[dict] = []
+        after = ""
+        while len(selected) < limit:
+            wanted = limit - len(selected)
+            page = await self._state.get_fsm_pending_files(limit=wanted, after=after)
+            if not page:
+                break
+            after = page[-1]["file_path"]
+            self._prepared.update(
+                await self._prepare_uploads([f["file_path"] for f in page])
             )
-            poll_results = await subscribe_awaitable(poll_obs)
-
-            for result in poll_results:
-                if isinstance(result, Exception):
-                    batch_failed += 1
-                    logger.error("Poll task exception: %s", result)
-                elif result is True:
-                    batch_succeeded += 1
-                else:
-                    batch_failed += 1
+            exhausted = len(page) < wanted
+            if self._config.dedup_uploads:
+                page = await self._dedup_pending(page)
+            selected.extend(page)
+            if exhausted:
+                break
+        return selected
 
-        # Update batch record
-        status = "completed" if batch_failed == 0 else "failed"
-        await self._state.update_batch(
-            batch_id, batch_succeeded, batch_failed, status
-        )
+    @property
+    def dedup_stats(self) -> DedupStats | None:
+        """Content-addressed dedup outcome of the last FSM run."""
+        return self._dedup_stats
 
-        if self._progress is not None:
-            self._progress.complete_batch(batch_number)
+    @property
+    def content_bytes(self) -> dict[str, int]:
+        """Bytes read/spooled for enriched upload bodies during this run."""
+        return dict(self._content_bytes)
+
+    def _build_concurrency_controller(self) -> AIMDConcurrencyController:
+        """AIMD controller over this run's breaker and quota headers."""
+        config = self._config
+        rate_limiter = getattr(self._client, "rate_limiter", None)
+
+        def _quota_remaining() -> int | None:
+            return getattr(rate_limiter, "observed_remaining", None)
+
+        def _on_adjust(adjustment: ConcurrencyAdjustment) -> None:
+            if adjustment.stage == "upload" and self._progress is not None:
+                self._progress.update_circuit_state(
+                    self._circuit_breaker.state.value, adjustment.new
+                )
 
-        logger.info(
-            "Batch %d complete: %d succeeded, %d failed",
-            batch_number,
-            batch_succeeded,
-            batch_failed,
+        return AIMDConcurrencyController(
+            self._circuit_breaker,
+            upload=(config.max_concurrent_uploads,
+                    max(config.max_concurrent_uploads, config.max_adaptive_uploads)),
+            poll=(self._max_concurrent_polls,
+                  max(self._max_concurrent_polls, config.max_adaptive_polls)),
+            target_error_rate=config.target_error_rate,
+            quota_remaining=_quota_remaining,
+            on_adjust=_on_adjust,
         )
 
     # ------------------------------------------------------------------
@@ -363,7 +558,7 @@ class UploadOrchestrator:
             # Build display name (truncated to 512 chars)
             display_name = file_info.get("filename", os.path.basename(file_path))[:512]
 
-            # Upload (concurrency bounded by ops.merge at caller level)
+            # Upload (concurrency bounded by the pipeline's upload stage)
             file_obj, operation = await self._client.upload_and_import(
                 file_path, display_name, custom_metadata
             )
@@ -426,7 +621,7 @@ class UploadOrchestrator:
         file_path, operation = operation_info
 
         try:
-            # Concurrency bounded by ops.merge at caller level
+            # Concurrency bounded by the pipeline's stage limits
             completed = await self._client.poll_operation(
                 operation, timeout=self._config.poll_timeout_seconds
             )
@@ -468,6 +663,11 @@ class UploadOrchestrator:
     # Summary
     # ------------------------------------------------------------------
 
+    @property
+    def pipeline_stats(self) -> PipelineStats | None:
+        """Stage counters and latencies from the last pipeline run, if any."""
+        return self._pipeline_stats
+
     @property
     def summary(self) -> dict[str, int]:
         """Return upload summary counts."""
@@ -494,10 +694,12 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
     * Builds ``CustomMetadata`` with ``string_list_value`` fields via
       ``build_enriched_metadata()``.
     * Prepends Tier 4 AI analysis to file content via
-      ``prepare_enriched_content()``.
+      ``open_upload_source()`` (in-memory body, no temp file).
     * Skips files whose ``last_upload_hash`` matches (idempotency).
-    * Conservative concurrency: ``Semaphore(2)`` default with 1-second
-      staggered launch delay.
+    * Streams files through the shared :class:`UploadPipeline` with a
+      1-second base launch interval; the upload and poll stage limits are
+      sized by the AIMD controller (or follow the circuit breaker when
+      ``adaptive_concurrency`` is off).
 
     Usage::
 
@@ -521,7 +723,7 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
         self._include_needs_review = include_needs_review
         self._file_limit = file_limit
         self._reset_count = 0
-        self._retry_succeeded = 0  # Track post-batch retry successes
+        self._retry_succeeded = 0  # Files recovered by the pipeline's retry
 
     # ------------------------------------------------------------------
     # Enriched upload entry point
@@ -534,7 +736,7 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
         2. Acquire single-writer lock
         3. Optionally reset already-uploaded files for re-upload
         4. Fetch enriched pending files from SQLite
-        5. Split into batches and process with enriched upload
+        5. Stream files through the pipeline with enriched upload
         6. Release lock and return summary
 
         Args:
@@ -583,30 +785,26 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
                 return self.enriched_summary
 
             logger.info(
-                "Found %d enriched pending files, processing in batches of %d",
+                "Found %d enriched pending files, pipelining with %d uploads / %d polls",
                 self._total,
-                self._config.batch_size,
+                self._config.max_concurrent_uploads,
+                self._max_concurrent_polls,
             )
 
-            # Step 5: Split into batches and process
-            batches = [
-                pending[i : i + self._config.batch_size]
-                for i in range(0, len(pending), self._config.batch_size)
-            ]
-
+            # Step 5: Stream every file through the upload/poll pipeline
             if self._progress is not None:
                 self._progress.start()
 
             try:
-                for batch_num, batch_files in enumerate(batches, start=1):
-                    if self._shutdown_requested:
-                        logger.warning("Shutdown requested, skipping remaining batches")
-                        self._skipped += sum(
-                            len(b)
-                            for b in batches[batch_num:]
-                        )
-                        break
-                    await self._process_enriched_batch(batch_files, batch_num)
+                stats = await self._run_pipeline(
+                    pending,
+                    self._upload_enriched_file,
+                    self._poll_single_operation,
+                    launch_interval=LAUNCH_INTERVAL_SECONDS,
+                    retry=self._prepare_enriched_retry,
+                    label="Enriched upload",
+                )
+                self._retry_succeeded += stats.retry_succeeded
             finally:
                 if self._progress is not None:
                     self._progress.stop()
@@ -660,266 +858,91 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
         db = self._state._ensure_connected()
         now = self._state._now_iso()
 
-        # Fetch all store documents once to build an O(1) lookup.
-        # Avoids calling list_store_documents() inside the loop (which would be O(N²)).
-        doc_name_by_file_id: dict[str, str] = {}
+        # List the store once into the store document index; every lookup in
+        # the loop below is then a local query instead of a listing.
+        store_db = Database(self._state.db_path)
+        store_index: StoreDocumentIndex | None = StoreDocumentIndex(store_db, self._client)
         try:
-            store_documents = await self._client.list_store_documents()
-            for _doc in store_documents:
-                _doc_name = getattr(_doc, "name", "") or ""
-                # display_name holds the plain file ID set at import time.
-                # The document resource name uses a compound suffix that does
-                # not match DB gemini_file_id values directly.
-                _display = getattr(_doc, "display_name", "") or ""
-                if _doc_name and _display:
-                    doc_name_by_file_id[_display] = _doc_name
-            logger.info(
-                "Built store document lookup with %d entries for reset cleanup",
-                len(doc_name_by_file_id),
-            )
+            await store_index.refresh()
         except Exception as exc:
+            store_index = None
             logger.warning(
                 "Could not list store documents for reset cleanup: %s -- "
                 "store documents will not be deleted during this reset",
                 exc,
             )
 
-        for file_info in files_to_reset:
-            file_path = file_info["file_path"]
-            gemini_file_id = file_info.get("gemini_file_id")
-
-            try:
-                # Delete from Gemini if there's a remote file
-                if gemini_file_id:
-                    # Normalize to full resource name if needed
-                    if not gemini_file_id.startswith("files/"):
-                        gemini_file_id = f"files/{gemini_file_id}"
-                    try:
-                        await self._client.delete_file(gemini_file_id)
-                        logger.info("Deleted %s from Gemini", gemini_file_id)
-                    except Exception as exc:
-                        # File may already be expired/deleted -- continue
-                        logger.warning(
-                            "Could not delete %s from Gemini: %s",
-                            gemini_file_id,
-                            exc,
-                        )
+        try:
+            for file_info in files_to_reset:
+                file_path = file_info["file_path"]
+                gemini_file_id = file_info.get("gemini_file_id")
 
-                    # Delete the corresponding store document (permanently indexed entry).
-                    # Raw files (Files API) expire in 48hr; store documents never expire
-                    # and must be explicitly deleted. Without this, every --reset-existing
-                    # run leaves an orphaned store document that accumulates indefinitely
-                    # and causes [Unresolved file #N] in search results.
-                    file_id_suffix = gemini_file_id.replace("files/", "")
-                    store_doc_name = doc_name_by_file_id.get(file_id_suffix)
-                    if store_doc_name:
+                try:
+                    # Delete from Gemini if there's a remote file
+                    if gemini_file_id:
+                        # Normalize to full resource name if needed
+                        if not gemini_file_id.startswith("files/"):
+                            gemini_file_id = f"files/{gemini_file_id}"
                         try:
-                            await self._client.delete_store_document(store_doc_name)
-                            logger.info(
-                                "Deleted store document %s for %s",
-                                store_doc_name,
-                                gemini_file_id,
-                            )
+                            await self._client.delete_file(gemini_file_id)
+                            logger.info("Deleted %s from Gemini", gemini_file_id)
                         except Exception as exc:
+                            # File may already be expired/deleted -- continue
                             logger.warning(
-                                "Could not delete store document %s: %s",
-                                store_doc_name,
+                                "Could not delete %s from Gemini: %s",
+                                gemini_file_id,
                                 exc,
                             )
 
-                # Reset for re-upload in database
-                await db.execute(
-                    """UPDATE files
-                       SET error_message = NULL,
-                           upload_attempt_count = 0,
-                           gemini_file_uri = NULL,
-                           gemini_file_id = NULL,
-                           remote_expiration_ts = NULL,
-                           upload_timestamp = NULL,
-                           updated_at = ?
-                       WHERE file_path = ?""",
-                    (now, file_path),
-                )
-                await db.commit()
-                self._reset_count += 1
+                        # Delete the corresponding store document (permanently indexed entry).
+                        # Raw files (Files API) expire in 48hr; store documents never expire
+                        # and must be explicitly deleted. Without this, every --reset-existing
+                        # run leaves an orphaned store document that accumulates indefinitely
+                        # and causes [Unresolved file #N] in search results.
+                        store_doc_name = store_index.lookup(gemini_file_id) if store_index else None
+                        if store_doc_name:
+                            try:
+                                await store_index.delete(store_doc_name)
+                                logger.info(
+                                    "Deleted store document %s for %s",
+                                    store_doc_name,
+                                    gemini_file_id,
+                                )
+                            except Exception as exc:
+                                logger.warning(
+                                    "Could not delete store document %s: %s",
+                                    store_doc_name,
+                                    exc,
+                                )
+
+                    # Reset for re-upload in database
+                    await db.execute(
+                        """UPDATE files
+                           SET error_message = NULL,
+                               upload_attempt_count = 0,
+                               gemini_file_uri = NULL,
+                               gemini_file_id = NULL,
+                               remote_expiration_ts = NULL,
+                               upload_timestamp = NULL,
+                               updated_at = ?
+                           WHERE file_path = ?""",
+                        (now, file_path),
+                    )
+                    await db.commit()
+                    self._reset_count += 1
 
-            except Exception as exc:
-                logger.error("Failed to reset %s: %s", file_path, exc)
+                except Exception as exc:
+                    logger.error("Failed to reset %s: %s", file_path, exc)
+        finally:
+            store_db.close()
 
     # ------------------------------------------------------------------
-    # Enriched batch processing
+    # Enriched retry
     # ------------------------------------------------------------------
 
-    async def _process_enriched_batch(
-        self, files: list[dict], batch_number: int
-    ) -> None:
-        """Process a batch of enriched files with staggered launches and retry pass.
-
-        Same structure as parent _process_batch but uses enriched upload
-        method, adds 1-second delay between task launches, and includes
-        a post-batch retry pass for transient failures.
-
-        Retry Pass:
-          - Collects all failures after main batch polling
-          - Waits 30 seconds (API cooldown)
-          - Retries failed files once more
-          - Reports final success/failure counts
-        """
-        batch_id = await self._state.create_batch(batch_number, len(files))
-
-        if self._progress is not None:
-            self._progress.start_batch(batch_number, len(files))
-
-        logger.info(
-            "Starting enriched batch %d (%d files)", batch_number, len(files)
-        )
-
-        # Phase 1: Upload all files with staggered launches (RxPY pipeline)
-        file_map = {}  # Track file_path -> file_info for retry
-        for f in files:
-            file_map[f["file_path"]] = f
-
-        async def _staggered_upload(pair):
-            """Upload with stagger delay built into the pipeline."""
-            idx, f = pair
-            if idx > 0:
-                await asyncio.sleep(1.0)  # Stagger to prevent burst
-            try:
-                return await self._upload_enriched_file(f)
-            except Exception as exc:
-                return exc
-
-        upload_obs = rx.from_iterable(enumerate(files)).pipe(
-            ops.map(lambda pair: rx.defer(
-                lambda pair=pair: rx.from_future(asyncio.ensure_future(_staggered_upload(pair)))
-            )),
-            ops.merge(max_concurrent=self._max_concurrent_uploads),
-            ops.to_list(),
-        )
-        upload_results = await subscribe_awaitable(upload_obs)
-
-        # Collect successful operations for polling
-        operations: list[tuple[str, Any]] = []
-        batch_succeeded = 0
-        batch_failed = 0
-
-        for result in upload_results:
-            if isinstance(result, Exception):
-                batch_failed += 1
-                logger.error("Upload task exception: %s", result)
-            elif result is None:
-                # Skipped (shutdown, circuit breaker open, or idempotent)
-                pass
-            else:
-                operations.append(result)
-
-        # Phase 2: Poll all operations (RxPY bounded concurrency)
-        failed_files = []
-        if operations:
-            async def _do_poll_enriched(op):
-                try:
-                    return await self._poll_single_operation(op)
-                except Exception as exc:
-                    return exc
-
-            poll_obs = rx.from_iterable(operations).pipe(
-                ops.map(lambda op: rx.defer(
-                    lambda op=op: rx.from_future(asyncio.ensure_future(_do_poll_enriched(op)))
-                )),
-                ops.merge(max_concurrent=self._max_concurrent_polls),
-                ops.to_list(),
-            )
-            poll_results = await subscribe_awaitable(poll_obs)
-
-            for i, result in enumerate(poll_results):
-                if isinstance(result, Exception):
-                    batch_failed += 1
-                    logger.error("Poll task exception: %s", result)
-                    # Track for retry
-                    file_path = operations[i][0]
-                    if file_path in file_map:
-                        failed_files.append(file_map[file_path])
-                elif result is True:
-                    batch_succeeded += 1
-                else:
-                    batch_failed += 1
-                    # Track for retry
-                    file_path = operations[i][0]
-                    if file_path in file_map:
-                        failed_files.append(file_map[file_path])
-
-        # Phase 3: Retry pass for failures (RxPY timer for cooldown)
-        retry_succeeded = 0
-        retry_failed = 0
-        if failed_files and not self._shutdown_requested:
-            logger.info(
-                "Batch %d: %d failures detected, starting retry pass after 30s cooldown...",
-                batch_number,
-                len(failed_files),
-            )
-            await asyncio.sleep(30.0)  # API cooldown
-
-            # Retry each failed file
-            retry_operations = []
-            for f in failed_files:
-                result = await self._upload_enriched_file(f)
-                if result is not None:
-                    retry_operations.append(result)
-
-            # Poll retry operations (RxPY bounded concurrency)
-            if retry_operations:
-                async def _do_retry_poll(op):
-                    try:
-                        return await self._poll_single_operation(op)
-                    except Exception as exc:
-                        return exc
-
-                retry_poll_obs = rx.from_iterable(retry_operations).pipe(
-                    ops.map(lambda op: rx.defer(
-                        lambda op=op: rx.from_future(asyncio.ensure_future(_do_retry_poll(op)))
-                    )),
-                    ops.merge(max_concurrent=self._max_concurrent_polls),
-                    ops.to_list(),
-                )
-                retry_poll_results = await subscribe_awaitable(retry_poll_obs)
-
-                for result in retry_poll_results:
-                    if isinstance(result, Exception):
-                        retry_failed += 1
-                        logger.error("Retry poll exception: %s", result)
-                    elif result is True:
-                        retry_succeeded += 1
-                        # Adjust batch counters
-                        batch_succeeded += 1
-                        batch_failed -= 1
-                        # Track global retry successes
-                        self._retry_succeeded += 1
-                    else:
-                        retry_failed += 1
-
-            logger.info(
-                "Batch %d retry pass: %d succeeded, %d still failed",
-                batch_number,
-                retry_succeeded,
-                retry_failed,
-            )
-
-        # Update batch record with final counts
-        status = "completed" if batch_failed == 0 else "failed"
-        await self._state.update_batch(
-            batch_id, batch_succeeded, batch_failed, status
-        )
-
-        if self._progress is not None:
-            self._progress.complete_batch(batch_number)
-
-        logger.info(
-            "Enriched batch %d complete: %d succeeded, %d failed%s",
-            batch_number,
-            batch_succeeded,
-            batch_failed,
-            f" (after {retry_succeeded} retries)" if retry_succeeded > 0 else "",
-        )
+    async def _prepare_enriched_retry(self, file_info: dict) -> dict | None:
+        """Enriched uploads re-upload a failed file as-is."""
+        return file_info
 
     # ------------------------------------------------------------------
     # Enriched single file upload
@@ -933,8 +956,8 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
         1. Parse Phase 1 metadata, AI metadata, and entity names
         2. Compute upload hash for idempotency
         3. Build enriched CustomMetadata via build_enriched_metadata()
-        4. Prepare enriched content via prepare_enriched_content()
-        5. Upload with semaphore-limited concurrency
+        4. Build the enriched body via open_upload_source()
+        5. Upload (concurrency is bounded by the pipeline's upload stage)
         6. Record success and update upload hash
 
         Returns:
@@ -977,11 +1000,13 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
             phase1_metadata, ai_metadata, entity_names
         )
 
-        # Prepare enriched content (temp file with Tier 4 header)
-        temp_path = None
+        # Prepare enriched content (Tier 4 header + original, in memory)
+        source: UploadSource | None = None
         try:
-            temp_path = prepare_enriched_content(file_path, ai_metadata)
-            upload_path = temp_path if temp_path is not None else file_path
+            ai_header = build_ai_analysis_header(ai_metadata)
+            if ai_header is not None:
+                source = await self._open_upload_source(file_path, [ai_header])
+            upload_body = source.stream if source is not None else file_path
 
             # Build display name (truncated to 512 chars)
             display_name = file_info.get("filename", os.path.basename(file_path))[:512]
@@ -989,9 +1014,9 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
             # Record intent BEFORE API call
             await self._state.record_upload_intent(file_path)
 
-            # Upload (concurrency bounded by ops.merge at caller level)
+            # Upload (concurrency bounded by the pipeline's upload stage)
             file_obj, operation = await self._client.upload_and_import(
-                upload_path, display_name, custom_metadata
+                upload_body, display_name, custom_metadata
             )
 
             # Record success AFTER API response
@@ -1037,8 +1062,8 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
             return None
 
         finally:
-            # Always clean up temp file
-            cleanup_temp_file(temp_path)
+            if source is not None:
+                source.close()
 
     # ------------------------------------------------------------------
     # Enriched summary
@@ -1053,8 +1078,9 @@ class EnrichedUploadOrchestrator(UploadOrchestrator):
             "failed": self._failed,
             "skipped": self._skipped,
             "reset": self._reset_count,
-            "retried": self._retry_succeeded,  # Post-batch retry successes
+            "retried": self._retry_succeeded,  # Failed files recovered on retry
             "pending": self._total - self._succeeded - self._failed - self._skipped,
+            "deduplicated": self._dedup_stats.skipped if self._dedup_stats else 0,
         }
 
 
@@ -1094,7 +1120,7 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
         3. Acquire single-writer lock
         4. Optionally reset already-indexed files (SC3-compliant)
         5. Fetch untracked files via get_fsm_pending_files()
-        6. Process in batches using FSM transitions
+        6. Stream files through the pipeline using FSM transitions
         7. Release lock and return summary
 
         Args:
@@ -1105,46 +1131,8 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
         """
         self.setup_signal_handlers()
 
-        # Step 0: Run crash recovery (RecoveryManager + RecoveryCrawler)
-        recovery = RecoveryManager(self._client, self._state, self._config)
-        recovery_result = await recovery.run()
-        if recovery_result.recovered_operations > 0 or recovery_result.reset_to_pending > 0:
-            logger.info(
-                "Recovery: %d ops recovered, %d files reset to pending",
-                recovery_result.recovered_operations,
-                recovery_result.reset_to_pending,
-            )
-
-        # RecoveryCrawler for FSM-specific write-ahead intents
-        crawler = RecoveryCrawler(self._state, self._client)
-        recovered, occ_failures = await crawler.recover_all()
-        if recovered:
-            logger.info("RecoveryCrawler recovered %d files", len(recovered))
-        if occ_failures:
-            logger.warning("RecoveryCrawler OCC failures: %d files (will retry next startup)", len(occ_failures))
-
-        # Step 0b: Reconcile FAILED files against actual Gemini state.
-        # Class B/C (actually indexed) → upgraded to indexed.
-        # Class A/D (genuinely failed)  → cleaned up and reset to untracked.
-        upgraded, reset_to_untracked = await cleanup_and_reset_failed_files(self._state, self._client)
-        if upgraded or reset_to_untracked:
-            logger.info(
-                "Startup reconcile: %d failed files upgraded to indexed, %d reset to untracked",
-                upgraded, reset_to_untracked,
-            )
-
-        # Step 0c: Recover untracked files that have valid store documents.
-        # These were incorrectly reset to untracked by the expiration deadline
-        # bug (Phase 3 of RecoveryManager checked 'indexed' state files and
-        # reset them when their raw 48hr file expired, even though the store
-        # document is permanent).  Restore STATE_ACTIVE docs back to indexed.
-        restored, cleared_docs = await recover_untracked_with_store_doc(self._state, self._client)
-        if restored or cleared_docs:
-            logger.info(
-                "Startup store-doc recovery: %d untracked files restored to indexed, "
-                "%d stale store doc IDs cleared",
-                restored, cleared_docs,
-            )
+        # Step 0: Crash recovery and startup reconciliation
+        await self._run_startup_recovery()
 
         # Step 1: Ensure store exists
         logger.info("Ensuring store '%s' exists...", store_display_name)
@@ -1161,40 +1149,40 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
             if self._reset_existing:
                 await self._reset_existing_files_fsm(limit=self._file_limit)
 
-            # Step 4: Get FSM pending files (untracked)
+            # Step 4: Get FSM pending files (untracked), prepared and deduplicated:
+            # identical payloads upload once, the other paths become aliases
             limit = self._file_limit if self._file_limit > 0 else 10000
-            pending = await self._state.get_fsm_pending_files(limit=limit)
+            pending = await self._select_fsm_pending(limit)
             self._total = len(pending)
 
             if not pending:
-                logger.info("No untracked files to upload")
+                if self._dedup_stats is not None and self._dedup_stats.skipped:
+                    logger.info("Every untracked file shares an uploaded payload")
+                else:
+                    logger.info("No untracked files to upload")
                 return self.enriched_summary
 
             logger.info(
-                "Found %d untracked files, processing in batches of %d",
+                "Found %d untracked files, pipelining with %d uploads / %d polls",
                 self._total,
-                self._config.batch_size,
+                self._config.max_concurrent_uploads,
+                self._max_concurrent_polls,
             )
 
-            # Step 5: Split into batches and process
-            batches = [
-                pending[i : i + self._config.batch_size]
-                for i in range(0, len(pending), self._config.batch_size)
-            ]
-
+            # Step 5: Stream every file through the upload/poll pipeline
             if self._progress is not None:
                 self._progress.start()
 
             try:
-                for batch_num, batch_files in enumerate(batches, start=1):
-                    if self._shutdown_requested:
-                        logger.warning("Shutdown requested, skipping remaining batches")
-                        self._skipped += sum(
-                            len(b)
-                            for b in batches[batch_num:]
-                        )
-                        break
-                    await self._process_fsm_batch(batch_files, batch_num)
+                stats = await self._run_pipeline(
+                    pending,
+                    self._upload_fsm_file,
+                    self._poll_fsm_operation,
+                    launch_interval=LAUNCH_INTERVAL_SECONDS,
+                    retry=self._prepare_fsm_retry,
+                    label="FSM upload",
+                )
+                self._retry_succeeded += stats.retry_succeeded
             finally:
                 if self._progress is not None:
                     self._progress.stop()
@@ -1224,180 +1212,78 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
         return self.enriched_summary
 
     # ------------------------------------------------------------------
-    # FSM batch processing
+    # Startup recovery
     # ------------------------------------------------------------------
 
-    async def _process_fsm_batch(
-        self, files: list[dict], batch_number: int
-    ) -> None:
-        """Process a batch of files through FSM-mediated upload.
+    async def _run_startup_recovery(self) -> None:
+        """Reconcile interrupted, failed and stale rows before uploading.
 
-        Same structure as parent ``_process_enriched_batch`` but uses
-        FSM transition methods. Includes a retry pass for transient
-        failures (30s cooldown).
+        Bulk mode (``config.bulk_recovery``) lists the store once and writes
+        every transition in one transaction; it falls back to the per-file
+        steps below when the store cannot be listed.
         """
-        batch_id = await self._state.create_batch(batch_number, len(files))
-
-        if self._progress is not None:
-            self._progress.start_batch(batch_number, len(files))
-
-        logger.info(
-            "Starting FSM batch %d (%d files)", batch_number, len(files)
-        )
-
-        # Phase 1: Upload all files with staggered launches (RxPY pipeline)
-        file_map: dict[str, dict] = {}
-        for f in files:
-            file_map[f["file_path"]] = f
+        if self._config.bulk_recovery:
+            report = await BulkRecovery(self._state, self._client, self._config).run()
+            if report is not None:
+                self._startup_recovery = report
+                return
+            logger.warning("Bulk recovery unavailable, falling back to per-file recovery")
+
+        # Crash recovery (RecoveryManager + RecoveryCrawler)
+        recovery = RecoveryManager(self._client, self._state, self._config)
+        recovery_result = await recovery.run()
+        if recovery_result.recovered_operations > 0 or recovery_result.reset_to_pending > 0:
+            logger.info(
+                "Recovery: %d ops recovered, %d files reset to pending",
+                recovery_result.recovered_operations,
+                recovery_result.reset_to_pending,
+            )
 
-        async def _staggered_fsm_upload(pair):
-            idx, f = pair
-            if idx > 0:
-                await asyncio.sleep(1.0)  # Stagger to prevent burst
-            try:
-                return await self._upload_fsm_file(f)
-            except Exception as exc:
-                return exc
-
-        upload_obs = rx.from_iterable(enumerate(files)).pipe(
-            ops.map(lambda pair: rx.defer(
-                lambda pair=pair: rx.from_future(asyncio.ensure_future(_staggered_fsm_upload(pair)))
-            )),
-            ops.merge(max_concurrent=self._max_concurrent_uploads),
-            ops.to_list(),
-        )
-        upload_results = await subscribe_awaitable(upload_obs)
-
-        # Collect successful operations for polling
-        operations: list[tuple[str, Any, int]] = []  # (file_path, operation, version)
-        batch_succeeded = 0
-        batch_failed = 0
-
-        for result in upload_results:
-            if isinstance(result, Exception):
-                batch_failed += 1
-                logger.error("FSM upload task exception: %s", result)
-            elif result is None:
-                # Skipped (shutdown, circuit breaker, or invalid transition)
-                pass
-            else:
-                operations.append(result)
+        # RecoveryCrawler for FSM-specific write-ahead intents
+        crawler = RecoveryCrawler(self._state, self._client)
+        recovered, occ_failures = await crawler.recover_all()
+        if recovered:
+            logger.info("RecoveryCrawler recovered %d files", len(recovered))
+        if occ_failures:
+            logger.warning("RecoveryCrawler OCC failures: %d files (will retry next startup)", len(occ_failures))
 
-        # Phase 2: Poll all operations (RxPY bounded concurrency)
-        failed_files: list[dict] = []
-        if operations:
-            async def _do_fsm_poll(op_info):
-                try:
-                    return await self._poll_fsm_operation(op_info)
-                except Exception as exc:
-                    return exc
-
-            poll_obs = rx.from_iterable(operations).pipe(
-                ops.map(lambda op_info: rx.defer(
-                    lambda op_info=op_info: rx.from_future(asyncio.ensure_future(_do_fsm_poll(op_info)))
-                )),
-                ops.merge(max_concurrent=self._max_concurrent_polls),
-                ops.to_list(),
-            )
-            poll_results = await subscribe_awaitable(poll_obs)
-
-            for i, result in enumerate(poll_results):
-                if isinstance(result, Exception):
-                    batch_failed += 1
-                    logger.error("FSM poll task exception: %s", result)
-                    file_path = operations[i][0]
-                    if file_path in file_map:
-                        failed_files.append(file_map[file_path])
-                elif result is True:
-                    batch_succeeded += 1
-                else:
-                    batch_failed += 1
-                    file_path = operations[i][0]
-                    if file_path in file_map:
-                        failed_files.append(file_map[file_path])
-
-        # Phase 3: Retry pass for failures
-        retry_succeeded = 0
-        retry_failed = 0
-        if failed_files and not self._shutdown_requested:
+        # Reconcile FAILED files against actual Gemini state.
+        # Class B/C (actually indexed) → upgraded to indexed.
+        # Class A/D (genuinely failed)  → cleaned up and reset to untracked.
+        upgraded, reset_to_untracked = await cleanup_and_reset_failed_files(self._state, self._client)
+        if upgraded or reset_to_untracked:
             logger.info(
-                "FSM batch %d: %d failures detected, starting retry pass after 30s cooldown...",
-                batch_number,
-                len(failed_files),
+                "Startup reconcile: %d failed files upgraded to indexed, %d reset to untracked",
+                upgraded, reset_to_untracked,
             )
-            await asyncio.sleep(30.0)
-
-            # Reset failed files back to untracked before retrying
-            retry_operations = []
-            for f in failed_files:
-                fp = f["file_path"]
-                # Use retry_failed_file to reset FAILED -> UNTRACKED
-                reset_ok = await retry_failed_file(self._state, fp)
-                if not reset_ok:
-                    logger.warning(
-                        "Could not reset %s for retry (not in failed state?)", fp
-                    )
-                    continue
-                # Re-read current version and state from DB
-                state_val, version_val = await self._state.get_file_version(fp)
-                f_updated = dict(f)
-                f_updated["version"] = version_val
-                f_updated["gemini_state"] = state_val
-                result = await self._upload_fsm_file(f_updated)
-                if result is not None:
-                    retry_operations.append(result)
-
-            if retry_operations:
-                async def _do_fsm_retry_poll(op_info):
-                    try:
-                        return await self._poll_fsm_operation(op_info)
-                    except Exception as exc:
-                        return exc
-
-                retry_poll_obs = rx.from_iterable(retry_operations).pipe(
-                    ops.map(lambda op_info: rx.defer(
-                        lambda op_info=op_info: rx.from_future(asyncio.ensure_future(_do_fsm_retry_poll(op_info)))
-                    )),
-                    ops.merge(max_concurrent=self._max_concurrent_polls),
-                    ops.to_list(),
-                )
-                retry_poll_results = await subscribe_awaitable(retry_poll_obs)
-
-                for result in retry_poll_results:
-                    if isinstance(result, Exception):
-                        retry_failed += 1
-                        logger.error("FSM retry poll exception: %s", result)
-                    elif result is True:
-                        retry_succeeded += 1
-                        batch_succeeded += 1
-                        batch_failed -= 1
-                        self._retry_succeeded += 1
-                    else:
-                        retry_failed += 1
 
+        # Recover untracked files that have valid store documents.
+        # These were incorrectly reset to untracked by the expiration deadline
+        # bug (Phase 3 of RecoveryManager checked 'indexed' state files and
+        # reset them when their raw 48hr file expired, even though the store
+        # document is permanent).  Restore STATE_ACTIVE docs back to indexed.
+        restored, cleared_docs = await recover_untracked_with_store_doc(self._state, self._client)
+        if restored or cleared_docs:
             logger.info(
-                "FSM batch %d retry pass: %d succeeded, %d still failed",
-                batch_number,
-                retry_succeeded,
-                retry_failed,
+                "Startup store-doc recovery: %d untracked files restored to indexed, "
+                "%d stale store doc IDs cleared",
+                restored, cleared_docs,
             )
 
-        # Update batch record
-        status = "completed" if batch_failed == 0 else "failed"
-        await self._state.update_batch(
-            batch_id, batch_succeeded, batch_failed, status
-        )
-
-        if self._progress is not None:
-            self._progress.complete_batch(batch_number)
+    # ------------------------------------------------------------------
+    # FSM retry
+    # ------------------------------------------------------------------
 
-        logger.info(
-            "FSM batch %d complete: %d succeeded, %d failed%s",
-            batch_number,
-            batch_succeeded,
-            batch_failed,
-            f" (after {retry_succeeded} retries)" if retry_succeeded > 0 else "",
-        )
+    async def _prepare_fsm_retry(self, file_info: dict) -> dict | None:
+        """Reset a FAILED file to UNTRACKED and refresh its OCC version."""
+        file_path = file_info["file_path"]
+        if not await retry_failed_file(self._state, file_path):
+            logger.warning(
+                "Could not reset %s for retry (not in failed state?)", file_path
+            )
+            return None
+        state_val, version_val = await self._state.get_file_version(file_path)
+        return {**file_info, "version": version_val, "gemini_state": state_val}
 
     # ------------------------------------------------------------------
     # FSM single file upload
@@ -1453,77 +1339,42 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
             # Build display_name with .strip() (Phase 11: leading whitespace causes hang)
             display_name = file_info.get("filename", os.path.basename(file_path))[:512].strip()
 
-            # Parse metadata and build enriched metadata if available
-            metadata_json = file_info.get("metadata_json") or "{}"
-            metadata = json.loads(metadata_json)
-            custom_metadata = self._client.build_custom_metadata(metadata)
+            # Identity header (Title/Course/Class/Tags/Aspects, Phase 16.3 fix),
+            # [AI Analysis] header and custom metadata, bulk-built before the
+            # pipeline started (upload/preparation.py).
+            prepared = self._prepared.get(file_path)
+            if prepared is None:
+                prepared = (await self._prepare_uploads([file_path])).get(file_path)
+            if prepared is None:
+                metadata = json.loads(file_info.get("metadata_json") or "{}")
+                custom_metadata = self._client.build_custom_metadata(metadata)
+                headers: list[str] = []
+            else:
+                custom_metadata = prepared.custom_metadata
+                headers = prepared.headers
 
-            # Prepare content: [AI Analysis] header + original transcript
-            upload_path = file_path
-            temp_path = None
-            identity_temp_path = None
-            ai_json = file_info.get("ai_metadata_json")
-            if ai_json:
-                ai_metadata = json.loads(ai_json)
-                custom_metadata = build_enriched_metadata(
-                    metadata, ai_metadata,
-                    file_info.get("entity_names", []),
-                )
-                temp_path = prepare_enriched_content(file_path, ai_metadata)
-                if temp_path is not None:
-                    upload_path = temp_path
-
-            # Warn if topic_aspects is empty — S4a fallback will be
-            # unavailable for this file, degrading per-file retrievability.
-            if ai_json:
-                _aspects = ai_metadata.get("topic_aspects") or []
-                if not _aspects:
+                # Warn if topic_aspects is empty — S4a fallback will be
+                # unavailable for this file, degrading per-file retrievability.
+                if file_info.get("ai_metadata_json") and not prepared.aspect_count:
                     logger.warning(
                         "Empty topic_aspects for %s — S4a fallback unavailable; "
                         "file may be harder to retrieve via rarest-aspect queries",
                         file_info.get("filename", file_path),
                     )
 
-            # Prepend identity header (Title/Course/Class/Tags/Aspects) so
-            # Gemini can discriminate semantically similar files by their
-            # unique class number, course, and aspects (Phase 16.3 fix).
-            identity_header = ""
-            sync_conn = sqlite3.connect(self._state.db_path)
-            try:
-                identity_header = build_identity_header(file_path, sync_conn)
-            except Exception as _exc:
-                logger.warning(
-                    "Identity header build failed for %s: %s", file_path, _exc
-                )
-            finally:
-                sync_conn.close()
-
-            if identity_header:
-                base_content = Path(upload_path).read_text(encoding="utf-8")
-                _itmp = tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".txt", delete=False, encoding="utf-8"
-                )
-                try:
-                    _itmp.write(identity_header)
-                    _itmp.write(base_content)
-                    _itmp.close()
-                    identity_temp_path = _itmp.name
-                    upload_path = identity_temp_path
-                except Exception as _exc:
-                    _itmp.close()
-                    cleanup_temp_file(_itmp.name)
-                    logger.warning(
-                        "Identity temp file failed for %s: %s", file_path, _exc
-                    )
+            # identity header + [AI Analysis] header + original, read once
+            # into one in-memory body (no temp files).
+            source = (
+                await self._open_upload_source(file_path, headers) if headers else None
+            )
+            upload_body = source.stream if source is not None else file_path
 
             try:
                 # Upload with 429 retry via upload_with_retry operator
-                # Concurrency bounded by ops.merge at caller level
-                _upload_path = upload_path  # capture for closure
-
+                # Concurrency bounded by the pipeline's stage limits
                 async def _do_api_upload(_record):
                     return await self._client.upload_and_import(
-                        _upload_path, display_name, custom_metadata
+                        upload_body, display_name, custom_metadata
                     )
 
                 file_record = {"file_path": file_path}
@@ -1535,8 +1386,8 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
                 )
                 file_obj, operation = await subscribe_awaitable(upload_obs)
             finally:
-                cleanup_temp_file(temp_path)
-                cleanup_temp_file(identity_temp_path)
+                if source is not None:
+                    source.close()
 
             # Transition to processing: record Gemini file identifiers
             version = await self._state.transition_to_processing(
@@ -1585,7 +1436,7 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
         file_path, operation, version = operation_info
 
         try:
-            # Concurrency bounded by ops.merge at caller level
+            # Concurrency bounded by the pipeline's stage limits
             completed = await self._client.poll_operation(
                 operation, timeout=self._config.poll_timeout_seconds
             )
@@ -1686,69 +1537,78 @@ class FSMUploadOrchestrator(EnrichedUploadOrchestrator):
             len(files_to_reset),
         )
 
-        for file_info in files_to_reset:
-            file_path = file_info["file_path"]
-            version = file_info["version"]
-            gemini_store_doc_id = file_info.get("gemini_store_doc_id")
-            gemini_file_id = file_info.get("gemini_file_id")
+        store_db: Database | None = None
+        store_index: StoreDocumentIndex | None = None
+        try:
+            for file_info in files_to_reset:
+                file_path = file_info["file_path"]
+                version = file_info["version"]
+                gemini_store_doc_id = file_info.get("gemini_store_doc_id")
+                gemini_file_id = file_info.get("gemini_file_id")
 
-            try:
-                # Step 1: Write-ahead intent (OCC-guarded, no version increment)
-                await self._state.write_reset_intent(file_path, version)
-
-                # Step 2: Delete store document FIRST (SC3 order)
-                if gemini_store_doc_id:
-                    # Construct full resource name if DB stores only the suffix
-                    doc_resource_name = gemini_store_doc_id
-                    if not doc_resource_name.startswith("fileSearchStores/"):
-                        store_name = self._client.store_name or ""
-                        doc_resource_name = f"{store_name}/documents/{gemini_store_doc_id}"
-                    try:
-                        await self._client.delete_store_document(doc_resource_name)
-                    except Exception as exc:
-                        exc_str = str(exc)
-                        if "404" not in exc_str and "NOT_FOUND" not in exc_str:
-                            raise
-                    await self._state.update_intent_progress(file_path, 1)
-                else:
-                    # Legacy path: gemini_store_doc_id missing, try list+map lookup
+                try:
+                    # Step 1: Write-ahead intent (OCC-guarded, no version increment)
+                    await self._state.write_reset_intent(file_path, version)
+
+                    # Step 2: Delete store document FIRST (SC3 order)
+                    if gemini_store_doc_id:
+                        # Construct full resource name if DB stores only the suffix
+                        doc_resource_name = gemini_store_doc_id
+                        if not doc_resource_name.startswith("fileSearchStores/"):
+                            store_name = self._client.store_name or ""
+                            doc_resource_name = f"{store_name}/documents/{gemini_store_doc_id}"
+                        try:
+                            await self._client.delete_store_document(doc_resource_name)
+                        except Exception as exc:
+                            exc_str = str(exc)
+                            if "404" not in exc_str and "NOT_FOUND" not in exc_str:
+                                raise
+                        await self._state.update_intent_progress(file_path, 1)
+                    else:
+                        # Legacy path: gemini_store_doc_id missing, resolve via the index
+                        if gemini_file_id:
+                            if store_index is None:
+                                store_db = Database(self._state.db_path)
+                                store_index = StoreDocumentIndex(store_db, self._client)
+                            doc_name = await store_index.find(gemini_file_id)
+                            if doc_name:
+                                try:
+                                    await store_index.delete(doc_name)
+                                except Exception as exc:
+                                    exc_str = str(exc)
+                                    if "404" not in exc_str and "NOT_FOUND" not in exc_str:
+                                        raise
+                        await self._state.update_intent_progress(file_path, 1)
+
+                    # Step 3: Delete raw file SECOND
                     if gemini_file_id:
-                        doc_name = await self._client.find_store_document_name(gemini_file_id)
-                        if doc_name:
-                            try:
-                                await self._client.delete_store_document(doc_name)
-                            except Exception as exc:
-                                exc_str = str(exc)
-                                if "404" not in exc_str and "NOT_FOUND" not in exc_str:
-                                    raise
-                    await self._state.update_intent_progress(file_path, 1)
-
-                # Step 3: Delete raw file SECOND
-                if gemini_file_id:
-                    file_name = gemini_file_id
-                    if not file_name.startswith("files/"):
-                        file_name = f"files/{file_name}"
-                    try:
-                        await self._client.delete_file(file_name)
-                    except Exception as exc:
-                        exc_str = str(exc)
-                        if "404" not in exc_str and "NOT_FOUND" not in exc_str:
-                            raise
-                await self._state.update_intent_progress(file_path, 2)
-
-                # Step 4: Finalize (OCC-guarded, increments version)
-                success = await self._state.finalize_reset(file_path, version)
-                if success:
-                    self._reset_count += 1
-                    logger.info("Reset %s (store doc -> raw file -> finalize)", file_path)
-                else:
-                    logger.warning(
-                        "OCC conflict finalizing reset for %s (another writer?)",
-                        file_path,
-                    )
+                        file_name = gemini_file_id
+                        if not file_name.startswith("files/"):
+                            file_name = f"files/{file_name}"
+                        try:
+                            await self._client.delete_file(file_name)
+                        except Exception as exc:
+                            exc_str = str(exc)
+                            if "404" not in exc_str and "NOT_FOUND" not in exc_str:
+                                raise
+                    await self._state.update_intent_progress(file_path, 2)
+
+                    # Step 4: Finalize (OCC-guarded, increments version)
+                    success = await self._state.finalize_reset(file_path, version)
+                    if success:
+                        self._reset_count += 1
+                        logger.info("Reset %s (store doc -> raw file -> finalize)", file_path)
+                    else:
+                        logger.warning(
+                            "OCC conflict finalizing reset for %s (another writer?)",
+                            file_path,
+                        )
 
-            except OCCConflictError as exc:
-                logger.warning("OCC conflict resetting %s: %s", file_path, exc)
+                except OCCConflictError as exc:
+                    logger.warning("OCC conflict resetting %s: %s", file_path, exc)
 
-            except Exception as exc:
-                logger.error("Failed to reset %s: %s", file_path, exc)
+                except Exception as exc:
+                    logger.error("Failed to reset %s: %s", file_path, exc)
+        finally:
+            if store_db is not None:
+                store_db.close()
@@ -0,0 +1,360 @@
+"""Pipelined upload scheduler: upload stage -> queue -> polling stage.
+
+The batch orchestrators used to upload a whole batch, wait for every
+upload, poll every operation, then sleep a fixed cooldown before a retry
+pass. One slow file held up its batch, and the upload slots sat idle
+while polls ran.
+
+``UploadPipeline`` runs the two stages continuously instead:
+
+* A fixed pool of upload workers pulls files from a bounded queue. The
+  number actually in flight is capped by ``upload_limit()`` (re-read
+  before every start, so concurrency controller and circuit-breaker
+  decisions apply immediately), and starts are spaced by
+  ``launch_interval``.
+* Each operation returned by an upload goes onto a bounded poll queue,
+  where a separate worker pool polls it, capped the same way by
+  ``poll_limit()``. A full poll queue blocks the uploaders
+  (backpressure), so unpolled operations never pile up.
+* A file whose poll fails waits out ``retry_delay`` in its own task and
+  re-enters the upload queue once; the rest of the pipeline keeps moving.
+
+Per-stage queue depth and latency percentiles are collected in
+:class:`PipelineStats`.
+
+Usage::
+
+    pipeline = UploadPipeline(upload_file, poll_operation,
+                              upload_concurrency=7, poll_concurrency=20)
+    stats = await pipeline.run(pending_files)
+    for line in stats.report_lines():
+        logger.info(line)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_RETRY_DELAY = 30.0  # Per-file cooldown before a failed file is re-uploaded
+QUEUE_SLACK = 2  # Queue bound as a multiple of the consuming stage's concurrency
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class StageStats:
+    """Counters and timings for one pipeline stage."""
+
+    name: str
+    concurrency: int
+    completed: int = 0
+    failed: int = 0
+    latencies: list[float] = field(default_factory=list)  # Service time, seconds
+    waits: list[float] = field(default_factory=list)  # Time queued before service
+    depths: list[int] = field(default_factory=list)  # Queue depth seen at each enqueue
+    limits: list[int] = field(default_factory=list)  # In-flight cap seen at each start
+
+    @property
+    def max_depth(self) -> int:
+        return max(self.depths, default=0)
+
+    @property
+    def limit_range(self) -> tuple[int, int]:
+        """Smallest and largest in-flight cap applied during the run."""
+        if not self.limits:
+            return (self.concurrency, self.concurrency)
+        return (min(self.limits), max(self.limits))
+
+    def summary(self) -> str:
+        """One-line report: counts, queue depth and latency percentiles."""
+        lat = self.latencies
+        low, high = self.limit_range
+        return (
+            f"{self.name}: {self.completed} done, {self.failed} failed, "
+            f"concurrency {self.concurrency} (limit {low}-{high}), "
+            f"queue p50/max {percentile(self.depths, 50):.0f}/{self.max_depth}, "
+            f"wait p50 {percentile(self.waits, 50):.1f}s, "
+            f"latency p50/p95/p99 {percentile(lat, 50):.1f}/"
+            f"{percentile(lat, 95):.1f}/{percentile(lat, 99):.1f}s"
+        )
+
+
+@dataclass
+class PipelineStats:
+    """Result of one :meth:`UploadPipeline.run`."""
+
+    upload: StageStats
+    poll: StageStats
+    retried: int = 0
+    retry_succeeded: int = 0
+    not_started: int = 0
+    wall_seconds: float = 0.0
+
+    def report_lines(self) -> list[str]:
+        """Human-readable per-stage report for logs and the CLI."""
+        return [
+            self.upload.summary(),
+            self.poll.summary(),
+            f"retried {self.retried} ({self.retry_succeeded} recovered), "
+            f"not started {self.not_started}, wall {self.wall_seconds:.1f}s",
+        ]
+
+
+@dataclass
+class _Job(Generic[T]):
+    item: T
+    attempt: int = 0
+    enqueued_at: float = 0.0
+
+
+class SlotGate:
+    """In-flight counter capped by a limit that may change between starts.
+
+    Waiters re-read the limit whenever a slot is released; while at the
+    cap at least one slot is busy, so a raised limit is seen promptly.
+    """
+
+    def __init__(self, limit: Callable[[], int]) -> None:
+        self._limit = limit
+        self._in_flight = 0
+        self._current = 0
+        self._freed = asyncio.Condition()
+
+    async def acquire(self, stage: StageStats) -> None:
+        async with self._freed:
+            await self._freed.wait_for(self._has_room)
+            self._in_flight += 1
+            stage.limits.append(self._current)
+
+    def _has_room(self) -> bool:
+        self._current = max(1, self._limit())
+        return self._in_flight < self._current
+
+    async def release(self) -> None:
+        async with self._freed:
+            self._in_flight -= 1
+            self._freed.notify_all()
+
+
+class UploadPipeline(Generic[T]):
+    """Continuous two-stage upload/poll scheduler.
+
+    Args:
+        upload: ``upload(item)`` returns an operation handle to poll, or
+            None when the item was skipped or its failure already recorded.
+        poll: ``poll(operation)`` returns True once the import is indexed.
+        upload_concurrency: Upload workers (upper bound on uploads in flight).
+        poll_concurrency: Poll workers (upper bound on polls in flight).
+        upload_limit: Current cap on uploads in flight, re-read before each
+            start (defaults to ``upload_concurrency``).
+        poll_limit: Current cap on polls in flight, re-read before each
+            poll (defaults to ``poll_concurrency``).
+        launch_interval: Minimum seconds between consecutive upload starts,
+            or a callable re-read before each start.
+        retry: ``retry(item)`` prepares a failed item for its single retry,
+            returning the item to re-upload or None to give up. Without it,
+            failed polls are final.
+        retry_delay: Seconds a failed item waits before re-entering the
+            upload queue.
+        should_stop: Checked before feeding each item; once True, nothing
+            new starts and in-flight work drains.
+        on_outcome: Called once per item with True (indexed), False
+            (failed) or None (upload produced no operation) and the attempt
+            number (0 for the first try).
+    """
+
+    def __init__(
+        self,
+        upload: Callable[[T], Awaitable[Any]],
+        poll: Callable[[Any], Awaitable[bool]],
+        *,
+        upload_concurrency: int,
+        poll_concurrency: int,
+        upload_limit: Callable[[], int] | None = None,
+        poll_limit: Callable[[], int] | None = None,
+        launch_interval: float | Callable[[], float] = 0.0,
+        retry: Callable[[T], Awaitable[T | None]] | None = None,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        should_stop: Callable[[], bool] | None = None,
+        on_outcome: Callable[[T, bool | None, int], Awaitable[None]] | None = None,
+    ) -> None:
+        if upload_concurrency < 1 or poll_concurrency < 1:
+            raise ValueError("stage concurrency must be >= 1")
+        self._upload = upload
+        self._poll = poll
+        self._launch_interval = (
+            launch_interval if callable(launch_interval) else (lambda: launch_interval)
+        )
+        self._retry = retry
+        self._retry_delay = retry_delay
+        self._should_stop = should_stop or (lambda: False)
+        self._on_outcome = on_outcome
+
+        self.stats = PipelineStats(
+            upload=StageStats("upload", upload_concurrency),
+            poll=StageStats("poll", poll_concurrency),
+        )
+        self._upload_q: asyncio.Queue[_Job[T]] = asyncio.Queue(
+            maxsize=upload_concurrency * QUEUE_SLACK
+        )
+        self._poll_q: asyncio.Queue[tuple[_Job[T], Any]] = asyncio.Queue(
+            maxsize=poll_concurrency * QUEUE_SLACK
+        )
+        self._upload_gate = SlotGate(upload_limit or (lambda: upload_concurrency))
+        self._poll_gate = SlotGate(poll_limit or (lambda: poll_concurrency))
+        self._next_launch = 0.0
+        self._outstanding = 0
+        self._feeding = True
+        self._done = asyncio.Event()
+        self._retry_tasks: set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, items: Iterable[T]) -> PipelineStats:
+        """Push every item through upload and polling; return the stats."""
+        started = time.monotonic()
+        workers = [
+            asyncio.create_task(self._upload_worker())
+            for _ in range(self.stats.upload.concurrency)
+        ] + [
+            asyncio.create_task(self._poll_worker())
+            for _ in range(self.stats.poll.concurrency)
+        ]
+        try:
+            pending = list(items)
+            for i, item in enumerate(pending):
+                if self._should_stop():
+                    self.stats.not_started = len(pending) - i
+                    logger.warning(
+                        "Shutdown requested, %d files not started", self.stats.not_started
+                    )
+                    break
+                self._outstanding += 1
+                await self._enqueue_upload(_Job(item))
+            self._feeding = False
+            if self._outstanding == 0:
+                self._done.set()
+            await self._done.wait()
+        finally:
+            for task in (*workers, *self._retry_tasks):
+                task.cancel()
+            await asyncio.gather(*workers, *self._retry_tasks, return_exceptions=True)
+            self.stats.wall_seconds = time.monotonic() - started
+        return self.stats
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _enqueue_upload(self, job: _Job[T]) -> None:
+        job.enqueued_at = time.monotonic()
+        self.stats.upload.depths.append(self._upload_q.qsize())
+        await self._upload_q.put(job)
+
+    async def _acquire_upload_slot(self) -> None:
+        await self._upload_gate.acquire(self.stats.upload)
+        delay = self._next_launch - time.monotonic()
+        self._next_launch = max(self._next_launch, time.monotonic()) + self._launch_interval()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _upload_worker(self) -> None:
+        stage = self.stats.upload
+        while True:
+            job = await self._upload_q.get()
+            await self._acquire_upload_slot()
+            t0 = time.monotonic()
+            stage.waits.append(t0 - job.enqueued_at)
+            try:
+                operation = await self._upload(job.item)
+            except Exception as exc:
+                logger.error("Upload task exception: %s", exc)
+                operation = exc
+            finally:
+                stage.latencies.append(time.monotonic() - t0)
+                await self._upload_gate.release()
+
+            if isinstance(operation, Exception):
+                stage.failed += 1
+                await self._finish(job, False)
+            elif operation is None:
+                stage.completed += 1
+                await self._finish(job, None)
+            else:
+                stage.completed += 1
+                job.enqueued_at = time.monotonic()
+                self.stats.poll.depths.append(self._poll_q.qsize())
+                await self._poll_q.put((job, operation))
+
+    async def _poll_worker(self) -> None:
+        stage = self.stats.poll
+        while True:
+            job, operation = await self._poll_q.get()
+            await self._poll_gate.acquire(stage)
+            t0 = time.monotonic()
+            stage.waits.append(t0 - job.enqueued_at)
+            try:
+                ok = await self._poll(operation) is True
+            except Exception as exc:
+                logger.error("Poll task exception: %s", exc)
+                ok = False
+            finally:
+                stage.latencies.append(time.monotonic() - t0)
+                await self._poll_gate.release()
+
+            if ok:
+                stage.completed += 1
+                if job.attempt:
+                    self.stats.retry_succeeded += 1
+                await self._finish(job, True)
+            else:
+                stage.failed += 1
+                if self._retry is not None and job.attempt == 0 and not self._should_stop():
+                    task = asyncio.create_task(self._retry_later(job))
+                    self._retry_tasks.add(task)
+                    task.add_done_callback(self._retry_tasks.discard)
+                else:
+                    await self._finish(job, False)
+
+    async def _retry_later(self, job: _Job[T]) -> None:
+        """Cool down one failed item, then send it back to the upload stage."""
+        await asyncio.sleep(self._retry_delay)
+        try:
+            item = await self._retry(job.item) if not self._should_stop() else None
+        except Exception as exc:
+            logger.error("Retry preparation failed: %s", exc)
+            item = None
+        if item is None:
+            await self._finish(job, False)
+            return
+        self.stats.retried += 1
+        await self._enqueue_upload(_Job(item, attempt=job.attempt + 1))
+
+    async def _finish(self, job: _Job[T], outcome: bool | None) -> None:
+        if self._on_outcome is not None:
+            try:
+                await self._on_outcome(job.item, outcome, job.attempt)
+            except Exception as exc:
+                logger.error("Outcome callback failed: %s", exc)
+        self._outstanding -= 1
+        if not self._feeding and self._outstanding == 0:
+            self._done.set()
@@ -0,0 +1,274 @@
+"""Bulk upload preparation: identity headers and custom metadata (schema V21).
+
+Preparing one file for upload used to cost a query per input:
+``build_identity_header()`` issues four point SELECTs (files,
+file_primary_topics, file_metadata_ai, file_discrimination_phrases) and
+the caller then re-parses the same JSON for ``build_enriched_metadata()``.
+A 1,749-file re-upload made ~7,000 point queries plus repeated parsing.
+
+``UploadPreparer`` loads the inputs for a whole set of files with one
+set-based query per table (the paths are passed as a single JSON array
+and expanded with ``json_each``), then builds every file's identity
+header, ``[AI Analysis]`` header, custom metadata and upload hash in one
+pass. Results are cached in ``upload_prep_cache`` under a SHA-256 of
+their raw inputs: a file whose inputs are unchanged skips JSON parsing
+and header building on the next ``fsm-upload`` or sync, and any change to
+its metadata, AI metadata, topics, CRAD phrase, entities or content hash
+rebuilds it. Bump ``PREP_VERSION`` when the builders' output changes.
+
+Usage::
+
+    preparer = UploadPreparer(conn)
+    prepared = preparer.prepare(file_paths)
+    item = prepared[file_path]   # identity_header, ai_header, custom_metadata
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from objlib.upload.client import GeminiFileSearchClient
+from objlib.upload.content_preparer import build_ai_analysis_header
+from objlib.upload.header_builder import render_identity_header
+from objlib.upload.metadata_builder import build_enriched_metadata, compute_upload_hash
+
+logger = logging.getLogger(__name__)
+
+PREP_VERSION = 1  # Part of every input hash; bump to invalidate all entries
+
+_PATHS = "SELECT value FROM json_each(?)"
+
+
+@dataclass
+class PreparedUpload:
+    """Headers and metadata for one file, ready for upload."""
+
+    file_path: str
+    identity_header: str
+    ai_header: str | None
+    custom_metadata: list[dict[str, Any]]
+    upload_hash: str
+    aspect_count: int
+    cached: bool = False
+
+    @property
+    def headers(self) -> list[str]:
+        """Non-empty headers in upload order (identity first)."""
+        return [h for h in (self.identity_header, self.ai_header) if h]
+
+
+@dataclass
+class PreparationStats:
+    """Counters for one UploadPreparer.prepare() call."""
+
+    requested: int = 0
+    cached: int = 0
+    built: int = 0
+    missing: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Inputs:
+    filename: str
+    metadata_json: str | None
+    content_hash: str
+    ai_json: str | None = None
+    topics: list[str] = field(default_factory=list)
+    phrase: str | None = None
+    entities: list[str] | None = None
+
+    def digest(self, file_path: str) -> str:
+        raw = json.dumps([
+            PREP_VERSION, file_path, self.filename, self.metadata_json,
+            self.content_hash, self.ai_json, self.topics, self.phrase, self.entities,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class UploadPreparer:
+    """Set-based builder of upload headers and metadata with an input-hash cache.
+
+    Args:
+        conn: Open connection to library.db (the cache table lives there).
+        include_entities: Load entity names and always build enriched
+            metadata (the sync profile). When False, entities are not
+            loaded and files without AI metadata get simple Tier 1
+            metadata (the ``fsm-upload`` profile).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, include_entities: bool = False) -> None:
+        self._conn = conn
+        self._include_entities = include_entities
+        self.stats = PreparationStats()
+
+    def prepare(self, file_paths: Iterable[str]) -> dict[str, PreparedUpload]:
+        """Prepare every file in ``file_paths``; unknown paths are skipped.
+
+        Cache rows for rebuilt files are written (and committed) before
+        returning.
+        """
+        paths = list(dict.fromkeys(file_paths))
+        stats = PreparationStats(requested=len(paths))
+        self.stats = stats
+        if not paths:
+            return {}
+
+        inputs = self._load_inputs(paths)
+        stats.missing = [p for p in paths if p not in inputs]
+        cached = self._load_cache(paths)
+
+        prepared: dict[str, PreparedUpload] = {}
+        fresh: list[tuple[str, PreparedUpload]] = []
+        for path, item in inputs.items():
+            input_hash = item.digest(path)
+            hit = cached.get(path)
+            if hit is not None and hit[0] == input_hash:
+                prepared[path] = hit[1]
+                stats.cached += 1
+                continue
+            result = self._build(path, item)
+            prepared[path] = result
+            fresh.append((input_hash, result))
+        stats.built = len(fresh)
+
+        if fresh:
+            self._store(fresh)
+        logger.info(
+            "Upload preparation: %d files (%d cached, %d built, %d missing)",
+            stats.requested, stats.cached, stats.built, len(stats.missing),
+        )
+        return prepared
+
+    # ------------------------------------------------------------------
+    # Set-based loading
+    # ------------------------------------------------------------------
+
+    def _load_inputs(self, paths: list[str]) -> dict[str, _Inputs]:
+        conn = self._conn
+        key = json.dumps(paths)
+        inputs = {
+            row[0]: _Inputs(row[1], row[2], row[3] or "")
+            for row in conn.execute(
+                "SELECT file_path, filename, metadata_json, content_hash FROM files "
+                f"WHERE file_path IN ({_PATHS})",
+                (key,),
+            )
+        }
+        if not inputs:
+            return inputs
+
+        for path, ai_json in conn.execute(
+            "SELECT file_path, metadata_json FROM file_metadata_ai "
+            f"WHERE is_current = 1 AND file_path IN ({_PATHS})",
+            (key,),
+        ):
+            inputs[path].ai_json = ai_json
+
+        for path, tag in conn.execute(
+            "SELECT file_path, topic_tag FROM file_primary_topics "
+            f"WHERE file_path IN ({_PATHS}) ORDER BY file_path, topic_tag",
+            (key,),
+        ):
+            inputs[path].topics.append(tag)
+
+        by_filename: dict[str, list[_Inputs]] = defaultdict(list)
+        for item in inputs.values():
+            by_filename[item.filename].append(item)
+        for filename, phrase in conn.execute(
+            "SELECT filename, phrase FROM file_discrimination_phrases "
+            f"WHERE validation_status = 'validated' AND filename IN ({_PATHS})",
+            (json.dumps(list(by_filename)),),
+        ):
+            for item in by_filename[filename]:
+                item.phrase = phrase or None
+
+        if self._include_entities:
+            for item in inputs.values():
+                item.entities = []
+            for path, name in conn.execute(
+                "SELECT te.transcript_id, p.canonical_name "
+                "FROM transcript_entity te JOIN person p ON te.person_id = p.person_id "
+                f"WHERE te.transcript_id IN ({_PATHS}) "
+                "ORDER BY te.transcript_id, te.mention_count DESC",
+                (key,),
+            ):
+                inputs[path].entities.append(name)
+        return inputs
+
+    def _load_cache(self, paths: list[str]) -> dict[str, tuple[str, PreparedUpload]]:
+        rows = self._conn.execute(
+            "SELECT file_path, input_hash, identity_header, ai_header, "
+            "custom_metadata_json, upload_hash, aspect_count FROM upload_prep_cache "
+            f"WHERE file_path IN ({_PATHS})",
+            (json.dumps(paths),),
+        )
+        return {
+            row[0]: (
+                row[1],
+                PreparedUpload(
+                    row[0], row[2], row[3], json.loads(row[4]), row[5], row[6], cached=True
+                ),
+            )
+            for row in rows
+        }
+
+    # ------------------------------------------------------------------
+    # Building and storing
+    # ------------------------------------------------------------------
+
+    def _build(self, path: str, item: _Inputs) -> PreparedUpload:
+        metadata: dict[str, Any] = {}
+        if item.metadata_json:
+            try:
+                metadata = json.loads(item.metadata_json)
+            except (json.JSONDecodeError, TypeError):
+                logger.warning("Upload preparation: invalid metadata_json for %s", item.filename)
+
+        ai_metadata: dict[str, Any] = {}
+        if item.ai_json:
+            try:
+                ai_metadata = json.loads(item.ai_json)
+            except (json.JSONDecodeError, TypeError):
+                logger.warning("Upload preparation: invalid AI metadata for %s", item.filename)
+        aspects = ai_metadata.get("topic_aspects", []) or []
+        entities = item.entities or []
+
+        if item.ai_json or self._include_entities:
+            custom_metadata = build_enriched_metadata(metadata, ai_metadata, entities)
+        else:
+            custom_metadata = GeminiFileSearchClient.build_custom_metadata(metadata)
+
+        return PreparedUpload(
+            file_path=path,
+            identity_header=render_identity_header(
+                path, item.filename, metadata, item.topics, aspects, item.phrase
+            ),
+            ai_header=build_ai_analysis_header(ai_metadata) if ai_metadata else None,
+            custom_metadata=custom_metadata,
+            upload_hash=compute_upload_hash(metadata, ai_metadata, entities, item.content_hash),
+            aspect_count=len(aspects),
+        )
+
+    def _store(self, fresh: list[tuple[str, PreparedUpload]]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO upload_prep_cache (file_path, input_hash, "
+                "identity_header, ai_header, custom_metadata_json, upload_hash, "
+                "aspect_count, built_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        p.file_path, input_hash, p.identity_header, p.ai_header,
+                        json.dumps(p.custom_metadata), p.upload_hash, p.aspect_count, now,
+                    )
+                    for input_hash, p in fresh
+                ],
+            )
@@ -76,8 +76,9 @@ class AdaptiveRateLimiter:
     * **OPEN** -- multiplies interval by 3x.
     * **HALF_OPEN** -- multiplies interval by 1.5x.
 
-    Also tracks observed rate limit headers for diagnostics (observation
-    only; does not enforce).
+    Also tracks observed rate limit headers. They are not enforced here;
+    :class:`~objlib.upload.concurrency.AIMDConcurrencyController` reads
+    :attr:`observed_remaining` to hold or shrink concurrency.
     """
 
     def __init__(
@@ -113,7 +114,8 @@ class AdaptiveRateLimiter:
     def observe_headers(self, headers: dict[str, str] | None) -> None:
         """Record observed rate limit headers from an API response.
 
-        This is observation-only -- it does not enforce limits.
+        Called by the client for every response (and API error) that
+        carries headers; it does not enforce limits itself.
 
         Args:
             headers: Response headers dict (or ``None``).
@@ -8,6 +8,9 @@ Handles three recovery scenarios per locked decision #9 (Crash Recovery):
    polled to completion.
 3. **Expiration deadlines** -- Files approaching or past the 48-hour TTL
    (locked decision #1), which must be reset for re-upload.
+
+These per-file steps are the fallback for ``fsm-upload`` startup, which
+normally runs them set-based via :mod:`objlib.upload.bulk_recovery`.
 """
 
 from __future__ import annotations
@@ -7,19 +7,187 @@ updated AFTER every API response.
 
 Each write method commits immediately -- no transactions are held across
 ``await`` boundaries (per Pitfall 5: aiosqlite connection sharing).
+
+FSM transitions (``transition_to_*``) are group-committed: concurrent
+callers' transitions are queued, and each flush applies all queued
+transitions of one kind as a single ``UPDATE ... FROM (VALUES ...)
+RETURNING`` statement plus one commit. ``RETURNING`` reports which rows
+passed their OCC guard, so each awaiting caller still gets its own
+:class:`OCCConflictError`, and no caller resumes before its row is
+committed -- the write-ahead guarantee for crash recovery is unchanged.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import sqlite3
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 import aiosqlite
 
+from objlib.upload.dedup import NOT_SHARED_ALIAS
 from objlib.upload.exceptions import OCCConflictError
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_GROUP_COMMIT_WINDOW = 0.0  # Seconds a flush waits for more transitions
+DEFAULT_GROUP_COMMIT_MAX_ROWS = 64  # Flush early once this many are queued
+
+# UPDATE ... FROM needs SQLite 3.33, RETURNING 3.35; older builds commit per row.
+_GROUP_COMMIT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Per transition kind: SET clause and extra guard. VALUES rows are
+# (file_path, expected_version, now, *extra) -> v.column1, v.column2, ...
+_TRANSITIONS: dict[str, tuple[str, str]] = {
+    "uploading": (
+        "gemini_state = 'uploading', gemini_state_updated_at = v.column3, "
+        "version = v.column2 + 1",
+        "AND files.gemini_state = 'untracked'",
+    ),
+    "processing": (
+        "gemini_state = 'processing', gemini_file_id = v.column4, "
+        "gemini_file_uri = v.column5, upload_timestamp = v.column3, "
+        "gemini_state_updated_at = v.column3, version = v.column2 + 1",
+        "AND files.gemini_state = 'uploading'",
+    ),
+    "indexed": (
+        "gemini_state = 'indexed', gemini_store_doc_id = v.column4, "
+        "gemini_state_updated_at = v.column3, version = v.column2 + 1",
+        "AND files.gemini_state = 'processing'",
+    ),
+    "failed": (
+        "gemini_state = 'failed', error_message = v.column4, "
+        "gemini_state_updated_at = v.column3, version = v.column2 + 1",
+        "",
+    ),
+}
+
+
+@dataclass
+class _Transition:
+    kind: str
+    row: tuple  # (file_path, expected_version, now, *extra)
+    future: asyncio.Future[bool] = field(repr=False)
+
+    @property
+    def file_path(self) -> str:
+        return self.row[0]
+
+
+class _GroupCommitter:
+    """Queue FSM transitions and apply them in per-kind batched statements.
+
+    The writer task wakes on the first queued transition, waits up to
+    ``window`` seconds (or until ``max_rows`` are queued; with the default
+    of 0 it only yields to the event loop once), then applies the queue.
+    Transitions arriving while a flush is in flight form the next one, so
+    batches grow with concurrency and a lone caller pays no extra delay.
+    """
+
+    def __init__(self, db: aiosqlite.Connection, window: float, max_rows: int) -> None:
+        self._db = db
+        self._window = window
+        self._max_rows = max_rows
+        self._pending: list[_Transition] = []
+        self._wake = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.flushes = 0
+        self.rows = 0
+
+    def submit(self, kind: str, row: tuple) -> asyncio.Future[bool]:
+        """Queue one transition; the future resolves to False on OCC conflict."""
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._pending.append(_Transition(kind, row, future))
+        self._wake.set()
+        if len(self._pending) >= self._max_rows:
+            self._full.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def close(self) -> None:
+        """Let the writer apply anything still queued, then stop it."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    def _take(self) -> list[_Transition]:
+        batch = self._pending[: self._max_rows]
+        del self._pending[: self._max_rows]
+        if not self._pending:
+            self._wake.clear()
+        if len(self._pending) < self._max_rows:
+            self._full.clear()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            if self._closing and not self._pending:
+                return
+            if self._window > 0 and not self._full.is_set() and not self._closing:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self._window)
+                except TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0)
+            await self._flush(self._take())
+
+    async def _flush(self, batch: list[_Transition]) -> None:
+        groups: dict[str, list[_Transition]] = {}
+        seen: set[str] = set()
+        for transition in batch:
+            # Two transitions for one file cannot share a statement (only one
+            # would match); the later one waits for the next flush.
+            if transition.file_path in seen:
+                self._pending.append(transition)
+                self._wake.set()
+                continue
+            seen.add(transition.file_path)
+            groups.setdefault(transition.kind, []).append(transition)
+
+        for kind, transitions in groups.items():
+            try:
+                applied = await self.apply(self._db, kind, [t.row for t in transitions])
+            except Exception as exc:
+                for t in transitions:
+                    if not t.future.done():
+                        t.future.set_exception(exc)
+                continue
+            for t in transitions:
+                if not t.future.done():
+                    t.future.set_result(t.file_path in applied)
+            self.flushes += 1
+            self.rows += len(transitions)
+
+    @staticmethod
+    async def apply(db: aiosqlite.Connection, kind: str, rows: list[tuple]) -> set[str]:
+        """Run one batched transition statement and commit; return updated paths."""
+        assignments, guard = _TRANSITIONS[kind]
+        width = len(rows[0])
+        values = ", ".join(["(" + ", ".join("?" * width) + ")"] * len(rows))
+        # execute_fetchall steps the statement to completion in one hop, so
+        # no other coroutine can try to commit while RETURNING is mid-way.
+        returned = await db.execute_fetchall(
+            f"""UPDATE files SET {assignments}
+                FROM (VALUES {values}) AS v
+                WHERE files.file_path = v.column1
+                  AND files.version = v.column2
+                  {guard}
+                RETURNING files.file_path""",
+            [value for row in rows for value in row],
+        )
+        await db.commit()
+        return {row[0] for row in returned}
+
 
 class AsyncUploadStateManager:
     """Async SQLite state manager for upload intent/result tracking.
@@ -29,11 +197,29 @@ class AsyncUploadStateManager:
         async with AsyncUploadStateManager("data/library.db") as state:
             pending = await state.get_pending_files(limit=200)
             await state.record_upload_intent(pending[0]["file_path"])
+
+    Args:
+        db_path: SQLite database path.
+        group_commit: Batch concurrent FSM transitions into shared
+            statements and commits (see module docstring). When False, or
+            on SQLite older than 3.35, each transition commits on its own.
+        group_commit_window: Seconds a flush waits to gather transitions.
+        group_commit_max_rows: Queued transitions that trigger an early flush.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        group_commit: bool = True,
+        group_commit_window: float = DEFAULT_GROUP_COMMIT_WINDOW,
+        group_commit_max_rows: int = DEFAULT_GROUP_COMMIT_MAX_ROWS,
+    ) -> None:
         self.db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        self._group_commit = group_commit and _GROUP_COMMIT_SUPPORTED
+        self._group_commit_window = group_commit_window
+        self._group_commit_max_rows = group_commit_max_rows
+        self._committer: _GroupCommitter | None = None
 
     # ------------------------------------------------------------------
     # Connection lifecycle
@@ -46,9 +232,16 @@ class AsyncUploadStateManager:
         await self._db.execute("PRAGMA journal_mode=WAL")
         await self._db.execute("PRAGMA synchronous=NORMAL")
         await self._db.execute("PRAGMA foreign_keys=ON")
+        if self._group_commit:
+            self._committer = _GroupCommitter(
+                self._db, self._group_commit_window, self._group_commit_max_rows
+            )
 
     async def close(self) -> None:
-        """Close the connection if open."""
+        """Apply queued transitions, then close the connection if open."""
+        if self._committer is not None:
+            await self._committer.close()
+            self._committer = None
         if self._db is not None:
             await self._db.close()
             self._db = None
@@ -78,6 +271,39 @@ class AsyncUploadStateManager:
     def _now_iso() -> str:
         return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
 
+    async def _transition(
+        self, kind: str, file_path: str, expected_version: int, *extra: str
+    ) -> int:
+        """Apply one OCC-guarded FSM transition; return the new version."""
+        db = self._ensure_connected()
+        row = (file_path, expected_version, self._now_iso(), *extra)
+        if self._committer is not None:
+            applied = await self._committer.submit(kind, row)
+        else:
+            applied = await self._transition_single(db, kind, row)
+        if not applied:
+            raise OCCConflictError(
+                f"Version conflict on {file_path}: expected version {expected_version}"
+            )
+        new_version = expected_version + 1
+        logger.debug(
+            "Transitioned %s to %s (v%d->v%d)", file_path, kind, expected_version, new_version
+        )
+        return new_version
+
+    @staticmethod
+    async def _transition_single(db: aiosqlite.Connection, kind: str, row: tuple) -> bool:
+        """Apply one transition with its own commit (group commit off)."""
+        assignments, guard = _TRANSITIONS[kind]
+        # v.columnN -> :cN, bound from the same row tuple.
+        cursor = await db.execute(
+            f"""UPDATE files SET {assignments.replace("v.column", ":c")}
+                WHERE files.file_path = :c1 AND files.version = :c2 {guard}""",
+            {f"c{i}": value for i, value in enumerate(row, 1)},
+        )
+        await db.commit()
+        return cursor.rowcount > 0
+
     # ------------------------------------------------------------------
     # Read queries
     # ------------------------------------------------------------------
@@ -96,10 +322,11 @@ class AsyncUploadStateManager:
         """
         db = self._ensure_connected()
         cursor = await db.execute(
-            """SELECT file_path, content_hash, filename, file_size, metadata_json
-               FROM files
+            f"""SELECT file_path, content_hash, filename, file_size, metadata_json
+               FROM files f
                WHERE gemini_state = 'untracked'
                  AND (filename LIKE '%.txt' OR filename LIKE '%.md')
+                 AND {NOT_SHARED_ALIAS}
                ORDER BY file_path
                LIMIT ?""",
             (limit,),
@@ -402,6 +629,7 @@ class AsyncUploadStateManager:
                 WHERE (f.filename LIKE '%.txt' OR f.filename LIKE '%.md')
                   AND f.entity_extraction_status = 'entities_done'
                   AND f.gemini_state = 'untracked'
+                  AND {NOT_SHARED_ALIAS}
                   {status_clause}
                 ORDER BY f.file_path
                 LIMIT ?""",
@@ -507,7 +735,8 @@ class AsyncUploadStateManager:
     # Each method:
     # - Dual-writes gemini_state + status (backward compat per Q1 decision)
     # - Uses OCC guard: WHERE version = ? (raises OCCConflictError on mismatch)
-    # - Commits immediately (no held transactions across await boundaries)
+    # - Returns only after its row is committed (group-committed with
+    #   concurrent transitions; no held transactions across await boundaries)
     # - Returns the new version (expected_version + 1)
 
     async def transition_to_uploading(
@@ -525,28 +754,7 @@ class AsyncUploadStateManager:
         Raises:
             OCCConflictError: If the version has changed since read.
         """
-        db = self._ensure_connected()
-        now = self._now_iso()
-        new_version = expected_version + 1
-        cursor = await db.execute(
-            """UPDATE files
-               SET gemini_state = 'uploading',
-                   gemini_state_updated_at = ?,
-                   version = ?
-               WHERE file_path = ?
-                 AND gemini_state = 'untracked'
-                 AND version = ?""",
-            (now, new_version, file_path, expected_version),
-        )
-        await db.commit()
-        if cursor.rowcount == 0:
-            raise OCCConflictError(
-                f"Version conflict on {file_path}: expected version {expected_version}"
-            )
-        logger.debug(
-            "Transitioned %s to uploading (v%d->v%d)", file_path, expected_version, new_version
-        )
-        return new_version
+        return await self._transition("uploading", file_path, expected_version)
 
     async def transition_to_processing(
         self,
@@ -571,31 +779,9 @@ class AsyncUploadStateManager:
         Raises:
             OCCConflictError: If the version has changed since read.
         """
-        db = self._ensure_connected()
-        now = self._now_iso()
-        new_version = expected_version + 1
-        cursor = await db.execute(
-            """UPDATE files
-               SET gemini_state = 'processing',
-                   gemini_file_id = ?,
-                   gemini_file_uri = ?,
-                   upload_timestamp = ?,
-                   gemini_state_updated_at = ?,
-                   version = ?
-               WHERE file_path = ?
-                 AND gemini_state = 'uploading'
-                 AND version = ?""",
-            (gemini_file_id, gemini_file_uri, now, now, new_version, file_path, expected_version),
+        return await self._transition(
+            "processing", file_path, expected_version, gemini_file_id, gemini_file_uri
         )
-        await db.commit()
-        if cursor.rowcount == 0:
-            raise OCCConflictError(
-                f"Version conflict on {file_path}: expected version {expected_version}"
-            )
-        logger.debug(
-            "Transitioned %s to processing (v%d->v%d)", file_path, expected_version, new_version
-        )
-        return new_version
 
     async def transition_to_indexed(
         self,
@@ -618,29 +804,9 @@ class AsyncUploadStateManager:
         Raises:
             OCCConflictError: If the version has changed since read.
         """
-        db = self._ensure_connected()
-        now = self._now_iso()
-        new_version = expected_version + 1
-        cursor = await db.execute(
-            """UPDATE files
-               SET gemini_state = 'indexed',
-                   gemini_store_doc_id = ?,
-                   gemini_state_updated_at = ?,
-                   version = ?
-               WHERE file_path = ?
-                 AND gemini_state = 'processing'
-                 AND version = ?""",
-            (gemini_store_doc_id, now, new_version, file_path, expected_version),
-        )
-        await db.commit()
-        if cursor.rowcount == 0:
-            raise OCCConflictError(
-                f"Version conflict on {file_path}: expected version {expected_version}"
-            )
-        logger.debug(
-            "Transitioned %s to indexed (v%d->v%d)", file_path, expected_version, new_version
+        return await self._transition(
+            "indexed", file_path, expected_version, gemini_store_doc_id
         )
-        return new_version
 
     async def transition_to_failed(
         self,
@@ -664,41 +830,22 @@ class AsyncUploadStateManager:
         Raises:
             OCCConflictError: If the version has changed since read.
         """
-        db = self._ensure_connected()
-        now = self._now_iso()
-        new_version = expected_version + 1
-        cursor = await db.execute(
-            """UPDATE files
-               SET gemini_state = 'failed',
-                   error_message = ?,
-                   gemini_state_updated_at = ?,
-                   version = ?
-               WHERE file_path = ?
-                 AND version = ?""",
-            (error_message, now, new_version, file_path, expected_version),
-        )
-        await db.commit()
-        if cursor.rowcount == 0:
-            raise OCCConflictError(
-                f"Version conflict on {file_path}: expected version {expected_version}"
-            )
-        logger.debug(
-            "Transitioned %s to failed (v%d->v%d)", file_path, expected_version, new_version
-        )
-        return new_version
+        return await self._transition("failed", file_path, expected_version, error_message)
 
     # ------------------------------------------------------------------
     # FSM read helpers (Phase 12)
     # ------------------------------------------------------------------
 
-    async def get_fsm_pending_files(self, limit: int = 50) -> list[dict]:
+    async def get_fsm_pending_files(self, limit: int = 50, after: str = "") -> list[dict]:
         """Return files in untracked gemini_state ready for FSM upload.
 
         This is the FSM-path equivalent of ``get_pending_files()`` (which
-        uses the legacy ``status='pending'`` column).
+        uses the legacy ``status='pending'`` column). Live dedup aliases
+        (``upload/dedup.py``) share an indexed document and are skipped.
 
         Args:
             limit: Maximum rows to return.
+            after: Only paths sorting after this one (keyset paging).
 
         Returns:
             List of dicts with file_path, content_hash, filename,
@@ -707,20 +854,22 @@ class AsyncUploadStateManager:
         """
         db = self._ensure_connected()
         cursor = await db.execute(
-            """SELECT f.file_path, f.content_hash, f.filename, f.file_size,
+            f"""SELECT f.file_path, f.content_hash, f.filename, f.file_size,
                       f.metadata_json, f.version, f.gemini_state,
                       fma.metadata_json AS ai_metadata_json
                FROM files f
                LEFT JOIN file_metadata_ai fma
                        ON fma.file_path = f.file_path AND fma.is_current = 1
                WHERE f.gemini_state = 'untracked'
+                 AND f.file_path > ?
                  AND (f.filename LIKE '%.txt' OR f.filename LIKE '%.md')
                  AND f.ai_metadata_status = 'approved'
                  AND (SELECT COUNT(*) FROM file_primary_topics pt
                       WHERE pt.file_path = f.file_path) = 8
+                 AND {NOT_SHARED_ALIAS}
                ORDER BY f.file_path
                LIMIT ?""",
-            (limit,),
+            (after, limit),
         )
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
@@ -0,0 +1,211 @@
+"""Local index of File Search store documents (SQLite, schema V20).
+
+The Gemini API has no lookup from a file ID to the store document that
+was imported from it: the only way to find one is to page through
+``documents.list`` for the whole store. Looking up one document at a time
+(orphan cleanup, missing-file pruning, replacement of modified files)
+therefore cost a full listing per file.
+
+``StoreDocumentIndex`` materializes one paged listing into the
+``store_documents`` table, keyed by the Gemini file ID (the document's
+``display_name``, set at import time) and by the document ID suffix (the
+value kept in ``files.gemini_store_doc_id``). Lookups are then SQLite
+queries:
+
+- The listing is reused across runs for ``max_age_seconds``. A refresh
+  applies only the difference (new rows inserted, vanished rows removed).
+- Deletions made through :meth:`StoreDocumentIndex.delete` drop their row
+  immediately, so the index stays correct without relisting.
+- A miss against a listing taken by an earlier run triggers one relisting
+  (documents may have been imported since), so each run lists the store at
+  most once.
+- When several documents exist for one file ID (duplicate imports), the one
+  recorded in ``files.gemini_store_doc_id`` wins.
+
+Usage::
+
+    index = StoreDocumentIndex(db, client)
+    doc_name = await index.find("files/abc123")
+    if doc_name:
+        await index.delete(doc_name)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from objlib.database import Database
+from objlib.upload.client import GeminiFileSearchClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE_SECONDS = 3600.0
+
+_LISTED_AT_KEY = "store_index_listed_at:{store}"
+
+
+def file_id_suffix(gemini_file_id: str) -> str:
+    """Bare file ID: ``'files/abc123'`` and ``'abc123'`` both give ``'abc123'``."""
+    return gemini_file_id.rsplit("/", 1)[-1]
+
+
+@dataclass
+class StoreIndexRefresh:
+    """Counters for one StoreDocumentIndex.refresh() run."""
+
+    listed: int = 0
+    added: int = 0
+    removed: int = 0
+
+
+class StoreDocumentIndex:
+    """File ID -> store document name map backed by the ``store_documents`` table.
+
+    Args:
+        db: Open database (the table lives next to ``files``).
+        client: Upload client whose ``store_name`` identifies the store.
+        max_age_seconds: How long a listing from an earlier run is trusted
+            before the first lookup relists the store.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        client: GeminiFileSearchClient,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        self._db = db
+        self._client = client
+        self.max_age_seconds = max_age_seconds
+        self._listed_this_run = False
+        self._relist_lock = asyncio.Lock()  # Concurrent finds share one relist
+
+    @property
+    def store_name(self) -> str:
+        store = self._client.store_name
+        if not store:
+            raise RuntimeError("store_name not set -- call get_or_create_store() first")
+        return store
+
+    def _listed_at(self) -> float | None:
+        value = self._db.get_library_config(_LISTED_AT_KEY.format(store=self.store_name))
+        return float(value) if value else None
+
+    async def refresh(self) -> StoreIndexRefresh:
+        """List the store once and apply the difference to the table."""
+        store = self.store_name
+        documents = await self._client.list_store_documents(store)
+        now = time.time()
+
+        listed: dict[str, tuple[str, str | None, str | None, str | None]] = {}
+        for doc in documents:
+            name = getattr(doc, "name", None)
+            if not name:
+                continue
+            display_name = getattr(doc, "display_name", None) or None
+            state = getattr(doc, "state", None)
+            listed[name] = (
+                name.rsplit("/", 1)[-1],
+                display_name,
+                file_id_suffix(display_name) if display_name else None,
+                getattr(state, "name", None) or (str(state) if state is not None else None),
+            )
+
+        conn = self._db.conn
+        with conn:
+            known = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT document_name FROM store_documents WHERE store_name = ?", (store,)
+                )
+            }
+            stale = known - listed.keys()
+            conn.executemany(
+                "DELETE FROM store_documents WHERE document_name = ?",
+                [(name,) for name in stale],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO store_documents "
+                "(document_name, store_name, doc_id, display_name, file_id, state, listed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(name, store, *fields, now) for name, fields in listed.items()],
+            )
+        self._db.set_library_config(_LISTED_AT_KEY.format(store=store), repr(now))
+        self._listed_this_run = True
+
+        stats = StoreIndexRefresh(
+            listed=len(listed), added=len(listed.keys() - known), removed=len(stale)
+        )
+        logger.info(
+            "Store index for %s: %d documents (%d added, %d removed)",
+            store, stats.listed, stats.added, stats.removed,
+        )
+        return stats
+
+    async def ensure_fresh(self) -> None:
+        """Relist unless a listing younger than ``max_age_seconds`` exists."""
+        if self._listed_this_run:
+            return
+        listed_at = self._listed_at()
+        if listed_at is None or time.time() - listed_at > self.max_age_seconds:
+            await self.refresh()
+
+    def lookup(self, gemini_file_id: str) -> str | None:
+        """Resolve a file ID from the table alone (no API call)."""
+        suffix = file_id_suffix(gemini_file_id)
+        if not suffix:
+            return None
+        rows = self._db.conn.execute(
+            "SELECT document_name, doc_id FROM store_documents "
+            "WHERE store_name = ? AND (file_id = ? OR doc_id = ? OR doc_id GLOB ?) "
+            "ORDER BY file_id = ? DESC, document_name",
+            (self.store_name, suffix, suffix, f"{suffix}-*", suffix),
+        ).fetchall()
+        if not rows:
+            return None
+        if len(rows) > 1:
+            recorded = {
+                row[0]
+                for row in self._db.conn.execute(
+                    "SELECT gemini_store_doc_id FROM files "
+                    "WHERE gemini_file_id IN (?, ?) AND gemini_store_doc_id IS NOT NULL",
+                    (suffix, f"files/{suffix}"),
+                )
+            }
+            for document_name, doc_id in rows:
+                if doc_id in recorded:
+                    return document_name
+        return rows[0][0]
+
+    async def find(self, gemini_file_id: str) -> str | None:
+        """Return the store document name for a file ID, or None.
+
+        Relists at most once per index instance: on first use when the
+        stored listing is too old, or on a miss against an older listing.
+        """
+        async with self._relist_lock:
+            await self.ensure_fresh()
+            doc_name = self.lookup(gemini_file_id)
+            if doc_name is None and not self._listed_this_run:
+                await self.refresh()
+                doc_name = self.lookup(gemini_file_id)
+        if doc_name is None:
+            logger.info("No store document for file %s in %s", gemini_file_id, self.store_name)
+        return doc_name
+
+    def forget(self, document_name: str) -> None:
+        """Drop a document that is known to be gone from the store."""
+        with self._db.conn:
+            self._db.conn.execute(
+                "DELETE FROM store_documents WHERE document_name = ?", (document_name,)
+            )
+
+    async def delete(self, document_name: str) -> bool:
+        """Delete a store document and drop its row on success (404 included)."""
+        deleted = await self._client.delete_store_document(document_name)
+        if deleted:
+            self.forget(document_name)
+        return deleted
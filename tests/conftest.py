@@ -17,6 +17,7 @@ from objlib.config import ScannerConfig
 from objlib.database import Database
 from objlib.metadata import MetadataExtractor
 from objlib.models import FileRecord, MetadataQuality
+from objlib.services.pool import close_all_pools
 
 
 @pytest.fixture
@@ -28,6 +29,14 @@ def tmp_db(tmp_path: Path) -> Database:
     db.close()
 
 
+@pytest.fixture
+def reset_pools():
+    """Start and end the test with no process-wide connection pools."""
+    close_all_pools()
+    yield
+    close_all_pools()
+
+
 @pytest.fixture
 def tmp_library(tmp_path: Path) -> Path:
     """Create a temporary directory tree mimicking the real Objectivism Library.
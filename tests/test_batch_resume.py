@@ -0,0 +1,116 @@
+"""Tests for streamed, chunked apply of Mistral batch results (schema V23).
+
+The batch client is a MagicMock whose ``iter_results`` yields results and
+can fail part-way, standing in for an interrupted download. Validation is
+replaced by a stub that always passes. Skipped where
+``objlib.extraction.batch_orchestrator`` cannot be imported.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import FileRecord
+
+batch_orchestrator = pytest.importorskip(
+    "objlib.extraction.batch_orchestrator", exc_type=ImportError
+)
+from objlib.extraction.batch_client import BatchResult  # noqa: E402
+
+FILES = 7
+
+
+def _result(custom_id: str) -> BatchResult:
+    if custom_id == "3":
+        return BatchResult(custom_id=custom_id, response=None, error={"message": "boom"})
+    content = json.dumps({"primary_topics": ["ethics"], "confidence_score": 0.9})
+    return BatchResult(custom_id=custom_id, error=None,
+                       response={"choices": [{"message": {"content": content}}]})
+
+
+def _client(fail_after: int | None = None) -> MagicMock:
+    async def iter_results(batch_id):
+        for i in range(FILES):
+            if fail_after is not None and i == fail_after:
+                raise ConnectionError("download interrupted")
+            yield _result(str(i))
+
+    client = MagicMock()
+    client.get_status = AsyncMock(return_value={
+        "status": "SUCCESS", "succeeded_requests": FILES, "total_requests": FILES,
+    })
+    client.iter_results = iter_results
+    return client
+
+
+@pytest.fixture
+def seeded(tmp_db: Database, tmp_path: Path, monkeypatch) -> dict[str, str]:
+    monkeypatch.setattr(batch_orchestrator, "validate_extraction",
+                        lambda *a, **kw: SimpleNamespace(hard_failures=[], soft_warnings=[]))
+    monkeypatch.setattr(batch_orchestrator, "calculate_confidence", lambda **kw: 0.9)
+    file_map = {}
+    for i in range(FILES):
+        path = tmp_path / f"t{i}.txt"
+        path.write_text(f"transcript {i}")
+        tmp_db.upsert_file(FileRecord(file_path=str(path), content_hash=str(i),
+                                      filename=path.name, file_size=12))
+        file_map[str(i)] = str(path)
+    return file_map
+
+
+async def test_interrupted_apply_resumes_after_last_committed_chunk(tmp_db: Database, seeded):
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, _client(fail_after=5), apply_chunk_size=2
+    )
+    orchestrator._record_job("batch-1", seeded)
+    interrupted = await orchestrator.resume_batch_extraction("batch-1", poll_interval=0.01)
+    assert interrupted["shards"][0]["status"] == "interrupted"
+    assert "--resume batch-1" in interrupted["shards"][0]["error"]
+
+    # Lines 1-4 were committed in two chunks; line 5 was pending and lost
+    cursor = tmp_db.conn.execute(
+        "SELECT applied_lines, last_custom_id, succeeded, failed FROM extraction_batch_jobs"
+    ).fetchone()
+    assert tuple(cursor) == (4, "3", 3, 1)
+
+    orchestrator._client = _client()
+    summary = await orchestrator.resume_batch_extraction("batch-1", poll_interval=0.01)
+
+    assert summary["resumed_lines"] == 4
+    assert (summary["succeeded"], summary["failed"]) == (3, 0)
+    rows = dict(tmp_db.conn.execute(
+        "SELECT file_path, COUNT(*) FROM file_metadata_ai GROUP BY file_path"
+    ).fetchall())
+    assert len(rows) == FILES - 1 and set(rows.values()) == {1}
+    status = tmp_db.conn.execute(
+        "SELECT ai_metadata_status FROM files WHERE file_path = ?", (seeded["3"],)
+    ).fetchone()[0]
+    assert status == "failed_validation"
+    done = tmp_db.conn.execute(
+        "SELECT applied_lines, completed_at IS NOT NULL FROM extraction_batch_jobs"
+    ).fetchone()
+    assert tuple(done) == (FILES, 1)
+
+
+async def test_cursor_mismatch_is_refused(tmp_db: Database, seeded):
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(tmp_db, _client())
+    orchestrator._record_job("batch-1", seeded)
+    tmp_db.conn.execute(
+        "UPDATE extraction_batch_jobs SET applied_lines = 2, last_custom_id = '5'"
+    )
+    tmp_db.conn.commit()
+
+    with pytest.raises(RuntimeError, match="does not match its saved cursor"):
+        await orchestrator.resume_batch_extraction("batch-1", poll_interval=0.01)
+
+
+async def test_resume_unknown_batch(tmp_db: Database):
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(tmp_db, _client())
+    with pytest.raises(ValueError, match="No recorded requests"):
+        await orchestrator.resume_batch_extraction("missing")
@@ -0,0 +1,165 @@
+"""Tests for sharded batch extraction (several jobs, one poller, per-shard resubmit).
+
+The batch client is a MagicMock that keeps each submitted job's custom IDs;
+one job fails once and one finishes slowly. Validation is stubbed to pass.
+Skipped where ``objlib.extraction.batch_orchestrator`` cannot be imported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import FileRecord
+
+batch_orchestrator = pytest.importorskip(
+    "objlib.extraction.batch_orchestrator", exc_type=ImportError
+)
+from objlib.extraction.batch_client import BatchResult  # noqa: E402
+
+SIZES = [4000, 400, 1200, 800, 2400, 200, 1600, 600, 1000]  # Bytes per transcript
+
+
+def _client(events: list[str]) -> MagicMock:
+    jobs: dict[str, list[str]] = {}
+    checks: dict[str, int] = {}
+
+    async def submit_batch_file(path, request_count, job_name=None, metadata=None):
+        batch_id = f"b{len(jobs) + 1}"
+        jobs[batch_id] = [json.loads(line)["custom_id"] for line in path.read_text().splitlines()]
+        events.append(f"submit:{batch_id}:{metadata['shard']}")
+        return batch_id
+
+    async def get_status(batch_id):
+        checks[batch_id] = checks.get(batch_id, 0) + 1
+        state = "SUCCESS"
+        if batch_id == "b1":
+            state = "FAILED"
+        elif batch_id == "b2" and checks[batch_id] < 6:
+            state = "RUNNING"
+        events.append(f"status:{batch_id}:{state}")
+        return {"status": state, "succeeded_requests": 0, "total_requests": len(jobs[batch_id])}
+
+    async def iter_results(batch_id):
+        content = json.dumps({"primary_topics": ["ethics"], "confidence_score": 0.9})
+        for custom_id in jobs[batch_id]:
+            yield BatchResult(custom_id=custom_id, error=None,
+                              response={"choices": [{"message": {"content": content}}]})
+        events.append(f"applied:{batch_id}")
+
+    client = MagicMock()
+    client.build_extraction_request = lambda custom_id, system_prompt, user_prompt, **kw: (
+        SimpleNamespace(to_jsonl_line=lambda: json.dumps({"custom_id": custom_id}))
+    )
+    client.submit_batch_file = AsyncMock(side_effect=submit_batch_file)
+    client.get_status = AsyncMock(side_effect=get_status)
+    client.iter_results = iter_results
+    return client
+
+
+async def test_shards_balance_tokens_apply_early_and_resubmit(
+    tmp_db: Database, tmp_path: Path, monkeypatch
+):
+    monkeypatch.setattr(batch_orchestrator, "validate_extraction",
+                        lambda *a, **kw: SimpleNamespace(hard_failures=[], soft_warnings=[]))
+    monkeypatch.setattr(batch_orchestrator, "calculate_confidence", lambda **kw: 0.9)
+    for i, size in enumerate(SIZES):
+        path = tmp_path / f"t{i}.txt"
+        path.write_text("w " * (size // 2))
+        tmp_db.upsert_file(FileRecord(file_path=str(path), content_hash=str(i),
+                                      filename=path.name, file_size=size))
+
+    events: list[str] = []
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, _client(events), spool_dir=tmp_path
+    )
+    orchestrator._poller.coalesce_window = 0.0  # Checks follow their real backoff
+    summary = await orchestrator.run_batch_extraction(poll_interval=0.01, shards=3)
+
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (9, 9, 0)
+    shards = summary["shards"]
+    assert [s["status"] for s in shards] == ["applied"] * 3
+    assert shards[0]["batch_ids"] == ["b1", "b4"]  # Failed job resubmitted on its own
+    assert sum(s["requests"] for s in shards) == 9
+    tokens = [s["estimated_tokens"] for s in shards]
+    assert max(tokens) - min(tokens) <= max(SIZES) // 4
+
+    # The quick shard was applied while the slow one was still running
+    assert events.index("applied:b3") < events.index("status:b2:SUCCESS")
+    assert tmp_db.conn.execute("SELECT COUNT(*) FROM file_metadata_ai").fetchone()[0] == 9
+    jobs = tmp_db.conn.execute(
+        "SELECT COUNT(*), SUM(completed_at IS NOT NULL) FROM extraction_batch_jobs"
+    ).fetchone()
+    assert tuple(jobs) == (4, 3)
+
+
+def _add_files(tmp_db: Database, tmp_path: Path, count: int) -> None:
+    for i in range(count):
+        path = tmp_path / f"t{i}.txt"
+        path.write_text("w " * 100)
+        tmp_db.upsert_file(FileRecord(file_path=str(path), content_hash=str(i),
+                                      filename=path.name, file_size=200))
+
+
+async def test_local_timeout_leaves_job_running_and_cancelled_job_is_not_resubmitted(
+    tmp_db: Database, tmp_path: Path, monkeypatch
+):
+    monkeypatch.setattr(batch_orchestrator, "JOB_TIMEOUT_SECONDS", 0.1)
+    _add_files(tmp_db, tmp_path, 2)
+    events: list[str] = []
+    client = _client(events)
+    states = {"b1": "CANCELLED", "b2": "QUEUED"}
+    client.get_status = AsyncMock(side_effect=lambda batch_id: {
+        "status": states[batch_id], "succeeded_requests": 0, "total_requests": 1,
+    })
+
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, client, spool_dir=tmp_path
+    )
+    summary = await orchestrator.run_batch_extraction(poll_interval=0.01, shards=2)
+
+    cancelled, queued = summary["shards"]
+    assert cancelled["status"] == "failed" and cancelled["batch_ids"] == ["b1"]
+    assert queued["status"] == "interrupted" and queued["batch_ids"] == ["b2"]
+    assert "--resume b2" in queued["error"]
+    assert client.submit_batch_file.await_count == 2
+    client.cancel_batch.assert_not_called()
+
+
+async def test_cursor_mismatch_cancels_sibling_shards(
+    tmp_db: Database, tmp_path: Path, monkeypatch
+):
+    _add_files(tmp_db, tmp_path, 2)
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, _client([]), spool_dir=tmp_path
+    )
+    sibling_cancelled = False
+
+    async def complete_shard(shard, batch_id, poll_interval):
+        nonlocal sibling_cancelled
+        if shard.index == 0:
+            await asyncio.sleep(0.01)
+            raise batch_orchestrator.CursorMismatchError("line 3 is custom_id 7")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            sibling_cancelled = True
+            raise
+        return True
+
+    monkeypatch.setattr(orchestrator, "_complete_shard", complete_shard)
+    with pytest.raises(batch_orchestrator.CursorMismatchError):
+        await orchestrator.run_batch_extraction(poll_interval=0.01, shards=2)
+    assert sibling_cancelled
+
+
+async def test_shard_count_must_be_positive(tmp_db: Database):
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(tmp_db, MagicMock())
+    with pytest.raises(ValueError):
+        await orchestrator.run_batch_extraction(shards=0)
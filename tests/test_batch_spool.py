@@ -0,0 +1,96 @@
+"""Tests for the streaming batch-request spool (extraction/batch_spool.py).
+
+The orchestrator test needs the Mistral SDK's client classes and is skipped
+where ``objlib.extraction.batch_orchestrator`` cannot be imported.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.extraction.batch_spool import (
+    MAX_DOCUMENT_TOKENS,
+    BatchSpool,
+    estimate_token_count,
+    size_token_bound,
+)
+from objlib.models import FileRecord
+
+
+class _Request:
+    def __init__(self, custom_id: str, text: str) -> None:
+        self.custom_id, self.text = custom_id, text
+
+    def to_jsonl_line(self) -> str:
+        return json.dumps({"custom_id": self.custom_id, "body": {"text": self.text}})
+
+
+@pytest.mark.parametrize("text", ["", "a", "a b", "one  two\tthree\nfour ", "x" * 50, "a " * 999])
+def test_size_bound_never_underestimates(text: str):
+    assert estimate_token_count(text) <= size_token_bound(len(text.encode("utf-8")))
+
+
+def test_spool_writes_lines_and_cleans_up(tmp_path: Path):
+    with BatchSpool.create(tmp_path) as spool:
+        spool.write("0", "/lib/a.txt", _Request("0", "alpha"))
+        spool.write("1", "/lib/b.txt", _Request("1", "β" * 10))
+        spool.close()
+        lines = spool.path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["custom_id"] for line in lines] == ["0", "1"]
+        assert spool.file_map == {"0": "/lib/a.txt", "1": "/lib/b.txt"}
+        assert spool.stats.requests == 2
+        assert spool.stats.bytes_written == spool.path.stat().st_size
+        path = spool.path
+    assert not path.exists()
+
+
+async def test_orchestrator_spools_and_submits_file(tmp_db: Database, tmp_path: Path):
+    batch_orchestrator = pytest.importorskip(
+        "objlib.extraction.batch_orchestrator", exc_type=ImportError
+    )
+    library = tmp_path / "lib"
+    library.mkdir()
+    small = library / "small.txt"
+    small.write_text("short transcript " * 20)
+    huge = library / "huge.txt"
+    huge.write_text("w " * (MAX_DOCUMENT_TOKENS + 1000))
+    for path in (small, huge):
+        tmp_db.upsert_file(FileRecord(file_path=str(path), content_hash=path.name,
+                                      filename=path.name, file_size=path.stat().st_size))
+
+    submitted: dict = {}
+
+    async def submit_batch_file(path, request_count, job_name=None, metadata=None):
+        submitted["lines"] = path.read_text(encoding="utf-8").splitlines()
+        submitted["path"] = path
+        return "batch-1"
+
+    client = MagicMock()
+    client.build_extraction_request = lambda custom_id, system_prompt, user_prompt, **kw: (
+        _Request(custom_id, user_prompt)
+    )
+    client.submit_batch_file = AsyncMock(side_effect=submit_batch_file)
+    client.get_status = AsyncMock(return_value={  # Stop after submission
+        "status": "FAILED", "succeeded_requests": 0, "total_requests": 1,
+    })
+
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, client, spool_dir=tmp_path, max_resubmits=0
+    )
+    summary = await orchestrator.run_batch_extraction(poll_interval=0.01)
+
+    assert summary["batch_id"] == "batch-1" and summary["total"] == 1
+    assert summary["failed_files"] == [str(small)]
+    assert summary["oversized_files"] == [str(huge)]
+    status = tmp_db.conn.execute(
+        "SELECT ai_metadata_status FROM files WHERE file_path = ?", (str(huge),)
+    ).fetchone()[0]
+    assert status == "skipped"
+    assert len(submitted["lines"]) == 1
+    assert "short transcript" in json.loads(submitted["lines"][0])["body"]["text"]
+    assert not submitted["path"].exists()
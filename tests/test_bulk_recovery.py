@@ -0,0 +1,216 @@
+"""Tests for bulk startup recovery (one store listing, one transaction).
+
+The same seeded database is recovered twice -- once by the per-file steps
+run_fsm used to call, once by BulkRecovery -- and the resulting rows are
+compared. The Gemini client is a MagicMock with AsyncMock API methods so
+calls can be counted.
+"""
+
+from __future__ import annotations
+
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai.types import DocumentState
+
+from objlib.database import Database
+from objlib.models import UploadConfig
+from objlib.upload.bulk_recovery import BulkRecovery
+from objlib.upload.recovery import (
+    RecoveryCrawler,
+    RecoveryManager,
+    cleanup_and_reset_failed_files,
+    recover_untracked_with_store_doc,
+)
+from objlib.upload.state import AsyncUploadStateManager
+
+STORE = "fileSearchStores/s1"
+CONFIG = UploadConfig(store_name="s1", recovery_timeout_seconds=30)
+
+_COLUMNS = (
+    "file_path, gemini_state, gemini_file_id, gemini_file_uri, gemini_store_doc_id, "
+    "remote_expiration_ts, upload_timestamp, error_message, intent_type, "
+    "intent_api_calls_completed, version"
+)
+
+
+def _iso(hours: float) -> str:
+    return (datetime.now(timezone.utc) + timedelta(hours=hours)).isoformat()
+
+
+# (file_path, gemini_state, gemini_file_id, store_doc_id, expiration, intent, version)
+ROWS = [
+    ("/lib/upload-no-id.txt", "uploading", None, None, None, None, 1),
+    ("/lib/upload-valid.txt", "uploading", "files/uv", None, _iso(30), None, 1),
+    ("/lib/upload-expired.txt", "uploading", "files/ux", None, _iso(-2), None, 1),
+    ("/lib/indexed-expired.txt", "indexed", "files/ix", "docix", _iso(-1), None, 3),
+    ("/lib/indexed-soon.txt", "indexed", "files/is", "docis", _iso(4), None, 3),
+    ("/lib/intent.txt", "indexed", "files/in", "docin", None, "reset", 2),
+    ("/lib/failed-active.txt", "failed", "files/fa", None, None, None, 4),
+    ("/lib/failed-broken.txt", "failed", "files/fb", None, None, None, 4),
+    ("/lib/failed-gone.txt", "failed", "files/fg", "docgone", None, None, 4),
+    ("/lib/untracked-active.txt", "untracked", None, "docua", None, None, 5),
+    ("/lib/untracked-pending.txt", "untracked", None, "docup", None, None, 5),
+    ("/lib/untracked-missing.txt", "untracked", None, "docum", None, None, 5),
+    ("/lib/op.txt", "uploading", None, None, None, None, 1),
+    ("/lib/plain.txt", "untracked", None, None, None, None, 0),
+]
+
+DOCUMENTS = [
+    ("docix", "files/ix", DocumentState.STATE_ACTIVE),
+    ("docis", "files/is", DocumentState.STATE_ACTIVE),
+    ("docin", "files/in", DocumentState.STATE_ACTIVE),
+    ("docfa", "files/fa", DocumentState.STATE_ACTIVE),
+    ("docfb", "files/fb", DocumentState.STATE_FAILED),
+    ("docua", "files/old-ua", DocumentState.STATE_ACTIVE),
+    ("docup", "files/old-up", DocumentState.STATE_PENDING),
+    ("docpr", "files/pr", DocumentState.STATE_ACTIVE),
+]
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    client.store_name = STORE
+    client.list_store_documents = AsyncMock(return_value=[
+        SimpleNamespace(name=f"{STORE}/documents/{doc}", display_name=file_id, state=state)
+        for doc, file_id, state in DOCUMENTS
+    ])
+    client.delete_store_document = AsyncMock(return_value=True)
+    client.delete_file = AsyncMock(return_value=None)
+    client.poll_operation = AsyncMock(return_value=SimpleNamespace(done=True, error=None))
+    return client
+
+
+@pytest.fixture
+def seeded_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "seed.db"
+    with Database(db_path) as db:
+        for path, state, file_id, doc_id, expiration, intent, version in ROWS:
+            db.conn.execute(
+                "INSERT INTO files (file_path, content_hash, filename, file_size, gemini_state, "
+                "gemini_file_id, gemini_store_doc_id, remote_expiration_ts, intent_type, "
+                "intent_started_at, version) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)",
+                (path, path, Path(path).name, state, file_id, doc_id, expiration, intent,
+                 _iso(-1) if intent else None, version),
+            )
+        db.conn.execute(
+            "INSERT INTO upload_operations (operation_name, file_path, operation_state) "
+            "VALUES ('operations/op1', '/lib/op.txt', 'pending')"
+        )
+        db.conn.commit()
+    return db_path
+
+
+async def _state(path: Path) -> AsyncUploadStateManager:
+    state = AsyncUploadStateManager(str(path))
+    await state.connect()
+    return state
+
+
+async def _rows(state: AsyncUploadStateManager) -> dict[str, tuple]:
+    db = state._ensure_connected()
+    rows = await db.execute_fetchall(f"SELECT {_COLUMNS} FROM files ORDER BY file_path")
+    return {row[0]: tuple(row) for row in rows}
+
+
+async def _per_file(state: AsyncUploadStateManager, client: MagicMock) -> None:
+    await RecoveryManager(client, state, CONFIG).run()
+    await RecoveryCrawler(state, client).recover_all()
+    await cleanup_and_reset_failed_files(state, client)
+    await recover_untracked_with_store_doc(state, client)
+
+
+async def test_bulk_matches_per_file_recovery(seeded_db: Path, tmp_path: Path):
+    bulk_path = tmp_path / "bulk.db"
+    shutil.copy(seeded_db, bulk_path)
+
+    per_file_state, per_file_client = await _state(seeded_db), _client()
+    bulk_state, bulk_client = await _state(bulk_path), _client()
+    try:
+        await _per_file(per_file_state, per_file_client)
+        report = await BulkRecovery(bulk_state, bulk_client, CONFIG).run()
+
+        assert await _rows(bulk_state) == await _rows(per_file_state)
+        db = bulk_state._ensure_connected()
+        ops = await db.execute_fetchall("SELECT operation_state FROM upload_operations")
+        assert [r[0] for r in ops] == ["succeeded"]
+    finally:
+        await per_file_state.close()
+        await bulk_state.close()
+
+    assert per_file_client.list_store_documents.await_count == 2
+    assert bulk_client.list_store_documents.await_count == 1
+    # docgone/docum are absent from the listing: no delete call for them
+    deleted = {c.args[0] for c in bulk_client.delete_store_document.await_args_list}
+    assert deleted == {"docin", f"{STORE}/documents/docfb"}
+
+    result = report.recovery
+    assert (result.recovered_operations, result.expired_files, result.deadline_critical) == (2, 2, 1)
+    assert report.intents_recovered == ["/lib/intent.txt"]
+    assert (report.failed_upgraded, report.failed_reset) == (1, 2)
+    assert (report.untracked_restored, report.store_doc_ids_cleared) == (1, 1)
+    assert report.phases["list"].api_calls == 1
+    assert report.api_calls == 1 + 1 + bulk_client.delete_store_document.await_count \
+        + bulk_client.delete_file.await_count
+
+
+async def test_processing_resolved_from_listing(tmp_path: Path):
+    db_path = tmp_path / "processing.db"
+    with Database(db_path) as db:
+        db.conn.executemany(
+            "INSERT INTO files (file_path, content_hash, filename, file_size, gemini_state, "
+            "gemini_file_id, version) VALUES (?, ?, ?, 1, 'processing', ?, 2)",
+            [("/lib/p1.txt", "h1", "p1.txt", "files/pr"),
+             ("/lib/p2.txt", "h2", "p2.txt", "files/unknown")],
+        )
+        db.conn.commit()
+    state = await _state(db_path)
+    try:
+        report = await BulkRecovery(state, _client(), CONFIG).run()
+        rows = await _rows(state)
+    finally:
+        await state.close()
+
+    assert report.processing_indexed == 1
+    assert rows["/lib/p1.txt"][1:5] == ("indexed", "files/pr", None, "docpr")
+    assert rows["/lib/p1.txt"][-1] == 3
+    assert rows["/lib/p2.txt"][1] == "processing"  # Not listed yet: import may be running
+
+
+async def test_rows_changed_since_load_are_left_alone(seeded_db: Path):
+    state = await _state(seeded_db)
+    client = _client()
+
+    async def _concurrent_writer(name: str) -> None:
+        if name == "files/fb":
+            db = state._ensure_connected()
+            await db.execute(
+                "UPDATE files SET version = version + 1 WHERE file_path = '/lib/failed-broken.txt'"
+            )
+
+    client.delete_file = AsyncMock(side_effect=_concurrent_writer)
+    try:
+        report = await BulkRecovery(state, client, CONFIG).run()
+        rows = await _rows(state)
+    finally:
+        await state.close()
+
+    assert report.occ_conflicts == ["/lib/failed-broken.txt"]
+    assert rows["/lib/failed-broken.txt"][1] == "failed"
+    assert rows["/lib/failed-active.txt"][1] == "indexed"
+
+
+async def test_listing_failure_returns_none_without_changes(seeded_db: Path):
+    state = await _state(seeded_db)
+    client = _client()
+    client.list_store_documents = AsyncMock(side_effect=RuntimeError("store unavailable"))
+    try:
+        before = await _rows(state)
+        assert await BulkRecovery(state, client, CONFIG).run() is None
+        assert await _rows(state) == before
+    finally:
+        await state.close()
@@ -0,0 +1,169 @@
+"""Tests for the AIMD concurrency controller and its pipeline wiring.
+
+Outcomes are fed through a real RollingWindowCircuitBreaker (the
+controller samples its cumulative counts); time is a settable fake clock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.concurrency import AIMDConcurrencyController
+from objlib.upload.pipeline import UploadPipeline
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(breaker, clock, **kwargs) -> AIMDConcurrencyController:
+    kwargs.setdefault("upload", (4, 10))
+    kwargs.setdefault("poll", (8, 20))
+    return AIMDConcurrencyController(
+        breaker, sample_size=10, decrease_cooldown=5.0, clock=clock, **kwargs
+    )
+
+
+def _succeed(breaker: RollingWindowCircuitBreaker, n: int) -> None:
+    for _ in range(n):
+        breaker.record_success()
+
+
+def test_healthy_samples_increase_additively_up_to_maximum():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    controller = _controller(breaker, clock)
+
+    _succeed(breaker, 9)
+    assert controller.upload_limit() == 4
+    _succeed(breaker, 1)
+    assert (controller.upload_limit(), controller.poll_limit()) == (5, 9)
+
+    for _ in range(20):
+        _succeed(breaker, 10)
+        controller.update()
+    assert controller.limits == {"upload": 10, "poll": 20}
+    assert all(a.new == a.old + 1 for a in controller.adjustments)
+
+
+def test_429_halves_once_per_cooldown(caplog):
+    breaker = RollingWindowCircuitBreaker(window_size=1000, consecutive_threshold=100)
+    clock = FakeClock()
+    controller = _controller(breaker, clock, upload=(8, 10))
+
+    breaker.record_429()
+    with caplog.at_level("INFO", logger="objlib.upload.concurrency"):
+        assert controller.upload_limit() == 4
+    assert "Upload concurrency 8 -> 4 (1 rate-limit response(s))" in caplog.text
+
+    breaker.record_429()
+    assert controller.upload_limit() == 4  # Same burst, inside cooldown
+
+    clock.now += 6
+    breaker.record_429()
+    assert controller.upload_limit() == 2
+    assert controller.limits["poll"] == 2
+
+
+def test_error_rate_above_target_decreases():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    controller = _controller(breaker, clock, target_error_rate=0.1)
+
+    _succeed(breaker, 9)
+    breaker.record_error()
+    controller.update()  # 10% errors: at target, still grows
+    assert controller.limits["upload"] == 5
+
+    _succeed(breaker, 8)
+    breaker.record_error()
+    breaker.record_error()
+    controller.update()
+    assert controller.limits["upload"] == 2
+    assert "error rate 0.20 > target 0.10" in controller.adjustments[-1].reason
+
+
+def test_quota_headers_hold_and_shrink():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    remaining = 3
+    controller = _controller(breaker, clock, quota_remaining=lambda: remaining)
+
+    _succeed(breaker, 10)
+    controller.update()
+    assert controller.limits["upload"] == 4  # 3 left < limit 4: hold
+
+    remaining = 0
+    controller.update()
+    assert controller.limits["upload"] == 2
+
+
+def test_open_breaker_caps_limit():
+    breaker = RollingWindowCircuitBreaker(consecutive_threshold=1, cooldown_seconds=300)
+    controller = _controller(breaker, FakeClock(), upload=(10, 10), decrease_factor=0.9)
+
+    breaker.record_429()
+    assert controller.upload_limit() == 5  # AIMD says 9, OPEN breaker recommends 5
+
+
+def test_launch_interval_shrinks_as_limit_grows():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    controller = _controller(breaker, clock)
+    spacing = controller.launch_interval(1.0)
+
+    assert spacing() == pytest.approx(1.0)
+    for _ in range(4):
+        _succeed(breaker, 10)
+        controller.update()
+    assert spacing() == pytest.approx(0.5)
+
+
+def test_upload_only_controller_has_no_poll_stage():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    controller = _controller(breaker, clock, poll=None)
+
+    _succeed(breaker, 10)
+    assert controller.upload_limit() == 5
+    assert controller.limits == {"upload": 5}
+    with pytest.raises(RuntimeError):
+        controller.poll_limit()
+
+
+def test_invalid_target_error_rate_rejected():
+    with pytest.raises(ValueError):
+        AIMDConcurrencyController(RollingWindowCircuitBreaker(), upload=(1, 2), poll=(1, 2),
+                                  target_error_rate=1.5)
+
+
+async def test_pipeline_poll_limit_grows_with_controller():
+    breaker, clock = RollingWindowCircuitBreaker(), FakeClock()
+    controller = _controller(breaker, clock, upload=(1, 4), poll=(1, 4))
+    in_flight = 0
+    peak = 0
+
+    async def upload(item):
+        breaker.record_success()
+        return item
+
+    async def poll(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        breaker.record_success()
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return True
+
+    pipeline = UploadPipeline(
+        upload, poll, upload_concurrency=4, poll_concurrency=4,
+        upload_limit=controller.upload_limit, poll_limit=controller.poll_limit,
+    )
+    stats = await pipeline.run(range(60))
+
+    assert stats.poll.completed == 60
+    assert stats.poll.limit_range[0] == 1 and stats.poll.limit_range[1] > 1
+    assert peak <= stats.poll.limit_range[1]
@@ -0,0 +1,207 @@
+"""Tests for content-addressed upload dedup (schema V22 upload_payloads).
+
+Planning runs against a real temporary database; the sync test uses a
+MagicMock client and counts uploads, and the FSM selection test stubs
+upload preparation.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rich.console import Console
+
+from objlib.config import ScannerConfig
+from objlib.database import Database
+from objlib.models import Citation, FileRecord, UploadConfig
+from objlib.search.citations import enrich_citations
+from objlib.sync.detector import SyncChangeSet
+from objlib.sync.orchestrator import SyncOrchestrator
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.dedup import API_CALLS_PER_UPLOAD, PayloadCandidate, UploadDeduplicator
+from objlib.upload.orchestrator import FSMUploadOrchestrator
+from objlib.upload.state import AsyncUploadStateManager
+
+
+def _insert(db: Database, path: str, content_hash: str = "h1") -> None:
+    db.upsert_file(FileRecord(file_path=path, content_hash=content_hash,
+                              filename=Path(path).name, file_size=100))
+
+
+def _candidate(
+    path: str, content_hash: str = "h1", header: str = "[AI]\n", enrichment: str = "e1"
+) -> PayloadCandidate:
+    return PayloadCandidate.build(path, content_hash, 100, f"upload-{enrichment}", [header])
+
+
+def _index(db: Database, path: str, file_id: str = "files/abc123") -> None:
+    db.conn.execute(
+        "UPDATE files SET gemini_state = 'indexed', gemini_file_id = ?, "
+        "gemini_store_doc_id = ? WHERE file_path = ?",
+        (file_id, f"{file_id.removeprefix('files/')}-chunk", path),
+    )
+    db.conn.commit()
+
+
+@pytest.fixture
+def db(tmp_db: Database) -> Database:
+    for path in ("/lib/a/t.txt", "/lib/b/t.txt", "/lib/c/t.txt", "/lib/d/other.txt"):
+        _insert(tmp_db, path, "h2" if "other" in path else "h1")
+    return tmp_db
+
+
+def test_identical_payloads_in_one_run_upload_once(db: Database):
+    plan = UploadDeduplicator(db.conn).plan([
+        _candidate("/lib/b/t.txt"), _candidate("/lib/a/t.txt"),
+        _candidate("/lib/d/other.txt", "h2"),
+    ])
+
+    assert plan.uploads == ["/lib/a/t.txt", "/lib/d/other.txt"]
+    assert plan.aliases == {"/lib/b/t.txt": "/lib/a/t.txt"}
+    stats = plan.stats
+    assert (stats.aliased_in_run, stats.aliased_to_store) == (1, 0)
+    assert stats.bytes_saved == 100 + len("[AI]\n")
+    assert stats.api_calls_saved == API_CALLS_PER_UPLOAD
+
+
+def test_payload_key_is_content_and_enrichment_hash(db: Database):
+    # Path-derived headers differ between paths; they do not split the payload
+    plan = UploadDeduplicator(db.conn).plan([
+        _candidate("/lib/a/t.txt", header="[Title: a]\n"),
+        _candidate("/lib/b/t.txt", header="[Title: b]\n"),
+        _candidate("/lib/c/t.txt", enrichment="e2"),
+    ])
+    assert plan.aliases == {"/lib/b/t.txt": "/lib/a/t.txt"}
+    assert plan.uploads == ["/lib/a/t.txt", "/lib/c/t.txt"]
+
+
+def test_alias_to_indexed_document_and_citation_paths(db: Database):
+    dedup = UploadDeduplicator(db.conn)
+    dedup.plan([_candidate("/lib/a/t.txt")])
+    _index(db, "/lib/a/t.txt")
+
+    plan = dedup.plan([_candidate("/lib/b/t.txt"), _candidate("/lib/c/t.txt")])
+    assert plan.uploads == []
+    assert plan.stats.aliased_to_store == 2
+    assert plan.stats.api_calls_saved == 2 * API_CALLS_PER_UPLOAD
+
+    # A second run finds the live aliases: skipped again, no new savings
+    again = dedup.plan([_candidate("/lib/b/t.txt")])
+    assert (again.stats.already_shared, again.stats.bytes_saved) == (1, 0)
+
+    assert db.get_shared_paths(["/lib/a/t.txt"]) == {
+        "/lib/a/t.txt": ["/lib/b/t.txt", "/lib/c/t.txt"]
+    }
+    citations = enrich_citations(
+        [Citation(index=1, title="abc123", uri=None, text="passage",
+                  document_name=None, confidence=0.9)],
+        db,
+    )
+    assert citations[0].file_path == "/lib/a/t.txt"
+    assert citations[0].shared_paths == ["/lib/b/t.txt", "/lib/c/t.txt"]
+
+
+def test_alias_dies_when_canonical_changes(db: Database):
+    dedup = UploadDeduplicator(db.conn)
+    dedup.plan([_candidate("/lib/a/t.txt")])
+    _index(db, "/lib/a/t.txt")
+    dedup.plan([_candidate("/lib/b/t.txt")])
+
+    db.conn.execute("UPDATE files SET content_hash = 'h9' WHERE file_path = '/lib/a/t.txt'")
+    db.conn.commit()
+    assert db.get_shared_paths(["/lib/a/t.txt"]) == {}
+
+    plan = dedup.plan([_candidate("/lib/b/t.txt")])
+    assert plan.uploads == ["/lib/b/t.txt"]
+
+
+async def test_limited_fsm_runs_skip_aliases_and_upload_the_next_file(tmp_path: Path):
+    db_path = tmp_path / "library.db"
+    with Database(db_path) as db:
+        for path, content_hash in (("/lib/a.txt", "h1"), ("/lib/b.txt", "h1"),
+                                   ("/lib/c.txt", "h2"), ("/lib/d.txt", "h3")):
+            _insert(db, path, content_hash)
+            db.conn.execute(
+                "UPDATE files SET ai_metadata_status = 'approved' WHERE file_path = ?", (path,)
+            )
+            db.conn.executemany(
+                "INSERT INTO file_primary_topics (file_path, topic_tag) VALUES (?, ?)",
+                [(path, f"topic-{i}") for i in range(8)],
+            )
+        db.conn.commit()
+        UploadDeduplicator(db.conn).plan([_candidate("/lib/a.txt")])
+        _index(db, "/lib/a.txt")  # First --limit 1 run uploaded a.txt
+
+    state = AsyncUploadStateManager(str(db_path))
+    await state.connect()
+
+    async def _select() -> list[str]:
+        orchestrator = FSMUploadOrchestrator(
+            MagicMock(), state, RollingWindowCircuitBreaker(),
+            UploadConfig(store_name="s1"), file_limit=1,
+        )
+
+        async def prepare(paths):
+            return {p: SimpleNamespace(upload_hash="upload-e1", headers=[f"[{p}]\n"])
+                    for p in paths}
+
+        orchestrator._prepare_uploads = prepare
+        pending = await orchestrator._select_fsm_pending(1)
+        return [f["file_path"] for f in pending]
+
+    try:
+        # b.txt duplicates the indexed a.txt: aliased, and the window refills
+        assert await _select() == ["/lib/c.txt"]
+        pending = await state.get_fsm_pending_files(limit=10)
+        assert [f["file_path"] for f in pending] == ["/lib/c.txt", "/lib/d.txt"]
+
+        await state._ensure_connected().execute(
+            "UPDATE files SET gemini_state = 'indexed' WHERE file_path = '/lib/c.txt'"
+        )
+        await state._ensure_connected().commit()
+        assert await _select() == ["/lib/d.txt"]
+    finally:
+        await state.close()
+
+    with Database(db_path) as db:
+        counts = db.get_status_counts()
+        assert counts == {"indexed": 2, "shared": 1, "untracked": 1}
+        assert [row["file_path"] for row in db.get_pending_files()] == ["/lib/d.txt"]
+
+
+async def test_sync_uploads_duplicate_new_files_once(tmp_db: Database, tmp_path: Path):
+    library = tmp_path / "lib"
+    changeset = SyncChangeSet()
+    for folder in ("a", "b"):
+        path = library / folder / "Course" / "t.txt"
+        path.parent.mkdir(parents=True)
+        path.write_text("same transcript")
+        changeset.new_files.append({
+            "file_path": str(path), "content_hash": "h1", "file_size": 15,
+            "filename": "t.txt", "metadata_json": json.dumps({"course": "Course"}),
+            "mtime": 1.0,
+        })
+
+    client = MagicMock()
+    client.upload_and_import = AsyncMock(return_value=(
+        SimpleNamespace(name="files/abc123", uri="uri"), SimpleNamespace(name="operations/1"),
+    ))
+    client.poll_operation = AsyncMock(return_value=SimpleNamespace(done=True, error=None))
+    orchestrator = SyncOrchestrator(
+        tmp_db, client, ScannerConfig(library_path=library), "key", Console(quiet=True)
+    )
+    await orchestrator._sync_changed_files(changeset, skip_enrichment=True)
+
+    first, second = (f["file_path"] for f in changeset.new_files)
+    assert client.upload_and_import.await_count == 1
+    assert orchestrator.summary["new_uploaded"] == 1
+    assert orchestrator.summary["deduplicated"] == 1
+    assert tmp_db.get_shared_paths([first]) == {first: [second]}
+    row = tmp_db.conn.execute(
+        "SELECT gemini_state, mtime, upload_hash FROM files WHERE file_path = ?", (second,)
+    ).fetchone()
+    assert row["gemini_state"] == "untracked" and row["mtime"] == 1.0 and row["upload_hash"]
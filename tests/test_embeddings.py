@@ -0,0 +1,184 @@
+"""Tests for the on-disk passage embedding index (local semantic search).
+
+A deterministic bag-of-words encoder stands in for sentence-transformers
+so the tests exercise chunking, the float16 memmap, incremental refresh
+and top-k search without downloading a model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from objlib.database import Database  # noqa: E402
+from objlib.models import FileRecord  # noqa: E402
+from objlib.search import embeddings as emb  # noqa: E402
+from objlib.search.embeddings import EmbeddingIndex, chunk_passages, top_k_cosine  # noqa: E402
+from objlib.search.local_index import LocalSearchIndex  # noqa: E402
+from objlib.services import SearchService  # noqa: E402
+from objlib.services.pool import close_all_pools  # noqa: E402
+
+DIM = 64
+
+
+class CountingEncoder:
+    """Hashes each word into one of DIM buckets; counts texts encoded."""
+
+    def __init__(self) -> None:
+        self.texts_encoded = 0
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.texts_encoded += len(texts)
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1.0
+        return out
+
+
+def _add(db: Database, path: Path, text: str, content_hash: str, **meta) -> None:
+    path.write_text(text)
+    db.upsert_file(FileRecord(
+        file_path=str(path),
+        content_hash=content_hash,
+        filename=path.name,
+        file_size=len(text),
+        metadata_json=json.dumps(meta),
+    ))
+
+
+@pytest.fixture
+def corpus(tmp_path: Path, tmp_db: Database) -> Database:
+    _add(tmp_db, tmp_path / "OPAR - Lesson 01.txt",
+         "volition free will choice " * 30 + "epistemology " * 300, "h1", year=2020)
+    _add(tmp_db, tmp_path / "MOTM - Rights.txt",
+         "individual rights property government " * 40, "h2", year=2015)
+    return tmp_db
+
+
+class TestChunking:
+    def test_spans_cover_text_with_overlap(self):
+        text = " ".join(f"word{i}" for i in range(2000))
+        spans = chunk_passages(text, chunk_chars=500, overlap=100)
+        assert spans[0][0] == 0
+        assert spans[-1][1] == len(text)
+        for (s1, e1), (s2, e2) in zip(spans, spans[1:]):
+            assert s1 < s2 < e1 < e2  # strictly advancing, overlapping
+            assert e1 - s1 <= 500
+        # Never split inside a word
+        assert all(text[s - 1] == " " for s, _ in spans[1:])
+
+    def test_blank_text(self):
+        assert chunk_passages("   \n  ") == []
+
+
+class TestTopK:
+    def test_matches_brute_force_with_mask(self):
+        rng = np.random.default_rng(0)
+        m = rng.standard_normal((1000, DIM)).astype(np.float32)
+        m /= np.linalg.norm(m, axis=1, keepdims=True)
+        q = m[17] + 0.01
+        mask = np.ones(1000, dtype=bool)
+        mask[17] = False
+
+        rows, scores = top_k_cosine(m.astype(np.float16), q, k=5, mask=mask, block_rows=128)
+
+        expected = np.argsort(-(m @ q))
+        expected = [i for i in expected if i != 17][:5]
+        assert list(rows) == expected
+        assert np.all(np.diff(scores) <= 0)
+
+
+class TestRefresh:
+    def test_only_changed_files_are_reembedded(self, corpus, tmp_path):
+        encoder = CountingEncoder()
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=encoder)
+        stats = index.refresh()
+        assert stats.files_embedded == 2
+        first_total = stats.passages_total
+        assert index.open_matrix().dtype == np.float16
+        assert index.open_matrix().shape == (first_total, DIM)
+
+        encoder.texts_encoded = 0
+        stats = index.refresh()
+        assert stats.files_unchanged == 2
+        assert encoder.texts_encoded == 0
+
+        _add(corpus, tmp_path / "MOTM - Rights.txt", "capitalism trade money " * 40, "h2b")
+        stats = index.refresh()
+        assert stats.files_embedded == 1
+        assert encoder.texts_encoded == stats.passages_embedded
+        # Only the current matrix file remains on disk (no old matrix or spool)
+        assert [p.suffix for p in (tmp_path / "emb").iterdir()] == [".npy"]
+
+    def test_spooled_vectors_land_in_row_order(self, corpus, tmp_path, monkeypatch):
+        monkeypatch.setattr(emb, "COPY_BLOCK_ROWS", 3)  # Several blocks per copy
+        encoder = CountingEncoder()
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=encoder)
+        index.refresh()
+
+        matrix = index.open_matrix()
+        rows = corpus.conn.execute(
+            "SELECT row_id, file_path, char_start, char_end FROM embedding_passages ORDER BY row_id"
+        ).fetchall()
+        assert len(rows) == matrix.shape[0] > 3
+        for row in rows:
+            text = Path(row["file_path"]).read_text()[row["char_start"]:row["char_end"]]
+            expected = encoder([text])[0]
+            expected /= np.linalg.norm(expected)
+            np.testing.assert_allclose(matrix[row["row_id"]], expected, atol=1e-3)
+
+    def test_deleted_files_dropped(self, corpus, tmp_path):
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=CountingEncoder())
+        index.refresh()
+        corpus.mark_deleted({str(tmp_path / "MOTM - Rights.txt")})
+        stats = index.refresh()
+        assert stats.files_removed == 1
+        paths = {r[0] for r in corpus.conn.execute("SELECT DISTINCT file_path FROM embedding_passages")}
+        assert paths == {str(tmp_path / "OPAR - Lesson 01.txt")}
+
+
+class TestSearch:
+    def test_semantic_hit_and_passage_text(self, corpus, tmp_path):
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=CountingEncoder())
+        index.refresh()
+
+        citations = index.search("free will volition", limit=3)
+        top = citations[0]
+        assert top.title == "OPAR - Lesson 01.txt"
+        start, end = top.snippet_offsets
+        assert top.text == (tmp_path / top.title).read_text()[start:end]
+        assert 0 < top.score <= 1.0
+
+    def test_text_comes_from_local_fts_when_available(self, corpus, tmp_path):
+        LocalSearchIndex(corpus).refresh()
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=CountingEncoder())
+        index.refresh()
+        (tmp_path / "MOTM - Rights.txt").unlink()  # library offline
+        top = index.search("property rights", limit=1)[0]
+        assert "rights" in top.text
+
+    def test_filters(self, corpus, tmp_path):
+        index = EmbeddingIndex(corpus, index_dir=tmp_path / "emb", encode=CountingEncoder())
+        index.refresh()
+        citations = index.search("free will volition", limit=5, filters={"year": "2015"})
+        assert {c.title for c in citations} == {"MOTM - Rights.txt"}
+
+
+async def test_search_service_semantic_mode(corpus, tmp_path, monkeypatch):
+    close_all_pools()
+    monkeypatch.setattr(emb, "_default_encoder", CountingEncoder())
+    EmbeddingIndex(corpus).refresh()
+
+    svc = SearchService(api_key="unused", store_resource_name="", db_path=str(tmp_path / "test.db"))
+    result = await svc.search("individual rights", semantic=True, mode="research")
+
+    assert svc._client is None
+    assert result.citations[0].title == "MOTM - Rights.txt"
+    close_all_pools()
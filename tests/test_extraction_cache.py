@@ -0,0 +1,158 @@
+"""Tests for the content-addressed extraction cache (extraction/cache.py, schema V24).
+
+The batch orchestrator test needs the Mistral SDK's client classes and is
+skipped where ``objlib.extraction.batch_orchestrator`` cannot be imported;
+validation is stubbed there and rejects entries marked stale.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.extraction.cache import CacheKey, ExtractionCache
+from objlib.extraction.prompts import (
+    build_system_prompt,
+    hash_prompt_template,
+    production_config_hash,
+)
+from objlib.models import FileRecord
+
+KEY = CacheKey(strategy="minimalist", prompt_hash="p1", config_hash="c1", model="m")
+
+
+def _add_file(db: Database, path: str, content_hash: str) -> None:
+    db.upsert_file(FileRecord(file_path=path, content_hash=content_hash,
+                              filename=Path(path).name, file_size=100))
+
+
+def test_duplicate_content_shares_entries_and_key_parts_isolate(tmp_db: Database):
+    _add_file(tmp_db, "/lib/a.txt", "h1")
+    _add_file(tmp_db, "/lib/copy-of-a.txt", "h1")
+    _add_file(tmp_db, "/lib/b.txt", "h2")
+    cache = ExtractionCache(tmp_db, KEY)
+    with tmp_db.conn:
+        cache.store("/lib/a.txt", {"primary_topics": ["ethics"]}, tokens=1200)
+
+    entry = cache.lookup("/lib/copy-of-a.txt")
+    assert entry is not None and entry.metadata == {"primary_topics": ["ethics"]}
+    cache.record_hit(entry)
+    assert cache.lookup("/lib/b.txt") is None
+
+    for other in (
+        CacheKey("teacher", "p1", "c1", "m"),
+        CacheKey("minimalist", "p2", "c1", "m"),
+        CacheKey("minimalist", "p1", "c2", "m"),
+        CacheKey("minimalist", "p1", "c1", "other-model"),
+    ):
+        assert ExtractionCache(tmp_db, other).lookup("/lib/a.txt") is None
+
+    report = cache.stats.report(cost_per_request=0.02)
+    assert report == {"hits": 1, "misses": 1, "rejected": 0, "stored": 1,
+                      "tokens_avoided": 1200, "cost_avoided": 0.02}
+
+
+def test_force_skips_lookups_but_refreshes_entries(tmp_db: Database):
+    _add_file(tmp_db, "/lib/a.txt", "h1")
+    with tmp_db.conn:
+        ExtractionCache(tmp_db, KEY).store("/lib/a.txt", {"v": 1}, tokens=10)
+
+    forced = ExtractionCache(tmp_db, KEY, reuse=False)
+    assert forced.lookup("/lib/a.txt") is None and forced.stats.lookups == 0
+    with tmp_db.conn:
+        forced.store("/lib/a.txt", {"v": 2}, tokens=20)
+
+    entry = ExtractionCache(tmp_db, KEY).lookup("/lib/a.txt")
+    assert (entry.metadata, entry.tokens) == ({"v": 2}, 20)
+    assert tmp_db.conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0] == 1
+
+
+def test_prompt_hash_tracks_prompt_and_transcript_policy():
+    system = build_system_prompt("minimalist")
+    base = hash_prompt_template(system, "minimalist", "full")
+    assert base == hash_prompt_template(system, "minimalist", "full")
+    assert base != hash_prompt_template(system + " ", "minimalist", "full")
+    assert base != hash_prompt_template(system, "teacher", "full")
+    assert base != hash_prompt_template(system, "minimalist", "chunked-18000")
+
+
+async def test_batch_extraction_serves_cached_files_without_submitting(
+    tmp_db: Database, tmp_path: Path, monkeypatch
+):
+    batch_orchestrator = pytest.importorskip(
+        "objlib.extraction.batch_orchestrator", exc_type=ImportError
+    )
+    from objlib.extraction.batch_client import BatchResult
+
+    def validate(metadata, **kwargs):
+        failures = ["stale"] if metadata.get("stale") else []
+        return SimpleNamespace(hard_failures=failures, soft_warnings=[])
+
+    monkeypatch.setattr(batch_orchestrator, "validate_extraction", validate)
+    monkeypatch.setattr(batch_orchestrator, "calculate_confidence", lambda **kw: 0.9)
+    paths = []
+    for i, content_hash in enumerate(["h0", "h0", "h1", "h2"]):  # t1 duplicates t0
+        path = tmp_path / f"t{i}.txt"
+        path.write_text(f"transcript {content_hash}")
+        _add_file(tmp_db, str(path), content_hash)
+        paths.append(str(path))
+
+    submitted: list[list[str]] = []
+
+    async def submit_batch_file(path, request_count, job_name=None, metadata=None):
+        submitted.append([json.loads(line)["custom_id"] for line in path.read_text().splitlines()])
+        return "batch-1"
+
+    async def iter_results(batch_id):
+        content = json.dumps({"primary_topics": ["ethics"], "confidence_score": 0.9})
+        for custom_id in submitted[-1]:
+            yield BatchResult(custom_id=custom_id, error=None, response={
+                "choices": [{"message": {"content": content}}],
+                "usage": {"total_tokens": 500},
+            })
+
+    client = MagicMock()
+    client.build_extraction_request = lambda custom_id, system_prompt, user_prompt, **kw: (
+        SimpleNamespace(to_jsonl_line=lambda: json.dumps({"custom_id": custom_id}))
+    )
+    client.submit_batch_file = AsyncMock(side_effect=submit_batch_file)
+    client.get_status = AsyncMock(return_value={
+        "status": "SUCCESS", "succeeded_requests": 1, "total_requests": 1,
+    })
+    client.iter_results = iter_results
+
+    orchestrator = batch_orchestrator.BatchExtractionOrchestrator(
+        tmp_db, client, spool_dir=tmp_path
+    )
+    seed = ExtractionCache(tmp_db, CacheKey(
+        "minimalist",
+        hash_prompt_template(build_system_prompt("minimalist"), "minimalist", "full"),
+        production_config_hash(),
+        batch_orchestrator.BATCH_MODEL,
+    ))
+    with tmp_db.conn:
+        seed.store(paths[0], {"primary_topics": ["ethics"]}, tokens=700)
+        seed.store(paths[2], {"stale": True}, tokens=700)
+
+    summary = await orchestrator.run_batch_extraction(poll_interval=0.01)
+
+    # t0 and its duplicate t1 come from the cache; the stale entry is re-sent
+    assert submitted == [["0", "1"]]
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (4, 4, 0)
+    assert summary["cache"]["hits"] == 2 and summary["cache"]["rejected"] == 1
+    assert summary["cache"]["tokens_avoided"] == 1400
+    assert summary["cache"]["stored"] == 2
+    assert tmp_db.conn.execute("SELECT COUNT(*) FROM file_metadata_ai").fetchone()[0] == 4
+
+    # A second run after a reset submits nothing
+    tmp_db.conn.execute("UPDATE files SET ai_metadata_status = 'pending'")
+    tmp_db.conn.commit()
+    rerun = batch_orchestrator.BatchExtractionOrchestrator(tmp_db, client, spool_dir=tmp_path)
+    summary = await rerun.run_batch_extraction(poll_interval=0.01)
+    assert len(submitted) == 1
+    assert (summary["succeeded"], summary["cache"]["hits"]) == (4, 4)
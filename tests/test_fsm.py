@@ -229,6 +229,20 @@ class TestFSMLifecycle:
         assert state == "failed"
         assert version == 2
 
+    @pytest.mark.asyncio
+    async def test_store_doc_prefix_follows_transitions(self, fsm_state):
+        """gemini_store_doc_prefix is set on indexed and cleared on reset."""
+        await _insert_test_file(fsm_state, gemini_state="processing", version=2)
+        db = fsm_state._ensure_connected()
+
+        await fsm_state.transition_to_indexed("/test/file.txt", 2, "abcdefgh1234-q1w2e3")
+        cursor = await db.execute("SELECT gemini_store_doc_prefix FROM files")
+        assert (await cursor.fetchone())[0] == "abcdefgh1234"
+
+        await fsm_state.finalize_reset("/test/file.txt", 3)
+        cursor = await db.execute("SELECT gemini_store_doc_prefix FROM files")
+        assert (await cursor.fetchone())[0] is None
+
 
 # ======================================================================
 # Test 4: SC6 -- RecoveryCrawler raises on OCC conflict
@@ -527,3 +541,68 @@ class TestResetIntentMethods:
         # Pass wrong expected_version
         result = await fsm_state.finalize_reset("/test/conflict.txt", 99)
         assert result is False
+
+
+# ======================================================================
+# Group commit of FSM transitions
+# ======================================================================
+
+
+class TestGroupCommit:
+    """Concurrent transitions share statements/commits but keep per-file OCC."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_transitions_share_flushes(self, fsm_state):
+        paths = [f"/test/gc{i}.txt" for i in range(20)]
+        for path in paths:
+            await _insert_test_file(fsm_state, file_path=path)
+
+        versions = await asyncio.gather(
+            *(fsm_state.transition_to_uploading(path, 0) for path in paths)
+        )
+
+        assert versions == [1] * 20
+        assert fsm_state._committer.rows == 20
+        assert fsm_state._committer.flushes < 20
+
+    @pytest.mark.asyncio
+    async def test_conflicts_reported_per_file_in_one_batch(self, fsm_state):
+        await _insert_test_file(fsm_state, file_path="/test/ok.txt")
+        await _insert_test_file(fsm_state, file_path="/test/stale.txt", version=3)
+
+        results = await asyncio.gather(
+            fsm_state.transition_to_uploading("/test/ok.txt", 0),
+            fsm_state.transition_to_uploading("/test/stale.txt", 0),
+            fsm_state.transition_to_failed("/test/ok.txt", 0, "racing writer"),
+            return_exceptions=True,
+        )
+
+        assert results[0] == 1
+        assert isinstance(results[1], OCCConflictError)
+        assert isinstance(results[2], OCCConflictError)
+        assert await fsm_state.get_file_version("/test/ok.txt") == ("uploading", 1)
+
+    @pytest.mark.asyncio
+    async def test_transition_committed_before_return(self, fsm_state):
+        """Write-ahead guarantee: another connection sees the row on return."""
+        await _insert_test_file(fsm_state)
+        await fsm_state.transition_to_uploading("/test/file.txt", 0)
+
+        with Database(fsm_state.db_path) as other:
+            row = other.conn.execute(
+                "SELECT gemini_state, version FROM files WHERE file_path = '/test/file.txt'"
+            ).fetchone()
+        assert tuple(row) == ("uploading", 1)
+
+    @pytest.mark.asyncio
+    async def test_per_row_commit_mode(self, tmp_path: Path):
+        db_path = tmp_path / "per_row.db"
+        Database(db_path).conn.close()
+        async with AsyncUploadStateManager(str(db_path), group_commit=False) as state:
+            await _insert_test_file(state)
+            assert state._committer is None
+            v = await state.transition_to_uploading("/test/file.txt", 0)
+            v = await state.transition_to_processing("/test/file.txt", v, "files/a", "uri")
+            assert await state.transition_to_indexed("/test/file.txt", v, "a-doc") == 3
+            with pytest.raises(OCCConflictError):
+                await state.transition_to_failed("/test/file.txt", 0, "stale")
@@ -0,0 +1,125 @@
+"""Tests for the incremental, parallel HashEngine and its FileScanner wiring.
+
+Uses real temporary files (mmap needs a real file descriptor).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from objlib.config import ScannerConfig
+from objlib.database import Database
+from objlib.hashing import FileFingerprint, HashEngine, hash_file
+from objlib.metadata import MetadataExtractor
+from objlib.scanner import FileScanner
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+class TestHashFile:
+    def test_streaming_matches_hashlib(self, tmp_path):
+        data = b"objectivism " * 5000
+        p = _write(tmp_path / "a.txt", data)
+        assert hash_file(p, chunk_size=4096) == hashlib.sha256(data).hexdigest()
+
+    def test_mmap_path_matches_hashlib(self, tmp_path):
+        data = os.urandom(64 * 1024)
+        p = _write(tmp_path / "book.txt", data)
+        assert hash_file(p, mmap_threshold=1024) == hashlib.sha256(data).hexdigest()
+
+    def test_empty_file_with_mmap_threshold_zero(self, tmp_path):
+        # mmap refuses zero-length files; falls back to streaming reads
+        p = _write(tmp_path / "empty.txt", b"")
+        assert hash_file(p, mmap_threshold=0) == hashlib.sha256(b"").hexdigest()
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        assert hash_file(tmp_path / "nope.txt") == ""
+
+
+class TestHashEngine:
+    def test_unchanged_fingerprint_is_skipped(self, tmp_path):
+        p = _write(tmp_path / "a.txt", b"x" * 2000)
+        st = p.stat()
+        known = {str(p): FileFingerprint("stored-hash", st.st_size, st.st_mtime, st.st_ino)}
+
+        engine = HashEngine(workers=2)
+        results = engine.hash_files([p], known=known)
+
+        assert results[str(p)].fingerprint.content_hash == "stored-hash"
+        assert results[str(p)].rehashed is False
+        assert engine.stats.files_skipped == 1
+        assert engine.stats.files_hashed == 0
+
+    def test_legacy_row_without_inode_still_skips(self, tmp_path):
+        p = _write(tmp_path / "a.txt", b"x" * 2000)
+        st = p.stat()
+        known = {str(p): FileFingerprint("stored-hash", st.st_size, st.st_mtime, None)}
+        results = HashEngine().hash_files([p], known=known)
+        assert results[str(p)].rehashed is False
+
+    def test_changed_mtime_or_inode_rehashes(self, tmp_path):
+        p = _write(tmp_path / "a.txt", b"x" * 2000)
+        st = p.stat()
+        known = {
+            str(p): FileFingerprint("stale", st.st_size, st.st_mtime - 10, st.st_ino)
+        }
+        results = HashEngine().hash_files([p], known=known)
+        assert results[str(p)].fingerprint.content_hash == hashlib.sha256(b"x" * 2000).hexdigest()
+
+        known = {str(p): FileFingerprint("stale", st.st_size, st.st_mtime, st.st_ino + 1)}
+        assert HashEngine().hash_files([p], known=known)[str(p)].rehashed is True
+
+    def test_force_ignores_fingerprints(self, tmp_path):
+        p = _write(tmp_path / "a.txt", b"x" * 2000)
+        st = p.stat()
+        known = {str(p): FileFingerprint("stored", st.st_size, st.st_mtime, st.st_ino)}
+        engine = HashEngine()
+        engine.hash_files([p], known=known, force=True)
+        assert engine.stats.files_hashed == 1
+
+    def test_parallel_results_and_throughput(self, tmp_path):
+        paths = [_write(tmp_path / f"f{i}.txt", bytes([i]) * 4096) for i in range(20)]
+        engine = HashEngine(workers=4)
+        results = engine.hash_files(paths)
+        assert len(results) == 20
+        for i, p in enumerate(paths):
+            expected = hashlib.sha256(bytes([i]) * 4096).hexdigest()
+            assert results[str(p)].fingerprint.content_hash == expected
+        assert engine.stats.bytes_hashed == 20 * 4096
+        assert engine.stats.bytes_per_second > 0
+
+
+def test_rescan_skips_unchanged_files(tmp_library: Path, scanner_config: ScannerConfig, tmp_db: Database) -> None:
+    """Second scan reuses stored fingerprints instead of re-reading files."""
+    scanner = FileScanner(scanner_config, tmp_db, MetadataExtractor())
+
+    scanner.scan()
+    assert scanner.hash_stats.files_hashed == 6
+
+    changes = scanner.scan()
+    assert len(changes.unchanged) == 6
+    assert scanner.hash_stats.files_skipped == 6
+    assert scanner.hash_stats.files_hashed == 0
+
+    changes = scanner.scan(force_rehash=True)
+    assert scanner.hash_stats.files_hashed == 6
+    assert len(changes.unchanged) == 6
+
+
+def test_legacy_rows_get_fingerprint_backfilled(tmp_library: Path, scanner_config: ScannerConfig, tmp_db: Database) -> None:
+    """Rows without mtime/inode are hashed once, then refreshed so later scans skip."""
+    scanner = FileScanner(scanner_config, tmp_db, MetadataExtractor())
+    scanner.scan()
+    tmp_db.conn.execute("UPDATE files SET mtime = NULL, inode = NULL")
+    tmp_db.conn.commit()
+
+    scanner.scan()
+    assert scanner.hash_stats.files_hashed == 6
+
+    scanner.scan()
+    assert scanner.hash_stats.files_skipped == 6
@@ -0,0 +1,126 @@
+"""Tests for hybrid retrieval: reciprocal rank fusion and concurrent tiers.
+
+Gemini is replaced by an AsyncMock returning a minimal grounding
+response; the local FTS5 tier runs against real temporary files.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import Citation, FileRecord
+from objlib.search.citations import dedupe_citations
+from objlib.search.hybrid import RRF_K, reciprocal_rank_fusion
+from objlib.search.local_index import LocalSearchIndex
+from objlib.services import SearchService
+
+
+def _cite(title: str, text: str, **kwargs) -> Citation:
+    return Citation(index=0, title=title, uri=None, text=text, document_name=None,
+                    confidence=0.5, **kwargs)
+
+
+def _gemini_response(chunks: list[tuple[str, str]], text: str = "Gemini answer") -> SimpleNamespace:
+    grounding = SimpleNamespace(
+        grounding_chunks=[
+            SimpleNamespace(retrieved_context=SimpleNamespace(
+                title=title, uri=None, text=body, document_name=None))
+            for title, body in chunks
+        ],
+        grounding_supports=[],
+    )
+    content = SimpleNamespace(parts=[SimpleNamespace(text=text)])
+    return SimpleNamespace(candidates=[SimpleNamespace(grounding_metadata=grounding, content=content)])
+
+
+class TestReciprocalRankFusion:
+    def test_agreement_across_tiers_ranks_first(self):
+        fused = reciprocal_rank_fusion({
+            "gemini": [_cite("a.txt", "alpha"), _cite("b.txt", "beta")],
+            "lexical": [_cite("c.txt", "gamma"), _cite("b.txt", "beta")],
+        })
+        assert [c.title for c in fused] == ["b.txt", "a.txt", "c.txt"]
+        assert [c.index for c in fused] == [1, 2, 3]
+        assert fused[0].score == pytest.approx(2 / (RRF_K + 2))
+
+    def test_shared_passage_keeps_resolved_citation(self):
+        raw = _cite("abc123xyz", "Same passage text")
+        resolved = _cite("OPAR - Lesson 01.txt", "  same passage TEXT", file_path="/lib/x.txt")
+        fused = reciprocal_rank_fusion({"gemini": [raw], "lexical": [resolved]})
+        assert len(fused) == 1
+        assert fused[0].title == "OPAR - Lesson 01.txt"
+        assert resolved.index == 0  # inputs are copied, not renumbered in place
+
+    def test_limit(self):
+        fused = reciprocal_rank_fusion({"t": [_cite(f"{i}.txt", f"p{i}") for i in range(5)]}, limit=2)
+        assert [c.title for c in fused] == ["0.txt", "1.txt"]
+
+    def test_dedupe_citations_matches_fusion_key(self):
+        cites = [_cite("abc123xyz", "dup"), _cite("keep.txt", "other"), _cite("a.txt", "DUP")]
+        assert [c.title for c in dedupe_citations(cites)] == ["keep.txt", "a.txt"]
+
+
+def _add(db: Database, path: Path, text: str, content_hash: str) -> None:
+    path.write_text(text)
+    db.upsert_file(FileRecord(
+        file_path=str(path),
+        content_hash=content_hash,
+        filename=path.name,
+        file_size=len(text),
+        metadata_json=json.dumps({"category": "course"}),
+    ))
+
+
+@pytest.mark.usefixtures("reset_pools")
+class TestHybridSearch:
+    @pytest.fixture
+    def svc(self, tmp_path: Path, tmp_db: Database) -> SearchService:
+        _add(tmp_db, tmp_path / "OPAR - Lesson 01.txt", "Volition is the choice to focus.", "h1")
+        _add(tmp_db, tmp_path / "MOTM - Rights.txt", "Rights are moral principles of volition.", "h2")
+        LocalSearchIndex(tmp_db).refresh()
+        svc = SearchService(api_key="unused", store_resource_name="", db_path=str(tmp_path / "test.db"))
+        svc._client = object()
+        svc._search_client = AsyncMock()
+        return svc
+
+    async def test_local_partial_precedes_fused_result(self, svc):
+        gemini_released = asyncio.Event()
+        partials = []
+
+        async def slow_gemini(*args, **kwargs):
+            await gemini_released.wait()
+            return _gemini_response([("OPAR - Lesson 01.txt", "Volition is the choice to focus.")])
+
+        svc._search_client.query_with_retry.side_effect = slow_gemini
+
+        def on_partial(result):
+            partials.append(result)
+            gemini_released.set()
+
+        result = await svc.search("volition", expand=False, rerank=False, mode="research",
+                                  on_partial=on_partial)
+
+        assert partials and partials[0].response_text == ""
+        assert {c.title for c in partials[0].citations} == {"OPAR - Lesson 01.txt", "MOTM - Rights.txt"}
+        # Gemini and FTS agree on the OPAR passage; the Rights file is recovered locally
+        assert result.response_text == "Gemini answer"
+        assert [c.title for c in result.citations] == ["OPAR - Lesson 01.txt", "MOTM - Rights.txt"]
+        assert result.citations[0].file_path.endswith("OPAR - Lesson 01.txt")
+
+    async def test_gemini_failure_returns_local_results(self, svc):
+        svc._search_client.query_with_retry.side_effect = ConnectionError("offline")
+        result = await svc.search("rights", expand=False, rerank=False)
+        assert [c.title for c in result.citations] == ["MOTM - Rights.txt"]
+        assert result.response_text == ""
+
+    async def test_gemini_failure_without_local_hits_raises(self, svc):
+        svc._search_client.query_with_retry.side_effect = ConnectionError("offline")
+        with pytest.raises(ConnectionError):
+            await svc.search("zzzunmatched", expand=False, rerank=False)
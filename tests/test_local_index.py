@@ -0,0 +1,154 @@
+"""Tests for the FTS5 local search tier and its SearchService wiring.
+
+Uses real temporary files so refresh() reads transcripts from disk the
+same way scan/sync do.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.search.local_index import LocalSearchIndex, build_fts_query
+from objlib.services import SearchService
+
+FILLER = "Aristotle discusses logic and causality at some length. " * 40
+
+
+def _add(db: Database, path: Path, text: str, content_hash: str, **meta) -> None:
+    path.write_text(text)
+    db.upsert_file(FileRecord(
+        file_path=str(path),
+        content_hash=content_hash,
+        filename=path.name,
+        file_size=len(text),
+        metadata_json=json.dumps(meta),
+    ))
+
+
+@pytest.fixture
+def corpus(tmp_path: Path, tmp_db: Database) -> Database:
+    _add(tmp_db, tmp_path / "OPAR - Lesson 01.txt",
+         FILLER + "Concept formation is a process of measurement omission. " + FILLER,
+         "h1", category="course", year=2020, difficulty="introductory")
+    _add(tmp_db, tmp_path / "ITOE - Lesson 02.txt",
+         "Measurement is the identification of a relationship. Concept formation follows.",
+         "h2", category="course", year=2010, difficulty="advanced")
+    _add(tmp_db, tmp_path / "MOTM - Rights.txt",
+         "Individual rights are conditions of existence required by man's nature.",
+         "h3", category="motm", year=2015)
+    return tmp_db
+
+
+class TestBuildFtsQuery:
+    def test_terms_and_phrases_are_quoted(self):
+        assert build_fts_query('"concept formation" measurement') == '"concept formation" "measurement"'
+
+    def test_operators_and_punctuation_are_literal(self):
+        assert build_fts_query("rights AND NOT (man's)") == '"rights" "AND" "NOT" "(man\'s)"'
+        assert build_fts_query("!!! ???") == ""
+
+    def test_match_any(self):
+        assert build_fts_query("a b", match_any=True) == '"a" OR "b"'
+
+
+class TestRefresh:
+    def test_incremental_by_content_hash(self, corpus, tmp_path):
+        index = LocalSearchIndex(corpus)
+        stats = index.refresh()
+        assert (stats.indexed, stats.unchanged) == (3, 0)
+
+        reads: list[str] = []
+        stats = index.refresh(read_text=lambda p: reads.append(p) or "unused")
+        assert (stats.indexed, stats.unchanged) == (0, 3)
+        assert reads == []
+
+        # Modified file (new hash) is re-read; old text no longer matches
+        _add(corpus, tmp_path / "MOTM - Rights.txt", "Property rights and trade.", "h3b",
+             category="motm")
+        stats = index.refresh()
+        assert stats.indexed == 1
+        assert index.search("existence") == []
+        assert [c.title for c in index.search("trade")] == ["MOTM - Rights.txt"]
+
+    def test_deleted_files_are_removed(self, corpus, tmp_path):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+        corpus.mark_deleted({str(tmp_path / "MOTM - Rights.txt")})
+        assert index.refresh().removed == 1
+        assert index.document_count() == 2
+
+    def test_unreadable_file_keeps_previous_document(self, corpus):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+        corpus.conn.execute("UPDATE files SET content_hash = 'changed'")
+        corpus.conn.commit()
+        stats = index.refresh(read_text=lambda p: None)
+        assert stats.failed == 3
+        assert index.document_count() == 3
+
+
+class TestSearch:
+    def test_phrase_query_with_snippet_offsets(self, corpus, tmp_path):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+
+        citations = index.search('"measurement omission"')
+        assert [c.title for c in citations] == ["OPAR - Lesson 01.txt"]
+        hit = citations[0]
+        source = (tmp_path / hit.title).read_text()
+        start, end = hit.snippet_offsets
+        assert source[start:end] == hit.text
+        assert "measurement omission" in hit.text
+        assert hit.score > 0
+        assert hit.confidence == 1.0
+        assert hit.metadata["year"] == 2020
+
+    def test_bm25_ranks_denser_match_first(self, corpus):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+        citations = index.search("concept formation measurement")
+        assert citations[0].title == "ITOE - Lesson 02.txt"
+        assert citations[0].score >= citations[1].score
+
+    def test_falls_back_to_any_term(self, corpus):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+        titles = {c.title for c in index.search("rights zzzunmatched")}
+        assert titles == {"MOTM - Rights.txt"}
+
+    def test_metadata_filters(self, corpus):
+        index = LocalSearchIndex(corpus)
+        index.refresh()
+        titles = [c.title for c in index.search("measurement", filters={"year": ">=2015"})]
+        assert titles == ["OPAR - Lesson 01.txt"]
+        with pytest.raises(ValueError):
+            index.search("measurement", filters={"bogus": "x"})
+
+
+@pytest.mark.usefixtures("reset_pools")
+class TestSearchServiceLocalTier:
+    async def test_local_mode_skips_gemini(self, corpus, tmp_path):
+        LocalSearchIndex(corpus).refresh()
+        svc = SearchService(api_key="unused", store_resource_name="", db_path=str(tmp_path / "test.db"))
+
+        result = await svc.search('"individual rights"', local=True, mode="research")
+
+        assert svc._client is None
+        assert [c.title for c in result.citations] == ["MOTM - Rights.txt"]
+        assert result.response_text == ""
+
+    async def test_falls_back_to_local_when_gemini_fails(self, corpus, tmp_path):
+        LocalSearchIndex(corpus).refresh()
+        svc = SearchService(api_key="unused", store_resource_name="", db_path=str(tmp_path / "test.db"))
+        svc._client = object()
+        svc._search_client = AsyncMock()
+        svc._search_client.query_with_retry.side_effect = ConnectionError("offline")
+
+        result = await svc.search("rights", expand=False, rerank=False)
+        assert [c.title for c in result.citations] == ["MOTM - Rights.txt"]
@@ -0,0 +1,206 @@
+"""Tests for the shared operation tracker behind poll_operation/wait_for_active.
+
+Checks are plain async functions that count calls; delays are scaled down
+to milliseconds so schedules play out in real time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.client import GeminiFileSearchClient, RateLimitError
+from objlib.upload.operation_tracker import OperationTracker
+
+FAST = {"base_delay": 0.01, "max_delay": 0.02}
+
+
+def _tracker(**kwargs) -> OperationTracker:
+    kwargs.setdefault("coalesce_window", 0.01)
+    return OperationTracker(rng=random.Random(0), **kwargs)
+
+
+def _done_after(checks: int, calls: list[str], key: str):
+    async def check():
+        calls.append(key)
+        return calls.count(key) >= checks, key
+    return check
+
+
+async def test_operations_share_batched_checks():
+    tracker = _tracker(batch_size=50, jitter=0.0)
+    calls: list[str] = []
+    keys = [f"operations/{i}" for i in range(20)]
+
+    results = await asyncio.gather(*(
+        tracker.wait(key, _done_after(3, calls, key), timeout=5, timeout_message="t", **FAST)
+        for key in keys
+    ))
+
+    assert results == keys
+    assert len(calls) == 60
+    # Twenty independent pollers would wake sixty times; the tracker wakes three
+    assert tracker.stats.batches == 3
+    assert tracker.stats.completed == 20
+    assert tracker.outstanding == 0
+
+
+async def test_waiters_on_the_same_key_share_one_entry():
+    tracker = _tracker()
+    calls: list[str] = []
+    check = _done_after(2, calls, "files/a")
+
+    first, second = await asyncio.gather(
+        tracker.wait("files/a", check, timeout=5, timeout_message="t", **FAST),
+        tracker.wait("files/a", check, timeout=5, timeout_message="t", **FAST),
+    )
+
+    assert first == second == "files/a"
+    assert len(calls) == 2 and tracker.stats.tracked == 1
+
+
+async def test_rate_limit_raises_shared_backoff():
+    tracker = _tracker(rate_limit_errors=(RateLimitError,), jitter=0.0)
+    attempts = 0
+
+    async def limited():
+        nonlocal attempts
+        attempts += 1
+        if attempts <= 2:
+            raise RateLimitError("429")
+        return True, "ok"
+
+    waiter = asyncio.create_task(
+        tracker.wait("operations/1", limited, timeout=5, timeout_message="t", **FAST)
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0.005)
+    assert tracker.backoff == 2.0
+    assert await waiter == "ok"
+    assert tracker.stats.rate_limited == 2
+    assert tracker.backoff == 2.0  # Halved once by the clean batch from x4
+
+
+async def test_timeout_final_error_and_retried_error():
+    tracker = _tracker(final_errors=(RuntimeError,))
+    flaky_calls = 0
+
+    async def never():
+        return False, None
+
+    async def failed():
+        raise RuntimeError("File processing failed: files/x")
+
+    async def flaky():
+        nonlocal flaky_calls
+        flaky_calls += 1
+        if flaky_calls == 1:
+            raise ConnectionError("reset")
+        return True, "active"
+
+    timed_out, final, retried = await asyncio.gather(
+        tracker.wait("a", never, timeout=0.05, timeout_message="a timed out", **FAST),
+        tracker.wait("b", failed, timeout=5, timeout_message="t", **FAST),
+        tracker.wait("c", flaky, timeout=5, timeout_message="t", **FAST),
+        return_exceptions=True,
+    )
+
+    assert isinstance(timed_out, TimeoutError) and str(timed_out) == "a timed out"
+    assert isinstance(final, RuntimeError)
+    assert retried == "active" and flaky_calls == 2
+    assert (tracker.stats.timed_out, tracker.stats.failed) == (1, 1)
+
+
+async def test_hung_check_is_cut_off_and_does_not_stall_the_batch():
+    tracker = _tracker(check_timeout=0.05)
+    calls: list[str] = []
+    hung_calls = 0
+
+    async def hung():
+        nonlocal hung_calls
+        hung_calls += 1
+        await asyncio.Event().wait()
+
+    hung_task = asyncio.create_task(
+        tracker.wait("hung", hung, timeout=0.2, timeout_message="hung timed out", **FAST)
+    )
+    done = await asyncio.wait_for(
+        tracker.wait("ok", _done_after(3, calls, "ok"), timeout=5,
+                     timeout_message="t", **FAST),
+        timeout=1.0,
+    )
+    assert done == "ok"
+    with pytest.raises(TimeoutError, match="hung timed out"):
+        await asyncio.wait_for(hung_task, timeout=1.0)
+    assert hung_calls >= 2  # Cut off and retried until the deadline
+
+
+async def test_cancelled_check_is_retried_without_stopping_the_scheduler():
+    tracker = _tracker(jitter=0.0)
+    calls: list[str] = []
+    attempts = 0
+
+    async def cancelled_once():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise asyncio.CancelledError()
+        return True, "ok"
+
+    # A dead scheduler would leave both waiters hanging
+    results = await asyncio.wait_for(asyncio.gather(
+        tracker.wait("operations/1", cancelled_once, timeout=5, timeout_message="t", **FAST),
+        tracker.wait("operations/2", _done_after(2, calls, "operations/2"),
+                     timeout=5, timeout_message="t", **FAST),
+    ), timeout=2)
+
+    assert results == ["ok", "operations/2"]
+    assert attempts == 2 and tracker.outstanding == 0
+
+
+async def test_outstanding_oldest_age_and_cancellation():
+    now = [100.0]
+    tracker = OperationTracker(clock=lambda: now[0])
+
+    async def never():
+        return False, None
+
+    waiter = asyncio.create_task(tracker.wait("a", never, timeout=60, timeout_message="t"))
+    await asyncio.sleep(0)
+    now[0] = 107.5
+    assert tracker.outstanding == 1
+    assert tracker.oldest_age == 7.5
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert tracker.outstanding == 0 and tracker.oldest_age == 0.0
+
+
+async def test_client_polls_through_shared_tracker():
+    client = GeminiFileSearchClient.__new__(GeminiFileSearchClient)
+    client._circuit_breaker = RollingWindowCircuitBreaker()
+    client._rate_limiter = MagicMock()
+    client._operation_tracker = None
+    client._client = MagicMock()
+    client._client.aio.operations.get = AsyncMock(side_effect=[
+        SimpleNamespace(name="operations/1", done=False),
+        SimpleNamespace(name="operations/1", done=True),
+    ])
+    client._client.aio.files.get = AsyncMock(
+        return_value=SimpleNamespace(name="files/x", state=SimpleNamespace(name="FAILED"))
+    )
+    client.operation_tracker.coalesce_window = 10.0  # Skip the 5s wait between checks
+
+    operation = await client.poll_operation(SimpleNamespace(name="operations/1", done=False))
+    assert operation.done is True
+    with pytest.raises(RuntimeError, match="File processing failed"):
+        await client.wait_for_active(SimpleNamespace(name="files/x"))
+    assert client.operation_tracker.stats.checks == 3
+    # Status checks do not dilute the breaker's error and 429 rates
+    assert client._circuit_breaker.outcome_counts == (0, 0, 0)
@@ -0,0 +1,111 @@
+"""Tests for the process-wide SQLite connection pool used by the services.
+
+Covers single schema setup per process, read-only reader enforcement,
+writer visibility to readers (WAL), saturation accounting, and the
+service facades checking connections out of the shared pool.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.services import LibraryService, SessionService
+from objlib.services.pool import ConnectionPool, get_pool
+
+
+pytestmark = pytest.mark.usefixtures("reset_pools")
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "pool.db"
+
+
+class TestConnectionPool:
+    def test_schema_setup_runs_once(self, db_path):
+        """Only the writer runs _setup_schema, not the readers or checkouts."""
+        with patch.object(Database, "_setup_schema", autospec=True,
+                          side_effect=Database._setup_schema) as spy:
+            pool = ConnectionPool(db_path, readers=3)
+            for _ in range(10):
+                with pool.read() as db:
+                    db.get_file_count()
+            pool.close()
+        assert spy.call_count == 1
+
+    def test_readers_are_read_only(self, db_path):
+        pool = ConnectionPool(db_path, readers=1)
+        with pool.read() as db:
+            with pytest.raises(sqlite3.OperationalError):
+                db.conn.execute("DELETE FROM files")
+        pool.close()
+
+    def test_writer_commits_visible_to_readers(self, db_path):
+        pool = ConnectionPool(db_path, readers=2)
+        with pool.read() as db:
+            assert db.get_file_count() == 0
+        with pool.write() as db:
+            db.upsert_file(FileRecord("/a.txt", "h", "a.txt", 10))
+        with pool.read() as db:
+            assert db.get_file_count() == 1
+        pool.close()
+
+    def test_saturation_is_counted(self, db_path):
+        pool = ConnectionPool(db_path, readers=1)
+        held = threading.Event()
+        release = threading.Event()
+
+        def _hold():
+            with pool.read():
+                held.set()
+                release.wait(5)
+
+        t = threading.Thread(target=_hold)
+        t.start()
+        held.wait(5)
+        threading.Timer(0.05, release.set).start()
+        with pool.read() as db:
+            db.get_file_count()
+        t.join()
+
+        stats = pool.stats()
+        assert stats["read_checkouts"] == 2
+        assert stats["saturated_checkouts"] == 1
+        assert stats["peak_in_use"] == 1
+        assert stats["in_use"] == 0
+        assert stats["max_wait_ms"] > 0
+        pool.close()
+
+    def test_closed_pool_rejects_checkout(self, db_path):
+        pool = ConnectionPool(db_path, readers=1)
+        pool.close()
+        with pytest.raises(RuntimeError):
+            with pool.read():
+                pass
+
+    def test_get_pool_shares_by_resolved_path(self, db_path, monkeypatch):
+        monkeypatch.chdir(db_path.parent)
+        assert get_pool(db_path) is get_pool(db_path.name)
+
+
+class TestServicesUsePool:
+    async def test_library_and_session_share_pool(self, db_path):
+        session_svc = SessionService(str(db_path))
+        library_svc = LibraryService(str(db_path))
+
+        session_id = await session_svc.create_session("Pooled")
+        await session_svc.add_event(session_id, "note", {"text": "hi"})
+        events = await session_svc.get_events(session_id)
+        assert len(events) == 1
+        assert await library_svc.get_file_count() == 0
+
+        stats = get_pool(db_path).stats()
+        assert stats["write_checkouts"] == 2
+        assert stats["read_checkouts"] == 2
@@ -0,0 +1,147 @@
+"""Tests for bulk upload preparation (schema V21 upload_prep_cache).
+
+Results are compared against the per-file builders they replace
+(``build_identity_header``, ``build_enriched_metadata``,
+``build_ai_analysis_header``); SELECTs are counted with a trace callback.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from objlib.database import Database
+from objlib.upload.client import GeminiFileSearchClient
+from objlib.upload.content_preparer import build_ai_analysis_header
+from objlib.upload.header_builder import build_identity_header
+from objlib.upload.metadata_builder import build_enriched_metadata
+from objlib.upload.preparation import UploadPreparer
+
+COURSE = "/lib/Courses/Objectivist Logic"
+
+
+def _ai(aspects: list[str], summary: str = "Concepts and induction.") -> str:
+    return json.dumps({
+        "category": "course_transcript",
+        "difficulty": "advanced",
+        "primary_topics": ["logic", "induction"],
+        "topic_aspects": aspects,
+        "semantic_description": {"summary": summary, "key_arguments": ["A is A."]},
+        "confidence_score": 0.9,
+    })
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = Database(tmp_path / "library.db")
+    conn = database.conn
+    for i in range(1, 6):
+        path = f"{COURSE}/Objectivist Logic - Class 0{i}-01.txt"
+        conn.execute(
+            "INSERT INTO files (file_path, content_hash, filename, file_size, metadata_json) "
+            "VALUES (?, ?, ?, 10, ?)",
+            (path, f"hash{i}", Path(path).name,
+             json.dumps({"topic": f"Class 0{i}-01", "course": "Objectivist Logic"})),
+        )
+        if i != 5:  # File 5 has no AI metadata
+            conn.execute(
+                "INSERT INTO file_metadata_ai (file_path, metadata_json, model, prompt_version) "
+                "VALUES (?, ?, 'm', 'p')",
+                (path, _ai([f"aspect {i}"] if i != 4 else [])),
+            )
+        for tag in ("logic", "concepts", "induction"):
+            conn.execute(
+                "INSERT INTO file_primary_topics (file_path, topic_tag) VALUES (?, ?)",
+                (path, tag),
+            )
+    conn.execute(
+        "INSERT INTO file_discrimination_phrases (filename, series_name, phrase, word_count, "
+        "aspects_used, validation_status) VALUES (?, 'OL', 'measurement omission', 2, '', "
+        "'validated')",
+        ("Objectivist Logic - Class 02-01.txt",),
+    )
+    conn.execute(
+        "INSERT INTO transcript_entity (transcript_id, person_id, mention_count, "
+        "extraction_version) VALUES (?, 'ayn-rand', 3, 'v1')",
+        (f"{COURSE}/Objectivist Logic - Class 01-01.txt",),
+    )
+    conn.commit()
+    yield database
+    database.close()
+
+
+def _paths(db: Database) -> list[str]:
+    return [r[0] for r in db.conn.execute("SELECT file_path FROM files ORDER BY file_path")]
+
+
+def test_bulk_output_matches_per_file_builders(db):
+    prepared = UploadPreparer(db.conn).prepare(_paths(db))
+
+    assert len(prepared) == 5
+    for path, item in prepared.items():
+        assert item.identity_header == build_identity_header(path, db.conn)
+        row = db.conn.execute(
+            "SELECT f.metadata_json, a.metadata_json FROM files f LEFT JOIN file_metadata_ai a "
+            "ON a.file_path = f.file_path AND a.is_current = 1 WHERE f.file_path = ?",
+            (path,),
+        ).fetchone()
+        metadata = json.loads(row[0])
+        if row[1]:
+            ai_metadata = json.loads(row[1])
+            assert item.custom_metadata == build_enriched_metadata(metadata, ai_metadata, [])
+            assert item.ai_header == build_ai_analysis_header(ai_metadata)
+        else:
+            assert item.custom_metadata == GeminiFileSearchClient.build_custom_metadata(metadata)
+            assert item.ai_header is None
+    assert "Discrimination: measurement omission" in prepared[_paths(db)[1]].identity_header
+    assert prepared[_paths(db)[3]].aspect_count == 0
+
+
+def test_query_count_is_independent_of_batch_size(db):
+    paths = _paths(db)
+    statements: list[str] = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        UploadPreparer(db.conn).prepare(paths)
+    finally:
+        db.conn.set_trace_callback(None)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 5  # files, AI, topics, phrases, cache
+
+
+def test_unchanged_inputs_are_served_from_cache(db):
+    paths = _paths(db)
+    first = UploadPreparer(db.conn).prepare(paths)
+
+    preparer = UploadPreparer(db.conn)
+    second = preparer.prepare(paths)
+    assert (preparer.stats.cached, preparer.stats.built) == (5, 0)
+    assert all(item.cached for item in second.values())
+    assert {p: i.identity_header for p, i in second.items()} == {
+        p: i.identity_header for p, i in first.items()
+    }
+    assert second[paths[0]].custom_metadata == first[paths[0]].custom_metadata
+
+    db.conn.execute(
+        "UPDATE file_metadata_ai SET metadata_json = ? WHERE file_path = ?",
+        (_ai(["new aspect"]), paths[0]),
+    )
+    db.conn.commit()
+    third = preparer.prepare(paths)
+    assert (preparer.stats.cached, preparer.stats.built) == (4, 1)
+    assert "Aspects: new aspect" in third[paths[0]].identity_header
+
+
+def test_sync_profile_includes_entities(db):
+    path = _paths(db)[0]
+    fsm = UploadPreparer(db.conn).prepare([path])[path]
+    sync = UploadPreparer(db.conn, include_entities=True).prepare([path, "/missing.txt"])
+
+    assert "entities" not in {m["key"] for m in fsm.custom_metadata}
+    entities = next(m for m in sync[path].custom_metadata if m["key"] == "entities")
+    assert entities["string_list_value"]["values"] == ["Ayn Rand"]
+    assert sync[path].upload_hash != fsm.upload_hash
+    assert "/missing.txt" not in sync
@@ -0,0 +1,213 @@
+"""Tests for the staged production extraction pipeline (prepare -> API -> writer).
+
+Stages are plain functions with millisecond delays. The orchestrator test
+needs the Mistral SDK's client classes and is skipped where
+``objlib.extraction.orchestrator`` cannot be imported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import rx
+
+from objlib.database import Database
+from objlib.extraction.production_pipeline import ProductionPipeline
+from objlib.models import FileRecord
+
+
+class _Stop(Exception):
+    pass
+
+
+def _pipeline(extract, written: list[list], **kwargs) -> ProductionPipeline:
+    async def write(batch):
+        written.append(list(batch))
+
+    kwargs.setdefault("api_concurrency", 4)
+    kwargs.setdefault("flush_interval", 0.05)
+    return ProductionPipeline(
+        lambda item: (item, threading.get_ident()),
+        extract,
+        write,
+        failed=lambda item, exc: ("failed", item),
+        tokens=lambda result: 10 if result[0] == "ok" else 0,
+        **kwargs,
+    )
+
+
+async def test_stages_overlap_and_writes_are_batched():
+    in_flight = peak = 0
+    loop_thread = threading.get_ident()
+
+    async def extract(item, prepared):
+        nonlocal in_flight, peak
+        assert prepared[1] != loop_thread  # Prepared in a worker thread
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok", item
+
+    written: list[list] = []
+    stats = await _pipeline(extract, written, write_batch_size=5).run(range(12))
+
+    assert sorted(item for batch in written for _, item in batch) == list(range(12))
+    assert max(len(batch) for batch in written) == 5
+    assert peak == 4
+    assert (stats.files, stats.tokens, stats.batches) == (12, 120, len(written))
+    assert stats.files_per_minute > 0 and stats.tokens_per_second > 0
+    assert stats.throughput()["api_concurrency"] == "4-4"
+
+
+async def test_api_limit_is_reread_and_failures_are_written():
+    limit = [1]
+    in_flight = peak = 0
+
+    def prepare(item):
+        if item == 3:
+            raise OSError("unreadable")
+        return item
+
+    async def extract(item, prepared):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        limit[0] = 3  # Controller grew the limit
+        if item == 5:
+            raise ValueError("bad response")
+        return "ok", item
+
+    written: list[list] = []
+
+    async def write(batch):
+        written.append(batch)
+
+    pipeline = ProductionPipeline(
+        prepare, extract, write, failed=lambda item, exc: ("failed", item),
+        api_concurrency=6, api_limit=lambda: limit[0], flush_interval=0.05,
+    )
+    stats = await pipeline.run(range(10))
+
+    results = dict((item, status) for batch in written for status, item in batch)
+    assert results[3] == results[5] == "failed" and len(results) == 10
+    assert peak == 3
+    assert stats.api.limit_range == (1, 3)
+    assert (stats.prepare.failed, stats.api.failed) == (1, 1)
+    assert (stats.files, stats.failed) == (8, 2)  # Failures stay out of files/min
+    assert stats.throughput()["failed"] == 2
+
+
+async def test_stop_error_drains_in_flight_and_reraises():
+    started: list[int] = []
+
+    async def extract(item, prepared):
+        started.append(item)
+        await asyncio.sleep(0.01)
+        if item == 2:
+            raise _Stop("credits exhausted")
+        return "ok", item
+
+    written: list[list] = []
+    pipeline = _pipeline(extract, written, api_concurrency=2, stop_errors=(_Stop,))
+    with pytest.raises(_Stop):
+        await pipeline.run(range(20))
+
+    done = [item for batch in written for _, item in batch]
+    assert 2 not in done and set(done) == set(started) - {2}
+    assert pipeline.stats.files + pipeline.stats.not_started == 20
+    assert pipeline.stats.not_started > 10
+
+
+async def test_failed_write_stops_the_run():
+    async def extract(item, prepared):
+        return "ok", item
+
+    async def write(batch):
+        raise RuntimeError("database is locked")
+
+    pipeline = ProductionPipeline(
+        lambda item: item, extract, write, failed=lambda item, exc: ("failed", item),
+        api_concurrency=2, flush_interval=0.01,
+    )
+    with pytest.raises(RuntimeError, match="locked"):
+        await pipeline.run(range(30))
+    assert pipeline.stats.files == 0 and pipeline.stats.write.failed >= 1
+
+
+async def test_run_production_writes_batches_and_reports_throughput(
+    tmp_db: Database, tmp_path: Path, monkeypatch
+):
+    orchestrator_mod = pytest.importorskip(
+        "objlib.extraction.orchestrator", exc_type=ImportError
+    )
+    from objlib.extraction.checkpoint import CheckpointManager
+    from objlib.extraction.client import RateLimitException
+    from objlib.extraction.schemas import MetadataStatus
+    from objlib.extraction.validator import ValidationResult
+
+    monkeypatch.setattr(orchestrator_mod, "validate_extraction",
+                        lambda *a, **kw: ValidationResult(status=MetadataStatus.EXTRACTED))
+    monkeypatch.setattr(orchestrator_mod, "calculate_confidence", lambda **kw: 0.9)
+    files = []
+    for i in range(6):
+        path = tmp_path / f"t{i}.txt"
+        path.write_text(f"transcript {i} " * 20)
+        tmp_db.upsert_file(FileRecord(file_path=str(path), content_hash=str(i),
+                                      filename=path.name, file_size=200))
+        files.append({"file_path": str(path), "filename": path.name, "file_size": 200})
+
+    calls = 0
+
+    async def extract_metadata(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RateLimitException("429")
+        await asyncio.sleep(0.01)
+        return {"primary_topics": ["ethics"], "confidence_score": 0.9}, 100
+
+    client = MagicMock(_model="magistral-medium-latest")
+    client.extract_metadata = extract_metadata
+    checkpoint = CheckpointManager(tmp_path / "ckpt", "production.json")
+    saves = []
+    monkeypatch.setattr(checkpoint, "save", lambda state: saves.append(json.dumps(state)))
+    monkeypatch.setattr(orchestrator_mod.random, "uniform", lambda a, b: 0.0)
+    monkeypatch.setattr(orchestrator_mod, "rx", SimpleNamespace(timer=_short_timer))
+
+    orchestrator = orchestrator_mod.ExtractionOrchestrator(
+        client, tmp_db, checkpoint,
+        orchestrator_mod.ExtractionConfig(rate_limit_rpm=60_000, write_batch_size=3),
+    )
+    summary = await orchestrator.run_production(files, "minimalist")
+
+    assert (summary["extracted"], summary["failed"], summary["total_tokens"]) == (6, 0, 600)
+    assert summary["throughput"]["files_per_minute"] > 0
+    assert summary["throughput"]["write_batches"] == len(saves) <= 6
+    assert orchestrator._circuit_breaker.outcome_counts == (6, 1, 0)
+    assert orchestrator._cpu_executor is None  # Validation thread released
+    count = tmp_db.conn.execute(
+        "SELECT COUNT(*) FROM file_metadata_ai WHERE is_current = 1"
+    ).fetchone()[0]
+    assert count == 6
+
+    # Re-running serves every file from the extraction cache
+    rerun = orchestrator_mod.ExtractionOrchestrator(client, tmp_db, checkpoint)
+    summary = await rerun.run_production(files, "minimalist")
+    assert calls == 7 and summary["extracted"] == 6
+    assert summary["cache"]["hits"] == 6 and summary["cache"]["tokens_avoided"] == 600
+    forced = await rerun.run_production(files, "minimalist", reuse_cached=False)
+    assert calls == 13 and forced["cache"]["hits"] == 0
+
+
+def _short_timer(seconds: float):
+    """rx.timer capped at 1ms so backoff and pacing do not slow the test."""
+    return rx.timer(min(seconds, 0.001))
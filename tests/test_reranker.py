@@ -7,17 +7,23 @@ window-size mechanics.
 
 from __future__ import annotations
 
+import asyncio
 import json
 from unittest.mock import MagicMock
 
 import pytest
 
 from objlib.models import Citation
+from objlib.search import reranker
+from objlib.search.cache import RerankCache
 from objlib.search.models import RankedPassage, RankedResults
 from objlib.search.reranker import (
     apply_difficulty_ordering,
     rerank_passages,
+    rerank_passages_async,
+    score_passages_local,
 )
+from objlib.services.pool import close_all_pools
 
 
 def _make_citation(
@@ -224,3 +230,94 @@ class TestDifficultyOrdering:
         assert result[0].title == "intro1.txt"
         assert result[1].title == "intro2.txt"
         assert result[2].title == "adv.txt"
+
+
+class TestRerankCacheAndFallback:
+    """Per-passage score cache and the local similarity fallback."""
+
+    @pytest.fixture
+    def cache(self, tmp_db, tmp_path):
+        close_all_pools()
+        yield RerankCache(tmp_path / "test.db")
+        close_all_pools()
+
+    def test_repeated_query_skips_api(self, mock_gemini_client, cache):
+        citations = [
+            _make_citation(index=1, title="a.txt", text="Passage about metaphysics."),
+            _make_citation(index=2, title="b.txt", text="Passage about ethics."),
+        ]
+        mock_gemini_client.models.generate_content.return_value = _mock_rerank_response([
+            {"index": 0, "score": 2.0},
+            {"index": 1, "score": 9.0},
+        ])
+
+        first = rerank_passages(mock_gemini_client, "What is ethics?", citations, cache=cache)
+        second = rerank_passages(mock_gemini_client, "  what is ETHICS? ", citations, cache=cache)
+
+        assert [c.title for c in first] == ["b.txt", "a.txt"]
+        assert [c.title for c in second] == ["b.txt", "a.txt"]
+        assert mock_gemini_client.models.generate_content.call_count == 1
+
+    def test_only_unscored_passages_are_sent(self, mock_gemini_client, cache):
+        old = _make_citation(index=1, title="a.txt", text="Passage about metaphysics.")
+        new = _make_citation(index=2, title="c.txt", text="Passage about aesthetics.")
+        mock_gemini_client.models.generate_content.return_value = _mock_rerank_response([
+            {"index": 0, "score": 3.0},
+            {"index": 1, "score": 5.0},
+        ])
+        rerank_passages(mock_gemini_client, "art", [old, _make_citation(index=2, text="x y z")],
+                        cache=cache)
+
+        mock_gemini_client.models.generate_content.return_value = _mock_rerank_response([
+            {"index": 0, "score": 8.0},
+        ])
+        result = rerank_passages(mock_gemini_client, "art", [old, new], cache=cache)
+
+        prompt = mock_gemini_client.models.generate_content.call_args.kwargs["contents"]
+        assert "aesthetics" in prompt and "metaphysics" not in prompt
+        assert [c.title for c in result] == ["c.txt", "a.txt"]
+
+    def test_local_fallback_on_api_failure(self, mock_gemini_client, monkeypatch):
+        citations = [
+            _make_citation(index=1, title="a.txt", text="First."),
+            _make_citation(index=2, title="b.txt", text="Second."),
+        ]
+        mock_gemini_client.models.generate_content.side_effect = Exception("offline")
+        monkeypatch.setattr(reranker, "score_passages_local", lambda q, c: [0.1, 0.7])
+
+        result = rerank_passages(mock_gemini_client, "q", citations, local_fallback=True)
+        assert [c.title for c in result] == ["b.txt", "a.txt"]
+
+    async def test_slow_api_times_out_to_local_fallback(self, monkeypatch):
+        cancelled = asyncio.Event()
+
+        async def hang(**kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = MagicMock()
+        client.aio.models.generate_content = hang
+        monkeypatch.setattr(reranker, "score_passages_local", lambda q, c: [0.1, 0.7])
+        citations = [
+            _make_citation(index=1, title="a.txt", text="First."),
+            _make_citation(index=2, title="b.txt", text="Second."),
+        ]
+
+        result = await rerank_passages_async(client, "q", citations, local_fallback=True, timeout=0.05)
+
+        assert [c.title for c in result] == ["b.txt", "a.txt"]
+        assert cancelled.is_set()
+
+    def test_score_passages_local_cosine(self):
+        np = pytest.importorskip("numpy")
+        vectors = {"q": [1.0, 0.0], "near": [2.0, 0.2], "far": [0.0, 3.0]}
+        citations = [_make_citation(text="far"), _make_citation(text="near")]
+
+        scores = score_passages_local(
+            "q", citations, encode=lambda texts: np.array([vectors[t] for t in texts])
+        )
+
+        assert scores[1] > 0.99 and abs(scores[0]) < 1e-6
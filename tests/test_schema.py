@@ -36,9 +36,30 @@ EXPECTED_TABLES = {
     "library_config",
     "file_discrimination_phrases",  # Phase 16.6 CRAD discrimination phrases
     "series_genus",                 # Phase 16.6 series/genus taxonomy
+    "transcript_index",             # V16 local search bookkeeping
+    "transcript_fts",               # V16 FTS5 table + its shadow tables
+    "transcript_fts_data",
+    "transcript_fts_idx",
+    "transcript_fts_content",
+    "transcript_fts_docsize",
+    "transcript_fts_config",
+    "embedding_passages",           # V17 embedding matrix id map
+    "search_cache",                 # V18 Gemini search result cache
+    "rerank_cache",                 # V19 rerank score cache
+    "store_documents",              # V20 store document index
+    "upload_prep_cache",            # V21 upload preparation cache
+    "upload_payloads",              # V22 content-addressed upload dedup
+    "extraction_batch_jobs",        # V23 resumable batch extraction
+    "extraction_batch_requests",
+    "extraction_cache",             # V24 extraction result cache
 }
 
-EXPECTED_TRIGGERS = {"update_files_timestamp"}
+EXPECTED_TRIGGERS = {
+    "update_files_timestamp",
+    "bump_indexed_generation_on_update",  # V18 search cache invalidation
+    "bump_indexed_generation_on_insert",
+    "bump_indexed_generation_on_delete",
+}
 
 
 class TestSchemaCreation:
@@ -88,10 +109,10 @@ class TestSchemaCreation:
             f"Missing triggers: {EXPECTED_TRIGGERS - actual_triggers}"
         )
 
-    def test_user_version_is_12(self, in_memory_db):
-        """PRAGMA user_version returns 12 after schema setup (V12: CRAD tables)."""
+    def test_user_version_is_24(self, in_memory_db):
+        """PRAGMA user_version returns 24 after schema setup (V24: extraction cache)."""
         version = in_memory_db.conn.execute("PRAGMA user_version").fetchone()[0]
-        assert version == 12
+        assert version == 24
 
 
 class TestTriggers:
@@ -208,3 +229,37 @@ class TestV7Schema:
             in_memory_db.conn.execute(
                 "INSERT INTO upload_locks(lock_id, instance_id) VALUES (2, 'test-instance-2')"
             )
+
+
+class TestV14Schema:
+    """Verify V14 generated metadata columns and their indexes."""
+
+    def test_generated_columns_track_metadata_json(self, in_memory_db):
+        """meta_* columns are computed from metadata_json on every write."""
+        in_memory_db.conn.execute(
+            "INSERT INTO files (file_path, content_hash, filename, file_size, metadata_json) "
+            "VALUES ('/a.txt', 'h', 'a.txt', 1, '{\"category\": \"course\", \"course\": \"OPAR\", \"year\": 2020}')"
+        )
+        row = in_memory_db.conn.execute(
+            "SELECT meta_category, meta_course, meta_year, meta_week FROM files"
+        ).fetchone()
+        assert tuple(row) == ("course", "OPAR", 2020, None)
+
+        in_memory_db.conn.execute(
+            "UPDATE files SET metadata_json = '{\"category\": \"motm\"}'"
+        )
+        row = in_memory_db.conn.execute("SELECT meta_category, meta_course FROM files").fetchone()
+        assert tuple(row) == ("motm", None)
+
+    def test_course_queries_use_indexes(self, in_memory_db):
+        """Browse queries resolve through idx_meta_* instead of scanning files."""
+        plan = " ".join(
+            row["detail"] for row in in_memory_db.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT filename FROM files "
+                "WHERE meta_course = ? AND NOT is_deleted "
+                "ORDER BY meta_lesson_number, meta_year, meta_quarter, meta_week, filename",
+                ("OPAR",),
+            )
+        )
+        assert "idx_meta_course_order" in plan
+        assert "TEMP B-TREE" not in plan
@@ -214,6 +214,15 @@ class _FakeDB:
     def get_file_metadata_by_store_doc_prefix(self, prefixes):
         return {}
 
+    def resolve_citation_titles(self, titles):
+        return {
+            title: {**match, "filename": title, "matched_by": "filename"}
+            for title, match in self.get_file_metadata_by_filenames(titles).items()
+        }
+
+    def get_shared_paths(self, file_paths):
+        return {}
+
 
 class TestEnrichCitations:
     def test_matches_filename(self):
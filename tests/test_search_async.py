@@ -0,0 +1,161 @@
+"""Tests for the async-native Gemini search path (client.aio).
+
+A fake genai client exposes only ``aio`` coroutines, so any fallback to
+the blocking SDK surface or to a worker thread fails loudly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai import types
+
+from objlib.database import Database
+from objlib.models import Citation, FileRecord
+from objlib.search.cache import SearchResultCache
+from objlib.search.citations import enrich_citations_async
+from objlib.search.client import GeminiSearchClient
+from objlib.services import SearchService
+from objlib.services.pool import get_pool
+
+
+pytestmark = pytest.mark.usefixtures("reset_pools")
+
+
+class HangingAioClient:
+    """genai.Client stand-in whose generate_content never returns."""
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.cancelled = False
+        self.models = MagicMock()  # blocking API: must stay unused
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._generate))
+
+    async def _generate(self, **kwargs):
+        self.started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _response() -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text="ok")]))]
+    )
+
+
+async def test_cancelling_query_aborts_in_flight_request():
+    client = HangingAioClient()
+    search = GeminiSearchClient(client, "fileSearchStores/a")
+
+    task = asyncio.create_task(search.query_with_retry("rights"))
+    await asyncio.wait_for(client.started.wait(), 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert client.cancelled
+    client.models.generate_content.assert_not_called()
+
+
+async def test_cancelling_service_search_aborts_gemini(tmp_path: Path, tmp_db: Database):
+    client = HangingAioClient()
+    svc = SearchService(api_key="unused", store_resource_name="s", db_path=str(tmp_path / "test.db"))
+    svc._client = client
+    svc._search_client = GeminiSearchClient(client, "s")
+
+    task = asyncio.create_task(svc.search("rights", expand=False))
+    await asyncio.wait_for(client.started.wait(), 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert client.cancelled
+
+
+async def test_aquery_uses_cache(tmp_db: Database, tmp_path: Path):
+    client = MagicMock()
+    client.aio.models.generate_content = AsyncMock(return_value=_response())
+    search = GeminiSearchClient(client, "s", cache=SearchResultCache(tmp_path / "test.db"))
+
+    await search.aquery("rights")
+    second = await search.aquery("rights")
+
+    assert client.aio.models.generate_content.await_count == 1
+    assert second.text == "ok"
+
+
+async def test_enrich_async_resolves_orphaned_ids_concurrently(tmp_db: Database, tmp_path: Path):
+    tmp_db.upsert_file(FileRecord(
+        file_path="/lib/OPAR - Lesson 01.txt", content_hash="h", filename="OPAR - Lesson 01.txt",
+        file_size=1, metadata_json=json.dumps({"course": "OPAR"}),
+    ))
+    in_flight = 0
+    peak = 0
+
+    async def files_get(name):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if name == "files/orphan1":
+            return SimpleNamespace(display_name="OPAR - Lesson 01.txt")
+        raise RuntimeError("404")
+
+    client = SimpleNamespace(aio=SimpleNamespace(files=SimpleNamespace(get=files_get)))
+    citations = [
+        Citation(index=1, title="orphan1", uri=None, text="passage one", document_name=None,
+                 confidence=0.5),
+        Citation(index=2, title="orphan2", uri=None, text="passage two", document_name=None,
+                 confidence=0.5),
+    ]
+
+    result = await enrich_citations_async(citations, get_pool(tmp_path / "test.db").read, client)
+
+    assert peak == 2
+    assert result[0].title == "OPAR - Lesson 01.txt"
+    assert result[0].metadata == {"course": "OPAR"}
+    assert result[1].title == "orphan2"  # lookup failure is best-effort
+
+
+async def test_unreranked_results_stream_before_rerank(tmp_path: Path, tmp_db: Database):
+    for name in ("a.txt", "b.txt"):
+        tmp_db.upsert_file(FileRecord(file_path=f"/lib/{name}", content_hash=name, filename=name,
+                                      file_size=1))
+    search_response = types.GenerateContentResponse(candidates=[types.Candidate(
+        content=types.Content(role="model", parts=[types.Part(text="answer")]),
+        grounding_metadata=types.GroundingMetadata(grounding_chunks=[
+            types.GroundingChunk(retrieved_context=types.GroundingChunkRetrievedContext(
+                title=name, text=f"passage {name}"))
+            for name in ("a.txt", "b.txt")
+        ]),
+    )])
+    rerank_response = SimpleNamespace(
+        text='{"rankings": [{"passage_index": 0, "score": 1, "reason": "-"},'
+             ' {"passage_index": 1, "score": 9, "reason": "-"}]}'
+    )
+    partials = []
+
+    async def generate(model, contents, config):
+        if config.response_schema is None:
+            return search_response
+        assert [c.title for c in partials[-1].citations] == ["a.txt", "b.txt"]
+        return rerank_response
+
+    client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate)))
+    svc = SearchService(api_key="unused", store_resource_name="s", db_path=str(tmp_path / "test.db"))
+    svc._client = client
+    svc._search_client = GeminiSearchClient(client, "s")
+
+    result = await svc.search("q", expand=False, hybrid=False, mode="research",
+                              on_partial=partials.append)
+
+    assert len(partials) == 1
+    assert [c.title for c in result.citations] == ["b.txt", "a.txt"]
@@ -0,0 +1,158 @@
+"""Tests for the persistent Gemini search result cache (schema V18)."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from google.genai import types
+
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.search import cache as search_cache
+from objlib.search.cache import SearchResultCache, make_cache_key, read_search_cache_stats
+from objlib.search.client import GeminiSearchClient
+from objlib.services.pool import get_pool
+
+
+pytestmark = pytest.mark.usefixtures("reset_pools")
+
+
+@pytest.fixture
+def cache(tmp_db: Database, tmp_path: Path) -> SearchResultCache:
+    return SearchResultCache(tmp_path / "test.db")
+
+
+def _persisted(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "test.db")
+    try:
+        return read_search_cache_stats(conn)
+    finally:
+        conn.close()
+
+
+def _response(text: str = "Rights are moral principles.") -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                grounding_metadata=types.GroundingMetadata(
+                    grounding_chunks=[
+                        types.GroundingChunk(
+                            retrieved_context=types.GroundingChunkRetrievedContext(
+                                title="abc123def456", text="Individual rights..."
+                            )
+                        )
+                    ],
+                    grounding_supports=[
+                        types.GroundingSupport(grounding_chunk_indices=[0], confidence_scores=[0.9])
+                    ],
+                ),
+            )
+        ]
+    )
+
+
+def _index_file(db: Database, path: str, doc_id: str = "abc123def456-xyz") -> None:
+    db.upsert_file(FileRecord(file_path=path, content_hash="h", filename=Path(path).name, file_size=1))
+    db.conn.execute(
+        "UPDATE files SET gemini_state = 'indexed', gemini_store_doc_id = ? WHERE file_path = ?",
+        (doc_id, path),
+    )
+    db.conn.commit()
+
+
+class TestSearchResultCache:
+    def test_key_covers_every_request_parameter(self):
+        base = make_cache_key("rights", None, 20, "gemini-2.5-flash", "fileSearchStores/a")
+        assert base == make_cache_key("rights", None, 20, "gemini-2.5-flash", "fileSearchStores/a")
+        assert base != make_cache_key("rights", "year=2020", 20, "gemini-2.5-flash", "fileSearchStores/a")
+        assert base != make_cache_key("rights", None, 10, "gemini-2.5-flash", "fileSearchStores/a")
+        assert base != make_cache_key("rights", None, 20, "gemini-2.5-flash", "fileSearchStores/b")
+
+    def test_hit_and_miss_counters(self, cache):
+        assert cache.get("k") is None
+        cache.put("k", "rights", "store", "payload")
+        assert cache.get("k") == "payload"
+        stats = cache.stats()
+        assert (stats.entries, stats.hits, stats.misses) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_lookups_use_readers_and_defer_bookkeeping(self, cache, tmp_path):
+        cache.put("k", "rights", "store", "payload")
+        pool = get_pool(tmp_path / "test.db")
+        writes = pool.stats()["write_checkouts"]
+
+        assert cache.get("k") == "payload"
+        assert cache.get("missing") is None
+        assert pool.stats()["write_checkouts"] == writes
+
+        cache.flush()
+        persisted = _persisted(tmp_path)
+        assert (persisted.hits, persisted.misses) == (1, 1)
+
+    def test_bookkeeping_flushes_every_n_lookups(self, cache, tmp_path, monkeypatch):
+        monkeypatch.setattr(search_cache, "FLUSH_EVERY", 3)
+        for _ in range(3):
+            cache.get("missing")
+        assert _persisted(tmp_path).misses == 3
+
+    def test_ttl_expiry(self, tmp_db, tmp_path):
+        cache = SearchResultCache(tmp_path / "test.db", ttl_seconds=0)
+        cache.put("k", "q", "store", "payload")
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_db, tmp_path):
+        cache = SearchResultCache(tmp_path / "test.db", max_entries=2)
+        cache.put("a", "q", "s", "1")
+        cache.put("b", "q", "s", "2")
+        assert cache.get("a") == "1"  # 'b' is now least recently used
+        cache.put("c", "q", "s", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_indexing_a_file_invalidates(self, cache, tmp_db):
+        cache.put("k", "q", "store", "payload")
+        _index_file(tmp_db, "/lib/a.txt")
+        assert cache.stats().generation == 1
+        assert cache.get("k") is None
+
+    def test_unrelated_updates_keep_entries(self, cache, tmp_db):
+        _index_file(tmp_db, "/lib/a.txt")
+        cache.put("k", "q", "store", "payload")
+        tmp_db.conn.execute("UPDATE files SET metadata_json = '{}', gemini_state = 'indexed'")
+        tmp_db.conn.commit()
+        assert cache.get("k") == "payload"
+
+        tmp_db.conn.execute("UPDATE files SET gemini_state = 'untracked'")
+        tmp_db.conn.commit()
+        assert cache.get("k") is None
+
+
+class TestGeminiSearchClientCache:
+    def test_second_identical_query_skips_api(self, cache):
+        genai_client = MagicMock()
+        genai_client.models.generate_content.return_value = _response()
+        search = GeminiSearchClient(genai_client, "fileSearchStores/a", cache=cache)
+
+        first = search.query("rights", top_k=5)
+        second = search.query("rights", top_k=5)
+        search.query("rights", top_k=6)
+
+        assert genai_client.models.generate_content.call_count == 2
+        assert second.text == first.text
+        chunk = second.candidates[0].grounding_metadata.grounding_chunks[0]
+        assert chunk.retrieved_context.title == "abc123def456"
+        assert second.candidates[0].grounding_metadata.grounding_supports[0].confidence_scores == [0.9]
+
+    def test_empty_response_not_cached(self, cache):
+        genai_client = MagicMock()
+        genai_client.models.generate_content.return_value = types.GenerateContentResponse(candidates=[])
+        search = GeminiSearchClient(genai_client, "fileSearchStores/a", cache=cache)
+        search.query("rights")
+        search.query("rights")
+        assert genai_client.models.generate_content.call_count == 2
+        assert cache.stats().entries == 0
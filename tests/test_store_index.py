@@ -0,0 +1,128 @@
+"""Tests for the store document index (schema V20) and its sync callers.
+
+The Gemini client is a MagicMock whose ``list_store_documents`` returns
+SimpleNamespace documents, so listing calls can be counted.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rich.console import Console
+
+from objlib.config import ScannerConfig
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.sync.orchestrator import SyncOrchestrator
+from objlib.upload.store_index import StoreDocumentIndex
+
+STORE = "fileSearchStores/s1"
+
+
+def _doc(file_id: str, doc_id: str | None = None, state: str = "STATE_ACTIVE") -> SimpleNamespace:
+    return SimpleNamespace(
+        name=f"{STORE}/documents/{doc_id or file_id + '-c0'}",
+        display_name=file_id,
+        state=SimpleNamespace(name=state),
+    )
+
+
+def _client(documents: list[SimpleNamespace]) -> MagicMock:
+    client = MagicMock()
+    client.store_name = STORE
+    client.list_store_documents = AsyncMock(return_value=documents)
+    client.delete_store_document = AsyncMock(return_value=True)
+    return client
+
+
+class TestStoreDocumentIndex:
+    async def test_lookup_by_file_id_and_doc_prefix(self, tmp_db: Database):
+        client = _client([_doc("abc"), SimpleNamespace(name=f"{STORE}/documents/def-c9",
+                                                       display_name=None, state=None)])
+        index = StoreDocumentIndex(tmp_db, client)
+
+        assert await index.find("files/abc") == f"{STORE}/documents/abc-c0"
+        assert await index.find("abc") == f"{STORE}/documents/abc-c0"
+        assert await index.find("files/def") == f"{STORE}/documents/def-c9"
+        assert await index.find("files/zzz") is None
+        assert client.list_store_documents.await_count == 1
+
+    async def test_refresh_applies_difference(self, tmp_db: Database):
+        client = _client([_doc("a"), _doc("b")])
+        index = StoreDocumentIndex(tmp_db, client)
+        await index.refresh()
+
+        client.list_store_documents.return_value = [_doc("b"), _doc("c")]
+        stats = await index.refresh()
+
+        assert (stats.listed, stats.added, stats.removed) == (2, 1, 1)
+        assert index.lookup("files/a") is None
+        assert index.lookup("files/c") == f"{STORE}/documents/c-c0"
+
+    async def test_delete_drops_row(self, tmp_db: Database):
+        client = _client([_doc("a")])
+        index = StoreDocumentIndex(tmp_db, client)
+        doc_name = await index.find("files/a")
+
+        assert await index.delete(doc_name)
+        client.delete_store_document.assert_awaited_once_with(doc_name)
+        assert index.lookup("files/a") is None
+
+    async def test_duplicate_documents_prefer_recorded_doc_id(self, tmp_db: Database):
+        tmp_db.upsert_file(FileRecord(file_path="/lib/a.txt", content_hash="h", filename="a.txt",
+                                      file_size=1))
+        tmp_db.conn.execute(
+            "UPDATE files SET gemini_file_id = 'files/a', gemini_store_doc_id = 'a-c2'"
+        )
+        tmp_db.conn.commit()
+        client = _client([_doc("a", "a-c1"), _doc("a", "a-c2")])
+        index = StoreDocumentIndex(tmp_db, client)
+
+        assert await index.find("files/a") == f"{STORE}/documents/a-c2"
+
+    async def test_recent_listing_reused_until_a_miss(self, tmp_db: Database):
+        client = _client([_doc("a")])
+        await StoreDocumentIndex(tmp_db, client).refresh()
+
+        index = StoreDocumentIndex(tmp_db, client)
+        assert await index.find("files/a")
+        assert client.list_store_documents.await_count == 1
+
+        client.list_store_documents.return_value = [_doc("a"), _doc("new")]
+        assert await index.find("files/new") == f"{STORE}/documents/new-c0"
+        assert await index.find("files/gone") is None
+        assert client.list_store_documents.await_count == 2
+
+    async def test_stale_listing_relisted_on_first_use(self, tmp_db: Database):
+        client = _client([_doc("a")])
+        await StoreDocumentIndex(tmp_db, client).refresh()
+        tmp_db.set_library_config(f"store_index_listed_at:{STORE}", repr(time.time() - 7200))
+
+        await StoreDocumentIndex(tmp_db, client).find("files/a")
+        assert client.list_store_documents.await_count == 2
+
+
+class TestSyncCleanupUsesIndex:
+    @pytest.fixture
+    def orchestrator(self, tmp_db: Database, tmp_path: Path):
+        orphans = 200
+        for i in range(orphans):
+            tmp_db.upsert_file(FileRecord(file_path=f"/lib/{i}.txt", content_hash=str(i),
+                                          filename=f"{i}.txt", file_size=1))
+            tmp_db.update_file_sync_columns(f"/lib/{i}.txt", orphaned_gemini_file_id=f"files/old{i}")
+        client = _client([_doc(f"old{i}") for i in range(0, orphans, 2)])
+        config = ScannerConfig(library_path=tmp_path)
+        return SyncOrchestrator(tmp_db, client, config, "key", Console(quiet=True))
+
+    async def test_orphan_cleanup_lists_store_once(self, orchestrator, tmp_db: Database):
+        await orchestrator._cleanup_orphans()
+
+        client = orchestrator.client
+        assert client.list_store_documents.await_count == 1
+        assert client.delete_store_document.await_count == 100
+        assert tmp_db.get_orphaned_files() == []
+        assert orchestrator.summary["orphans_cleaned"] == 200
@@ -0,0 +1,138 @@
+"""Tests for concurrent new/modified file sync (SyncOrchestrator ``jobs``).
+
+The Gemini client is a MagicMock whose upload sleeps briefly and counts
+uploads in flight; the same changeset is synced sequentially and
+concurrently and the resulting rows are compared.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rich.console import Console
+
+from objlib.config import ScannerConfig
+from objlib.database import Database
+from objlib.models import FileRecord
+from objlib.sync.detector import SyncChangeSet
+from objlib.sync.orchestrator import SyncOrchestrator
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+
+STORE = "fileSearchStores/s1"
+NEW, MODIFIED = 6, 6
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    client.store_name = STORE
+    client.in_flight = client.peak = 0
+
+    async def upload_and_import(path, display_name, metadata):
+        client.in_flight += 1
+        client.peak = max(client.peak, client.in_flight)
+        await asyncio.sleep(0.01)
+        client.in_flight -= 1
+        if display_name == "new-3.txt":
+            raise RuntimeError("upload rejected")
+        stem = display_name.removesuffix(".txt")
+        return (SimpleNamespace(name=f"files/{stem}-v2", uri=f"uri/{stem}"),
+                SimpleNamespace(name=f"operations/{stem}"))
+
+    client.upload_and_import = AsyncMock(side_effect=upload_and_import)
+    client.poll_operation = AsyncMock(return_value=SimpleNamespace(done=True, error=None))
+
+    async def list_store_documents(store):
+        await asyncio.sleep(0.01)
+        return [
+            SimpleNamespace(name=f"{STORE}/documents/mod-{i}-c0", display_name=f"mod-{i}",
+                            state=SimpleNamespace(name="STATE_ACTIVE"))
+            for i in range(MODIFIED)
+        ]
+
+    client.list_store_documents = AsyncMock(side_effect=list_store_documents)
+    client.delete_store_document = AsyncMock(return_value=True)
+    return client
+
+
+def _seed(db: Database, library: Path) -> SyncChangeSet:
+    changeset = SyncChangeSet()
+    for i in range(NEW):
+        path = library / f"new-{i}.txt"
+        path.write_text(f"new {i}")
+        changeset.new_files.append({
+            "file_path": str(path), "content_hash": f"n{i}", "file_size": 5,
+            "filename": path.name, "metadata_json": "{}", "mtime": 1.0,
+        })
+    for i in range(MODIFIED):
+        path = library / f"mod-{i}.txt"
+        path.write_text(f"modified {i}")
+        db.upsert_file(FileRecord(file_path=str(path), content_hash=f"old{i}",
+                                  filename=path.name, file_size=3))
+        db.conn.execute("UPDATE files SET gemini_file_id = ? WHERE file_path = ?",
+                        (f"files/mod-{i}", str(path)))
+        db.conn.commit()
+        changeset.modified_files.append({
+            "file_path": str(path), "content_hash": f"m{i}", "file_size": 10,
+            "mtime": 2.0, "old_gemini_file_id": f"files/mod-{i}",
+        })
+    return changeset
+
+
+async def _sync(tmp_path: Path, name: str, **kwargs) -> tuple[SyncOrchestrator, dict[str, tuple]]:
+    library = tmp_path / name
+    library.mkdir()
+    db = Database(tmp_path / f"{name}.db")
+    try:
+        changeset = _seed(db, library)
+        orchestrator = SyncOrchestrator(
+            db, _client(), ScannerConfig(library_path=library), "key", Console(quiet=True),
+            **kwargs,
+        )
+        await orchestrator._sync_changed_files(changeset, skip_enrichment=True)
+        rows = {
+            Path(row[0]).name: tuple(row[1:])
+            for row in db.conn.execute(
+                "SELECT file_path, content_hash, gemini_state, gemini_file_id, "
+                "orphaned_gemini_file_id, error_message FROM files"
+            )
+        }
+    finally:
+        db.close()
+    return orchestrator, rows
+
+
+async def test_concurrent_sync_matches_sequential(tmp_path: Path):
+    sequential, expected = await _sync(tmp_path, "seq", jobs=1)
+    concurrent, rows = await _sync(tmp_path, "par", jobs=4)
+
+    assert rows == expected
+    assert rows["new-3.txt"][1:] == ("failed", None, None, "upload rejected")
+    assert rows["mod-0.txt"] == ("m0", "indexed", "files/mod-0-v2", None, None)
+    assert concurrent.summary == sequential.summary
+    assert (concurrent.summary["new_uploaded"], concurrent.summary["modified_replaced"],
+            concurrent.summary["errors"]) == (NEW - 1, MODIFIED, 1)
+
+    assert sequential.client.peak == 1
+    assert 1 < concurrent.client.peak <= 4
+    # The concurrent replacements still share one store listing
+    assert concurrent.client.list_store_documents.await_count == 1
+    assert concurrent.client.delete_store_document.await_count == MODIFIED
+
+
+async def test_open_breaker_lowers_job_limit(tmp_path: Path):
+    breaker = RollingWindowCircuitBreaker(consecutive_threshold=1, cooldown_seconds=300)
+    breaker.record_429()
+    orchestrator, _ = await _sync(tmp_path, "open", jobs=8, circuit_breaker=breaker)
+
+    assert orchestrator.pipeline_stats.upload.limit_range == (4, 4)
+    assert orchestrator.client.peak <= 4
+
+
+def test_jobs_must_be_positive(tmp_db: Database, tmp_path: Path):
+    with pytest.raises(ValueError):
+        SyncOrchestrator(tmp_db, _client(), ScannerConfig(library_path=tmp_path), "key",
+                         Console(quiet=True), jobs=0)
@@ -390,6 +390,51 @@ class TestEnrichCitations:
         assert result[0].file_path == "/lib/Courses/OPAR/OPAR - Lesson 02.txt"
         assert result[0].metadata["difficulty"] == "intermediate"
 
+    def test_enrich_citations_maps_store_doc_prefix(self, in_memory_db):
+        """Store doc prefix titles resolve via the indexed prefix column."""
+        from objlib.models import FileRecord
+        in_memory_db.upsert_file(FileRecord(
+            file_path="/lib/Courses/OPAR/OPAR - Lesson 03.txt",
+            content_hash="ghi789",
+            filename="OPAR - Lesson 03.txt",
+            file_size=7000,
+            metadata_json=json.dumps({"course": "OPAR"}),
+        ))
+        in_memory_db.conn.execute(
+            "UPDATE files SET gemini_store_doc_id = ? WHERE file_path = ?",
+            ("abcdefgh1234-x9y8z7", "/lib/Courses/OPAR/OPAR - Lesson 03.txt"),
+        )
+        in_memory_db.conn.commit()
+
+        citation = Citation(
+            index=1,
+            title="abcdefgh1234",
+            uri=None,
+            text="A is A.",
+            document_name=None,
+            confidence=0.7,
+        )
+        result = enrich_citations([citation], in_memory_db)
+        assert result[0].title == "OPAR - Lesson 03.txt"
+        assert result[0].file_path == "/lib/Courses/OPAR/OPAR - Lesson 03.txt"
+
+    def test_resolver_prefers_filename_over_id_matches(self, in_memory_db):
+        """A title matching several strategies resolves by the earliest one."""
+        from objlib.models import FileRecord
+        for path, name in (("/lib/a.txt", "abcdefgh1234"), ("/lib/b.txt", "b.txt")):
+            in_memory_db.upsert_file(FileRecord(path, path, name, 1))
+        in_memory_db.conn.execute(
+            "UPDATE files SET gemini_store_doc_id = 'abcdefgh1234-zz', "
+            "gemini_file_id = 'files/abcdefgh1234' WHERE file_path = '/lib/b.txt'"
+        )
+        in_memory_db.conn.commit()
+
+        resolved = in_memory_db.resolve_citation_titles(["abcdefgh1234", "files/abcdefgh1234"])
+        assert resolved["abcdefgh1234"]["file_path"] == "/lib/a.txt"
+        assert resolved["abcdefgh1234"]["matched_by"] == "filename"
+        assert resolved["files/abcdefgh1234"]["matched_by"] == "gemini_file_id"
+        assert resolved["files/abcdefgh1234"]["filename"] == "b.txt"
+
     def test_enrich_citations_empty(self, in_memory_db):
         """Empty citations list returns empty."""
         result = enrich_citations([], in_memory_db)
@@ -9,6 +9,7 @@ automatically discovered and run without explicit @pytest.mark.asyncio.
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -329,6 +330,32 @@ async def test_search_results_populate_list(mock_search_service, mock_library_se
         assert len(items) == len(sample_citations)
 
 
+async def test_partial_local_results_shown_before_search_completes(
+    mock_search_service, mock_library_service, sample_citations
+):
+    """Local-tier results passed to on_partial are displayed while Gemini is in flight."""
+    gemini_done = asyncio.Event()
+
+    async def search(query, on_partial=None, **kwargs):
+        on_partial(SearchResult("", sample_citations[:1], query, None))
+        await gemini_done.wait()
+        return SearchResult("Fused", sample_citations, query, None)
+
+    mock_search_service.search.side_effect = search
+    app = make_app(search_service=mock_search_service, library_service=mock_library_service)
+    async with app.run_test(size=(120, 40)) as pilot:
+        app.query_one(SearchBar)._enter_subject.on_next("existence")
+        await pilot.pause(0.5)
+
+        assert app.results == sample_citations[:1]
+        assert app.is_searching
+
+        gemini_done.set()
+        await pilot.pause(0.2)
+        assert app.results == sample_citations
+        assert not app.is_searching
+
+
 async def test_search_updates_reactive_query(mock_search_service, mock_library_service):
     """Search via Enter updates app.query reactive property.
 
@@ -577,3 +577,106 @@ class TestDowngradeToFailed:
             )
             row = await cursor.fetchone()
             assert row["error_message"] == "targeted query timeout after 300s"
+
+
+# ======================================================================
+# Upload Source Tests
+# ======================================================================
+
+_AI_METADATA = {
+    "category": "course_transcript",
+    "difficulty": "intermediate",
+    "semantic_description": {
+        "summary": "On the primacy of existence.",
+        "key_arguments": ["Existence exists."],
+        "philosophical_positions": [],
+    },
+}
+
+
+class TestUploadSource:
+    """Tests for open_upload_source() and build_ai_analysis_header()."""
+
+    def test_in_memory_body_matches_temp_file_output(self, tmp_path: Path):
+        """The streamed body is byte-identical to prepare_enriched_content()."""
+        from objlib.upload.content_preparer import (
+            build_ai_analysis_header,
+            cleanup_temp_file,
+            open_upload_source,
+            prepare_enriched_content,
+        )
+
+        original = tmp_path / "lecture.txt"
+        original.write_bytes("Line one\r\nLine two — ok\r\n".encode("utf-8"))
+
+        temp_path = prepare_enriched_content(str(original), _AI_METADATA)
+        try:
+            expected = Path(temp_path).read_bytes()
+        finally:
+            cleanup_temp_file(temp_path)
+
+        header = build_ai_analysis_header(_AI_METADATA)
+        with open_upload_source(str(original), [header]) as source:
+            assert source.stream.read() == expected
+            assert source.size == len(expected)
+            assert source.bytes_read == original.stat().st_size
+            assert not source.spooled
+
+    def test_headers_concatenated_in_order(self, tmp_path: Path):
+        """Identity header precedes the AI header; empty headers are skipped."""
+        from objlib.upload.content_preparer import open_upload_source
+
+        original = tmp_path / "a.txt"
+        original.write_text("body\n", encoding="utf-8")
+
+        with open_upload_source(str(original), ["ID\n", "", "AI\n"]) as source:
+            assert source.stream.read() == b"ID\nAI\nbody\n"
+            assert source.header_bytes == 6
+
+    def test_large_body_is_spooled(self, tmp_path: Path):
+        """Bodies above the threshold go through a spooled temp file."""
+        from objlib.upload.content_preparer import open_upload_source
+
+        original = tmp_path / "book.txt"
+        original.write_text("x" * 5000 + "\r\n", encoding="utf-8")
+
+        with open_upload_source(str(original), ["H\n"], spool_threshold=1024) as source:
+            data = source.stream.read()
+            assert data == b"H\n" + b"x" * 5000 + b"\n"
+            assert source.spooled
+            assert source.bytes_spooled == source.size == len(data)
+
+    def test_no_tier4_content_returns_none(self):
+        """Empty semantic description means no AI header."""
+        from objlib.upload.content_preparer import build_ai_analysis_header
+
+        assert build_ai_analysis_header({}) is None
+        assert build_ai_analysis_header({"semantic_description": {"summary": ""}}) is None
+
+    async def test_client_rewinds_stream_and_sets_mime_type(self):
+        """Streams are uploaded from position 0 with an explicit mime type."""
+        import io
+
+        rate_limiter = MagicMock()
+        rate_limiter.wait_if_needed = AsyncMock()
+        client = GeminiFileSearchClient(
+            api_key="test",
+            circuit_breaker=RollingWindowCircuitBreaker(),
+            rate_limiter=rate_limiter,
+        )
+        uploaded = {}
+
+        def _upload(file, config):
+            uploaded["data"] = file.read()
+            uploaded["config"] = config
+            return MagicMock(name="files/abc")
+
+        client._client = MagicMock()
+        client._client.aio.files.upload = AsyncMock(side_effect=_upload)
+        stream = io.BytesIO(b"hello")
+        stream.read()
+
+        await client.upload_file(stream, "Display")
+
+        assert uploaded["data"] == b"hello"
+        assert uploaded["config"]["mime_type"] == "text/plain"
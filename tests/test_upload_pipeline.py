@@ -0,0 +1,180 @@
+"""Tests for the pipelined upload scheduler (upload -> queue -> poll).
+
+Stage functions are plain coroutines with controllable delays, so the
+tests check scheduling (no batch barriers, limits, retries, shutdown)
+without any API client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from objlib.database import Database
+from objlib.models import UploadConfig
+from objlib.upload.circuit_breaker import RollingWindowCircuitBreaker
+from objlib.upload.orchestrator import UploadOrchestrator
+from objlib.upload.pipeline import UploadPipeline, percentile
+from objlib.upload.state import AsyncUploadStateManager
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 50) == 2.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 99) == 4.0
+
+
+async def test_slow_poll_does_not_hold_back_other_files():
+    polled: list[str] = []
+    release_slow = asyncio.Event()
+
+    async def upload(item):
+        return item
+
+    async def poll(item):
+        if item == "slow":
+            await release_slow.wait()
+        polled.append(item)
+        if len(polled) == 4:
+            release_slow.set()
+        return True
+
+    pipeline = UploadPipeline(upload, poll, upload_concurrency=2, poll_concurrency=2)
+    stats = await pipeline.run(["slow", "a", "b", "c", "d"])
+
+    assert polled[-1] == "slow"
+    assert stats.poll.completed == 5
+    assert len(stats.upload.latencies) == 5
+
+
+async def test_upload_limit_caps_in_flight_uploads():
+    in_flight = 0
+    peak = 0
+
+    async def upload(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item
+
+    pipeline = UploadPipeline(
+        upload, AsyncMock(return_value=True),
+        upload_concurrency=5, poll_concurrency=5, upload_limit=lambda: 2,
+    )
+    await pipeline.run(range(10))
+    assert peak == 2
+
+
+async def test_failed_poll_is_retried_once_without_blocking():
+    attempts: dict[str, int] = {}
+    outcomes: list[tuple[str, bool | None, int]] = []
+
+    async def upload(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        return item
+
+    async def poll(item):
+        return item != "bad" and (item != "flaky" or attempts[item] > 1)
+
+    async def on_outcome(item, outcome, attempt):
+        outcomes.append((item, outcome, attempt))
+
+    pipeline = UploadPipeline(
+        upload, poll, upload_concurrency=2, poll_concurrency=2,
+        retry=AsyncMock(side_effect=lambda item: item), retry_delay=0.01,
+        on_outcome=on_outcome,
+    )
+    stats = await pipeline.run(["ok", "flaky", "bad"])
+
+    assert attempts == {"ok": 1, "flaky": 2, "bad": 2}
+    assert sorted(outcomes) == [("bad", False, 1), ("flaky", True, 1), ("ok", True, 0)]
+    assert (stats.retried, stats.retry_succeeded) == (2, 1)
+
+
+async def test_upload_skip_and_exception_are_final():
+    outcomes = []
+
+    async def upload(item):
+        if item == "boom":
+            raise RuntimeError("upload exploded")
+        return None
+
+    async def on_outcome(item, outcome, attempt):
+        outcomes.append((item, outcome))
+
+    poll = AsyncMock()
+    pipeline = UploadPipeline(upload, poll, upload_concurrency=1, poll_concurrency=1,
+                              on_outcome=on_outcome)
+    stats = await pipeline.run(["skip", "boom"])
+
+    poll.assert_not_awaited()
+    assert sorted(outcomes) == [("boom", False), ("skip", None)]
+    assert (stats.upload.completed, stats.upload.failed) == (1, 1)
+
+
+async def test_shutdown_stops_feeding_and_drains():
+    stop = False
+
+    async def upload(item):
+        nonlocal stop
+        stop = True
+        return item
+
+    pipeline = UploadPipeline(
+        upload, AsyncMock(return_value=True),
+        upload_concurrency=1, poll_concurrency=1, should_stop=lambda: stop,
+    )
+    stats = await pipeline.run(range(50))
+
+    assert stats.poll.completed >= 1
+    assert stats.not_started + stats.poll.completed == 50
+
+
+@pytest.fixture
+async def pending_state(tmp_path: Path):
+    db_path = tmp_path / "test_upload.db"
+    with Database(db_path) as db:
+        for i in range(5):
+            db.conn.execute(
+                "INSERT INTO files (file_path, content_hash, filename, file_size, metadata_json) "
+                "VALUES (?, ?, ?, 10, '{}')",
+                (f"/lib/{i}.txt", str(i), f"{i}.txt"),
+            )
+        db.conn.commit()
+    state = AsyncUploadStateManager(str(db_path))
+    await state.connect()
+    yield state
+    await state.close()
+
+
+async def test_orchestrator_pipeline_records_logical_batches(pending_state):
+    client = MagicMock()
+    client.build_custom_metadata.return_value = []
+    client.upload_and_import = AsyncMock(side_effect=lambda path, name, meta: (
+        SimpleNamespace(uri=f"uri:{name}", name=f"files/{name}"),
+        SimpleNamespace(name=f"operations/{name}"),
+    ))
+    client.poll_operation = AsyncMock(return_value=SimpleNamespace(done=True, error=None))
+    config = UploadConfig(store_name="s", max_concurrent_uploads=2, batch_size=2)
+    orchestrator = UploadOrchestrator(client, pending_state, RollingWindowCircuitBreaker(), config)
+
+    pending = await pending_state.get_pending_files()
+    stats = await orchestrator._run_pipeline(
+        pending, orchestrator._upload_single_file, orchestrator._poll_single_operation
+    )
+
+    assert stats.poll.completed == 5
+    assert orchestrator.summary["succeeded"] == 5
+    db = pending_state._ensure_connected()
+    rows = await db.execute_fetchall(
+        "SELECT batch_number, file_count, succeeded_count, status FROM upload_batches "
+        "ORDER BY batch_number"
+    )
+    assert [tuple(r) for r in rows] == [(1, 2, 2, "completed"), (2, 2, 2, "completed"),
+                                        (3, 1, 1, "completed")]